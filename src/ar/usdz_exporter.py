@@ -13,7 +13,6 @@ a shell, preventing command injection vulnerabilities.
 import asyncio
 import hashlib
 import shutil
-import struct
 import tempfile
 import zipfile
 from dataclasses import dataclass, field
@@ -23,6 +22,7 @@ from pathlib import Path
 from typing import List, Optional, Tuple
 from uuid import uuid4
 
+from src.mesh_io import MeshData, merge_duplicate_vertices, read_3mf, read_obj, read_stl
 from src.utils import get_logger
 from src.config import get_settings
 
@@ -452,106 +452,25 @@ class USDZExporter:
 
     def _read_stl(self, path: Path) -> Tuple[List[Tuple[float, float, float]], List[Tuple[int, int, int]]]:
         """Read STL file (binary or ASCII)."""
-        with open(path, "rb") as f:
-            header = f.read(80)
-            # Check if binary STL
-            num_triangles = struct.unpack("<I", f.read(4))[0]
-
-            vertices = []
-            faces = []
-            vertex_map = {}
-            vertex_index = 0
-
-            for _ in range(num_triangles):
-                # Skip normal
-                f.read(12)
-
-                # Read 3 vertices
-                face_indices = []
-                for _ in range(3):
-                    x, y, z = struct.unpack("<fff", f.read(12))
-                    v = (x, y, z)
-
-                    # Deduplicate vertices
-                    v_key = f"{x:.6f},{y:.6f},{z:.6f}"
-                    if v_key not in vertex_map:
-                        vertex_map[v_key] = vertex_index
-                        vertices.append(v)
-                        vertex_index += 1
-
-                    face_indices.append(vertex_map[v_key])
-
-                faces.append(tuple(face_indices))
-
-                # Skip attribute byte count
-                f.read(2)
-
-        return vertices, faces
+        # STL stores every triangle corner separately; share coincident vertices
+        return self._mesh_to_lists(merge_duplicate_vertices(read_stl(path)))
 
     def _read_obj(self, path: Path) -> Tuple[List[Tuple[float, float, float]], List[Tuple[int, int, int]]]:
         """Read OBJ file."""
-        vertices = []
-        faces = []
-
-        with open(path, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith("v "):
-                    parts = line.split()
-                    vertices.append((float(parts[1]), float(parts[2]), float(parts[3])))
-                elif line.startswith("f "):
-                    parts = line.split()[1:]
-                    # Handle different face formats (v, v/vt, v/vt/vn, v//vn)
-                    indices = []
-                    for p in parts:
-                        idx = int(p.split("/")[0]) - 1  # OBJ is 1-indexed
-                        indices.append(idx)
-                    # Triangulate if needed (simple fan triangulation)
-                    for i in range(1, len(indices) - 1):
-                        faces.append((indices[0], indices[i], indices[i + 1]))
-
-        return vertices, faces
+        return self._mesh_to_lists(read_obj(path))
 
     def _read_3mf(self, path: Path) -> Tuple[List[Tuple[float, float, float]], List[Tuple[int, int, int]]]:
-        """Read 3MF file (basic support)."""
-        import xml.etree.ElementTree as ET
-
-        vertices = []
-        faces = []
-
+        """Read 3MF file."""
         try:
-            with zipfile.ZipFile(path, "r") as zf:
-                # Find model file
-                for name in zf.namelist():
-                    if name.endswith(".model") or "3D/3dmodel.model" in name:
-                        with zf.open(name) as f:
-                            tree = ET.parse(f)
-                            root = tree.getroot()
-
-                            # Handle namespaces
-                            ns = {"": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"}
-
-                            # Find mesh elements
-                            for mesh in root.iter("{http://schemas.microsoft.com/3dmanufacturing/core/2015/02}mesh"):
-                                # Read vertices
-                                for vertex in mesh.findall(".//{http://schemas.microsoft.com/3dmanufacturing/core/2015/02}vertex"):
-                                    x = float(vertex.get("x", 0))
-                                    y = float(vertex.get("y", 0))
-                                    z = float(vertex.get("z", 0))
-                                    vertices.append((x, y, z))
-
-                                # Read triangles
-                                for triangle in mesh.findall(".//{http://schemas.microsoft.com/3dmanufacturing/core/2015/02}triangle"):
-                                    v1 = int(triangle.get("v1", 0))
-                                    v2 = int(triangle.get("v2", 0))
-                                    v3 = int(triangle.get("v3", 0))
-                                    faces.append((v1, v2, v3))
-
-                        break
-
+            return self._mesh_to_lists(read_3mf(path))
         except Exception as e:
             logger.error(f"Failed to read 3MF: {e}")
+            return [], []
 
+    def _mesh_to_lists(self, mesh: MeshData) -> Tuple[List[Tuple[float, float, float]], List[Tuple[int, int, int]]]:
+        """Convert mesh arrays to the vertex and face lists used for USDA output."""
+        vertices = [tuple(v) for v in mesh.vertices.tolist()]
+        faces = [tuple(f) for f in mesh.faces.tolist()]
         return vertices, faces
 
     def _write_obj(self, vertices: List, faces: List, path: Path) -> None:
@@ -12,6 +12,10 @@ from src.blender.design_advisor import (
     DesignAdvice,
     OrientationSuggestion,
 )
+from src.blender.orientation import (
+    OrientationOptimizer,
+    OrientationScore,
+)
 from src.blender.support_generator import (
     SupportGenerator,
     SupportSettings,
@@ -20,6 +24,8 @@ from src.blender.support_generator import (
     SupportType,
     SupportDensity,
     SupportPattern,
+    SupportColumns,
+    sample_grid_points,
 )
 from src.blender.support_optimizer import (
     SupportOptimizer,
@@ -29,6 +35,12 @@ from src.blender.support_optimizer import (
     generate_optimized_supports,
     compare_support_strategies,
 )
+from src.blender.worker_pool import (
+    BlenderWorker,
+    BlenderWorkerPool,
+    blender_worker_command,
+    stub_worker_command,
+)
 
 __all__ = [
     "OverhangDetector",
@@ -39,6 +51,8 @@ __all__ = [
     "IssueSeverity",
     "DesignAdvice",
     "OrientationSuggestion",
+    "OrientationOptimizer",
+    "OrientationScore",
     "SupportGenerator",
     "SupportSettings",
     "SupportResult",
@@ -46,10 +60,16 @@ __all__ = [
     "SupportType",
     "SupportDensity",
     "SupportPattern",
+    "SupportColumns",
+    "sample_grid_points",
     "SupportOptimizer",
     "OptimizationResult",
     "OptimizationSettings",
     "OptimizationGoal",
     "generate_optimized_supports",
     "compare_support_strategies",
+    "BlenderWorker",
+    "BlenderWorkerPool",
+    "blender_worker_command",
+    "stub_worker_command",
 ]
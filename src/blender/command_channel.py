@@ -0,0 +1,444 @@
+"""
+Socket command channel for the interactive Blender session.
+
+The Blender addon serves a Unix socket from a Blender timer; clients
+send design commands over it as length-prefixed JSON messages (see
+``framing.py``). Every request carries an id, so a client may pipeline
+several commands and the server may stream progress messages before
+each result. Many clients can be connected at once, and a ping doubles
+as the heartbeat that tells whether Blender is up.
+
+Client messages:
+    {"id": 1, "type": "command", "command": {"action": ..., "params": ...}}
+    {"id": 2, "type": "ping"}
+
+Server messages:
+    {"id": 1, "type": "progress", "message": ..., "data": {...}}
+    {"id": 1, "type": "result", "result": {"success": ..., "message": ...}}
+    {"id": 2, "type": "pong"}
+"""
+
+import socket
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from src.blender.framing import FrameDecoder, encode_message
+
+CHANNEL_SOCKET = Path.home() / ".claude" / "blender_channel.sock"
+
+RECV_BYTES = 1 << 16  # Bytes read per socket receive
+CONNECT_TIMEOUT = 1.0  # Seconds to wait when connecting to Blender
+REQUEST_TIMEOUT = 5.0  # Seconds to wait for a command result
+HEARTBEAT_TIMEOUT = 0.5  # Seconds to wait for a ping answer
+
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+CommandHandler = Callable[[Dict[str, Any], ProgressCallback], Dict[str, Any]]
+
+
+class _Connection:
+    """One connected client on the server side."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.decoder = FrameDecoder()
+        self.outgoing = bytearray()
+        self.closed = False
+
+
+class ChannelServer:
+    """
+    Non-blocking command server, driven by repeated calls to ``poll``.
+
+    Blender's API may only be used from its main thread, so the addon
+    calls ``poll`` from a timer and commands run there, one at a time,
+    in the order they arrive.
+    """
+
+    def __init__(self, handler: CommandHandler, path: Union[str, Path] = CHANNEL_SOCKET):
+        """
+        Initialize the server.
+
+        Args:
+            handler: Runs a command; called with the command and a progress
+                callback, returns the result dictionary
+            path: Unix socket path to listen on
+        """
+        self.handler = handler
+        self.path = Path(path)
+        self._listener: Optional[socket.socket] = None
+        self._connections: List[_Connection] = []
+
+    @property
+    def is_running(self) -> bool:
+        """True while the server is listening."""
+        return self._listener is not None
+
+    @property
+    def client_count(self) -> int:
+        """Number of connected clients."""
+        return len(self._connections)
+
+    def start(self) -> None:
+        """
+        Start listening, replacing a socket file left by a dead session.
+
+        Raises:
+            OSError: If another live session already serves the path
+        """
+        if self._listener is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            if _socket_is_live(self.path):
+                raise OSError(f"A Blender session already serves {self.path}")
+            self.path.unlink()
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(str(self.path))
+        listener.listen()
+        listener.setblocking(False)
+        self._listener = listener
+
+    def stop(self) -> None:
+        """Disconnect every client and stop listening."""
+        for conn in self._connections:
+            conn.sock.close()
+        self._connections = []
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+    def poll(self) -> int:
+        """
+        Accept clients, answer every complete request and flush replies.
+
+        Returns:
+            Number of commands run
+        """
+        if self._listener is None:
+            return 0
+        self._accept()
+
+        handled = 0
+        for conn in self._connections:
+            # Commands sent just before a client hung up still run
+            for message in self._receive(conn):
+                if self._handle(conn, message):
+                    handled += 1
+            self._flush(conn)
+
+        for conn in self._connections:
+            if conn.closed:
+                conn.sock.close()
+        self._connections = [conn for conn in self._connections if not conn.closed]
+        return handled
+
+    def _accept(self) -> None:
+        """Accept every waiting client."""
+        while True:
+            try:
+                sock, _ = self._listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            sock.setblocking(False)
+            self._connections.append(_Connection(sock))
+
+    def _receive(self, conn: _Connection) -> List[dict]:
+        """Read what a client has sent so far and decode whole messages."""
+        messages = []
+        while not conn.closed:
+            try:
+                data = conn.sock.recv(RECV_BYTES)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                conn.closed = True
+                break
+            if not data:
+                conn.closed = True
+                break
+            try:
+                messages.extend(conn.decoder.feed(data))
+            except (ConnectionError, ValueError):
+                conn.closed = True
+        return messages
+
+    def _handle(self, conn: _Connection, message: dict) -> bool:
+        """Answer one request; returns True if it ran a command."""
+        request_id = message.get("id")
+        kind = message.get("type")
+
+        if kind == "ping":
+            self._send(conn, {"id": request_id, "type": "pong"})
+            return False
+        if kind != "command":
+            self._send(conn, {"id": request_id, "type": "result", "result": {
+                "success": False, "message": f"Unknown request type: {kind}",
+            }})
+            return False
+
+        def progress(text: str, data: Optional[Dict[str, Any]] = None) -> None:
+            self._send(conn, {"id": request_id, "type": "progress", "message": text, "data": data or {}})
+            self._flush(conn)
+
+        try:
+            result = self.handler(message.get("command") or {}, progress)
+        except Exception as e:
+            result = {"success": False, "message": f"Error: {str(e)}"}
+        self._send(conn, {"id": request_id, "type": "result", "result": result})
+        return True
+
+    def _send(self, conn: _Connection, message: dict) -> None:
+        """Queue a message for a client."""
+        if not conn.closed:
+            conn.outgoing.extend(encode_message(message))
+
+    def _flush(self, conn: _Connection) -> None:
+        """Send as much queued data as the socket takes without blocking."""
+        while conn.outgoing and not conn.closed:
+            try:
+                sent = conn.sock.send(conn.outgoing)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                conn.closed = True
+                return
+            del conn.outgoing[:sent]
+
+
+class PendingCommand:
+    """A request sent over the channel whose answer may not be in yet."""
+
+    def __init__(self, request_id: int, on_progress: Optional[ProgressCallback] = None):
+        self.id = request_id
+        self.on_progress = on_progress
+        self._done = threading.Event()
+        self._result: Dict[str, Any] = {}
+
+    def done(self) -> bool:
+        """True once the answer has arrived."""
+        return self._done.is_set()
+
+    def result(self, timeout: Optional[float] = REQUEST_TIMEOUT) -> Dict[str, Any]:
+        """
+        Wait for the answer.
+
+        Args:
+            timeout: Seconds to wait (None = wait forever)
+
+        Raises:
+            TimeoutError: If no answer arrives in time
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"No answer to request {self.id}")
+        return self._result
+
+    def _resolve(self, result: Dict[str, Any]) -> None:
+        """Record the answer and wake the waiters."""
+        self._result = result
+        self._done.set()
+
+
+class ChannelClient:
+    """
+    Client side of the command channel.
+
+    A background thread reads the server's messages and routes them to
+    the waiting requests by id, so any number of threads may share one
+    client and requests may be pipelined.
+    """
+
+    def __init__(self, path: Union[str, Path] = CHANNEL_SOCKET):
+        """
+        Initialize the client.
+
+        Args:
+            path: Unix socket path the Blender session listens on
+        """
+        self.path = Path(path)
+        self._sock: Optional[socket.socket] = None
+        self._pending: Dict[int, PendingCommand] = {}
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._reader: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "ChannelClient":
+        self.connect()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def is_connected(self) -> bool:
+        """True while the connection is open."""
+        return self._sock is not None
+
+    def connect(self, timeout: float = CONNECT_TIMEOUT) -> None:
+        """
+        Connect to the Blender session.
+
+        Raises:
+            OSError: If no session is listening
+        """
+        if self._sock is not None:
+            return
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(str(self.path))
+        except OSError:
+            sock.close()
+            raise
+        sock.settimeout(None)
+        self._sock = sock
+        self._reader = threading.Thread(target=self._read_loop, args=(sock,), daemon=True)
+        self._reader.start()
+
+    def close(self) -> None:
+        """Close the connection, failing every unanswered request."""
+        with self._lock:
+            sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        self._fail_pending("Blender connection closed")
+
+    def send(self, command: Dict[str, Any], on_progress: Optional[ProgressCallback] = None) -> PendingCommand:
+        """
+        Send a command without waiting for its answer.
+
+        Args:
+            command: Command dictionary with "action" and "params"
+            on_progress: Called with each progress message and its data
+
+        Returns:
+            The pending request
+
+        Raises:
+            ConnectionError: If the client is not connected
+        """
+        return self._submit({"type": "command", "command": command}, on_progress)
+
+    def request(
+        self,
+        command: Dict[str, Any],
+        timeout: Optional[float] = REQUEST_TIMEOUT,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a command and wait for its result.
+
+        Args:
+            command: Command dictionary with "action" and "params"
+            timeout: Seconds to wait for the result (None = wait forever)
+            on_progress: Called with each progress message and its data
+
+        Returns:
+            Result dictionary from Blender
+
+        Raises:
+            TimeoutError: If the result does not arrive in time
+            ConnectionError: If the client is not connected
+        """
+        pending = self.send(command, on_progress)
+        try:
+            return pending.result(timeout)
+        except TimeoutError:
+            with self._lock:
+                self._pending.pop(pending.id, None)
+            raise
+
+    def ping(self, timeout: float = HEARTBEAT_TIMEOUT) -> bool:
+        """True if the session answers a heartbeat in time."""
+        try:
+            pending = self._submit({"type": "ping"})
+        except ConnectionError:
+            return False
+        try:
+            return pending.result(timeout).get("success", False)
+        except TimeoutError:
+            with self._lock:
+                self._pending.pop(pending.id, None)
+            return False
+
+    def _submit(self, message: Dict[str, Any], on_progress: Optional[ProgressCallback] = None) -> PendingCommand:
+        """Register a request and write it to the socket."""
+        with self._lock:
+            if self._sock is None:
+                raise ConnectionError("Not connected to Blender")
+            self._next_id += 1
+            pending = PendingCommand(self._next_id, on_progress)
+            self._pending[pending.id] = pending
+            try:
+                self._sock.sendall(encode_message(dict(message, id=pending.id)))
+            except OSError as e:
+                del self._pending[pending.id]
+                raise ConnectionError(f"Could not send to Blender: {e}")
+        return pending
+
+    def _read_loop(self, sock: socket.socket) -> None:
+        """Route the server's messages to their requests until the socket closes."""
+        decoder = FrameDecoder()
+        try:
+            while True:
+                data = sock.recv(RECV_BYTES)
+                if not data:
+                    break
+                for message in decoder.feed(data):
+                    self._dispatch(message)
+        except (OSError, ConnectionError, ValueError):
+            pass
+
+        with self._lock:
+            if self._sock is sock:
+                self._sock = None
+                sock.close()
+        self._fail_pending("Blender connection closed")
+
+    def _dispatch(self, message: dict) -> None:
+        """Deliver one server message."""
+        kind = message.get("type")
+        with self._lock:
+            if kind == "progress":
+                pending = self._pending.get(message.get("id"))
+            else:
+                pending = self._pending.pop(message.get("id"), None)
+        if pending is None:
+            return  # Answer to a request that already timed out
+
+        if kind == "progress":
+            if pending.on_progress:
+                pending.on_progress(message.get("message", ""), message.get("data", {}))
+        elif kind == "pong":
+            pending._resolve({"success": True})
+        else:
+            pending._resolve(message.get("result", {}))
+
+    def _fail_pending(self, reason: str) -> None:
+        """Answer every outstanding request with a failure."""
+        with self._lock:
+            pending, self._pending = list(self._pending.values()), {}
+        for request in pending:
+            request._resolve({"success": False, "message": reason})
+
+
+def _socket_is_live(path: Path) -> bool:
+    """True if something accepts connections on the socket path."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    probe.settimeout(CONNECT_TIMEOUT)
+    try:
+        probe.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
@@ -14,14 +14,25 @@ Examples:
 
 import json
 import re
-import time
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple
 
+from src.blender.command_channel import (
+    CHANNEL_SOCKET,
+    HEARTBEAT_TIMEOUT,
+    ChannelClient,
+    ProgressCallback,
+)
+
 # Communication files
 COMMAND_FILE = Path.home() / ".claude" / "blender_commands.json"
 RESPONSE_FILE = Path.home() / ".claude" / "blender_response.json"
 
+# Shared connection to the Blender session's command channel
+_client: Optional[ChannelClient] = None
+_client_lock = threading.Lock()
+
 # Ensure directory exists
 COMMAND_FILE.parent.mkdir(parents=True, exist_ok=True)
 
@@ -318,37 +329,57 @@ def interpret_command(text: str) -> Optional[Dict[str, Any]]:
     return None
 
 
-def send_command(cmd: Dict[str, Any], timeout: float = 5.0) -> Dict[str, Any]:
+def get_channel() -> Optional[ChannelClient]:
+    """
+    Get the shared connection to Blender, connecting if needed.
+
+    Returns:
+        Connected client, or None if no Blender session is listening
+    """
+    global _client
+
+    with _client_lock:
+        if _client is not None and _client.is_connected and _client.path == Path(CHANNEL_SOCKET):
+            return _client
+        if _client is not None:
+            _client.close()
+            _client = None
+
+        client = ChannelClient(CHANNEL_SOCKET)
+        try:
+            client.connect()
+        except OSError:
+            return None
+        _client = client
+        return client
+
+
+def send_command(
+    cmd: Dict[str, Any],
+    timeout: float = 5.0,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Any]:
     """
     Send command to Blender and wait for response.
 
     Args:
         cmd: Command dictionary
         timeout: Max seconds to wait for response
+        on_progress: Called with each progress message Blender streams back
 
     Returns:
         Response dictionary from Blender
     """
-    # Write command
-    with open(COMMAND_FILE, 'w') as f:
-        json.dump(cmd, f)
+    client = get_channel()
+    if client is None:
+        return {"success": False, "message": "Blender not connected"}
 
-    # Wait for response
-    start_time = time.time()
-    cmd_time = COMMAND_FILE.stat().st_mtime
-
-    while time.time() - start_time < timeout:
-        if RESPONSE_FILE.exists():
-            try:
-                resp_time = RESPONSE_FILE.stat().st_mtime
-                if resp_time > cmd_time:
-                    with open(RESPONSE_FILE, 'r') as f:
-                        return json.load(f)
-            except:
-                pass
-        time.sleep(0.1)
-
-    return {"success": False, "message": "Timeout waiting for Blender response"}
+    try:
+        return client.request(cmd, timeout=timeout, on_progress=on_progress)
+    except TimeoutError:
+        return {"success": False, "message": "Timeout waiting for Blender response"}
+    except ConnectionError as e:
+        return {"success": False, "message": f"Blender connection lost: {e}"}
 
 
 def execute_natural_command(text: str) -> Dict[str, Any]:
@@ -372,16 +403,9 @@ def execute_natural_command(text: str) -> Dict[str, Any]:
 
 
 def is_blender_connected() -> bool:
-    """Check if Blender interactive mode is running."""
-    if not RESPONSE_FILE.exists():
-        return False
-
-    try:
-        # Check if response file is recent (within 10 seconds)
-        mtime = RESPONSE_FILE.stat().st_mtime
-        return time.time() - mtime < 10
-    except:
-        return False
+    """Check if Blender interactive mode is running by sending a heartbeat."""
+    client = get_channel()
+    return client is not None and client.ping(HEARTBEAT_TIMEOUT)
 
 
 # Example usage and testing
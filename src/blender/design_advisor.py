@@ -11,7 +11,9 @@ from pathlib import Path
 from typing import List, Optional, Tuple, Dict
 
 from src.utils import get_logger
+from src.blender.orientation import OrientationOptimizer, OrientationScore
 from src.blender.overhang_detector import OverhangDetector, OverhangAnalysis, OverhangSeverity
+from src.mesh_io import MeshData, load_mesh_features
 
 logger = get_logger("blender.advisor")
 
@@ -135,6 +137,7 @@ class DesignAdvisor:
     THIN_FEATURE_THRESHOLD = 0.4  # mm
     BRIDGE_LENGTH_THRESHOLD = 10.0  # mm
     SHARP_EDGE_ANGLE_THRESHOLD = 30  # degrees
+    ORIENTATION_SUGGESTIONS = 3  # Searched orientations offered besides the current one
 
     def __init__(
         self,
@@ -157,6 +160,9 @@ class DesignAdvisor:
         self.overhang_detector = OverhangDetector(
             support_threshold=support_angle_threshold,
         )
+        self.orientation_optimizer = OrientationOptimizer(
+            support_angle_threshold=support_angle_threshold,
+        )
 
     def analyze(self, file_path: str) -> DesignAdvice:
         """
@@ -185,7 +191,7 @@ class DesignAdvisor:
         issues.extend(self._scale_issues(geometry))
 
         # Generate suggestions
-        orientations = self._suggest_orientations(overhang_analysis, geometry)
+        orientations = self._suggest_orientations(overhang_analysis, geometry, self._load_mesh(path))
         fillets = self._suggest_fillets(geometry)
 
         # Calculate scores and recommendations
@@ -211,6 +217,15 @@ class DesignAdvisor:
         logger.info(f"Analysis complete: {len(issues)} issues, printability {printability:.0f}%")
         return advice
 
+    def _load_mesh(self, path: Path) -> Optional[MeshData]:
+        """Load the model's triangles, or None if the file cannot be read as a mesh."""
+        try:
+            mesh = load_mesh_features(path).mesh
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not load {path} for orientation search: {e}")
+            return None
+        return None if mesh.is_empty else mesh
+
     def _analyze_geometry(self, path: Path) -> dict:
         """Analyze geometry characteristics."""
         content = path.read_text(errors="ignore")
@@ -417,8 +432,22 @@ class DesignAdvisor:
 
         return issues
 
-    def _suggest_orientations(self, overhang_analysis: OverhangAnalysis, geometry: dict) -> List[OrientationSuggestion]:
-        """Generate optimal orientation suggestions."""
+    def _suggest_orientations(
+        self,
+        overhang_analysis: OverhangAnalysis,
+        geometry: dict,
+        mesh: Optional[MeshData] = None,
+    ) -> List[OrientationSuggestion]:
+        """
+        Generate optimal orientation suggestions.
+
+        With a mesh, orientations are searched and their support volume,
+        bed contact and height measured; without one, fixed rotations are
+        proposed from the bounding box.
+        """
+        if mesh is not None:
+            return self._search_orientations(mesh)
+
         suggestions = []
         bbox = geometry.get("bounding_box", (10, 10, 10))
 
@@ -465,6 +494,60 @@ class DesignAdvisor:
         suggestions.sort(key=lambda s: s.confidence, reverse=True)
         return suggestions
 
+    def _search_orientations(self, mesh: MeshData) -> List[OrientationSuggestion]:
+        """Suggest the best searched orientations, compared with the current one."""
+        current = self.orientation_optimizer.evaluate(mesh, [(0.0, 0.0, 1.0)])[0]
+        found = self.orientation_optimizer.optimize(mesh, top_k=self.ORIENTATION_SUGGESTIONS)
+
+        suggestions = [self._measured_suggestion(o, current) for o in found]
+        if not any(o.rotation_x == 0 and o.rotation_y == 0 for o in found):
+            suggestions.append(self._measured_suggestion(current, current))
+
+        suggestions.sort(key=lambda s: s.confidence, reverse=True)
+        return suggestions
+
+    def _measured_suggestion(self, orientation: OrientationScore, current: OrientationScore) -> OrientationSuggestion:
+        """Describe a measured orientation relative to the current one."""
+        support_change = 0.0
+        if current.support_volume > 0:
+            support_change = (1 - orientation.support_volume / current.support_volume) * 100
+        height_change = 0.0
+        if current.height > 0:
+            height_change = (orientation.height / current.height - 1) * 100
+
+        # The current orientation scores 0.5; better ones approach 1, worse ones 0
+        spread = max(abs(current.score), abs(orientation.score), 1e-9)
+        confidence = min(1.0, max(0.0, 0.5 + 0.5 * (current.score - orientation.score) / spread))
+
+        benefits = []
+        if support_change >= 1:
+            benefits.append(f"Support volume {support_change:.0f}% lower")
+        if orientation.contact_area > current.contact_area:
+            benefits.append(f"Larger base for adhesion ({orientation.contact_area:.0f} mm² on the bed)")
+        if height_change <= -1:
+            benefits.append(f"Print height {-height_change:.0f}% lower")
+        if orientation.rotation_x == 0 and orientation.rotation_y == 0:
+            benefits.append("No rotation needed")
+
+        drawbacks = []
+        if orientation.overhang_area > 0:
+            drawbacks.append(f"Requires supports under {orientation.overhang_area:.0f} mm² of overhang")
+        if height_change >= 1:
+            drawbacks.append(f"Print height {height_change:.0f}% taller")
+        if orientation.contact_area == 0:
+            drawbacks.append("No flat face on the bed")
+
+        return OrientationSuggestion(
+            rotation_x=orientation.rotation_x,
+            rotation_y=orientation.rotation_y,
+            rotation_z=0,
+            benefits=benefits,
+            drawbacks=drawbacks,
+            support_reduction_percent=round(support_change, 1),
+            print_time_change_percent=round(height_change, 1),
+            confidence=round(confidence, 2),
+        )
+
     def _get_orientation_drawbacks(self, analysis: OverhangAnalysis) -> List[str]:
         """Get drawbacks of current orientation."""
         drawbacks = []
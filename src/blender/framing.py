@@ -0,0 +1,114 @@
+"""
+Length-prefixed JSON framing shared by the Blender worker pool and the
+interactive command channel.
+
+Each message is a JSON object encoded as UTF-8 and preceded by its
+length as a 4-byte big-endian integer.
+"""
+
+import json
+import os
+import select
+import struct
+import time
+from typing import List, Optional
+
+HEADER = struct.Struct(">I")  # Message length prefix
+MAX_MESSAGE_BYTES = 64 << 20  # Larger frames are treated as a broken stream
+
+
+def encode_message(message: dict) -> bytes:
+    """Frame one message for sending."""
+    data = json.dumps(message).encode("utf-8")
+    return HEADER.pack(len(data)) + data
+
+
+def write_message(fd: int, message: dict) -> None:
+    """
+    Write one length-prefixed JSON message.
+
+    Args:
+        fd: File descriptor to write to
+        message: JSON-serializable message
+    """
+    view = memoryview(encode_message(message))
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def read_message(fd: int, timeout: Optional[float] = None) -> Optional[dict]:
+    """
+    Read one length-prefixed JSON message.
+
+    Args:
+        fd: File descriptor to read from
+        timeout: Seconds to wait for the whole message (None = wait forever)
+
+    Returns:
+        The message, or None if the stream ended cleanly before it
+
+    Raises:
+        TimeoutError: If the message does not arrive in time
+        ConnectionError: If the stream ends mid-message or the frame is invalid
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    header = _read_exact(fd, HEADER.size, deadline)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        raise ConnectionError("Stream ended inside a message header")
+
+    (length,) = HEADER.unpack(header)
+    if length > MAX_MESSAGE_BYTES:
+        raise ConnectionError(f"Message of {length} bytes exceeds the frame limit")
+    data = _read_exact(fd, length, deadline)
+    if len(data) < length:
+        raise ConnectionError("Stream ended inside a message")
+    return json.loads(data.decode("utf-8"))
+
+
+def _read_exact(fd: int, size: int, deadline: Optional[float]) -> bytes:
+    """Read up to size bytes, stopping early only at end of stream."""
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        if deadline is not None:
+            wait = deadline - time.monotonic()
+            if wait <= 0 or not select.select([fd], [], [], wait)[0]:
+                raise TimeoutError("Timed out waiting for message")
+        chunk = os.read(fd, remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+class FrameDecoder:
+    """Splits a byte stream arriving in arbitrary pieces into messages."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[dict]:
+        """
+        Add received bytes and return the messages they complete.
+
+        Raises:
+            ConnectionError: If a frame is larger than the limit
+        """
+        self._buffer.extend(data)
+        messages = []
+        offset = 0
+        while len(self._buffer) - offset >= HEADER.size:
+            (length,) = HEADER.unpack_from(self._buffer, offset)
+            if length > MAX_MESSAGE_BYTES:
+                raise ConnectionError(f"Message of {length} bytes exceeds the frame limit")
+            end = offset + HEADER.size + length
+            if end > len(self._buffer):
+                break
+            messages.append(json.loads(self._buffer[offset + HEADER.size:end].decode("utf-8")))
+            offset = end
+        del self._buffer[:offset]
+        return messages
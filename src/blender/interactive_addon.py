@@ -10,18 +10,19 @@ Or run Blender with: blender --python src/blender/interactive_addon.py
 
 import bpy
 import bmesh
-import json
 import os
-import threading
-import time
+import sys
 from pathlib import Path
 from mathutils import Vector, Euler
 import math
 from typing import Dict, List, Tuple, Optional
 
-# Command file for communication
-COMMAND_FILE = Path.home() / ".claude" / "blender_commands.json"
-RESPONSE_FILE = Path.home() / ".claude" / "blender_response.json"
+# Add project root to path for the command channel
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.blender.command_channel import CHANNEL_SOCKET, ChannelServer
+
+SERVE_INTERVAL = 0.01  # Seconds between command channel polls
 
 # Color name to RGBA mapping (sRGB, 0-1)
 COLOR_MAP: Dict[str, Tuple[float, float, float, float]] = {
@@ -69,30 +70,15 @@ REGION_ALIASES: Dict[str, str] = {
     'entire': 'all',
 }
 
-# Ensure directory exists
-COMMAND_FILE.parent.mkdir(parents=True, exist_ok=True)
-
 
 class InteractiveState:
     """Global state for interactive session."""
     running = False
-    last_command_time = 0
+    server = None
     scan_object = None
     case_object = None
 
 
-def write_response(success: bool, message: str, data: dict = None):
-    """Write response for Claude Code to read."""
-    response = {
-        "success": success,
-        "message": message,
-        "timestamp": time.time(),
-        "data": data or {}
-    }
-    with open(RESPONSE_FILE, 'w') as f:
-        json.dump(response, f, indent=2)
-
-
 def get_active_object():
     """Get the active mesh object."""
     obj = bpy.context.active_object
@@ -310,8 +296,15 @@ def setup_vertex_color_material(obj):
     return mat
 
 
-def execute_command(cmd: dict) -> dict:
-    """Execute a design command and return result."""
+def execute_command(cmd: dict, progress=None) -> dict:
+    """
+    Execute a design command and return result.
+
+    Args:
+        cmd: Command with "action" and "params"
+        progress: Optional callback(message, data) streaming progress to the client
+    """
+    progress = progress or (lambda message, data=None: None)
     action = cmd.get('action', '').lower()
     params = cmd.get('params', {})
 
@@ -332,6 +325,7 @@ def execute_command(cmd: dict) -> dict:
             bpy.ops.object.select_all(action='SELECT')
             bpy.ops.object.delete()
 
+            progress(f"Importing {Path(filepath).name}")
             # Import based on extension
             ext = Path(filepath).suffix.lower()
             if ext == '.stl':
@@ -625,6 +619,7 @@ def execute_command(cmd: dict) -> dict:
             bpy.ops.object.select_all(action='DESELECT')
             obj.select_set(True)
 
+            progress(f"Exporting {Path(filepath).name}")
             if ext == '.stl':
                 bpy.ops.wm.stl_export(filepath=filepath, export_selected_objects=True)
             elif ext == '.obj':
@@ -1054,35 +1049,24 @@ def execute_command(cmd: dict) -> dict:
     return result
 
 
-def check_commands():
-    """Check for new commands from Claude Code."""
-    if not COMMAND_FILE.exists():
-        return None
-
+def start_server() -> bool:
+    """Start serving the command channel; returns False if that failed."""
+    if InteractiveState.server is None:
+        InteractiveState.server = ChannelServer(execute_command)
     try:
-        mtime = COMMAND_FILE.stat().st_mtime
-        if mtime <= InteractiveState.last_command_time:
-            return None
-
-        InteractiveState.last_command_time = mtime
-
-        with open(COMMAND_FILE, 'r') as f:
-            cmd = json.load(f)
-
-        return cmd
-    except:
-        return None
+        InteractiveState.server.start()
+    except OSError as e:
+        print(f"Could not start command channel: {e}")
+        return False
+    InteractiveState.running = True
+    return True
 
 
-def command_loop():
-    """Background thread to check for commands."""
-    while InteractiveState.running:
-        cmd = check_commands()
-        if cmd:
-            # Execute in main thread
-            result = execute_command(cmd)
-            write_response(result["success"], result["message"], result.get("data"))
-        time.sleep(0.1)
+def stop_server():
+    """Stop serving the command channel."""
+    InteractiveState.running = False
+    if InteractiveState.server is not None:
+        InteractiveState.server.stop()
 
 
 class CLAUDE_OT_StartInteractive(bpy.types.Operator):
@@ -1092,18 +1076,9 @@ class CLAUDE_OT_StartInteractive(bpy.types.Operator):
 
     def execute(self, context):
         if not InteractiveState.running:
-            InteractiveState.running = True
-            InteractiveState.last_command_time = 0
-
-            # Clear command file
-            if COMMAND_FILE.exists():
-                COMMAND_FILE.unlink()
-
-            # Start background thread
-            thread = threading.Thread(target=command_loop, daemon=True)
-            thread.start()
-
-            write_response(True, "Interactive mode started. Ready for commands.")
+            if not start_server():
+                self.report({'ERROR'}, "Could not start the command channel")
+                return {'CANCELLED'}
             self.report({'INFO'}, "Claude Interactive mode started")
         return {'FINISHED'}
 
@@ -1114,8 +1089,7 @@ class CLAUDE_OT_StopInteractive(bpy.types.Operator):
     bl_label = "Stop Claude Interactive"
 
     def execute(self, context):
-        InteractiveState.running = False
-        write_response(True, "Interactive mode stopped.")
+        stop_server()
         self.report({'INFO'}, "Claude Interactive mode stopped")
         return {'FINISHED'}
 
@@ -1148,18 +1122,15 @@ class CLAUDE_PT_InteractivePanel(bpy.types.Panel):
             layout.label(text=f"      {dims.x/25.4:.2f} x {dims.y/25.4:.2f} x {dims.z/25.4:.2f} in")
 
 
-# Timer for checking commands in main thread (more reliable than threading)
+# Timer serving the command channel in Blender's main thread
 def timer_check_commands():
-    """Timer callback to check commands."""
-    if InteractiveState.running:
-        cmd = check_commands()
-        if cmd:
-            result = execute_command(cmd)
-            write_response(result["success"], result["message"], result.get("data"))
+    """Timer callback to answer commands from connected clients."""
+    if InteractiveState.running and InteractiveState.server is not None:
+        if InteractiveState.server.poll():
             # Force viewport update
             for area in bpy.context.screen.areas:
                 area.tag_redraw()
-    return 0.1  # Check every 100ms
+    return SERVE_INTERVAL
 
 
 classes = [
@@ -1176,6 +1147,7 @@ def register():
 
 
 def unregister():
+    stop_server()
     if bpy.app.timers.is_registered(timer_check_commands):
         bpy.app.timers.unregister(timer_check_commands)
     for cls in reversed(classes):
@@ -1187,16 +1159,8 @@ if __name__ == "__main__":
     register()
 
     # Auto-start interactive mode
-    InteractiveState.running = True
-    InteractiveState.last_command_time = 0
-
-    # Clear old command file
-    if COMMAND_FILE.exists():
-        COMMAND_FILE.unlink()
-
-    write_response(True, "Blender interactive mode ready. Waiting for commands...")
-    print("\n" + "="*50)
-    print("Claude Code Interactive Mode Active")
-    print(f"Command file: {COMMAND_FILE}")
-    print(f"Response file: {RESPONSE_FILE}")
-    print("="*50 + "\n")
+    if start_server():
+        print("\n" + "="*50)
+        print("Claude Code Interactive Mode Active")
+        print(f"Command channel: {CHANNEL_SOCKET}")
+        print("="*50 + "\n")
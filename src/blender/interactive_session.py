@@ -63,13 +63,11 @@ import bpy
 import sys
 sys.path.insert(0, "{project_root}")
 
-# Wait for addon to initialize
-import time
-time.sleep(0.5)
-
-# Load the scan file
-from src.blender.command_interpreter import send_command
-send_command({{"action": "load", "params": {{"file": "{os.path.abspath(scan_file)}"}}}})
+# Queue the load on the addon's channel; it runs once Blender's timers start,
+# so do not wait for the answer here in Blender's main thread
+from src.blender.command_channel import ChannelClient
+with ChannelClient() as client:
+    client.send({{"action": "load", "params": {{"file": "{os.path.abspath(scan_file)}"}}}})
 '''
         startup_file = COMMAND_FILE.parent / "blender_startup.py"
         with open(startup_file, 'w') as f:
@@ -9,13 +9,31 @@ Automatically detects and fixes common mesh problems from 3D scans:
 - Duplicate vertices/faces
 - Self-intersecting geometry
 
-Works both inside Blender (full repair) and standalone (analysis only).
+Works both inside Blender (bmesh repair) and standalone (analysis and
+NumPy repair of triangle arrays).
 """
 
 from dataclasses import dataclass, field
-from typing import List, Tuple, Optional, Set, Dict
+from typing import List, Tuple, Optional, Sequence, Set, Dict
 from enum import Enum
+import itertools
 import math
+import time
+
+import numpy as np
+
+from src.mesh_io import (
+    MeshData,
+    boundary_loop_count,
+    connected_components,
+    edge_incidence,
+    edge_keys,
+    face_edges,
+    weld_points,
+)
+
+HOLE_FILL_MAX_EDGES = 500  # Longer boundary loops are reported instead of filled
+DEGENERATE_AREA = 1e-10  # Faces with less area (mm²) are degenerate
 
 # Try to import Blender modules
 try:
@@ -125,7 +143,9 @@ class MeshAnalyzer:
     """
     Analyzes mesh geometry for issues.
 
-    Works with raw vertex/face data, no Blender required.
+    Works with raw vertex/face data, no Blender required. Topology comes
+    from one sort of packed edge keys and duplicates from a spatial hash,
+    so large scans are analyzed in O(F log F).
     """
 
     def __init__(self, merge_threshold: float = 0.0001):
@@ -153,129 +173,82 @@ class MeshAnalyzer:
             MeshAnalysis with detected issues
         """
         issues = []
+        points = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        corners, sizes, next_corner = _face_corners(faces)
 
-        # Build edge map
-        edge_faces = {}  # edge -> list of face indices
-        for fi, face in enumerate(faces):
-            for i in range(len(face)):
-                v1, v2 = face[i], face[(i + 1) % len(face)]
-                edge = tuple(sorted([v1, v2]))
-                if edge not in edge_faces:
-                    edge_faces[edge] = []
-                edge_faces[edge].append(fi)
-
-        # Build vertex-face map
-        vertex_faces = {i: [] for i in range(len(vertices))}
-        for fi, face in enumerate(faces):
-            for vi in face:
-                vertex_faces[vi].append(fi)
+        # Edge-face incidence from sorted edge keys
+        corner_edges = np.stack([corners, corners[next_corner]], axis=1)
+        edges, uses, _ = edge_incidence(corner_edges, len(points))
 
         # Check for non-manifold edges (not exactly 2 faces)
-        non_manifold_edges = []
-        boundary_edges = []
-        for edge, face_list in edge_faces.items():
-            if len(face_list) == 1:
-                boundary_edges.append(edge)
-            elif len(face_list) > 2:
-                non_manifold_edges.append(edge)
-                v1, v2 = edge
-                mid = (
-                    (vertices[v1][0] + vertices[v2][0]) / 2,
-                    (vertices[v1][1] + vertices[v2][1]) / 2,
-                    (vertices[v1][2] + vertices[v2][2]) / 2,
-                )
-                issues.append(MeshIssue(
-                    issue_type=MeshIssueType.NON_MANIFOLD_EDGE,
-                    severity=RepairSeverity.ERROR,
-                    description=f"Edge shared by {len(face_list)} faces (should be 2)",
-                    location=mid,
-                    element_indices=list(edge)
-                ))
+        non_manifold_edges = edges[uses > 2]
+        boundary_edges = edges[uses == 1]
+        for edge, count in zip(non_manifold_edges.tolist(), uses[uses > 2].tolist()):
+            issues.append(MeshIssue(
+                issue_type=MeshIssueType.NON_MANIFOLD_EDGE,
+                severity=RepairSeverity.ERROR,
+                description=f"Edge shared by {count} faces (should be 2)",
+                location=_edge_midpoint(points, edge),
+                element_indices=edge
+            ))
 
         # Check for holes (boundary edges form loops)
-        if boundary_edges:
-            # Count boundary loops (simplified - just count boundary edges / 3)
-            hole_estimate = max(1, len(boundary_edges) // 3)
-            for edge in boundary_edges[:5]:  # Report first 5
-                v1, v2 = edge
-                mid = (
-                    (vertices[v1][0] + vertices[v2][0]) / 2,
-                    (vertices[v1][1] + vertices[v2][1]) / 2,
-                    (vertices[v1][2] + vertices[v2][2]) / 2,
-                )
-                issues.append(MeshIssue(
-                    issue_type=MeshIssueType.HOLE,
-                    severity=RepairSeverity.ERROR,
-                    description="Boundary edge (hole in mesh)",
-                    location=mid,
-                    element_indices=list(edge)
-                ))
+        for edge in boundary_edges[:5].tolist():  # Report first 5
+            issues.append(MeshIssue(
+                issue_type=MeshIssueType.HOLE,
+                severity=RepairSeverity.ERROR,
+                description="Boundary edge (hole in mesh)",
+                location=_edge_midpoint(points, edge),
+                element_indices=edge
+            ))
 
         # Check for loose vertices
-        loose_verts = [i for i, faces in vertex_faces.items() if len(faces) == 0]
-        for vi in loose_verts:
+        loose_verts = np.flatnonzero(np.bincount(corners, minlength=len(points)) == 0)
+        for vi in loose_verts.tolist():
             issues.append(MeshIssue(
                 issue_type=MeshIssueType.LOOSE_VERTEX,
                 severity=RepairSeverity.WARNING,
                 description="Vertex not connected to any face",
-                location=vertices[vi],
+                location=tuple(points[vi].tolist()),
                 element_indices=[vi]
             ))
 
         # Check for duplicate vertices
-        dup_groups = self._find_duplicate_vertices(vertices)
+        dup_groups = self._find_duplicate_vertices(points)
         for group in dup_groups:
-            if len(group) > 1:
-                issues.append(MeshIssue(
-                    issue_type=MeshIssueType.DUPLICATE_VERTEX,
-                    severity=RepairSeverity.WARNING,
-                    description=f"{len(group)} vertices at same location",
-                    location=vertices[group[0]],
-                    element_indices=group
-                ))
+            issues.append(MeshIssue(
+                issue_type=MeshIssueType.DUPLICATE_VERTEX,
+                severity=RepairSeverity.WARNING,
+                description=f"{len(group)} vertices at same location",
+                location=tuple(points[group[0]].tolist()),
+                element_indices=group
+            ))
 
-        # Check for degenerate faces (zero area)
-        for fi, face in enumerate(faces):
-            if len(face) >= 3:
-                area = self._triangle_area(
-                    vertices[face[0]],
-                    vertices[face[1]],
-                    vertices[face[2]]
-                )
-                if area < 1e-10:
-                    issues.append(MeshIssue(
-                        issue_type=MeshIssueType.DEGENERATE_FACE,
-                        severity=RepairSeverity.WARNING,
-                        description="Face has zero or near-zero area",
-                        element_indices=[fi]
-                    ))
+        # Check for degenerate faces (zero area of the first three corners)
+        for fi in np.flatnonzero(self._face_areas(points, corners, sizes) < DEGENERATE_AREA).tolist():
+            issues.append(MeshIssue(
+                issue_type=MeshIssueType.DEGENERATE_FACE,
+                severity=RepairSeverity.WARNING,
+                description="Face has zero or near-zero area",
+                element_indices=[fi]
+            ))
 
         # Calculate bounding box
-        if vertices:
-            min_pt = (
-                min(v[0] for v in vertices),
-                min(v[1] for v in vertices),
-                min(v[2] for v in vertices)
-            )
-            max_pt = (
-                max(v[0] for v in vertices),
-                max(v[1] for v in vertices),
-                max(v[2] for v in vertices)
-            )
-            bbox = (min_pt, max_pt)
+        if len(points):
+            bbox = (tuple(points.min(axis=0).tolist()), tuple(points.max(axis=0).tolist()))
         else:
             bbox = ((0, 0, 0), (0, 0, 0))
 
         # Create analysis
         analysis = MeshAnalysis(
-            vertex_count=len(vertices),
-            edge_count=len(edge_faces),
+            vertex_count=len(points),
+            edge_count=len(edges),
             face_count=len(faces),
             issues=issues,
-            hole_count=len(boundary_edges) // 3 if boundary_edges else 0,
+            hole_count=boundary_loop_count(boundary_edges),
             non_manifold_edge_count=len(non_manifold_edges),
             loose_vertex_count=len(loose_verts),
-            duplicate_vertex_count=sum(len(g) - 1 for g in dup_groups if len(g) > 1),
+            duplicate_vertex_count=sum(len(g) - 1 for g in dup_groups),
             is_manifold=len(non_manifold_edges) == 0,
             is_watertight=len(boundary_edges) == 0,
             bounding_box=bbox
@@ -283,55 +256,57 @@ class MeshAnalyzer:
 
         return analysis
 
-    def _find_duplicate_vertices(
-        self,
-        vertices: List[Tuple[float, float, float]]
-    ) -> List[List[int]]:
-        """Find groups of duplicate vertices."""
-        groups = []
-        used = set()
-
-        for i, v1 in enumerate(vertices):
-            if i in used:
-                continue
-
-            group = [i]
-            for j, v2 in enumerate(vertices[i + 1:], i + 1):
-                if j in used:
-                    continue
-
-                dist = math.sqrt(
-                    (v1[0] - v2[0]) ** 2 +
-                    (v1[1] - v2[1]) ** 2 +
-                    (v1[2] - v2[2]) ** 2
-                )
-                if dist < self.merge_threshold:
-                    group.append(j)
-                    used.add(j)
-
-            if len(group) > 1:
-                groups.append(group)
-                used.add(i)
-
-        return groups
-
-    def _triangle_area(
-        self,
-        v1: Tuple[float, float, float],
-        v2: Tuple[float, float, float],
-        v3: Tuple[float, float, float]
-    ) -> float:
-        """Calculate triangle area using cross product."""
-        # Vectors
-        ax, ay, az = v2[0] - v1[0], v2[1] - v1[1], v2[2] - v1[2]
-        bx, by, bz = v3[0] - v1[0], v3[1] - v1[1], v3[2] - v1[2]
+    def _find_duplicate_vertices(self, points: np.ndarray) -> List[List[int]]:
+        """Find groups of vertices closer than the merge threshold, ordered by first vertex."""
+        if len(points) < 2:
+            return []
+
+        _, labels = weld_points(points, self.merge_threshold)
+        sizes = np.bincount(labels)
+        shared = np.flatnonzero(sizes[labels] > 1)
+        if len(shared) == 0:
+            return []
+
+        # Labels are numbered in order of each group's first vertex
+        members = shared[np.argsort(labels[shared], kind="stable")].tolist()
+        bounds = np.cumsum(sizes[sizes > 1]).tolist()
+        return [members[a:b] for a, b in zip([0] + bounds[:-1], bounds)]
+
+    def _face_areas(self, points: np.ndarray, corners: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+        """Area of the triangle through the first three corners of every face (inf below three)."""
+        first = np.cumsum(sizes) - sizes
+        areas = np.full(len(sizes), np.inf)
+        valid = sizes >= 3
+        tri = points[corners[first[valid, None] + np.arange(3)]]
+        cross = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+        areas[valid] = 0.5 * np.linalg.norm(cross, axis=1)
+        return areas
+
+
+def _face_corners(faces: List[Tuple[int, ...]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flatten faces of any size into corner arrays.
+
+    Returns:
+        Vertex of every corner, corner count of every face, and the index
+        of the next corner around the same face
+    """
+    if isinstance(faces, np.ndarray) and faces.ndim == 2:
+        sizes = np.full(len(faces), faces.shape[1], dtype=np.int64)
+        corners = faces.astype(np.int64).reshape(-1)
+    else:
+        sizes = np.fromiter((len(f) for f in faces), dtype=np.int64, count=len(faces))
+        corners = np.fromiter(itertools.chain.from_iterable(faces), dtype=np.int64, count=int(sizes.sum()))
 
-        # Cross product
-        cx = ay * bz - az * by
-        cy = az * bx - ax * bz
-        cz = ax * by - ay * bx
+    next_corner = np.arange(len(corners)) + 1
+    last = np.cumsum(sizes)[sizes > 0] - 1
+    next_corner[last] = last - sizes[sizes > 0] + 1
+    return corners, sizes, next_corner
 
-        return 0.5 * math.sqrt(cx * cx + cy * cy + cz * cz)
+
+def _edge_midpoint(points: np.ndarray, edge: List[int]) -> Tuple[float, float, float]:
+    """Midpoint of an edge as a tuple."""
+    return tuple(((points[edge[0]] + points[edge[1]]) / 2).tolist())
 
 
 class MeshRepairer:
@@ -606,6 +581,307 @@ class MeshRepairer:
         return loop
 
 
+class TriangleMeshRepairer:
+    """
+    Repairs raw triangle arrays, no Blender required.
+
+    Runs the same steps as MeshRepairer.repair_object on NumPy arrays:
+    welding through a spatial hash, dropping collapsed and repeated faces,
+    orienting faces with a breadth-first walk over edge adjacency and
+    fan-filling simple boundary loops.
+
+    Usage:
+        repairer = TriangleMeshRepairer()
+        vertices, faces, result = repairer.repair(vertices, faces)
+    """
+
+    def __init__(self, merge_threshold: float = 0.0001, max_hole_edges: int = HOLE_FILL_MAX_EDGES):
+        """
+        Initialize repairer.
+
+        Args:
+            merge_threshold: Distance for merging duplicates
+            max_hole_edges: Boundary loops with more edges are left open
+        """
+        self.merge_threshold = merge_threshold
+        self.max_hole_edges = max_hole_edges
+
+    def repair(
+        self,
+        vertices,
+        faces,
+        fix_holes: bool = True,
+        fix_normals: bool = True,
+        remove_doubles: bool = True,
+        remove_loose: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray, RepairResult]:
+        """
+        Repair raw mesh data.
+
+        Args:
+            vertices: (V, 3) vertex positions
+            faces: Vertex index tuples (triangles or polygons, fan-triangulated)
+            fix_holes: Fill holes in mesh
+            fix_normals: Make normals consistent
+            remove_doubles: Merge duplicate vertices
+            remove_loose: Remove loose vertices
+
+        Returns:
+            (V', 3) float64 vertices, (F', 3) int64 triangles and a RepairResult
+        """
+        operations = []
+        warnings = []
+
+        points = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        tris = _triangulate(faces)
+        initial_issues = _count_array_issues(len(points), tris)
+
+        # Remove doubles (merge by distance), keeping the first vertex of each group
+        if remove_doubles and len(points):
+            count, labels = weld_points(points, self.merge_threshold)
+            if count < len(points):
+                first = np.full(count, len(points))
+                np.minimum.at(first, labels, np.arange(len(points)))
+                operations.append(f"Merged {len(points) - count} duplicate vertices")
+                points = points[first]
+                tris = labels[tris]
+
+        # Faces whose corners were welded together or lie on one line; these
+        # have no normal to orient and no volume to contribute
+        corners = points[tris]
+        doubled_area = np.linalg.norm(np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]), axis=1)
+        collapsed = (tris[:, 0] == tris[:, 1]) | (tris[:, 1] == tris[:, 2]) | (tris[:, 2] == tris[:, 0])
+        degenerate = collapsed | (doubled_area < 2 * DEGENERATE_AREA)
+        if degenerate.any():
+            tris = tris[~degenerate]
+            operations.append(f"Removed {int(degenerate.sum())} degenerate faces")
+
+        # Faces over the same three vertices, in either winding
+        repeated = _repeated_faces(tris, len(points))
+        if repeated.any():
+            tris = tris[~repeated]
+            operations.append(f"Removed {int(repeated.sum())} duplicate faces")
+
+        # Remove loose geometry
+        if remove_loose and len(points):
+            used = np.bincount(tris.reshape(-1), minlength=len(points)) > 0
+            if not used.all():
+                remap = np.cumsum(used) - 1
+                operations.append(f"Removed {int((~used).sum())} loose vertices")
+                points = points[used]
+                tris = remap[tris]
+
+        # Fix normals
+        if fix_normals and len(tris):
+            flip = _orient_faces(points, tris)
+            tris[flip] = tris[flip][:, ::-1]
+            operations.append("Recalculated face normals")
+
+        # Fill holes
+        if fix_holes and len(tris):
+            loops, skipped = _boundary_loops(tris, len(points))
+            fillable = [loop for loop in loops if len(loop) <= self.max_hole_edges]
+            for loop in loops:
+                if len(loop) > self.max_hole_edges:
+                    warnings.append(f"Could not fill hole with {len(loop)} edges")
+            if skipped:
+                warnings.append(f"Left {skipped} boundary edges at non-manifold vertices open")
+            if fillable:
+                points, tris = _fill_loops(points, tris, fillable)
+                operations.append(f"Filled {len(fillable)} holes")
+
+        final_issues = _count_array_issues(len(points), tris)
+        result = RepairResult(
+            success=True,
+            issues_fixed=initial_issues - final_issues,
+            issues_remaining=final_issues,
+            operations_performed=operations,
+            warnings=warnings
+        )
+        return points, tris, result
+
+    def repair_mesh(self, mesh: MeshData, **options) -> Tuple[MeshData, RepairResult]:
+        """
+        Repair a loaded mesh.
+
+        Args:
+            mesh: Mesh to repair
+            **options: Step switches passed on to repair()
+
+        Returns:
+            Repaired mesh and RepairResult
+        """
+        points, tris, result = self.repair(mesh.vertices, mesh.faces, **options)
+        repaired = MeshData(vertices=points.astype(np.float32), faces=tris, source=mesh.source)
+        return repaired, result
+
+
+def _triangulate(faces) -> np.ndarray:
+    """Fan-triangulate faces of any size into an (F, 3) int64 array."""
+    if isinstance(faces, np.ndarray) and faces.ndim == 2 and faces.shape[1] == 3:
+        return faces.astype(np.int64)
+
+    corners, sizes, _ = _face_corners(faces)
+    fans = np.maximum(sizes - 2, 0)
+    first = np.repeat(np.cumsum(sizes) - sizes, fans)
+    step = np.arange(fans.sum()) - np.repeat(np.cumsum(fans) - fans, fans)
+    return np.stack([corners[first], corners[first + step + 1], corners[first + step + 2]], axis=1)
+
+
+def _count_array_issues(vertex_count: int, tris: np.ndarray) -> int:
+    """Non-manifold and boundary edges plus loose vertices, as MeshRepairer counts them."""
+    _, uses, _ = edge_incidence(face_edges(tris), vertex_count)
+    loose = np.bincount(tris.reshape(-1), minlength=vertex_count) == 0
+    return int((uses > 2).sum() + (uses == 1).sum() + loose.sum())
+
+
+def _repeated_faces(tris: np.ndarray, vertex_count: int) -> np.ndarray:
+    """Mask of faces using the same three vertices as an earlier face."""
+    if len(tris) < 2:
+        return np.zeros(len(tris), dtype=bool)
+
+    corners = np.sort(tris, axis=1)
+    pair = corners[:, 0] * np.int64(vertex_count) + corners[:, 1]
+    order = np.lexsort((np.arange(len(tris)), corners[:, 2], pair))
+    same = (pair[order][1:] == pair[order][:-1]) & (corners[order, 2][1:] == corners[order, 2][:-1])
+
+    repeated = np.zeros(len(tris), dtype=bool)
+    repeated[order[1:][same]] = True
+    return repeated
+
+
+def _orient_faces(points: np.ndarray, tris: np.ndarray) -> np.ndarray:
+    """
+    Faces to flip so neighbours agree and closed parts face outward.
+
+    Faces sharing an edge with no third face agree when they run along it
+    in opposite directions. A breadth-first walk from one face of every
+    connected part settles each face against the neighbour it is reached
+    from, level by level for all parts at once. Parts enclosing a negative
+    volume are then flipped as a whole.
+    """
+    count = len(tris)
+    directed = face_edges(tris)
+    keys = edge_keys(tris, len(points))
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    # Edges used by exactly two faces
+    starts = np.flatnonzero(np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]]))
+    uses = np.diff(np.concatenate([starts, [len(keys)]]))
+    pair = starts[uses == 2]
+    a, b = order[pair], order[pair + 1]
+    face_a, face_b = a // 3, b // 3
+    # Running the shared edge the same way means exactly one of them is flipped
+    differ = (directed[a, 0] == directed[b, 0]).astype(np.int8)
+
+    # Adjacency in both directions, grouped by face
+    source = np.concatenate([face_a, face_b])
+    target = np.concatenate([face_b, face_a])
+    parity = np.concatenate([differ, differ])
+    by_source = np.argsort(source, kind="stable")
+    target, parity = target[by_source], parity[by_source]
+    offsets = np.searchsorted(source[by_source], np.arange(count + 1))
+
+    _, labels = connected_components(count, np.stack([face_a, face_b], axis=1))
+    _, seeds = np.unique(labels, return_index=True)
+
+    flip = np.full(count, -1, dtype=np.int8)
+    flip[seeds] = 0
+    frontier = seeds
+    while len(frontier):
+        degree = offsets[frontier + 1] - offsets[frontier]
+        parent = np.repeat(frontier, degree)
+        slot = np.repeat(offsets[frontier], degree) + np.arange(degree.sum()) - np.repeat(np.cumsum(degree) - degree, degree)
+        child = target[slot]
+        new = flip[child] < 0
+        child, parent, slot = child[new], parent[new], slot[new]
+
+        # A face reached from several parents takes the first
+        frontier, first = np.unique(child, return_index=True)
+        flip[frontier] = flip[parent[first]] ^ parity[slot[first]]
+
+    # Signed volume of every part once its faces are settled
+    tri = points[tris]
+    det = np.einsum("ij,ij->i", tri[:, 0], np.cross(tri[:, 1], tri[:, 2]))
+    volume = np.bincount(labels, weights=np.where(flip == 1, -det, det))
+    return (flip == 1) ^ (volume[labels] < 0)
+
+
+def _boundary_loops(tris: np.ndarray, vertex_count: int) -> Tuple[List[List[int]], int]:
+    """
+    Simple boundary loops, each wound to match the faces around it.
+
+    Returns:
+        Loops as vertex index lists, and the number of boundary edges left
+        out because they touch a vertex on more than one loop or run into a
+        dead end
+    """
+    directed = face_edges(tris)
+    _, uses, edge_of = edge_incidence(directed, vertex_count)
+    boundary = directed[uses[edge_of] == 1]
+    if len(boundary) == 0:
+        return [], 0
+
+    # A hole runs against the faces around it
+    tail, head = boundary[:, 1], boundary[:, 0]
+    out_degree = np.bincount(tail, minlength=vertex_count)
+    in_degree = np.bincount(head, minlength=vertex_count)
+    simple = (out_degree == 1) & (in_degree == 1)
+    usable = simple[tail] & simple[head]
+
+    successor = np.full(vertex_count, -1, dtype=np.int64)
+    successor[tail[usable]] = head[usable]
+    successor = successor.tolist()
+
+    loops = []
+    visited = set()
+    for start in tail[usable].tolist():
+        if start in visited:
+            continue
+        loop = [start]
+        visited.add(start)
+        node = successor[start]
+        while node != start and node >= 0 and node not in visited:
+            loop.append(node)
+            visited.add(node)
+            node = successor[node]
+        if node == start and len(loop) >= 3:
+            loops.append(loop)
+
+    skipped = len(boundary) - sum(len(loop) for loop in loops)
+    return loops, skipped
+
+
+def _fill_loops(
+    points: np.ndarray,
+    tris: np.ndarray,
+    loops: List[List[int]]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Close loops with one triangle, or a fan around a new centre vertex."""
+    triangles = [loop for loop in loops if len(loop) == 3]
+    fans = [loop for loop in loops if len(loop) > 3]
+    new_faces = [np.array(triangles, dtype=np.int64).reshape(-1, 3)]
+
+    if fans:
+        sizes = np.array([len(loop) for loop in fans])
+        ring = np.array(list(itertools.chain.from_iterable(fans)), dtype=np.int64)
+        owner = np.repeat(np.arange(len(fans)), sizes)
+        centres = np.zeros((len(fans), 3))
+        np.add.at(centres, owner, points[ring])
+        centres /= sizes[:, None]
+
+        # Each loop edge joined to its loop's centre
+        following = np.arange(len(ring)) + 1
+        ends = np.cumsum(sizes) - 1
+        following[ends] = ends - sizes + 1
+        centre = len(points) + owner
+        new_faces.append(np.stack([centre, ring, ring[following]], axis=1))
+        points = np.concatenate([points, centres])
+
+    return points, np.concatenate([tris] + new_faces)
+
+
 def analyze_mesh(
     vertices: List[Tuple[float, float, float]],
     faces: List[Tuple[int, ...]]
@@ -624,6 +900,108 @@ def analyze_mesh(
     return analyzer.analyze_mesh_data(vertices, faces)
 
 
+def repair_mesh_data(mesh: MeshData, **options) -> Tuple[MeshData, RepairResult]:
+    """
+    Convenience function to repair a loaded mesh without Blender.
+
+    Args:
+        mesh: Mesh to repair
+        **options: Step switches passed on to TriangleMeshRepairer.repair()
+
+    Returns:
+        Repaired mesh and RepairResult
+    """
+    return TriangleMeshRepairer().repair_mesh(mesh, **options)
+
+
+def benchmark_repair(
+    sizes: Sequence[int] = (32, 128, 512),
+    seed: int = 0,
+) -> List[Dict[str, float]]:
+    """
+    Time the NumPy repair pipeline against the Blender one on damaged spheres.
+
+    Each sphere is an unwelded triangle soup with some faces flipped,
+    repeated and removed. The Blender path is timed only when running
+    inside Blender.
+
+    Args:
+        sizes: Ring counts of the generated spheres (faces = 4 x rings²)
+        seed: Random seed for the damage
+
+    Returns:
+        One row per size with face counts, timings and remaining issues
+    """
+    rows = []
+    for rings in sizes:
+        vertices, faces = _damaged_sphere(rings, seed)
+
+        start = time.perf_counter()
+        _, repaired, result = TriangleMeshRepairer().repair(vertices, faces)
+        numpy_time = time.perf_counter() - start
+
+        blender_time = None
+        if HAS_BLENDER:
+            mesh = bpy.data.meshes.new("repair_benchmark")
+            mesh.from_pydata(vertices.tolist(), [], faces.tolist())
+            obj = bpy.data.objects.new("repair_benchmark", mesh)
+            bpy.context.collection.objects.link(obj)
+            try:
+                start = time.perf_counter()
+                MeshRepairer().repair_object(obj)
+                blender_time = time.perf_counter() - start
+            finally:
+                bpy.data.objects.remove(obj)
+                bpy.data.meshes.remove(mesh)
+
+        rows.append({
+            "faces": len(faces),
+            "repaired_faces": len(repaired),
+            "numpy_time": numpy_time,
+            "blender_time": blender_time,
+            "issues_remaining": result.issues_remaining,
+        })
+    return rows
+
+
+def format_repair_benchmark(rows: Sequence[Dict[str, float]]) -> str:
+    """Format benchmark rows as a text table."""
+    lines = [f"{'Faces':>10} {'Repaired':>10} {'NumPy s':>9} {'Blender s':>10} {'Speedup':>8} {'Issues':>7}"]
+    for row in rows:
+        blender = row["blender_time"]
+        blender_time = f"{blender:>10.3f}" if blender else f"{'-':>10}"
+        speedup = f"{blender / row['numpy_time']:>7.1f}x" if blender else f"{'-':>8}"
+        lines.append(
+            f"{row['faces']:>10} {row['repaired_faces']:>10} {row['numpy_time']:>9.3f} "
+            f"{blender_time} {speedup} {row['issues_remaining']:>7}"
+        )
+    return "\n".join(lines)
+
+
+def _damaged_sphere(rings: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Unwelded UV sphere soup with flipped, repeated and missing faces."""
+    rng = np.random.default_rng(seed)
+    segments = 2 * rings
+    theta = np.linspace(0, math.pi, rings + 1)
+    phi = np.linspace(0, 2 * math.pi, segments + 1)
+    t, p = np.meshgrid(theta, phi, indexing="ij")
+    grid = np.stack([np.sin(t) * np.cos(p), np.sin(t) * np.sin(p), np.cos(t)], axis=-1) * 50.0
+
+    # Two triangles per grid quad; the ones at the poles collapse and are dropped by the repair
+    i, j = np.meshgrid(np.arange(rings), np.arange(segments), indexing="ij")
+    a, b = grid[i, j], grid[i + 1, j]
+    c, d = grid[i + 1, j + 1], grid[i, j + 1]
+    tris = np.concatenate([np.stack([a, b, c], axis=-2), np.stack([a, c, d], axis=-2)]).reshape(-1, 3, 3)
+
+    count = len(tris)
+    flipped = rng.random(count) < 0.1
+    tris[flipped] = tris[flipped][:, ::-1]
+    tris = np.concatenate([tris, tris[rng.random(count) < 0.01]])
+    tris = tris[rng.random(len(tris)) > 0.001]
+
+    return tris.reshape(-1, 3), np.arange(len(tris) * 3, dtype=np.int64).reshape(-1, 3)
+
+
 def format_analysis(analysis: MeshAnalysis) -> str:
     """Format mesh analysis as human-readable string."""
     lines = [
@@ -0,0 +1,428 @@
+"""
+Print orientation search.
+
+Only the direction that ends up pointing up matters for supports: a
+rotation about Z afterwards changes nothing. Candidate up-directions are
+sampled on a Fibonacci sphere, then refined in shrinking caps around the
+best ones. For a block of K candidates the face normals, face centroids
+and vertices are each projected onto all K directions in one matmul,
+which gives every face's facing and height in every orientation at once;
+the metrics below are then area-weighted sums over those arrays.
+
+Metrics per orientation:
+    overhang_area   Area of faces steeper than the support threshold, off the bed
+    contact_area    Area of down-facing faces lying on the bed
+    height          Z extent, a proxy for layer count and print time
+    support_volume  Overhang area projected down times its height above the bed
+"""
+
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.mesh_io import MeshData
+from src.utils import get_logger
+
+logger = get_logger("blender.orientation")
+
+FIBONACCI_SAMPLES = 2000  # Up-directions in the initial sphere search
+REFINE_COUNT = 6  # Best distinct directions refined locally
+REFINE_SAMPLES = 48  # Directions sampled in each refinement cap
+REFINE_ROUNDS = 3  # Refinement passes, halving the cap each time
+MIN_SEPARATION_DEG = 15.0  # Suggestions closer than this are treated as the same
+BED_TOLERANCE = 0.1  # mm above the bed still counted as touching it
+BED_CONTACT_ANGLE = 5.0  # Degrees from straight down still counted as lying flat
+BLOCK_ELEMENTS = 1 << 16  # Face x orientation products per block; small blocks stay in cache
+CHUNKS_PER_WORKER = 4  # Direction batches handed to each worker process
+
+# Score weights; each metric is first made dimensionless by the mesh size
+SUPPORT_VOLUME_WEIGHT = 1.0
+OVERHANG_AREA_WEIGHT = 0.5
+HEIGHT_WEIGHT = 0.25
+CONTACT_AREA_WEIGHT = 0.25
+
+GOLDEN_ANGLE = math.pi * (3.0 - math.sqrt(5.0))
+
+
+@dataclass
+class OrientationScore:
+    """Measured metrics of one print orientation."""
+    direction: Tuple[float, float, float]  # Model axis that points up after rotation
+    rotation_x: float  # degrees, applied first
+    rotation_y: float  # degrees
+    score: float  # Lower is better
+    overhang_area: float  # mm²
+    contact_area: float  # mm²
+    height: float  # mm
+    support_volume: float  # mm³
+
+
+def fibonacci_sphere(count: int) -> np.ndarray:
+    """
+    Near-uniform unit vectors on the sphere.
+
+    Args:
+        count: Number of points
+
+    Returns:
+        (count, 3) unit vectors
+    """
+    i = np.arange(count, dtype=np.float64) + 0.5
+    z = 1.0 - 2.0 * i / count
+    r = np.sqrt(np.maximum(0.0, 1.0 - z * z))
+    phi = i * GOLDEN_ANGLE
+    return np.stack([r * np.cos(phi), r * np.sin(phi), z], axis=1)
+
+
+def spherical_cap(center: np.ndarray, radius: float, count: int) -> np.ndarray:
+    """
+    Unit vectors spread over a cap around a direction.
+
+    Args:
+        center: Unit vector at the middle of the cap
+        radius: Angular radius of the cap in radians
+        count: Number of points
+
+    Returns:
+        (count, 3) unit vectors
+    """
+    center = np.asarray(center, dtype=np.float64)
+    # Any vector not parallel to center gives the tangent basis
+    helper = np.array([1.0, 0.0, 0.0]) if abs(center[0]) < 0.9 else np.array([0.0, 1.0, 0.0])
+    u = np.cross(center, helper)
+    u /= np.linalg.norm(u)
+    v = np.cross(center, u)
+
+    i = np.arange(count, dtype=np.float64) + 0.5
+    angle = radius * np.sqrt(i / count)
+    phi = i * GOLDEN_ANGLE
+    tangent = np.outer(np.cos(phi), u) + np.outer(np.sin(phi), v)
+    return np.outer(np.cos(angle), center) + tangent * np.sin(angle)[:, None]
+
+
+def rotation_for_direction(direction: Sequence[float]) -> Tuple[float, float]:
+    """
+    Euler angles that turn a model direction to point up.
+
+    Rotating by rotation_x about X and then rotation_y about Y (Blender's
+    XYZ order with no Z rotation) maps the direction onto +Z.
+
+    Args:
+        direction: Unit vector in model coordinates
+
+    Returns:
+        (rotation_x, rotation_y) in degrees
+    """
+    x, y, z = (float(c) + 0.0 for c in direction)  # + 0.0 turns -0.0 into 0.0
+    rotation_x = math.atan2(y, z)
+    rotation_y = math.atan2(-x, math.hypot(y, z))
+    return math.degrees(rotation_x), math.degrees(rotation_y)
+
+
+class OrientationOptimizer:
+    """
+    Searches print orientations by batched support-area scoring.
+
+    Usage:
+        optimizer = OrientationOptimizer()
+        best = optimizer.optimize(load_mesh("part.stl"), top_k=3)
+        print(best[0].rotation_x, best[0].rotation_y, best[0].support_volume)
+    """
+
+    def __init__(
+        self,
+        support_angle_threshold: float = 45.0,
+        samples: int = FIBONACCI_SAMPLES,
+        refine_count: int = REFINE_COUNT,
+        refine_samples: int = REFINE_SAMPLES,
+        refine_rounds: int = REFINE_ROUNDS,
+        workers: int = 1,
+    ):
+        """
+        Initialize the optimizer.
+
+        Args:
+            support_angle_threshold: Overhang angle from vertical needing support (degrees)
+            samples: Directions in the initial Fibonacci sphere search
+            refine_count: Best distinct directions refined locally
+            refine_samples: Directions sampled per refinement cap
+            refine_rounds: Refinement passes
+            workers: Processes to score with (1 = in-process)
+        """
+        self.support_angle_threshold = support_angle_threshold
+        self.samples = samples
+        self.refine_count = refine_count
+        self.refine_samples = refine_samples
+        self.refine_rounds = refine_rounds
+        self.workers = workers
+
+    def optimize(self, mesh: MeshData, top_k: int = 3) -> List[OrientationScore]:
+        """
+        Find the best distinct print orientations of a mesh.
+
+        Args:
+            mesh: Mesh to orient
+            top_k: Number of orientations to return
+
+        Returns:
+            Up to top_k orientations, best first, at least MIN_SEPARATION_DEG apart
+        """
+        if mesh.is_empty:
+            return []
+
+        geometry = _prepare(mesh)
+        pool = self._open_pool(geometry)
+        try:
+            directions = np.vstack([np.eye(3), -np.eye(3), fibonacci_sphere(self.samples)])
+            metrics = self._evaluate(geometry, directions, pool)
+            scores = self._score(metrics, geometry)
+
+            # Shrink caps around the current leaders, starting at the lattice spacing
+            radius = math.sqrt(4.0 * math.pi / max(self.samples, 1))
+            for _ in range(self.refine_rounds):
+                leaders = _distinct(directions, scores, self.refine_count, MIN_SEPARATION_DEG)
+                caps = np.vstack([spherical_cap(directions[i], radius, self.refine_samples) for i in leaders])
+                cap_metrics = self._evaluate(geometry, caps, pool)
+                directions = np.vstack([directions, caps])
+                metrics = np.vstack([metrics, cap_metrics])
+                scores = np.concatenate([scores, self._score(cap_metrics, geometry)])
+                radius /= 2.0
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        logger.debug(f"Scored {len(directions)} orientations of {mesh.face_count} faces")
+        best = _distinct(directions, scores, top_k, MIN_SEPARATION_DEG)
+        return [self._result(directions[i], metrics[i], scores[i]) for i in best]
+
+    def evaluate(self, mesh: MeshData, directions: np.ndarray) -> List[OrientationScore]:
+        """
+        Measure given up-directions of a mesh.
+
+        Args:
+            mesh: Mesh to orient
+            directions: (K, 3) model directions to point up; normalized here
+
+        Returns:
+            One OrientationScore per direction, in the order given
+        """
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+        directions = directions / np.linalg.norm(directions, axis=1, keepdims=True)
+        geometry = _prepare(mesh)
+        pool = self._open_pool(geometry)
+        try:
+            metrics = self._evaluate(geometry, directions, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        scores = self._score(metrics, geometry)
+        return [self._result(d, m, s) for d, m, s in zip(directions, metrics, scores)]
+
+    def _open_pool(self, geometry: Dict[str, np.ndarray]) -> Optional[ProcessPoolExecutor]:
+        """Worker processes holding the mesh arrays, or None to score in-process."""
+        if self.workers <= 1:
+            return None
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(geometry, self.support_angle_threshold),
+        )
+
+    def _evaluate(
+        self,
+        geometry: Dict[str, np.ndarray],
+        directions: np.ndarray,
+        pool: Optional[ProcessPoolExecutor] = None,
+    ) -> np.ndarray:
+        """Metrics for each direction, split across the pool if there is one."""
+        if pool is None or len(directions) < self.workers * CHUNKS_PER_WORKER:
+            return _measure(geometry, directions, self.support_angle_threshold)
+
+        chunks = np.array_split(directions, self.workers * CHUNKS_PER_WORKER)
+        return np.vstack(list(pool.map(_measure_in_worker, chunks)))
+
+    def _score(self, metrics: np.ndarray, geometry: Dict[str, np.ndarray]) -> np.ndarray:
+        """Combine metric columns into one score per orientation; lower is better."""
+        area = max(float(geometry["total_area"]), 1e-12)
+        size = max(float(geometry["diameter"]), 1e-12)
+        overhang, contact, height, support = metrics.T
+        return (
+            SUPPORT_VOLUME_WEIGHT * support / (area * size)
+            + OVERHANG_AREA_WEIGHT * overhang / area
+            + HEIGHT_WEIGHT * height / size
+            - CONTACT_AREA_WEIGHT * contact / area
+        )
+
+    def _result(self, direction: np.ndarray, metrics: np.ndarray, score: float) -> OrientationScore:
+        """Package one orientation's measurements."""
+        rotation_x, rotation_y = rotation_for_direction(direction)
+        return OrientationScore(
+            direction=tuple(float(c) + 0.0 for c in direction),
+            rotation_x=round(rotation_x, 2) + 0.0,
+            rotation_y=round(rotation_y, 2) + 0.0,
+            score=float(score),
+            overhang_area=float(metrics[0]),
+            contact_area=float(metrics[1]),
+            height=float(metrics[2]),
+            support_volume=float(metrics[3]),
+        )
+
+
+def _prepare(mesh: MeshData) -> Dict[str, np.ndarray]:
+    """
+    Arrays the scoring needs.
+
+    Normals, centroids and vertices are stored transposed as (3, N)
+    float32, so each block is one (K, 3) @ (3, N) product whose rows are
+    contiguous for the per-orientation reductions.
+    """
+    triangles = mesh.triangles.astype(np.float64)
+    cross = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    doubled = np.linalg.norm(cross, axis=1)
+    keep = doubled > 0
+    vertices = mesh.vertices.astype(np.float64)
+    extent = vertices.max(axis=0) - vertices.min(axis=0)
+    return {
+        "normals": np.ascontiguousarray((cross[keep] / doubled[keep, None]).T, dtype=np.float32),
+        "areas": (0.5 * doubled[keep]).astype(np.float32),
+        "centroids": np.ascontiguousarray(triangles[keep].mean(axis=1).T, dtype=np.float32),
+        "vertices": np.ascontiguousarray(vertices.T, dtype=np.float32),
+        "total_area": np.float64(0.5 * doubled.sum()),
+        "diameter": np.float64(np.linalg.norm(extent)),
+    }
+
+
+def _measure(geometry: Dict[str, np.ndarray], directions: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Overhang area, contact area, height and support volume per direction.
+
+    Returns:
+        (K, 4) metrics in that column order
+    """
+    normals = geometry["normals"]
+    areas = geometry["areas"]
+    centroids = geometry["centroids"]
+    vertices = geometry["vertices"]
+
+    overhang_limit = math.sin(math.radians(threshold))
+    flat_limit = math.cos(math.radians(BED_CONTACT_ANGLE))
+    block = max(1, BLOCK_ELEMENTS // max(normals.shape[1], vertices.shape[1], 1))
+    directions = directions.astype(np.float32)
+    metrics = np.empty((len(directions), 4))
+
+    for start in range(0, len(directions), block):
+        up = directions[start:start + block]
+        heights = up @ vertices
+        floor = heights.min(axis=1)
+        lift = up @ centroids  # Face height above the bed
+        lift -= floor[:, None]
+        down = up @ normals  # -1 for a face looking straight down
+        np.negative(down, out=down)
+
+        contact = (down >= flat_limit) & (lift <= BED_TOLERANCE)
+        overhang = (down > overhang_limit) & ~contact
+        down *= lift
+        down *= overhang  # Now the projected height of each overhanging face
+
+        rows = slice(start, start + len(up))
+        metrics[rows, 0] = overhang @ areas
+        metrics[rows, 1] = contact @ areas
+        metrics[rows, 2] = heights.max(axis=1) - floor
+        metrics[rows, 3] = down @ areas
+    return metrics
+
+
+_worker_geometry: Optional[Dict[str, np.ndarray]] = None
+_worker_threshold = 45.0
+
+
+def _init_worker(geometry: Dict[str, np.ndarray], threshold: float) -> None:
+    """Receive the mesh arrays once per worker process."""
+    global _worker_geometry, _worker_threshold
+    _worker_geometry = geometry
+    _worker_threshold = threshold
+
+
+def _measure_in_worker(directions: np.ndarray) -> np.ndarray:
+    """Score a batch of directions against the worker's mesh."""
+    return _measure(_worker_geometry, directions, _worker_threshold)
+
+
+def _distinct(directions: np.ndarray, scores: np.ndarray, count: int, separation_deg: float) -> List[int]:
+    """Indices of the best-scoring directions, skipping near-duplicates."""
+    limit = math.cos(math.radians(separation_deg))
+    chosen: List[int] = []
+    for i in np.argsort(scores, kind="stable"):
+        if len(chosen) == count:
+            break
+        if chosen and np.max(directions[chosen] @ directions[i]) > limit:
+            continue
+        chosen.append(int(i))
+    return chosen
+
+
+def benchmark_orientation(
+    sizes: Sequence[int] = (16, 64, 256),
+    samples: int = FIBONACCI_SAMPLES,
+) -> List[Dict[str, float]]:
+    """
+    Time the orientation search on tori of growing resolution.
+
+    Args:
+        sizes: Ring counts of the generated tori (faces = 4 x rings²)
+        samples: Directions in the sphere search
+
+    Returns:
+        One row per size with face count, orientations scored, time and rate
+    """
+    rows = []
+    for rings in sizes:
+        mesh = _torus(rings)
+        optimizer = OrientationOptimizer(samples=samples)
+        count = 6 + samples + optimizer.refine_rounds * optimizer.refine_count * optimizer.refine_samples
+
+        start = time.perf_counter()
+        optimizer.optimize(mesh)
+        elapsed = time.perf_counter() - start
+        rows.append({
+            "faces": mesh.face_count,
+            "orientations": count,
+            "time": elapsed,
+            "per_second": count / elapsed if elapsed > 0 else float("inf"),
+        })
+    return rows
+
+
+def format_orientation_benchmark(rows: Sequence[Dict[str, float]]) -> str:
+    """Format benchmark rows as a text table."""
+    lines = [f"{'Faces':>10} {'Orientations':>13} {'Seconds':>9} {'Per second':>11}"]
+    for row in rows:
+        lines.append(
+            f"{row['faces']:>10} {row['orientations']:>13} {row['time']:>9.3f} {row['per_second']:>11.0f}"
+        )
+    return "\n".join(lines)
+
+
+def _torus(rings: int) -> MeshData:
+    """Closed torus lying flat, with 2 x rings segments around its axis."""
+    segments = 2 * rings
+    u = np.linspace(0, 2 * math.pi, segments, endpoint=False)
+    v = np.linspace(0, 2 * math.pi, rings, endpoint=False)
+    uu, vv = np.meshgrid(u, v, indexing="ij")
+    radius = 30.0 + 10.0 * np.cos(vv)
+    vertices = np.stack([radius * np.cos(uu), radius * np.sin(uu), 10.0 * np.sin(vv)], axis=-1).reshape(-1, 3)
+
+    i, j = np.meshgrid(np.arange(segments), np.arange(rings), indexing="ij")
+    a = i * rings + j
+    b = ((i + 1) % segments) * rings + j
+    c = ((i + 1) % segments) * rings + (j + 1) % rings
+    d = i * rings + (j + 1) % rings
+    faces = np.concatenate([
+        np.stack([a, b, c], axis=-1).reshape(-1, 3),
+        np.stack([a, c, d], axis=-1).reshape(-1, 3),
+    ])
+    return MeshData(vertices=vertices.astype(np.float32), faces=faces.astype(np.int64))
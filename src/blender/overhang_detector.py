@@ -10,6 +10,9 @@ from enum import Enum
 from pathlib import Path
 from typing import List, Optional, Tuple
 
+import numpy as np
+
+from src.mesh_io import MeshFeatures, load_mesh_features
 from src.utils import get_logger
 
 logger = get_logger("blender.overhang")
@@ -62,6 +65,24 @@ class OverhangAnalysis:
         return max(self.overhangs, key=lambda o: o.angle).severity
 
 
+def resolve_normals(features: MeshFeatures) -> np.ndarray:
+    """
+    Face normals of a mesh, preferring normals stored in the file where they are set.
+
+    Args:
+        features: Loaded mesh features
+
+    Returns:
+        (F, 3) face normals
+    """
+    normals = np.array(features.face_normals)
+    mesh = features.mesh
+    if mesh.normals is not None and len(mesh.normals) == len(normals):
+        stored = np.linalg.norm(mesh.normals, axis=1) > 1e-6
+        normals[stored] = mesh.normals[stored]
+    return normals
+
+
 class OverhangDetector:
     """
     Detects overhanging geometry in 3D models.
@@ -146,44 +167,23 @@ class OverhangDetector:
         - area: float
         - centroid: (cx, cy, cz)
         """
-        content = path.read_text(errors="ignore")
         faces = []
-
-        # Simple ASCII STL parser
-        lines = content.strip().split("\n")
-        current_face = None
-        vertices = []
-
-        for line in lines:
-            line = line.strip().lower()
-
-            if line.startswith("facet normal"):
-                parts = line.split()
-                if len(parts) >= 5:
-                    try:
-                        nx, ny, nz = float(parts[2]), float(parts[3]), float(parts[4])
-                        current_face = {"normal": (nx, ny, nz)}
-                    except (ValueError, IndexError):
-                        current_face = {"normal": (0, 0, 1)}  # Default up
-                else:
-                    current_face = {"normal": (0, 0, 1)}
-                vertices = []
-
-            elif line.startswith("vertex"):
-                parts = line.split()
-                if len(parts) >= 4:
-                    try:
-                        x, y, z = float(parts[1]), float(parts[2]), float(parts[3])
-                        vertices.append((x, y, z))
-                    except (ValueError, IndexError):
-                        pass
-
-            elif line.startswith("endfacet") and current_face and len(vertices) == 3:
-                current_face["vertices"] = vertices
-                current_face["area"] = self._triangle_area(vertices)
-                current_face["centroid"] = self._triangle_centroid(vertices)
-                faces.append(current_face)
-                current_face = None
+        features = load_mesh_features(path)
+        mesh = features.mesh
+
+        if not mesh.is_empty:
+            normals = resolve_normals(features)
+            triangles = mesh.triangles.tolist()
+            areas = features.face_areas.tolist()
+            centroids = features.face_centroids.tolist()
+
+            for normal, vertices, area, centroid in zip(normals.tolist(), triangles, areas, centroids):
+                faces.append({
+                    "normal": tuple(normal),
+                    "vertices": [tuple(v) for v in vertices],
+                    "area": area,
+                    "centroid": tuple(centroid),
+                })
 
         # If no faces parsed, create mock data for testing
         if not faces:
@@ -246,34 +246,6 @@ class OverhangDetector:
 
         return faces
 
-    def _triangle_area(self, vertices: List[Tuple[float, float, float]]) -> float:
-        """Calculate area of a triangle."""
-        if len(vertices) != 3:
-            return 0.0
-
-        v0, v1, v2 = vertices
-
-        # Cross product method
-        ax, ay, az = v1[0] - v0[0], v1[1] - v0[1], v1[2] - v0[2]
-        bx, by, bz = v2[0] - v0[0], v2[1] - v0[1], v2[2] - v0[2]
-
-        cx = ay * bz - az * by
-        cy = az * bx - ax * bz
-        cz = ax * by - ay * bx
-
-        return 0.5 * math.sqrt(cx*cx + cy*cy + cz*cz)
-
-    def _triangle_centroid(self, vertices: List[Tuple[float, float, float]]) -> Tuple[float, float, float]:
-        """Calculate centroid of a triangle."""
-        if len(vertices) != 3:
-            return (0, 0, 0)
-
-        cx = sum(v[0] for v in vertices) / 3
-        cy = sum(v[1] for v in vertices) / 3
-        cz = sum(v[2] for v in vertices) / 3
-
-        return (cx, cy, cz)
-
     def _detect_overhangs(self, faces: List[dict]) -> List[OverhangInfo]:
         """
         Detect overhang regions from face data.
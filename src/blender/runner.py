@@ -55,32 +55,18 @@ def get_blender_command(
     return " ".join(cmd_parts)
 
 
-def run_in_blender():
-    """Main function when running inside Blender."""
-    if not INSIDE_BLENDER:
-        print("Error: This function must be run inside Blender")
-        sys.exit(1)
+ACTIONS = [
+    "create_cube", "create_cylinder", "create_sphere",
+    "create_cone", "create_torus", "create_test_scene",
+    "analyze", "export",
+]
 
-    # Import Blender-specific modules
-    from src.blender.primitives import (
-        clear_scene, create_cube, create_cylinder, create_sphere,
-        create_cone, create_torus, create_test_scene
-    )
-    from src.blender.exporter import export_for_printing, get_export_stats
-    from src.blender.mesh_utils import analyze_mesh, make_manifold, center_object
-
-    # Parse arguments after "--"
-    argv = sys.argv
-    if "--" in argv:
-        argv = argv[argv.index("--") + 1:]
-    else:
-        argv = []
 
+def build_parser() -> argparse.ArgumentParser:
+    """Argument parser for runner actions, shared with the worker pool."""
     parser = argparse.ArgumentParser(description="Blender headless model creator")
     parser.add_argument("--action", required=True,
-                        choices=["create_cube", "create_cylinder", "create_sphere",
-                                 "create_cone", "create_torus", "create_test_scene",
-                                 "analyze", "export"],
+                        choices=ACTIONS,
                         help="Action to perform")
     parser.add_argument("--output", "-o", type=str, default="output/model.stl",
                         help="Output file path")
@@ -97,8 +83,26 @@ def run_in_blender():
                         help="Input .blend file")
     parser.add_argument("--json-output", action="store_true",
                         help="Output results as JSON")
+    return parser
 
-    args = parser.parse_args(argv)
+
+def perform_action(args: argparse.Namespace) -> dict:
+    """
+    Perform one runner action inside Blender.
+
+    Args:
+        args: Parsed runner arguments
+
+    Returns:
+        Result dictionary with "success" and action-specific keys
+    """
+    # Import Blender-specific modules
+    from src.blender.primitives import (
+        clear_scene, create_cube, create_cylinder, create_sphere,
+        create_cone, create_torus, create_test_scene
+    )
+    from src.blender.exporter import export_for_printing, get_export_stats
+    from src.blender.mesh_utils import analyze_mesh, make_manifold, center_object
 
     result = {"success": False, "action": args.action}
 
@@ -182,6 +186,25 @@ def run_in_blender():
         result["success"] = False
         result["error"] = str(e)
 
+    return result
+
+
+def run_in_blender():
+    """Main function when running inside Blender."""
+    if not INSIDE_BLENDER:
+        print("Error: This function must be run inside Blender")
+        sys.exit(1)
+
+    # Parse arguments after "--"
+    argv = sys.argv
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    else:
+        argv = []
+
+    args = build_parser().parse_args(argv)
+    result = perform_action(args)
+
     # Output results
     if args.json_output:
         print("JSON_RESULT:" + json.dumps(result))
@@ -2,6 +2,11 @@
 
 Generates optimized support structures for overhanging geometry,
 including tree supports for better material efficiency.
+
+Support points are sampled on a regular XY grid over every face that
+needs support, then dropped straight down against the mesh through a
+uniform triangle grid to find where each column lands, on the model or
+on the bed. Volumes follow from the real column heights.
 """
 
 import math
@@ -11,11 +16,17 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 
+import numpy as np
+
+from src.mesh_io import MeshFeatures, TriangleGrid, connected_components, face_adjacency, load_mesh_features
 from src.utils import get_logger
-from src.blender.overhang_detector import OverhangDetector, OverhangAnalysis, OverhangInfo
+from src.blender.overhang_detector import OverhangDetector, OverhangAnalysis, OverhangInfo, resolve_normals
 
 logger = get_logger("blender.support")
 
+SAMPLE_TOLERANCE = 1e-9  # Barycentric slack so grid points on shared edges are kept
+DEDUPE_PRECISION = 1e-3  # Points on the same grid node closer than this in Z are one point (mm)
+
 
 class SupportType(str, Enum):
     """Types of support structures."""
@@ -58,6 +69,7 @@ class SupportSettings:
     z_distance: float = 0.2       # Distance from model (mm)
     xy_distance: float = 0.7      # Horizontal distance from model (mm)
     tower_diameter: float = 3.0   # Diameter of support pillars (mm)
+    support_spacing: float = 5.0  # Grid spacing of support points (mm)
 
     # Tree support specific
     tree_branch_angle: float = 45.0   # Max branch angle
@@ -106,6 +118,9 @@ class SupportStructure:
     height: float
     volume: float  # mm³
 
+    # Whether the column stands on the model rather than the bed
+    rests_on_model: bool = False
+
     # Tree-specific
     branches: List[Dict] = field(default_factory=list)
     trunk_positions: List[Tuple[float, float, float]] = field(default_factory=list)
@@ -122,6 +137,7 @@ class SupportStructure:
             "base": self.base_position,
             "height": self.height,
             "volume": self.volume,
+            "on_model": self.rests_on_model,
             "material_grams": self.estimated_material_grams,
             "savings_percent": self.material_savings_percent,
         }
@@ -150,6 +166,90 @@ class SupportResult:
         return len(self.structures)
 
 
+@dataclass
+class SupportColumns:
+    """Vertical support columns under sampled overhang points."""
+
+    tops: np.ndarray  # (N, 3) column tops, z_distance below the model
+    landing: np.ndarray  # (N,) Z where each column stands
+    on_model: np.ndarray  # (N,) True where a column lands on the model rather than the bed
+    angles: np.ndarray  # (N,) overhang angle of the supported face (degrees)
+    areas: np.ndarray  # (N,) overhang area each column carries (mm²)
+
+    @property
+    def heights(self) -> np.ndarray:
+        """Column heights in mm."""
+        return self.tops[:, 2] - self.landing
+
+    def __len__(self) -> int:
+        return len(self.landing)
+
+
+def sample_grid_points(
+    triangles: np.ndarray,
+    spacing: float,
+    origin: Tuple[float, float] = (0.0, 0.0),
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sample triangles at the nodes of a regular XY grid.
+
+    Grid nodes sit at cell centres, ``origin + (i + 0.5) * spacing``. Each
+    node inside a triangle's XY projection gives one point on the triangle's
+    plane. Nodes on an edge shared by two faces are returned once.
+
+    Args:
+        triangles: (F, 3, 3) triangle corners
+        spacing: Grid spacing (mm)
+        origin: XY corner of the grid
+
+    Returns:
+        ((N, 3) points, (N,) index of the triangle each point lies on)
+    """
+    triangles = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+    if len(triangles) == 0:
+        return np.zeros((0, 3)), np.zeros(0, dtype=np.int64)
+
+    xy = (triangles[:, :, :2] - np.asarray(origin, dtype=np.float64)) / spacing - 0.5
+    lo = np.ceil(xy.min(axis=1)).astype(np.int64)
+    hi = np.floor(xy.max(axis=1)).astype(np.int64)
+    span = np.maximum(hi - lo + 1, 0)
+    per_tri = span[:, 0] * span[:, 1]
+
+    # Expand every triangle to the grid nodes of its bounding box
+    tri_ids = np.repeat(np.arange(len(triangles)), per_tri)
+    starts = np.cumsum(per_tri) - per_tri
+    local = np.arange(per_tri.sum()) - np.repeat(starts, per_tri)
+    nodes = lo[tri_ids] + np.stack([local // span[tri_ids, 1], local % span[tri_ids, 1]], axis=1)
+
+    # Barycentric coordinates in the XY projection
+    a = xy[tri_ids, 0]
+    e1 = xy[tri_ids, 1] - a
+    e2 = xy[tri_ids, 2] - a
+    d = nodes - a
+    det = e1[:, 0] * e2[:, 1] - e1[:, 1] * e2[:, 0]
+    valid = np.abs(det) > SAMPLE_TOLERANCE
+    det = np.where(valid, det, 1.0)
+    u = (d[:, 0] * e2[:, 1] - d[:, 1] * e2[:, 0]) / det
+    v = (e1[:, 0] * d[:, 1] - e1[:, 1] * d[:, 0]) / det
+    inside = valid & (u >= -SAMPLE_TOLERANCE) & (v >= -SAMPLE_TOLERANCE) & (u + v <= 1 + SAMPLE_TOLERANCE)
+
+    tri_ids, nodes, u, v = tri_ids[inside], nodes[inside], u[inside], v[inside]
+    corners = triangles[tri_ids]
+    z = corners[:, 0, 2] + u * (corners[:, 1, 2] - corners[:, 0, 2]) + v * (corners[:, 2, 2] - corners[:, 0, 2])
+
+    # A node on a shared edge is inside both faces at the same height
+    keys = np.column_stack([nodes, np.round(z / DEDUPE_PRECISION).astype(np.int64)])
+    _, first = np.unique(keys, axis=0, return_index=True)
+    first = np.sort(first)
+
+    points = np.column_stack([
+        origin[0] + (nodes[first, 0] + 0.5) * spacing,
+        origin[1] + (nodes[first, 1] + 0.5) * spacing,
+        z[first],
+    ])
+    return points, tri_ids[first]
+
+
 class SupportGenerator:
     """
     Generates optimized support structures.
@@ -188,23 +288,24 @@ class SupportGenerator:
         if not path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        # Analyze overhangs
-        analysis = self.overhang_detector.analyze(file_path)
-
-        # Generate support structures
-        if self.settings.support_type == SupportType.TREE:
-            structures = self._generate_tree_supports(analysis)
+        columns = self.plan_columns(file_path)
+        if columns is not None:
+            structures = self._column_structures(columns)
+            normal_volume, tree_volume = self._column_volumes(columns)
         else:
-            structures = self._generate_normal_supports(analysis)
+            # No readable geometry: fall back to the per-region estimates
+            analysis = self.overhang_detector.analyze(file_path)
+            if self.settings.support_type == SupportType.TREE:
+                structures = self._generate_tree_supports(analysis)
+            else:
+                structures = self._generate_normal_supports(analysis)
+            normal_volume = self._estimate_normal_support_volume(analysis)
+            tree_volume = self._estimate_tree_support_volume(analysis)
 
         # Calculate totals
         total_volume = sum(s.volume for s in structures)
         total_grams = self._volume_to_grams(total_volume)
 
-        # Calculate comparison (normal vs tree)
-        normal_volume = self._estimate_normal_support_volume(analysis)
-        tree_volume = total_volume if self.settings.support_type == SupportType.TREE else self._estimate_tree_support_volume(analysis)
-
         savings = 0.0
         if normal_volume > 0:
             savings = (1 - total_volume / normal_volume) * 100
@@ -223,6 +324,115 @@ class SupportGenerator:
         logger.info(f"Generated {len(structures)} support structures, {total_grams:.1f}g material")
         return result
 
+    def plan_columns(self, file_path: str) -> Optional[SupportColumns]:
+        """
+        Place support columns under the overhangs of a model.
+
+        Args:
+            file_path: Path to the mesh file
+
+        Returns:
+            SupportColumns, or None if the file has no faces
+        """
+        features = load_mesh_features(file_path)
+        if features.mesh.is_empty:
+            return None
+        return self._plan_columns(features)
+
+    def _plan_columns(self, features: MeshFeatures) -> SupportColumns:
+        """Sample support points on overhanging faces and drop them onto the model or bed."""
+        mesh = features.mesh
+        bed = float(features.bounds[0][2])
+        spacing = self.settings.support_spacing
+
+        normals = resolve_normals(features)
+        length = np.linalg.norm(normals, axis=1)
+        nz = normals[:, 2] / np.where(length > 0, length, 1.0)
+        face_angles = 90.0 - np.degrees(np.arccos(np.clip(-nz, 0.0, 1.0)))
+        faces = np.flatnonzero((face_angles >= self.settings.overhang_angle) & (features.face_areas > 0))
+
+        points, owner = sample_grid_points(mesh.triangles[faces], spacing, origin=features.bounds[0][:2])
+        areas = np.full(len(points), spacing * spacing)
+
+        # Regions too small to catch a grid node still get one point on their largest face,
+        # carrying the region's footprint on the bed like a grid point carries spacing²
+        count, labels = connected_components(len(faces), face_adjacency(mesh.faces[faces], len(mesh.vertices)))
+        missed = np.flatnonzero(np.bincount(labels[owner], minlength=count) == 0)
+        if len(missed):
+            face_areas = features.face_areas[faces]
+            order = np.lexsort((-face_areas, labels))
+            largest = order[np.unique(labels[order], return_index=True)[1]]
+            region_areas = np.bincount(labels, weights=face_areas * -nz[faces], minlength=count)
+            points = np.concatenate([points, features.face_centroids[faces[largest[missed]]]])
+            owner = np.concatenate([owner, largest[missed]])
+            areas = np.concatenate([areas, region_areas[missed]])
+
+        tops = points - np.array([0.0, 0.0, self.settings.z_distance])
+        distance, _ = TriangleGrid(mesh.triangles).intersect(
+            tops,
+            np.tile([0.0, 0.0, -1.0], (len(tops), 1)),
+            ignore_faces=faces[owner],
+        )
+        hit = np.isfinite(distance)
+        landing = np.maximum(np.where(hit, tops[:, 2] - distance, bed), bed)
+        on_model = hit & (landing > bed + DEDUPE_PRECISION)
+
+        # Faces resting on the bed leave no room for a column
+        keep = tops[:, 2] > landing
+        columns = SupportColumns(
+            tops=tops[keep],
+            landing=landing[keep],
+            on_model=on_model[keep],
+            angles=face_angles[faces[owner[keep]]],
+            areas=areas[keep],
+        )
+        logger.debug(
+            f"Dropped {len(columns)} support columns from {len(faces)} overhanging faces, "
+            f"{int(columns.on_model.sum())} landing on the model"
+        )
+        return columns
+
+    def _column_volumes(self, columns: SupportColumns) -> Tuple[float, float]:
+        """Total volume of the columns as normal and as tree supports."""
+        return float(self._normal_volumes(columns).sum()), float(self._tree_volumes(columns).sum())
+
+    def _normal_volumes(self, columns: SupportColumns) -> np.ndarray:
+        """Infill volume of each column filling the overhang area it carries."""
+        return columns.areas * columns.heights * self.settings.density_percent
+
+    def _tree_volumes(self, columns: SupportColumns) -> np.ndarray:
+        """Volume of each column as a solid tree branch."""
+        return math.pi * (self.settings.tree_branch_diameter / 2) ** 2 * columns.heights
+
+    def _column_structures(self, columns: SupportColumns) -> List[SupportStructure]:
+        """Build one support structure per column."""
+        tree = self.settings.support_type == SupportType.TREE
+        normal_volumes = self._normal_volumes(columns)
+        volumes = self._tree_volumes(columns) if tree else normal_volumes
+        savings = np.where(normal_volumes > 0, (1 - volumes / np.where(normal_volumes > 0, normal_volumes, 1)) * 100, 0)
+
+        gap = self.settings.z_distance
+        structures = []
+        rows = zip(
+            columns.tops.tolist(), columns.landing.tolist(), columns.heights.tolist(),
+            columns.on_model.tolist(), columns.angles.tolist(), columns.areas.tolist(),
+            volumes.tolist(), savings.tolist(),
+        )
+        for (x, y, top), landing, height, on_model, angle, area, volume, saving in rows:
+            structures.append(SupportStructure(
+                structure_id=str(uuid4())[:8],
+                support_type=SupportType.TREE if tree else SupportType.NORMAL,
+                points=[SupportPoint(position=(x, y, top + gap), overhang_angle=angle, area=area)],
+                base_position=(x, y, landing),
+                height=height,
+                volume=volume,
+                rests_on_model=on_model,
+                trunk_positions=[(x, y, landing), (x, y, top)] if tree else [],
+                estimated_material_grams=self._volume_to_grams(volume),
+                material_savings_percent=max(0.0, saving) if tree else 0.0,
+            ))
+        return structures
+
     def _generate_tree_supports(self, analysis: OverhangAnalysis) -> List[SupportStructure]:
         """Generate tree-style supports."""
         structures = []
@@ -390,8 +600,12 @@ class SupportGenerator:
         """
         analysis = self.overhang_detector.analyze(file_path)
 
-        normal_vol = self._estimate_normal_support_volume(analysis)
-        tree_vol = self._estimate_tree_support_volume(analysis)
+        columns = self.plan_columns(file_path)
+        if columns is not None:
+            normal_vol, tree_vol = self._column_volumes(columns)
+        else:
+            normal_vol = self._estimate_normal_support_volume(analysis)
+            tree_vol = self._estimate_tree_support_volume(analysis)
 
         return {
             "file": file_path,
@@ -2,16 +2,30 @@
 
 Optimizes generated support structures to minimize material usage
 while maintaining print quality.
+
+Nearby supports are found through a spatial hash of their base positions
+and clustered with union-find, so merging scales to the tens of thousands
+of columns grid sampling produces. Each cluster is priced as a real tree,
+one trunk under the cluster's centre forking into a branch per tip, and is
+only merged when that tree uses less material than the separate supports.
+Supports only merge with others landing on the same surface, so a trunk
+never rises from the bed through a ledge of the model or the reverse.
 """
 
 import math
+import random
+import time
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
+from src.mesh_io import close_pairs, connected_components
 from src.utils import get_logger
 from src.blender.support_generator import (
     SupportGenerator,
+    SupportPoint,
     SupportResult,
     SupportStructure,
     SupportSettings,
@@ -21,6 +35,8 @@ from src.blender.support_generator import (
 
 logger = get_logger("blender.support_optimizer")
 
+LANDING_TOLERANCE = 0.1  # mm; bases closer than this in Z land on the same surface
+
 
 class OptimizationGoal(str, Enum):
     """Optimization goals."""
@@ -124,7 +140,9 @@ class SupportOptimizer:
 
         # Apply optimization techniques based on goal
         if goal in [OptimizationGoal.MATERIAL, OptimizationGoal.BALANCED]:
-            optimized_structures, merged = self._merge_nearby_supports(optimized_structures)
+            optimized_structures, merged = self._merge_nearby_supports(
+                optimized_structures, support_result.settings
+            )
             changes["merged"] = merged
 
             if self.settings.remove_redundant:
@@ -194,70 +212,163 @@ class SupportOptimizer:
     def _merge_nearby_supports(
         self,
         structures: List[SupportStructure],
+        support_settings: Optional[SupportSettings] = None,
     ) -> Tuple[List[SupportStructure], int]:
-        """Merge supports that are close together."""
+        """
+        Merge supports whose bases are close together into trees.
+
+        Bases closer than merge_distance that land on the same surface are
+        linked and clustered with union-find. A cluster is replaced by one
+        tree when that tree needs less material than its supports do
+        separately.
+
+        Args:
+            structures: Supports to merge
+            support_settings: Settings the supports were generated with (trunk and branch sizes)
+
+        Returns:
+            (structures after merging, number of supports merged away)
+        """
         if len(structures) < 2:
             return structures, 0
 
-        merged_count = 0
+        support_settings = support_settings or SupportSettings()
+        bases = np.array([s.base_position for s in structures], dtype=np.float64)
+        heights = np.array([s.height for s in structures], dtype=np.float64)
+        volumes = np.array([s.volume for s in structures], dtype=np.float64)
+
+        on_model = np.array([s.rests_on_model for s in structures], dtype=bool)
+        labels = self._cluster_bases(bases, on_model)
+        tree = self._price_trees(bases, heights, labels, support_settings)
+        merge = ((tree["size"] > 1) & (tree["volume"] < np.bincount(labels, weights=volumes))).tolist()
+
         result = []
-        used = set()
-
-        for i, struct_a in enumerate(structures):
-            if i in used:
-                continue
-
-            # Find nearby structures to merge
-            to_merge = [struct_a]
-            for j, struct_b in enumerate(structures[i+1:], i+1):
-                if j in used:
-                    continue
-
-                distance = self._distance(struct_a.base_position, struct_b.base_position)
-                if distance < self.settings.merge_distance:
-                    to_merge.append(struct_b)
-                    used.add(j)
-                    merged_count += 1
-
-            # Create merged structure
-            if len(to_merge) > 1:
-                merged = self._create_merged_structure(to_merge)
-                result.append(merged)
-            else:
-                result.append(struct_a)
+        merged_count = 0
+        members = np.split(np.argsort(labels, kind="stable"), np.cumsum(tree["size"])[:-1])
+        emitted = [False] * len(merge)
+        for struct, label in zip(structures, labels.tolist()):
+            if not merge[label]:
+                result.append(struct)
+            elif not emitted[label]:
+                emitted[label] = True
+                indices = members[label].tolist()
+                result.append(self._create_merged_structure(structures, indices, tree, label))
+                merged_count += len(indices) - 1
 
         return result, merged_count
 
-    def _create_merged_structure(
+    def _cluster_bases(self, bases: np.ndarray, on_model: np.ndarray) -> np.ndarray:
+        """Cluster support bases per landing surface, splitting chains wider than a tree can span."""
+        distance = self.settings.merge_distance
+        pairs = close_pairs(bases, distance)
+
+        # A tree's trunk stands on one surface: never link the bed to a ledge, or two ledges
+        a, b = pairs[:, 0], pairs[:, 1]
+        same_surface = (on_model[a] == on_model[b]) & (np.abs(bases[a, 2] - bases[b, 2]) <= LANDING_TOLERANCE)
+        _, labels = connected_components(len(bases), pairs[same_surface])
+
+        # Single linkage chains across whole overhangs; cut wide clusters into cells
+        size = np.bincount(labels)
+        centre = np.stack([np.bincount(labels, weights=bases[:, axis]) / size for axis in (0, 1)], axis=1)
+        reach = np.hypot(*(bases[:, :2] - centre[labels]).T)
+        widest = np.zeros(len(size))
+        np.maximum.at(widest, labels, reach)
+        wide = widest[labels] > distance
+
+        cells = np.floor(bases[:, :2] / distance).astype(np.int64)
+        keys = np.column_stack([labels, np.where(wide[:, None], cells, 0)])
+        _, labels = np.unique(keys, axis=0, return_inverse=True)
+        return labels.reshape(-1)
+
+    def _price_trees(
         self,
-        structures: List[SupportStructure],
-    ) -> SupportStructure:
-        """Create a single structure from multiple merged structures."""
-        # Calculate centroid
-        cx = sum(s.base_position[0] for s in structures) / len(structures)
-        cy = sum(s.base_position[1] for s in structures) / len(structures)
+        bases: np.ndarray,
+        heights: np.ndarray,
+        labels: np.ndarray,
+        support_settings: SupportSettings,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Shape one tree per cluster and compute its volume.
 
-        # Max height
-        max_height = max(s.height for s in structures)
+        The trunk stands on the lowest base under the cluster's centre and
+        forks as high as it can while every branch stays within
+        max_branch_angle of vertical.
 
-        # Combine points
-        all_points = []
-        for s in structures:
-            all_points.extend(s.points)
+        Returns:
+            Per-cluster arrays: size, centre (C, 2), base, fork and volume, plus
+            per-support branch radius and length
+        """
+        size = np.bincount(labels)
+        centre = np.stack([np.bincount(labels, weights=bases[:, axis]) / size for axis in (0, 1)], axis=1)
+        tops = bases[:, 2] + heights
+
+        base = np.full(len(size), np.inf)
+        np.minimum.at(base, labels, bases[:, 2])
+
+        radius = np.hypot(*(bases[:, :2] - centre[labels]).T)
+        slope = math.tan(math.radians(self.settings.max_branch_angle))
+        fork = np.full(len(size), np.inf)
+        np.minimum.at(fork, labels, tops - radius / slope)
+        fork = np.maximum(fork, base)
+
+        branch_length = np.hypot(radius, tops - fork[labels])
+        trunk_area = math.pi * (max(support_settings.tree_trunk_diameter, self.settings.min_trunk_diameter) / 2) ** 2
+        branch_area = math.pi * (support_settings.tree_branch_diameter / 2) ** 2
+        volume = trunk_area * (fork - base) + branch_area * np.bincount(labels, weights=branch_length)
+
+        return {
+            "size": size,
+            "centre": centre,
+            "base": base,
+            "fork": fork,
+            "volume": volume,
+            "radius": radius,
+            "branch_length": branch_length,
+        }
 
-        # Total volume (reduced due to merging)
-        total_volume = sum(s.volume for s in structures) * 0.8  # 20% reduction from merging
+    def _create_merged_structure(
+        self,
+        structures: List[SupportStructure],
+        indices: List[int],
+        tree: Dict[str, np.ndarray],
+        label: int,
+    ) -> SupportStructure:
+        """Create a single tree from the supports of one cluster."""
+        cx, cy = tree["centre"][label].tolist()
+        base = float(tree["base"][label])
+        fork = float(tree["fork"][label])
+        volume = float(tree["volume"][label])
+        members = [structures[i] for i in indices]
+        original = sum(s.volume for s in members)
+
+        branches = []
+        all_points: List[SupportPoint] = []
+        lowest = members[0]
+        for index, struct in zip(indices, members):
+            tip = (struct.base_position[0], struct.base_position[1], struct.base_position[2] + struct.height)
+            radius = float(tree["radius"][index])
+            branches.append({
+                "start": (cx, cy, fork),
+                "end": tip,
+                "length": float(tree["branch_length"][index]),
+                "angle": math.degrees(math.atan2(radius, tip[2] - fork)),
+            })
+            all_points.extend(struct.points)
+            if struct.base_position[2] < lowest.base_position[2]:
+                lowest = struct
 
-        # Use tree support type for merged structures
         return SupportStructure(
-            structure_id=structures[0].structure_id,
+            structure_id=members[0].structure_id,
             support_type=SupportType.TREE,
             points=all_points,
-            base_position=(cx, cy, 0),
-            height=max_height,
-            volume=total_volume,
-            estimated_material_grams=total_volume / 1000 * 1.24,
-            material_savings_percent=20,
+            base_position=(cx, cy, base),
+            height=max(s.base_position[2] + s.height for s in members) - base,
+            volume=volume,
+            rests_on_model=lowest.rests_on_model,
+            branches=branches,
+            trunk_positions=[(cx, cy, base), (cx, cy, fork)],
+            estimated_material_grams=volume / 1000 * SupportGenerator.PLA_DENSITY,
+            material_savings_percent=(1 - volume / original) * 100 if original > 0 else 0,
         )
 
     def _remove_redundant_supports(
@@ -435,3 +546,61 @@ def compare_support_strategies(file_path: str) -> Dict:
         "potential_savings": f"{results['optimized'].reduction_percent:.0f}% vs tree, "
                            f"{((results['normal'].total_support_volume - results['optimized'].optimized.total_support_volume) / results['normal'].total_support_volume * 100) if results['normal'].total_support_volume > 0 else 0:.0f}% vs normal",
     }
+
+
+def benchmark_merge(
+    sizes: Sequence[int] = (1_000, 10_000, 100_000),
+    spacing: float = 2.0,
+    seed: int = 0,
+) -> List[Dict[str, float]]:
+    """
+    Time support merging on random tree columns of growing count.
+
+    Args:
+        sizes: Numbers of supports
+        spacing: Average distance between neighbouring supports (mm)
+        seed: Random seed for the support layout
+
+    Returns:
+        One row per size with support count, supports left, time and rate
+    """
+    settings = SupportSettings()
+    branch_area = math.pi * (settings.tree_branch_diameter / 2) ** 2
+    rows = []
+    for count in sizes:
+        rng = random.Random(seed)
+        side = math.sqrt(count) * spacing
+        structures = []
+        for i in range(count):
+            x, y = rng.uniform(0, side), rng.uniform(0, side)
+            height = rng.uniform(5.0, 40.0)
+            structures.append(SupportStructure(
+                structure_id=str(i),
+                support_type=SupportType.TREE,
+                points=[SupportPoint(position=(x, y, height), overhang_angle=60.0, area=spacing * spacing)],
+                base_position=(x, y, 0.0),
+                height=height,
+                volume=branch_area * height,
+            ))
+
+        optimizer = SupportOptimizer()
+        start = time.perf_counter()
+        merged, _ = optimizer._merge_nearby_supports(structures, settings)
+        elapsed = time.perf_counter() - start
+        rows.append({
+            "supports": count,
+            "remaining": len(merged),
+            "time": elapsed,
+            "per_second": count / elapsed if elapsed > 0 else float("inf"),
+        })
+    return rows
+
+
+def format_merge_benchmark(rows: Sequence[Dict[str, float]]) -> str:
+    """Format benchmark rows as a text table."""
+    lines = [f"{'Supports':>10} {'Remaining':>10} {'Seconds':>9} {'Per second':>11}"]
+    for row in rows:
+        lines.append(
+            f"{row['supports']:>10} {row['remaining']:>10} {row['time']:>9.3f} {row['per_second']:>11.0f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Long-lived worker for the Blender worker pool.
+
+Run inside Blender, serving runner actions until told to stop:
+    blender --background --python src/blender/worker.py -- --request-fd 3 --response-fd 4
+
+Or without Blender, as a stub that writes stand-in box meshes:
+    python src/blender/worker.py --stub --request-fd 3 --response-fd 4
+
+Requests and responses are length-prefixed JSON messages (see
+``framing.py``) on their own pipes so Blender's console output on
+stdout never mixes with the protocol.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.blender.framing import read_message, write_message
+from src.blender.runner import INSIDE_BLENDER, build_parser, perform_action
+from src.mesh_io.loader import STL_HEADER_SIZE, STL_RECORD_DTYPE
+
+
+def _parse_args(argv: list) -> argparse.Namespace:
+    """Parse runner arguments, turning usage errors into ValueError."""
+    try:
+        return build_parser().parse_args(argv)
+    except SystemExit:
+        raise ValueError(f"Invalid runner arguments: {' '.join(argv)}")
+
+
+def blender_handler(request: dict) -> dict:
+    """Run a runner action in this Blender process."""
+    return perform_action(_parse_args(request.get("args", [])))
+
+
+def stub_handler(request: dict) -> dict:
+    """
+    Answer a runner action without Blender.
+
+    Primitives are written as boxes the size of the requested shape's
+    bounds, resting on Z=0 like the centred Blender objects. A "delay"
+    in the request is slept first, to exercise timeouts and concurrency.
+    """
+    time.sleep(float(request.get("delay", 0.0)))
+    args = _parse_args(request.get("args", []))
+    result = {"success": True, "action": args.action, "stub": True}
+
+    extents = {
+        "create_cube": (args.size, args.size, args.size),
+        "create_cylinder": (2 * args.radius, 2 * args.radius, args.height),
+        "create_cone": (2 * args.radius, 2 * args.radius, args.height),
+        "create_sphere": (2 * args.radius, 2 * args.radius, 2 * args.radius),
+        "create_torus": (2.5 * args.radius, 2.5 * args.radius, 0.5 * args.radius),
+    }
+    if args.action in extents:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_box_stl(output_path, extents[args.action])
+        size = output_path.stat().st_size
+        result["output_path"] = str(output_path)
+        result["file_stats"] = {
+            "path": str(output_path),
+            "name": output_path.name,
+            "format": output_path.suffix.lower().lstrip('.'),
+            "size_bytes": size,
+            "size_mb": size / (1024 * 1024),
+        }
+    elif args.action == "analyze":
+        result["analysis"] = []
+    return result
+
+
+def _write_box_stl(path: Path, extents) -> None:
+    """Write a binary STL box centred in XY and resting on Z=0."""
+    half = np.array([extents[0] / 2, extents[1] / 2, extents[2]])
+    corners = np.array([[x, y, z] for z in (0, 1) for y in (0, 1) for x in (0, 1)], dtype=np.float64)
+    corners = (corners * [2, 2, 1] - [1, 1, 0]) * half
+    faces = np.array([
+        [0, 2, 1], [1, 2, 3], [4, 5, 6], [5, 7, 6],
+        [0, 1, 4], [1, 5, 4], [2, 6, 3], [3, 6, 7],
+        [0, 4, 2], [2, 4, 6], [1, 3, 5], [3, 7, 5],
+    ])
+    triangles = corners[faces]
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+
+    records = np.zeros(len(faces), dtype=STL_RECORD_DTYPE)
+    records["normal"] = normals
+    records["vertices"] = triangles
+    with open(path, "wb") as f:
+        header = b"stub worker box".ljust(STL_HEADER_SIZE - 4, b"\0")
+        f.write(header + np.uint32(len(records)).tobytes())
+        f.write(records.tobytes())
+
+
+def serve(handler: Callable[[dict], dict], request_fd: int, response_fd: int) -> int:
+    """
+    Answer requests until the pool asks to stop or closes the pipe.
+
+    Args:
+        handler: Runs one "run" request and returns its result
+        request_fd: Pipe to read requests from
+        response_fd: Pipe to write responses to
+
+    Returns:
+        Number of jobs run
+    """
+    jobs = 0
+    while True:
+        request = read_message(request_fd)
+        if request is None:
+            return jobs
+
+        op = request.get("op")
+        response = {"id": request.get("id"), "ok": True}
+        if op == "ping":
+            response.update(pid=os.getpid(), jobs=jobs)
+        elif op == "run":
+            try:
+                response["result"] = handler(request)
+            except Exception as e:
+                response["result"] = {"success": False, "error": str(e)}
+            jobs += 1
+        elif op == "shutdown":
+            write_message(response_fd, response)
+            return jobs
+        else:
+            response.update(ok=False, error=f"Unknown op: {op}")
+        write_message(response_fd, response)
+
+
+def main():
+    """Worker entry point, inside Blender or as the stub."""
+    argv = sys.argv
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    else:
+        argv = argv[1:]
+
+    parser = argparse.ArgumentParser(description="Blender worker pool process")
+    parser.add_argument("--request-fd", type=int, required=True,
+                        help="Pipe to read requests from")
+    parser.add_argument("--response-fd", type=int, required=True,
+                        help="Pipe to write responses to")
+    parser.add_argument("--stub", action="store_true",
+                        help="Answer without Blender, writing stand-in meshes")
+    args = parser.parse_args(argv)
+
+    if not args.stub and not INSIDE_BLENDER:
+        print("Error: the worker must run inside Blender, or with --stub")
+        sys.exit(1)
+
+    handler = stub_handler if args.stub else blender_handler
+    serve(handler, args.request_fd, args.response_fd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""
+Pool of long-lived Blender worker processes.
+
+Starting ``blender --background`` costs seconds, which dominates small
+jobs such as primitive and case generation. The pool keeps warm workers
+(see ``worker.py``) and sends them runner actions over length-prefixed
+JSON pipes. Workers are pinged when started and on health checks,
+replaced after a number of jobs so leaked Blender state cannot build up,
+and at most ``size`` jobs run at once.
+
+Example:
+    with BlenderWorkerPool(size=4) as pool:
+        results = pool.map([
+            ["--action", "create_cube", "--output", "output/a.stl"],
+            ["--action", "create_sphere", "--output", "output/b.stl"],
+        ])
+"""
+
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.blender.framing import read_message, write_message
+from src.utils import get_logger
+
+logger = get_logger("blender.worker_pool")
+
+project_root = Path(__file__).parent.parent.parent
+WORKER_SCRIPT = Path(__file__).parent / "worker.py"
+
+MAX_JOBS_PER_WORKER = 50  # Jobs a worker runs before it is replaced
+REQUEST_TIMEOUT = 120.0  # Seconds allowed per job, as for one-shot Blender runs
+STARTUP_TIMEOUT = 60.0  # Seconds for a new worker to answer its first ping
+PING_TIMEOUT = 5.0  # Seconds for a health check answer
+SHUTDOWN_TIMEOUT = 5.0  # Seconds to wait for a worker to exit before killing it
+
+
+def blender_worker_command(executable: str = "blender") -> List[str]:
+    """Command starting a worker inside background Blender."""
+    return [executable, "--background", "--python", str(WORKER_SCRIPT), "--"]
+
+
+def stub_worker_command() -> List[str]:
+    """Command starting a stub worker that needs no Blender."""
+    return [sys.executable, str(WORKER_SCRIPT), "--stub"]
+
+
+class BlenderWorker:
+    """One worker process and its request and response pipes."""
+
+    def __init__(self, command: List[str]):
+        """
+        Start a worker.
+
+        Args:
+            command: Worker command; pipe arguments are appended
+        """
+        request_read, self._request_fd = os.pipe()
+        self._response_fd, response_write = os.pipe()
+        try:
+            self.process = subprocess.Popen(
+                command + ["--request-fd", str(request_read), "--response-fd", str(response_write)],
+                pass_fds=(request_read, response_write),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=str(project_root),
+            )
+        except OSError:
+            os.close(self._request_fd)
+            os.close(self._response_fd)
+            raise
+        finally:
+            os.close(request_read)
+            os.close(response_write)
+
+        self.jobs = 0
+        self._next_id = 0
+
+    @property
+    def pid(self) -> int:
+        """Process id of the worker."""
+        return self.process.pid
+
+    @property
+    def is_alive(self) -> bool:
+        """True while the worker process is running."""
+        return self.process.poll() is None
+
+    def request(self, message: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+        """
+        Send a request and wait for its response.
+
+        Args:
+            message: Request with an "op" key
+            timeout: Seconds to wait for the response (None = wait forever)
+
+        Returns:
+            The worker's response
+
+        Raises:
+            TimeoutError: If the worker does not answer in time
+            ConnectionError: If the worker went away or answered out of turn
+        """
+        self._next_id += 1
+        message = dict(message, id=self._next_id)
+        try:
+            write_message(self._request_fd, message)
+        except BrokenPipeError:
+            raise ConnectionError("Worker closed its request pipe")
+
+        response = read_message(self._response_fd, timeout=timeout)
+        if response is None:
+            raise ConnectionError("Worker exited without answering")
+        if response.get("id") != self._next_id:
+            raise ConnectionError(f"Worker answered request {response.get('id')}, expected {self._next_id}")
+        if message.get("op") == "run":
+            self.jobs += 1
+        return response
+
+    def ping(self, timeout: float = PING_TIMEOUT) -> bool:
+        """True if the worker answers a ping in time."""
+        try:
+            return self.request({"op": "ping"}, timeout).get("ok", False)
+        except (OSError, TimeoutError, ConnectionError, ValueError):
+            return False
+
+    def close(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Ask the worker to exit, killing it if it does not."""
+        if self.is_alive:
+            try:
+                self.request({"op": "shutdown"}, timeout)
+                self.process.wait(timeout=timeout)
+            except (OSError, TimeoutError, ConnectionError, ValueError, subprocess.TimeoutExpired):
+                pass
+        self.kill()
+
+    def kill(self) -> None:
+        """Stop the worker at once and release its pipes."""
+        if self.is_alive:
+            self.process.kill()
+        self.process.wait()
+        for fd in (self._request_fd, self._response_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._request_fd = self._response_fd = -1
+
+
+class BlenderWorkerPool:
+    """
+    Warm Blender workers shared by concurrent jobs.
+
+    Workers start on demand up to ``size`` and are reused between jobs.
+    Callers may submit from any number of threads; at most ``size`` jobs
+    run at once and the rest wait for a free worker.
+    """
+
+    def __init__(
+        self,
+        command: Optional[List[str]] = None,
+        size: Optional[int] = None,
+        max_jobs_per_worker: int = MAX_JOBS_PER_WORKER,
+        request_timeout: float = REQUEST_TIMEOUT,
+        startup_timeout: float = STARTUP_TIMEOUT,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            command: Worker command (default: Blender on the PATH)
+            size: Most workers, and so most concurrent jobs (default: CPU count)
+            max_jobs_per_worker: Jobs before a worker is replaced (0 = never)
+            request_timeout: Seconds allowed per job
+            startup_timeout: Seconds allowed for a worker to start
+        """
+        self.command = list(command or blender_worker_command())
+        self.size = max(1, size or os.cpu_count() or 1)
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.request_timeout = request_timeout
+        self.startup_timeout = startup_timeout
+
+        self._idle: List[BlenderWorker] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._closed = False
+
+        self.workers_started = 0
+        self.workers_recycled = 0
+        self.jobs_completed = 0
+
+    def __enter__(self) -> "BlenderWorkerPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def idle_count(self) -> int:
+        """Number of warm workers waiting for a job."""
+        with self._lock:
+            return len(self._idle)
+
+    def warm_up(self, count: Optional[int] = None) -> int:
+        """
+        Start workers ahead of the first jobs.
+
+        Args:
+            count: Workers to have warm (default: the pool size)
+
+        Returns:
+            Number of idle workers afterwards
+        """
+        count = min(self.size, count or self.size)
+        started = []
+        for _ in range(count - self.idle_count):
+            with self._slots:
+                started.append(self._start_worker())
+        with self._lock:
+            self._idle.extend(started)
+            return len(self._idle)
+
+    def run(self, script_args: List[str], **request: Any) -> Dict[str, Any]:
+        """
+        Run one runner action on a warm worker.
+
+        Args:
+            script_args: Runner arguments, as passed after "--" to runner.py
+            **request: Extra request fields for the worker
+
+        Returns:
+            The action's result dictionary; failures have "success" False and an "error"
+
+        Raises:
+            RuntimeError: If the pool has been closed
+        """
+        if self._closed:
+            raise RuntimeError("Worker pool is closed")
+
+        with self._slots:
+            try:
+                worker = self._acquire()
+            except (OSError, TimeoutError, ConnectionError) as e:
+                return {"success": False, "error": f"Could not start Blender worker: {e}"}
+
+            try:
+                response = worker.request(
+                    dict(request, op="run", args=list(script_args)),
+                    self.request_timeout,
+                )
+            except TimeoutError:
+                logger.warning(f"Worker {worker.pid} timed out; replacing it")
+                worker.kill()
+                return {"success": False, "error": "Blender execution timed out"}
+            except (OSError, ConnectionError, ValueError) as e:
+                logger.warning(f"Worker {worker.pid} failed: {e}; replacing it")
+                worker.kill()
+                return {"success": False, "error": f"Blender worker failed: {e}"}
+
+            self._release(worker)
+            with self._lock:
+                self.jobs_completed += 1
+            return response.get("result") or {"success": False, "error": response.get("error", "No result")}
+
+    def map(self, jobs: Sequence[List[str]]) -> List[Dict[str, Any]]:
+        """
+        Run a batch of runner actions across the workers.
+
+        Args:
+            jobs: Runner arguments per job
+
+        Returns:
+            Result per job, in the order given
+        """
+        if not jobs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.size, len(jobs))) as executor:
+            return list(executor.map(self.run, jobs))
+
+    def health_check(self) -> Dict[str, int]:
+        """
+        Ping every idle worker, dropping those that do not answer.
+
+        Returns:
+            Counts of "healthy" and "removed" workers
+        """
+        with self._lock:
+            workers, self._idle = self._idle, []
+
+        healthy = []
+        removed = 0
+        for worker in workers:
+            if worker.is_alive and worker.ping():
+                healthy.append(worker)
+            else:
+                logger.warning(f"Worker {worker.pid} failed its health check")
+                worker.kill()
+                removed += 1
+
+        with self._lock:
+            self._idle.extend(healthy)
+        return {"healthy": len(healthy), "removed": removed}
+
+    def close(self) -> None:
+        """Stop every idle worker; busy workers stop when their job ends."""
+        with self._lock:
+            self._closed = True
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            worker.close()
+
+    def _start_worker(self) -> BlenderWorker:
+        """Start a worker and wait for its first ping."""
+        worker = BlenderWorker(self.command)
+        if not worker.ping(self.startup_timeout):
+            worker.kill()
+            raise ConnectionError("Worker did not answer after starting")
+        with self._lock:
+            self.workers_started += 1
+        return worker
+
+    def _acquire(self) -> BlenderWorker:
+        """Take a live idle worker, starting one if none is waiting."""
+        while True:
+            with self._lock:
+                worker = self._idle.pop() if self._idle else None
+            if worker is None:
+                return self._start_worker()
+            if worker.is_alive:
+                return worker
+            worker.kill()
+
+    def _release(self, worker: BlenderWorker) -> None:
+        """Return a worker to the pool, or replace it once it is worn out."""
+        if self.max_jobs_per_worker and worker.jobs >= self.max_jobs_per_worker:
+            with self._lock:
+                self.workers_recycled += 1
+            worker.close()
+            return
+        with self._lock:
+            if not self._closed:
+                self._idle.append(worker)
+                return
+        worker.close()
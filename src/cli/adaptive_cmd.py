@@ -75,7 +75,7 @@ def analyze(
             table.add_column("Z Range")
             table.add_column("Layer Height")
             table.add_column("Reason")
-            table.add_column("Curvature")
+            table.add_column("Slope")
             table.add_column("Overhang")
 
             for region in result.regions:
@@ -162,6 +162,6 @@ def presets(ctx: click.Context) -> None:
             f"[bold]Min Layer:[/bold] {config.min_layer_height}mm\n"
             f"[bold]Max Layer:[/bold] {config.max_layer_height}mm\n"
             f"[bold]Default:[/bold] {config.default_layer_height}mm\n"
-            f"[bold]Quality Threshold:[/bold] {config.quality_threshold}",
+            f"[bold]Cusp Height:[/bold] {config.cusp_height}mm",
             title=f"{strategy.value.upper()}",
         ))
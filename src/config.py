@@ -46,6 +46,10 @@ class Settings(BaseSettings):
         description="Database connection URL",
     )
 
+    # Mesh analysis cache
+    mesh_cache_enabled: bool = Field(default=True, description="Cache parsed meshes and derived arrays on disk")
+    mesh_cache_max_mb: int = Field(default=512, description="Size limit of the mesh cache in MB")
+
     # Feature flags
     enable_voice: bool = Field(default=False, description="Enable voice control")
     enable_camera: bool = Field(default=False, description="Enable camera monitoring")
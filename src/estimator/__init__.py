@@ -1,7 +1,8 @@
 """Estimator module for cost and time estimation.
 
 Provides print cost estimation, time prediction, cost optimization,
-and eco-friendly printing optimization.
+eco-friendly printing optimization, and streaming G-code analysis for
+print time, filament and layer estimates.
 """
 
 from src.estimator.cost_optimizer import (
@@ -14,6 +15,17 @@ from src.estimator.cost_optimizer import (
     estimate_cost,
 )
 
+from src.estimator.gcode_analyzer import (
+    GcodeAnalysis,
+    LayerStats,
+    MotionLimits,
+    analyze_3mf,
+    analyze_gcode,
+    analyze_gcode_bytes,
+    clear_analysis_cache,
+    read_3mf_gcode,
+)
+
 from src.estimator.eco_mode import (
     EcoOptimizer,
     EcoConfig,
@@ -35,6 +47,15 @@ __all__ = [
     "OptimizationResult",
     "create_optimizer",
     "estimate_cost",
+    # G-code analysis
+    "GcodeAnalysis",
+    "LayerStats",
+    "MotionLimits",
+    "analyze_3mf",
+    "analyze_gcode",
+    "analyze_gcode_bytes",
+    "clear_analysis_cache",
+    "read_3mf_gcode",
     # Eco mode
     "EcoOptimizer",
     "EcoConfig",
@@ -13,7 +13,10 @@ Features:
 import math
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional, Dict, Any, Tuple
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Tuple, Union
+
+from src.estimator.gcode_analyzer import GcodeAnalysis, analyze_3mf, analyze_gcode
 
 
 class ManufacturingMethod(Enum):
@@ -369,19 +372,7 @@ class CostEstimator:
 
         # Calculate costs
         material_cost = sum(m.cost for m in material_usage)
-        machine_time_hours = print_time_seconds / 3600
-        machine_time_cost = machine_time_hours * self.machine_costs.hourly_rate
-        energy_cost = machine_time_hours * self.machine_costs.energy_cost_per_hour
-
-        subtotal = material_cost + machine_time_cost + energy_cost
-        overhead_cost = subtotal * (self.overhead_percent / 100)
-
-        cost_breakdown = CostBreakdown(
-            material_cost=material_cost,
-            machine_time_cost=machine_time_cost,
-            energy_cost=energy_cost,
-            overhead_cost=overhead_cost,
-        )
+        cost_breakdown = self._cost_breakdown(material_cost, print_time_seconds)
 
         return PrintEstimate(
             model_name=model_name,
@@ -396,6 +387,76 @@ class CostEstimator:
             infill_percent=infill_percent,
         )
 
+    def estimate_from_gcode(
+        self,
+        gcode: Union[str, Path, GcodeAnalysis],
+        material: str = "pla",
+        model_name: str = "",
+        colors: Optional[Dict[int, str]] = None,  # tool -> color
+    ) -> PrintEstimate:
+        """
+        Estimate 3D print cost from sliced G-code.
+
+        Time and filament come from the G-code's moves rather than from
+        the volume heuristics of estimate_print().
+
+        Args:
+            gcode: Path to a G-code or sliced 3MF file, or an analysis of one
+            material: Material type (pla, petg, abs, etc.)
+            model_name: Name of the model (default: file name)
+            colors: Optional color name per extruder tool
+
+        Returns:
+            PrintEstimate with detailed breakdown
+
+        Raises:
+            ValueError: If a 3MF file holds no sliced G-code
+        """
+        material_info = self.filament_costs.get(
+            material.lower(),
+            self.filament_costs.get("pla", MaterialCost("Unknown", 25.0, 1.24))
+        )
+
+        if isinstance(gcode, GcodeAnalysis):
+            analysis = gcode
+        else:
+            path = Path(gcode)
+            model_name = model_name or path.stem
+            if path.suffix.lower() == ".3mf":
+                analysis = analyze_3mf(path)
+                if analysis is None:
+                    raise ValueError(f"No sliced G-code in {path.name}")
+            else:
+                analysis = analyze_gcode(path)
+
+        filament_area = math.pi * (1.75 / 2) ** 2  # mm²
+        material_usage = []
+        for tool, length_mm in analysis.extrusion_by_tool.items():
+            volume_mm3 = max(length_mm, 0.0) * filament_area
+            weight_grams = volume_mm3 / 1000 * material_info.density
+            material_usage.append(MaterialUsage(
+                name=material_info.name,
+                color=(colors or {}).get(tool),
+                volume_mm3=volume_mm3,
+                weight_grams=weight_grams,
+                length_meters=length_mm / 1000,
+                cost=weight_grams * material_info.cost_per_gram,
+            ))
+
+        layer_heights = analysis.layer_height_histogram
+        material_cost = sum(m.cost for m in material_usage)
+        return PrintEstimate(
+            model_name=model_name,
+            method=ManufacturingMethod.FDM_PRINT,
+            total_volume_mm3=sum(m.volume_mm3 for m in material_usage),
+            total_weight_grams=sum(m.weight_grams for m in material_usage),
+            filament_length_meters=analysis.extrusion_mm / 1000,
+            print_time_seconds=analysis.total_time_seconds,
+            material_usage=material_usage,
+            cost_breakdown=self._cost_breakdown(material_cost, analysis.total_time_seconds),
+            layer_height_mm=max(layer_heights, key=layer_heights.get) if layer_heights else 0.2,
+        )
+
     def estimate_laser_cut(
         self,
         path_length_mm: float,
@@ -448,19 +509,7 @@ class CostEstimator:
         )]
 
         # Calculate costs
-        machine_time_hours = total_time_seconds / 3600
-        machine_time_cost = machine_time_hours * self.machine_costs.hourly_rate
-        energy_cost = machine_time_hours * self.machine_costs.energy_cost_per_hour
-
-        subtotal = material_cost + machine_time_cost + energy_cost
-        overhead_cost = subtotal * (self.overhead_percent / 100)
-
-        cost_breakdown = CostBreakdown(
-            material_cost=material_cost,
-            machine_time_cost=machine_time_cost,
-            energy_cost=energy_cost,
-            overhead_cost=overhead_cost,
-        )
+        cost_breakdown = self._cost_breakdown(material_cost, total_time_seconds)
 
         # Extract thickness from material name
         thickness = 3.0
@@ -536,6 +585,22 @@ class CostEstimator:
 
         return estimate
 
+    def _cost_breakdown(self, material_cost: float, time_seconds: float) -> CostBreakdown:
+        """Add machine time, energy and overhead to a material cost."""
+        machine_time_hours = time_seconds / 3600
+        machine_time_cost = machine_time_hours * self.machine_costs.hourly_rate
+        energy_cost = machine_time_hours * self.machine_costs.energy_cost_per_hour
+
+        subtotal = material_cost + machine_time_cost + energy_cost
+        overhead_cost = subtotal * (self.overhead_percent / 100)
+
+        return CostBreakdown(
+            material_cost=material_cost,
+            machine_time_cost=machine_time_cost,
+            energy_cost=energy_cost,
+            overhead_cost=overhead_cost,
+        )
+
 
 # Convenience functions
 
@@ -10,6 +10,7 @@ from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from src.mesh_io import scan_mesh
 from src.utils import get_logger
 from src.config import get_settings
 
@@ -404,59 +405,12 @@ class CostOptimizer:
             return 0.0
 
         try:
-            # Parse mesh and calculate volume
-            vertices = []
-            faces = []
-
-            if mesh.suffix.lower() == ".obj":
-                with open(mesh, "r") as f:
-                    for line in f:
-                        if line.startswith("v "):
-                            parts = line.split()
-                            if len(parts) >= 4:
-                                vertices.append((
-                                    float(parts[1]),
-                                    float(parts[2]),
-                                    float(parts[3]),
-                                ))
-                        elif line.startswith("f "):
-                            parts = line.split()[1:]
-                            indices = [int(p.split("/")[0]) - 1 for p in parts[:3]]
-                            if len(indices) == 3:
-                                faces.append(tuple(indices))
-
-            elif mesh.suffix.lower() == ".stl":
-                import re
-                with open(mesh, "r") as f:
-                    content = f.read()
-                vertex_pattern = r"vertex\s+([\d.e+-]+)\s+([\d.e+-]+)\s+([\d.e+-]+)"
-                for i, match in enumerate(re.finditer(vertex_pattern, content, re.IGNORECASE)):
-                    vertices.append((float(match.group(1)), float(match.group(2)), float(match.group(3))))
-                    if (i + 1) % 3 == 0:
-                        base = len(vertices) - 3
-                        faces.append((base, base + 1, base + 2))
-
-            if not vertices or not faces:
+            stats = scan_mesh(mesh)
+            if stats.is_empty:
                 return 0.0
 
-            # Calculate volume using signed volume formula
-            volume = 0.0
-            for face in faces:
-                if max(face) >= len(vertices):
-                    continue
-                v0 = vertices[face[0]]
-                v1 = vertices[face[1]]
-                v2 = vertices[face[2]]
-
-                # Signed volume of tetrahedron with origin
-                volume += (
-                    v0[0] * (v1[1] * v2[2] - v2[1] * v1[2]) +
-                    v1[0] * (v2[1] * v0[2] - v0[1] * v2[2]) +
-                    v2[0] * (v0[1] * v1[2] - v1[1] * v0[2])
-                ) / 6.0
-
             # Convert mm3 to cm3
-            return abs(volume) / 1000
+            return abs(stats.volume) / 1000
 
         except Exception as e:
             logger.warning(f"Error calculating volume: {e}")
@@ -0,0 +1,1034 @@
+"""Streaming G-code analysis for print time, filament and layer estimates.
+
+Slicer header comments are a guess made before the G-code was written,
+and not every slicer writes them. This module reads the moves instead:
+the file is memory-mapped and cut into large chunks at line boundaries,
+the move lines of each chunk are parsed with vectorized NumPy, and the
+moves are run through a model of the firmware planner - trapezoidal
+acceleration with junction-deviation cornering, as in Marlin and Grbl -
+to get the time of every move. Time and extrusion are kept per layer,
+and results are cached by the file's content hash.
+
+Chunks can be parsed by a process pool; the planner pass over the parsed
+moves is sequential but vectorized, holding back only the moves whose
+speeds still depend on the next chunk.
+"""
+
+import math
+import mmap
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.utils import file_hash, get_logger
+
+logger = get_logger("estimator.gcode_analyzer")
+
+# Bump when analysis results change for the same input
+ANALYZER_VERSION = 1
+
+CHUNK_BYTES = 1 << 24  # Bytes parsed per chunk (16 MB)
+TOKEN_WIDTH = 12  # Parameter values of this many characters or more are parsed one by one
+LAYER_TOLERANCE = 0.005  # mm; smaller Z changes between extrusions stay in one layer
+HISTOGRAM_STEP = 0.01  # mm; layer heights are rounded to this for the histogram
+MIN_SPEED = 0.1  # mm/s; floor for zero or missing feedrates
+MAX_PLANNER_CARRY = 200_000  # Moves held for the backward pass before forcing a stop
+CACHE_ENTRIES = 128  # Analyses kept in memory
+HASH_ENTRIES = 4096  # File stamps whose content hash is remembered
+MAX_TOOLS = 16  # Higher T numbers are firmware macros, not extruders
+
+# Row kinds; 0-3 are the motion commands G0-G3
+KIND_SET_POSITION = 4  # G92
+KIND_HOME = 5  # G28
+KIND_ABSOLUTE = 6  # G90
+KIND_RELATIVE = 7  # G91
+KIND_E_ABSOLUTE = 8  # M82
+KIND_E_RELATIVE = 9  # M83
+KIND_ACCELERATION = 10  # M204, SET_VELOCITY_LIMIT
+KIND_TOOL = 11  # T<n>
+KIND_DWELL = 12  # G4
+
+_PARAMS = "XYZEFIJ"  # Value columns of parsed rows
+_PARAM_COLUMN = np.full(256, -1, dtype=np.int8)
+for _column, _letter in enumerate(_PARAMS):
+    _PARAM_COLUMN[ord(_letter)] = _column
+
+_MODE_COMMANDS = {
+    "G90": KIND_ABSOLUTE,
+    "G91": KIND_RELATIVE,
+    "M82": KIND_E_ABSOLUTE,
+    "M83": KIND_E_RELATIVE,
+}
+
+
+@dataclass(frozen=True)
+class MotionLimits:
+    """Machine limits for the planner model, used where the G-code sets none."""
+    max_acceleration: float = 20000.0  # mm/s², cap on M204 values
+    default_acceleration: float = 2500.0  # mm/s² until the G-code sets one
+    max_velocity: float = 500.0  # mm/s
+    max_z_velocity: float = 20.0  # mm/s
+    junction_deviation: float = 0.013  # mm
+    filament_diameter: float = 1.75  # mm
+    filament_density: float = 1.24  # g/cm³ (PLA)
+
+    @property
+    def filament_area(self) -> float:
+        """Filament cross-section in mm²."""
+        return math.pi * (self.filament_diameter / 2) ** 2
+
+    def grams(self, length_mm: float) -> float:
+        """Weight of a length of filament."""
+        return length_mm * self.filament_area * self.filament_density / 1000
+
+
+@dataclass
+class LayerStats:
+    """Time and material of one layer."""
+    number: int  # 1-based
+    z: float  # mm
+    height: float  # mm
+    time_seconds: float = 0.0
+    extrusion_mm: float = 0.0  # Filament length
+
+
+@dataclass
+class GcodeAnalysis:
+    """Result of analyzing a G-code file."""
+    total_time_seconds: float = 0.0
+    extrusion_mm: float = 0.0  # Net filament length, retractions cancelled
+    filament_grams: float = 0.0
+    extrusion_by_tool: Dict[int, float] = field(default_factory=dict)  # Tool -> mm
+    grams_by_tool: Dict[int, float] = field(default_factory=dict)
+    layers: List[LayerStats] = field(default_factory=list)
+    layer_height_histogram: Dict[float, int] = field(default_factory=dict)  # Height (mm) -> layers
+    minimum: Tuple[float, float, float] = (0.0, 0.0, 0.0)  # Bounds of extruding move end points
+    maximum: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    move_count: int = 0
+    bytes_parsed: int = 0
+    parse_seconds: float = 0.0
+    content_hash: str = ""
+
+    @property
+    def total_layers(self) -> int:
+        """Number of layers."""
+        return len(self.layers)
+
+    @property
+    def max_z(self) -> float:
+        """Height of the highest extrusion in mm."""
+        return self.maximum[2]
+
+    def dimensions(self) -> Tuple[float, float, float]:
+        """Size of the extruded bounding box along X, Y and Z."""
+        return (
+            self.maximum[0] - self.minimum[0],
+            self.maximum[1] - self.minimum[1],
+            self.maximum[2] - self.minimum[2],
+        )
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        d = asdict(self)
+        d["total_layers"] = self.total_layers
+        return d
+
+
+@dataclass
+class _Rows:
+    """Motion and mode-changing commands parsed from one chunk, in file order."""
+    kinds: np.ndarray  # (N,) int8 row kind
+    values: np.ndarray  # (N, 7) X Y Z E F I J, NaN where not given
+    arguments: np.ndarray  # (N, 2) accel/tool/dwell argument and travel accel, NaN if unused
+
+
+# ==================== Parsing ====================
+
+
+def _parse_chunk(data: np.ndarray) -> _Rows:
+    """
+    Parse a chunk of whole G-code lines.
+
+    Motion lines are parsed vectorized and must separate their parameters
+    with spaces, as every slicer does; the few other commands that change
+    the machine's modes are parsed one by one.
+
+    Args:
+        data: Bytes of the lines followed by TOKEN_WIDTH padding bytes
+
+    Returns:
+        Parsed rows
+    """
+    size = len(data) - TOKEN_WIDTH
+    text = data[:size]
+    newlines = np.flatnonzero(text == ord("\n"))
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.append(newlines, size)
+    if starts[-1] >= size:
+        starts, ends = starts[:-1], ends[:-1]
+
+    # Skip indentation
+    for _ in range(TOKEN_WIDTH):
+        indented = ((data[starts] == ord(" ")) | (data[starts] == ord("\t"))) & (starts < ends)
+        if not indented.any():
+            break
+        starts[indented] += 1
+
+    # Cut comments
+    semicolons = np.flatnonzero(text == ord(";"))
+    if len(semicolons):
+        cut = np.append(semicolons, size)[np.searchsorted(semicolons, starts)]
+        ends = np.minimum(ends, cut)
+
+    first, second, third = data[starts], data[starts + 1], data[starts + 2]
+    has_command = ends - starts >= 2
+    third_numeric = ((third - ord("0")).astype(np.uint8) <= 9) | (third == ord("."))
+    is_move = (
+        has_command & (first == ord("G"))
+        & (second >= ord("0")) & (second <= ord("3")) & ~third_numeric
+    )
+    # Commands that can change modes: G28, G4, G90-G92, M82, M83, M204, T<n>, SET_...
+    maybe_mode = has_command & ~is_move & (
+        ((first == ord("G")) & ((second == ord("2")) | (second == ord("4")) | (second == ord("9"))))
+        | ((first == ord("M")) & ((second == ord("2")) | (second == ord("8"))))
+        | (first == ord("T"))
+        | (first == ord("S"))
+    )
+
+    line_kinds = np.full(len(starts), -1, dtype=np.int8)
+    line_kinds[is_move] = second[is_move] - ord("0")
+    mode_values: Dict[int, Tuple[List[float], Tuple[float, float]]] = {}
+    for line in np.flatnonzero(maybe_mode):
+        words = text[starts[line]:ends[line]].tobytes().decode("ascii", "replace").split()
+        parsed = _parse_mode_command(words)
+        if parsed is not None:
+            line_kinds[line], mode_values[line] = parsed[0], parsed[1:]
+
+    rows = np.flatnonzero(line_kinds >= 0)
+    row_of_line = np.full(len(starts), -1, dtype=np.int64)
+    row_of_line[rows] = np.arange(len(rows))
+    values = np.full((len(rows), len(_PARAMS)), np.nan)
+    arguments = np.full((len(rows), 2), np.nan)
+
+    # Parameter letters after a space on motion lines
+    spaces = np.flatnonzero(text == ord(" "))
+    columns = _PARAM_COLUMN[data[spaces + 1]]
+    keep = columns >= 0
+    spaces, columns = spaces[keep], columns[keep]
+    lines = np.searchsorted(newlines, spaces)
+    keep = is_move[lines] & (spaces + 1 < ends[lines])
+    spaces, columns, lines = spaces[keep], columns[keep], lines[keep]
+    values[row_of_line[lines], columns] = _parse_numbers(data, spaces + 2)
+
+    for line, (params, args) in mode_values.items():
+        values[row_of_line[line], :4] = params
+        arguments[row_of_line[line]] = args
+
+    return _Rows(kinds=line_kinds[rows], values=values, arguments=arguments)
+
+
+def _parse_numbers(data: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    Parse the numbers starting at the given offsets.
+
+    Each number is cut from a fixed-width window, blanked after its last
+    numeric character and converted in one cast. Numbers that do not fit
+    the window, or that do not parse, fall back to float() one by one.
+
+    Args:
+        data: Chunk bytes with TOKEN_WIDTH padding
+        starts: Offsets of the first character of each number
+
+    Returns:
+        Values, NaN where a number is missing or malformed
+    """
+    windows = np.lib.stride_tricks.as_strided(
+        data, shape=(len(data) - TOKEN_WIDTH + 1, TOKEN_WIDTH), strides=(1, 1)
+    )[starts]
+    numeric = ((windows - ord("0")).astype(np.uint8) <= 9)
+    numeric |= (windows == ord(".")) | (windows == ord("-")) | (windows == ord("+"))
+    for k in range(1, TOKEN_WIDTH):
+        numeric[:, k] &= numeric[:, k - 1]
+    windows *= numeric
+
+    values = np.full(len(starts), np.nan)
+    fits = numeric[:, 0] & ~numeric[:, -1]
+    try:
+        values[fits] = windows[fits].view(f"S{TOKEN_WIDTH}").ravel().astype(np.float64)
+        slow = np.flatnonzero(numeric[:, -1])
+    except ValueError:
+        slow = np.flatnonzero(numeric[:, 0])
+
+    for i in slow:
+        start = starts[i]
+        stop = start
+        while stop < len(data) and chr(data[stop]) in "0123456789.-+":
+            stop += 1
+        try:
+            values[i] = float(data[start:stop].tobytes())
+        except ValueError:
+            pass
+    return values
+
+
+def _parse_mode_command(words: List[str]) -> Optional[Tuple[int, List[float], Tuple[float, float]]]:
+    """
+    Parse a command that changes the machine's modes rather than moving it.
+
+    Args:
+        words: Command and parameters of one line
+
+    Returns:
+        (row kind, X Y Z E values, arguments), or None for commands that
+        do not affect time or extrusion
+    """
+    command = words[0].upper()
+    params: Dict[str, float] = {}
+    for word in words[1:]:
+        key, _, value = word.partition("=")
+        try:
+            if value:
+                params[key.upper()] = float(value)
+            else:
+                params[word[0].upper()] = float(word[1:]) if len(word) > 1 else 0.0
+        except ValueError:
+            continue
+
+    nothing = (math.nan, math.nan)
+    position = [params.get(axis, math.nan) for axis in "XYZE"]
+    if command in _MODE_COMMANDS:
+        return _MODE_COMMANDS[command], [math.nan] * 4, nothing
+    if command == "G92":
+        if all(math.isnan(v) for v in position):
+            position = [0.0] * 4
+        return KIND_SET_POSITION, position, nothing
+    if command == "G28":
+        homed = [not math.isnan(v) for v in position[:3]]
+        if not any(homed):
+            homed = [True] * 3
+        return KIND_HOME, [0.0 if axis else math.nan for axis in homed] + [math.nan], nothing
+    if command == "G4":
+        seconds = params.get("S", params.get("P", 0.0) / 1000)
+        return KIND_DWELL, [math.nan] * 4, (seconds, math.nan)
+    if command == "M204":
+        printing = params.get("P", params.get("S", math.nan))
+        travel = params.get("T", params.get("S", math.nan))
+        return KIND_ACCELERATION, [math.nan] * 4, (printing, travel)
+    if command == "SET_VELOCITY_LIMIT" and "ACCEL" in params:
+        return KIND_ACCELERATION, [math.nan] * 4, (params["ACCEL"], params["ACCEL"])
+    if command[0] == "T" and command[1:].isdigit() and int(command[1:]) < MAX_TOOLS:
+        return KIND_TOOL, [math.nan] * 4, (float(command[1:]), math.nan)
+    return None
+
+
+def _chunk_bounds(buffer, size: int, chunk_bytes: int) -> List[Tuple[int, int]]:
+    """Split a buffer into (start, stop) ranges that end at newlines."""
+    bounds = []
+    start = 0
+    while start < size:
+        stop = min(start + chunk_bytes, size)
+        if stop < size:
+            newline = buffer.find(b"\n", stop - 1)
+            stop = size if newline < 0 else newline + 1
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def _padded(buffer, start: int, stop: int) -> np.ndarray:
+    """Copy a byte range into an array with TOKEN_WIDTH zero bytes after it."""
+    data = np.zeros(stop - start + TOKEN_WIDTH, dtype=np.uint8)
+    data[:stop - start] = np.frombuffer(buffer, dtype=np.uint8, count=stop - start, offset=start)
+    return data
+
+
+def _parse_file_range(task: Tuple[str, int, int]) -> _Rows:
+    """Parse one range of a file; runs in worker processes."""
+    path, start, stop = task
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return _parse_chunk(_padded(mapped, start, stop))
+
+
+# ==================== Planner ====================
+
+
+def _fill_forward(values: np.ndarray, initial: float) -> np.ndarray:
+    """Replace each NaN with the last value before it, or the initial value."""
+    index = np.where(np.isnan(values), -1, np.arange(len(values)))
+    np.maximum.accumulate(index, out=index)
+    return np.where(index >= 0, values[np.maximum(index, 0)], initial)
+
+
+def _plan(
+    length: np.ndarray,
+    nominal2: np.ndarray,
+    accel: np.ndarray,
+    junction2: np.ndarray,
+    entry2: float,
+    final: bool,
+) -> Tuple[np.ndarray, int, float]:
+    """
+    Plan speeds over a run of moves and time the settled ones.
+
+    Entry speeds are limited by each junction and by what the neighbouring
+    moves can accelerate or brake through. Both passes have closed forms
+    in squared speeds - the backward pass is a suffix minimum and the
+    forward pass a prefix minimum over cumulative 2·a·d - so they run
+    vectorized. Unless this is the end of the program, only moves up to
+    the last junction whose limit is binding are settled; the moves after
+    it still depend on what comes next.
+
+    Args:
+        length: Move lengths in mm
+        nominal2: Squared cruise speeds
+        accel: Accelerations in mm/s²
+        junction2: Squared speed limits at each move's start
+        entry2: Squared speed entering the first move
+        final: Whether the machine stops after the last move
+
+    Returns:
+        (times of the settled moves, number settled, squared entry speed
+        of the first unsettled move)
+    """
+    n = len(length)
+    reach = 2 * accel * length
+    suffix = np.append(np.cumsum(reach[::-1])[::-1], 0.0)
+    key = np.append(junction2 - suffix[:-1], 0.0)
+    suffix_min = np.minimum.accumulate(key[::-1])[::-1]
+    binding = junction2 <= suffix[:-1] + suffix_min[1:]
+    backward = np.where(binding, junction2, suffix[:-1] + suffix_min[1:])
+
+    prefix = np.concatenate(([0.0], np.cumsum(reach)[:-1]))
+    forward = prefix + np.minimum(entry2, np.minimum.accumulate(backward - prefix))
+
+    if final:
+        settled = n
+    else:
+        binding[0] = False
+        candidates = np.flatnonzero(binding)
+        if len(candidates):
+            settled = int(candidates[-1])
+        elif n > MAX_PLANNER_CARRY:
+            settled = n
+        else:
+            return np.zeros(0), 0, entry2
+
+    start2 = forward[:settled]
+    end2 = np.append(forward[1:], 0.0)[:settled]
+    length, nominal2, accel = length[:settled], nominal2[:settled], accel[:settled]
+    accelerating = (nominal2 - start2) / (2 * accel)
+    braking = (nominal2 - end2) / (2 * accel)
+    cruise = length - accelerating - braking
+    peak2 = np.where(cruise > 0, nominal2, accel * length + (start2 + end2) / 2)
+    peak = np.sqrt(np.maximum(peak2, 0.0))
+    cruise_time = np.where(cruise > 0, np.maximum(cruise, 0.0) / np.sqrt(np.maximum(nominal2, MIN_SPEED ** 2)), 0.0)
+    times = (2 * peak - np.sqrt(start2) - np.sqrt(end2)) / accel + cruise_time
+
+    next_entry2 = float(forward[settled]) if settled < n else 0.0
+    return np.maximum(times, 0.0), settled, next_entry2
+
+
+# ==================== Analyzer ====================
+
+
+class _Analyzer:
+    """Follows the machine through parsed rows, chunk after chunk."""
+
+    def __init__(self, limits: MotionLimits):
+        self.limits = limits
+
+        # Machine state carried between chunks
+        self.position = np.zeros(4)  # X Y Z E
+        self.absolute = True
+        self.absolute_e = True
+        self.feedrate = 1500.0  # mm/min
+        self.print_accel = limits.default_acceleration
+        self.travel_accel = limits.default_acceleration
+        self.tool = 0.0
+
+        # Planner state
+        self.exit_direction = np.zeros(3)
+        self.exit_nominal2 = 0.0
+        self.exit_stops = True  # The machine starts at rest
+        self.entry2 = 0.0
+        self.held: Dict[str, np.ndarray] = {}
+
+        # Layers and totals
+        self.layer_z: List[float] = []
+        self.last_extrusion_z = math.nan
+        self.layer_time = np.zeros(0)
+        self.layer_extrusion = np.zeros(0)
+        self.total_time = 0.0
+        self.extrusion_by_tool: Dict[int, float] = {}
+        self.minimum = np.full(3, np.inf)
+        self.maximum = np.full(3, -np.inf)
+        self.move_count = 0
+
+    def feed(self, rows: _Rows) -> None:
+        """Process the rows of the next chunk."""
+        if len(rows.kinds) == 0:
+            return
+        kinds = rows.kinds
+        values = rows.values
+        is_motion = kinds <= 3
+
+        # Modal state per row
+        mode = np.full(len(kinds), np.nan)
+        mode[kinds == KIND_ABSOLUTE] = 1.0
+        mode[kinds == KIND_RELATIVE] = 0.0
+        absolute = _fill_forward(mode, float(self.absolute)) > 0
+        mode[kinds == KIND_E_ABSOLUTE] = 1.0
+        mode[kinds == KIND_E_RELATIVE] = 0.0
+        absolute_e = _fill_forward(mode, float(self.absolute_e)) > 0
+        self.absolute, self.absolute_e = bool(absolute[-1]), bool(absolute_e[-1])
+
+        feedrate = _fill_forward(np.where(is_motion, values[:, 4], np.nan), self.feedrate)
+        is_accel = kinds == KIND_ACCELERATION
+        print_accel = _fill_forward(np.where(is_accel, rows.arguments[:, 0], np.nan), self.print_accel)
+        travel_accel = _fill_forward(np.where(is_accel, rows.arguments[:, 1], np.nan), self.travel_accel)
+        tool = _fill_forward(np.where(kinds == KIND_TOOL, rows.arguments[:, 0], np.nan), self.tool)
+        self.feedrate, self.print_accel, self.travel_accel, self.tool = (
+            feedrate[-1], print_accel[-1], travel_accel[-1], tool[-1]
+        )
+
+        # Positions: absolute values and G92/G28 reset an axis, relative values add to it
+        resets_all = (kinds == KIND_SET_POSITION) | (kinds == KIND_HOME)
+        ends = np.empty((len(kinds), 4))
+        for axis in range(4):
+            value = values[:, axis]
+            given = ~np.isnan(value)
+            axis_absolute = absolute if axis < 3 else absolute_e
+            reset = given & ((is_motion & axis_absolute) | resets_all)
+            steps = np.cumsum(np.where(given & is_motion & ~axis_absolute, value, 0.0))
+            last = np.where(reset, np.arange(len(kinds)), -1)
+            np.maximum.accumulate(last, out=last)
+            base = np.maximum(last, 0)
+            ends[:, axis] = np.where(
+                last >= 0, value[base] + steps - steps[base], self.position[axis] + steps
+            )
+        starts = np.vstack((self.position, ends[:-1]))
+        self.position = ends[-1].copy()
+        delta = np.where(is_motion[:, None], ends - starts, 0.0)
+
+        self._account_extrusion(is_motion, starts, ends, delta, tool)
+
+        # Rows the planner times: moves with length, dwells and homing
+        planar = np.hypot(delta[:, 0], delta[:, 1])
+        length = np.sqrt(planar ** 2 + delta[:, 2] ** 2)
+        entry_dir = np.divide(delta[:, :3], length[:, None], out=np.zeros((len(kinds), 3)), where=length[:, None] > 0)
+        exit_dir = entry_dir.copy()
+        nominal = np.maximum(feedrate / 60, MIN_SPEED)
+        accel = np.where(delta[:, 3] != 0, print_accel, travel_accel)
+        accel = np.clip(accel, 1.0, self.limits.max_acceleration)
+
+        arcs = np.flatnonzero((kinds == 2) | (kinds == 3))
+        if len(arcs):
+            self._shape_arcs(arcs, kinds, values, delta, length, entry_dir, exit_dir, nominal, accel)
+
+        e_only = is_motion & (length == 0) & (delta[:, 3] != 0)
+        length = np.where(e_only, np.abs(delta[:, 3]), length)
+        timed = (is_motion & (length > 0)) | (kinds == KIND_DWELL) | (kinds == KIND_HOME)
+        stops = ~is_motion | e_only
+
+        # Per-axis speed limits
+        nominal = np.minimum(nominal, self.limits.max_velocity)
+        z_share = np.divide(np.abs(delta[:, 2]), length, out=np.zeros(len(kinds)), where=length > 0)
+        nominal = np.where(
+            z_share > 0,
+            np.minimum(nominal, self.limits.max_z_velocity / np.maximum(z_share, 1e-12)),
+            nominal,
+        )
+        self.move_count += int(np.count_nonzero(is_motion & (length > 0)))
+
+        index = np.flatnonzero(timed)
+        if len(index) == 0:
+            return
+        dwell = np.where(kinds == KIND_DWELL, np.nan_to_num(rows.arguments[:, 0]), 0.0)[index]
+        layer = self._layer_of(is_motion, delta, ends)[index]
+        nominal2 = np.where(stops[index], 0.0, nominal[index] ** 2)
+        junction2 = self._junctions(
+            entry_dir[index], exit_dir[index], length[index], nominal2, accel[index], stops[index]
+        )
+        self._plan_rows({
+            "length": length[index],
+            "nominal2": np.where(e_only[index], nominal[index] ** 2, nominal2),
+            "accel": accel[index],
+            "junction2": junction2,
+            "dwell": np.maximum(dwell, 0.0),
+            "layer": layer,
+        }, final=False)
+
+    def finish(self) -> None:
+        """Settle the moves still held at the end of the program."""
+        if self.held:
+            held, self.held = self.held, {}
+            self._plan_rows(held, final=True)
+
+    def _account_extrusion(self, is_motion, starts, ends, delta, tool) -> None:
+        """Add up extrusion per tool and the extruded bounds."""
+        extrusion = delta[:, 3]
+        tools = np.maximum(tool, 0).astype(np.int64)
+        totals = np.bincount(tools[is_motion], weights=extrusion[is_motion], minlength=1)
+        for t in np.flatnonzero(totals):
+            self.extrusion_by_tool[int(t)] = self.extrusion_by_tool.get(int(t), 0.0) + float(totals[t])
+
+        extruding = is_motion & (extrusion > 0) & (np.hypot(delta[:, 0], delta[:, 1]) > 0)
+        if extruding.any():
+            for axis in range(3):
+                low, high = starts[extruding, axis], ends[extruding, axis]
+                self.minimum[axis] = min(self.minimum[axis], low.min(), high.min())
+                self.maximum[axis] = max(self.maximum[axis], low.max(), high.max())
+
+    def _layer_of(self, is_motion: np.ndarray, delta: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """
+        Layer index of every row, counting new layers as extrusion changes height.
+
+        Travel between layers belongs to the layer before; rows before the
+        first extrusion belong to the first layer.
+        """
+        extruding = is_motion & (delta[:, 3] > 0) & (np.hypot(delta[:, 0], delta[:, 1]) > 0)
+        z = ends[extruding, 2]
+        previous = np.concatenate(([self.last_extrusion_z], z[:-1]))
+        new_layer = ~(np.abs(z - previous) <= LAYER_TOLERANCE)
+
+        starts = np.zeros(len(is_motion), dtype=np.int64)
+        starts[np.flatnonzero(extruding)[new_layer]] = 1
+        layer = len(self.layer_z) - 1 + np.cumsum(starts)
+
+        if len(z):
+            self.layer_z.extend(z[new_layer].tolist())
+            self.last_extrusion_z = float(z[-1])
+            self._grow_layers(len(self.layer_z))
+
+        layer = np.maximum(layer, 0)
+        if self.layer_z:
+            self.layer_extrusion += np.bincount(
+                layer, weights=np.where(is_motion, delta[:, 3], 0.0), minlength=len(self.layer_z)
+            )
+        return layer
+
+    def _grow_layers(self, count: int) -> None:
+        """Make room for per-layer totals."""
+        if count > len(self.layer_time):
+            grow = count - len(self.layer_time)
+            self.layer_time = np.append(self.layer_time, np.zeros(grow))
+            self.layer_extrusion = np.append(self.layer_extrusion, np.zeros(grow))
+
+    def _shape_arcs(self, arcs, kinds, values, delta, length, entry_dir, exit_dir, nominal, accel) -> None:
+        """Replace chords with arc lengths, end tangents and a centripetal speed limit."""
+        offset = np.nan_to_num(values[arcs][:, 5:7])
+        radius = np.hypot(offset[:, 0], offset[:, 1])
+        arcs, offset, radius = arcs[radius > 0], offset[radius > 0], radius[radius > 0]
+        if len(arcs) == 0:
+            return
+
+        start_radial = -offset
+        end_radial = delta[arcs, :2] - offset
+        angle = np.arctan2(
+            start_radial[:, 0] * end_radial[:, 1] - start_radial[:, 1] * end_radial[:, 0],
+            np.einsum("ij,ij->i", start_radial, end_radial),
+        )
+        clockwise = kinds[arcs] == 2
+        angle = np.where(clockwise & (angle >= 0), angle - 2 * np.pi, angle)
+        angle = np.where(~clockwise & (angle <= 0), angle + 2 * np.pi, angle)
+        planar = np.abs(angle) * radius
+        dz = delta[arcs, 2]
+        arc_length = np.hypot(planar, dz)
+        length[arcs] = arc_length
+
+        turn = np.where(clockwise, -1.0, 1.0)[:, None]
+        for radial, directions in ((start_radial, entry_dir), (end_radial, exit_dir)):
+            norm = np.maximum(np.hypot(radial[:, 0], radial[:, 1]), 1e-12)[:, None]
+            tangent = turn * np.column_stack((-radial[:, 1], radial[:, 0])) / norm
+            directions[arcs, :2] = tangent * (planar / arc_length)[:, None]
+            directions[arcs, 2] = dz / arc_length
+        nominal[arcs] = np.minimum(nominal[arcs], np.sqrt(accel[arcs] * radius))
+
+    def _junctions(self, entry_dir, exit_dir, length, nominal2, accel, stops) -> np.ndarray:
+        """
+        Squared speed limit at the start of each move.
+
+        Junction deviation as in Grbl and Marlin, plus Marlin's limit for
+        short segments approximating a curve; a stop on either side of a
+        junction brings the machine to rest.
+        """
+        previous_dir = np.vstack((self.exit_direction, exit_dir[:-1]))
+        previous_nominal2 = np.concatenate(([self.exit_nominal2], nominal2[:-1]))
+        previous_stops = np.concatenate(([self.exit_stops], stops[:-1]))
+        self.exit_direction = exit_dir[-1].copy()
+        self.exit_nominal2 = float(nominal2[-1])
+        self.exit_stops = bool(stops[-1])
+
+        cos_turn = np.clip(np.einsum("ij,ij->i", previous_dir, entry_dir), -1.0, 1.0)
+        sin_half = np.sqrt(0.5 * (1.0 + cos_turn))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            deviation = accel * self.limits.junction_deviation * sin_half / (1.0 - sin_half)
+            turn = np.arccos(cos_turn)
+            curve = accel * length / turn
+        limit = np.minimum(np.where(sin_half < 1.0, deviation, np.inf), np.where(turn > 0, curve, np.inf))
+        limit = np.minimum(limit, np.minimum(nominal2, previous_nominal2))
+        return np.where(stops | previous_stops | (cos_turn <= -0.999999), 0.0, limit)
+
+    def _plan_rows(self, rows: Dict[str, np.ndarray], final: bool) -> None:
+        """Plan rows after those held back, and account the settled ones."""
+        if self.held:
+            rows = {name: np.concatenate((self.held[name], rows[name])) for name in rows}
+        times, settled, self.entry2 = _plan(
+            rows["length"], rows["nominal2"], rows["accel"], rows["junction2"], self.entry2, final
+        )
+        if settled < len(rows["length"]):
+            self.held = {name: array[settled:] for name, array in rows.items()}
+        else:
+            self.held = {}
+
+        times = times + rows["dwell"][:settled]
+        self.total_time += float(times.sum())
+        if len(self.layer_z):
+            layer = np.minimum(rows["layer"][:settled], len(self.layer_z) - 1)
+            self.layer_time += np.bincount(layer, weights=times, minlength=len(self.layer_z))[:len(self.layer_z)]
+
+    def result(self, bytes_parsed: int, seconds: float) -> GcodeAnalysis:
+        """Summarize the program."""
+        limits = self.limits
+        layers = []
+        histogram: Dict[float, int] = {}
+        for i, z in enumerate(self.layer_z):
+            height = z - self.layer_z[i - 1] if i > 0 and z > self.layer_z[i - 1] else z
+            layers.append(LayerStats(
+                number=i + 1,
+                z=round(z, 6),
+                height=round(height, 6),
+                time_seconds=float(self.layer_time[i]),
+                extrusion_mm=float(self.layer_extrusion[i]),
+            ))
+            bucket = round(round(height / HISTOGRAM_STEP) * HISTOGRAM_STEP, 6)
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+
+        by_tool = {tool: length for tool, length in sorted(self.extrusion_by_tool.items()) if length != 0}
+        extrusion = sum(by_tool.values())
+        has_bounds = bool(np.all(np.isfinite(self.minimum)))
+        return GcodeAnalysis(
+            total_time_seconds=self.total_time,
+            extrusion_mm=extrusion,
+            filament_grams=limits.grams(extrusion),
+            extrusion_by_tool=by_tool,
+            grams_by_tool={tool: limits.grams(length) for tool, length in by_tool.items()},
+            layers=layers,
+            layer_height_histogram=dict(sorted(histogram.items())),
+            minimum=tuple(float(v) for v in self.minimum) if has_bounds else (0.0, 0.0, 0.0),
+            maximum=tuple(float(v) for v in self.maximum) if has_bounds else (0.0, 0.0, 0.0),
+            move_count=self.move_count,
+            bytes_parsed=bytes_parsed,
+            parse_seconds=seconds,
+        )
+
+
+# ==================== Analysis ====================
+
+_cache_lock = threading.Lock()
+_analysis_cache: "OrderedDict[tuple, GcodeAnalysis]" = OrderedDict()
+_hashes: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()  # (path, size, mtime) -> content hash
+
+
+def analyze_gcode(
+    path: Union[str, Path],
+    limits: Optional[MotionLimits] = None,
+    workers: int = 1,
+    use_cache: bool = True,
+    chunk_bytes: int = CHUNK_BYTES,
+) -> GcodeAnalysis:
+    """
+    Analyze a G-code file.
+
+    Args:
+        path: Path to the G-code file
+        limits: Machine limits (default: MotionLimits())
+        workers: Processes parsing chunks in parallel
+        use_cache: Reuse the result for a file with the same content
+        chunk_bytes: Bytes parsed per chunk
+
+    Returns:
+        Time, filament and layer statistics; cached results are shared
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"G-code file not found: {path}")
+    limits = limits or MotionLimits()
+
+    key = None
+    if use_cache:
+        key = (_content_hash(path), limits, ANALYZER_VERSION)
+        cached = _recall(key)
+        if cached is not None:
+            return cached
+
+    size = path.stat().st_size
+    if size == 0:
+        analysis = _Analyzer(limits).result(0, 0.0)
+    else:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            bounds = _chunk_bounds(mapped, size, chunk_bytes)
+            if workers > 1 and len(bounds) > 1:
+                with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as executor:
+                    tasks = [(str(path), start, stop) for start, stop in bounds]
+                    analysis = _analyze_rows(executor.map(_parse_file_range, tasks), size, limits)
+            else:
+                chunks = (_parse_chunk(_padded(mapped, start, stop)) for start, stop in bounds)
+                analysis = _analyze_rows(chunks, size, limits)
+
+    logger.debug(
+        f"Analyzed {path.name}: {analysis.move_count} moves, {analysis.total_layers} layers "
+        f"in {analysis.parse_seconds:.2f}s"
+    )
+    if key is not None:
+        analysis.content_hash = key[0]
+        _remember(key, analysis)
+    return analysis
+
+
+def analyze_gcode_bytes(
+    data: bytes,
+    limits: Optional[MotionLimits] = None,
+    chunk_bytes: int = CHUNK_BYTES,
+) -> GcodeAnalysis:
+    """
+    Analyze G-code held in memory, such as a plate read from a 3MF.
+
+    Args:
+        data: G-code text
+        limits: Machine limits (default: MotionLimits())
+        chunk_bytes: Bytes parsed per chunk
+
+    Returns:
+        Time, filament and layer statistics
+    """
+    limits = limits or MotionLimits()
+    bounds = _chunk_bounds(data, len(data), chunk_bytes)
+    return _analyze_rows((_parse_chunk(_padded(data, start, stop)) for start, stop in bounds), len(data), limits)
+
+
+def read_3mf_gcode(path: Union[str, Path], plate: Optional[int] = None) -> Optional[bytes]:
+    """
+    Read the sliced G-code stored in a 3MF, as Bambu Studio and OrcaSlicer export it.
+
+    Args:
+        path: Path to the 3MF file
+        plate: Plate number (default: the first plate with G-code)
+
+    Returns:
+        G-code text, or None if the file holds no sliced plate
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            plates = {}
+            for name in archive.namelist():
+                stem = Path(name).name
+                if name.startswith("Metadata/") and stem.startswith("plate_") and stem.endswith(".gcode"):
+                    number = stem[len("plate_"):-len(".gcode")]
+                    if number.isdigit():
+                        plates[int(number)] = name
+            if not plates:
+                return None
+            chosen = plates.get(plate) if plate is not None else plates[min(plates)]
+            return archive.read(chosen) if chosen else None
+    except (OSError, zipfile.BadZipFile) as e:
+        logger.warning(f"Could not read G-code from {path}: {e}")
+        return None
+
+
+def analyze_3mf(
+    path: Union[str, Path],
+    limits: Optional[MotionLimits] = None,
+    plate: Optional[int] = None,
+    use_cache: bool = True,
+) -> Optional[GcodeAnalysis]:
+    """
+    Analyze the sliced G-code of a 3MF.
+
+    Args:
+        path: Path to the 3MF file
+        limits: Machine limits (default: MotionLimits())
+        plate: Plate number (default: the first plate with G-code)
+        use_cache: Reuse the result for a file with the same content
+
+    Returns:
+        Time, filament and layer statistics, or None if the 3MF is unsliced
+    """
+    path = Path(path)
+    limits = limits or MotionLimits()
+
+    key = None
+    if use_cache and path.exists():
+        key = (_content_hash(path), limits, ANALYZER_VERSION, plate)
+        cached = _recall(key)
+        if cached is not None:
+            return cached
+
+    data = read_3mf_gcode(path, plate)
+    if data is None:
+        return None
+    analysis = analyze_gcode_bytes(data, limits)
+    if key is not None:
+        analysis.content_hash = key[0]
+        _remember(key, analysis)
+    return analysis
+
+
+def clear_analysis_cache() -> None:
+    """Forget cached analyses and file hashes."""
+    with _cache_lock:
+        _analysis_cache.clear()
+        _hashes.clear()
+
+
+def _analyze_rows(chunks: Iterator[_Rows], size: int, limits: MotionLimits) -> GcodeAnalysis:
+    """Run parsed chunks through the analyzer in order."""
+    started = time.perf_counter()
+    analyzer = _Analyzer(limits)
+    for rows in chunks:
+        analyzer.feed(rows)
+    analyzer.finish()
+    return analyzer.result(size, time.perf_counter() - started)
+
+
+def _content_hash(path: Path) -> str:
+    """Content hash of a file, remembered while its size and mtime are unchanged."""
+    stat = path.stat()
+    stamp = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _cache_lock:
+        digest = _hashes.get(stamp)
+        if digest is not None:
+            _hashes.move_to_end(stamp)
+    if digest is None:
+        digest = file_hash(path)
+        with _cache_lock:
+            _hashes[stamp] = digest
+            while len(_hashes) > HASH_ENTRIES:
+                _hashes.popitem(last=False)
+    return digest
+
+
+def _recall(key: tuple) -> Optional[GcodeAnalysis]:
+    """Look up a cached analysis."""
+    with _cache_lock:
+        analysis = _analysis_cache.get(key)
+        if analysis is not None:
+            _analysis_cache.move_to_end(key)
+        return analysis
+
+
+def _remember(key: tuple, analysis: GcodeAnalysis) -> None:
+    """Keep an analysis in the in-memory LRU."""
+    with _cache_lock:
+        _analysis_cache[key] = analysis
+        _analysis_cache.move_to_end(key)
+        while len(_analysis_cache) > CACHE_ENTRIES:
+            _analysis_cache.popitem(last=False)
+
+
+# ==================== Benchmark ====================
+
+
+def write_sample_gcode(
+    path: Union[str, Path],
+    megabytes: float,
+    layer_height: float = 0.2,
+    seed: int = 0,
+) -> int:
+    """
+    Write a synthetic sliced-looking G-code file of roughly the given size.
+
+    Each layer is a perimeter loop and zig-zag infill with retracted
+    travel between them, in relative extrusion.
+
+    Args:
+        path: Output path
+        megabytes: Approximate file size in MB
+        layer_height: Layer height in mm
+        seed: Random seed for the infill density
+
+    Returns:
+        Number of layers written
+    """
+    rng = np.random.default_rng(seed)
+    target = int(megabytes * 1024 * 1024)
+    written = 0
+    layer = 0
+    with open(path, "w") as f:
+        header = "; synthetic benchmark G-code\nG28\nG90\nM83\nM204 S5000\nG1 Z0.2 F720\n"
+        f.write(header)
+        written += len(header)
+        while written < target:
+            layer += 1
+            z = layer * layer_height
+            lines = [f";LAYER_CHANGE\nG1 E-0.8 F2400\nG1 Z{z:.2f} F720\nG0 X20 Y20 F12000\nG1 E0.8 F2400\n"]
+            for x, y in ((180, 20), (180, 180), (20, 180), (20, 20)):
+                lines.append(f"G1 X{x} Y{y} E{160 * 0.0332:.5f} F3000\n")
+            spacing = rng.uniform(0.4, 0.8)
+            ys = np.arange(22.0, 178.0, spacing)
+            xs = np.where(np.arange(len(ys)) % 2 == 0, 178.0, 22.0)
+            lines.append("G1 X22 Y22 F12000\n")
+            lines.extend(f"G1 X{x:.3f} Y{y:.3f} E{156 * 0.0332:.5f} F6000\n" for x, y in zip(xs, ys))
+            text = "".join(lines)
+            f.write(text)
+            written += len(text)
+    return layer
+
+
+def benchmark_analyzer(
+    sizes_mb: Sequence[float] = (8, 32),
+    workers: int = 1,
+    seed: int = 0,
+) -> List[Dict[str, float]]:
+    """
+    Time the analyzer on synthetic G-code files of growing size.
+
+    Args:
+        sizes_mb: File sizes in MB
+        workers: Processes parsing chunks in parallel
+        seed: Random seed for the sample files
+
+    Returns:
+        One row per size with megabytes, moves, layers, time and throughput
+    """
+    import tempfile
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for megabytes in sizes_mb:
+            path = Path(tmp) / f"sample_{megabytes}.gcode"
+            write_sample_gcode(path, megabytes, seed=seed)
+            size = path.stat().st_size
+
+            start = time.perf_counter()
+            analysis = analyze_gcode(path, workers=workers, use_cache=False)
+            elapsed = time.perf_counter() - start
+            rows.append({
+                "megabytes": size / (1024 * 1024),
+                "moves": analysis.move_count,
+                "layers": analysis.total_layers,
+                "time": elapsed,
+                "mb_per_second": size / (1024 * 1024) / elapsed if elapsed > 0 else float("inf"),
+            })
+    return rows
+
+
+def format_analyzer_benchmark(rows: Sequence[Dict[str, float]]) -> str:
+    """Format benchmark rows as a text table."""
+    lines = [f"{'MB':>8} {'Moves':>10} {'Layers':>7} {'Seconds':>9} {'MB/s':>8}"]
+    for row in rows:
+        lines.append(
+            f"{row['megabytes']:>8.1f} {row['moves']:>10} {row['layers']:>7} "
+            f"{row['time']:>9.3f} {row['mb_per_second']:>8.1f}"
+        )
+    return "\n".join(lines)
@@ -17,6 +17,12 @@ from .projection import (
     project_to_2d,
     project_outline,
 )
+from .silhouette import (
+    VIEW_PROJECTIONS,
+    outline_loops,
+    silhouette_edges,
+    stitch_segments,
+)
 from .svg_export import (
     SVGExporter,
     export_to_svg,
@@ -40,12 +46,19 @@ from .job_control import (
     LaserJobController,
     create_laser_job,
 )
+from .path_ordering import (
+    EntryGrid,
+    nearest_neighbour_tour,
+    order_paths,
+    benchmark_ordering,
+)
 from .path_optimizer import (
     PathOptimizer,
     OptimizedPathSet,
     OptimizationStats,
     optimize_paths,
     format_optimization_stats,
+    rdp_keep,
 )
 
 __all__ = [
@@ -59,6 +72,11 @@ __all__ = [
     "ProjectionResult",
     "project_to_2d",
     "project_outline",
+    # Silhouette
+    "VIEW_PROJECTIONS",
+    "outline_loops",
+    "silhouette_edges",
+    "stitch_segments",
     # SVG Export
     "SVGExporter",
     "export_to_svg",
@@ -78,10 +96,16 @@ __all__ = [
     "LaserJobStatus",
     "LaserJobController",
     "create_laser_job",
+    # Path Ordering
+    "EntryGrid",
+    "nearest_neighbour_tour",
+    "order_paths",
+    "benchmark_ordering",
     # Path Optimizer
     "PathOptimizer",
     "OptimizedPathSet",
     "OptimizationStats",
     "optimize_paths",
     "format_optimization_stats",
+    "rdp_keep",
 ]
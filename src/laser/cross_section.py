@@ -3,23 +3,37 @@ Cross-Section Tool for Laser Cutting.
 
 Creates 2D cross-sections from 3D models at specified heights or planes.
 Used to generate laser cutting paths from 3D objects.
+
+Sections are cut from plain triangle arrays with the sweep-line slicer, so
+Blender objects, MeshData and mesh files all go through the same headless
+engine. Contours are linked through shared mesh edges and keep holes and
+concave outlines.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Any, Sequence
 from pathlib import Path
 import math
 
+import numpy as np
+
+from src.mesh_io import MeshData, load_mesh_features, merge_duplicate_vertices
+
 # Try to import Blender modules
 try:
     import bpy
-    import bmesh
-    from mathutils import Vector, Matrix
-    from mathutils.geometry import intersect_line_plane
     HAS_BLENDER = True
 except ImportError:
     HAS_BLENDER = False
 
+from src.slicing.slicer import MeshSlicer
+
+# Coordinate order that puts each cutting axis on Z, and whether it mirrors the mesh
+_AXIS_ORDER = {
+    'X': ([1, 2, 0], False),
+    'Y': ([0, 2, 1], True),
+}
+
 
 @dataclass
 class Path2D:
@@ -62,7 +76,7 @@ class CrossSectionTool:
         Initialize cross-section tool.
 
         Args:
-            tolerance: Distance tolerance for point merging
+            tolerance: Contours enclosing less than tolerance² are dropped
         """
         self.tolerance = tolerance
 
@@ -71,141 +85,82 @@ class CrossSectionTool:
         Create cross-section at specified height.
 
         Args:
-            obj: Blender mesh object
+            obj: Blender mesh object, MeshData or path to a mesh file
             height: Height along axis for the cutting plane
             axis: Axis perpendicular to cutting plane ('X', 'Y', 'Z')
 
         Returns:
             CrossSectionResult with paths
         """
-        if not HAS_BLENDER:
-            raise RuntimeError("This function requires Blender")
-
-        mesh = obj.data
-        world_matrix = obj.matrix_world
-
-        # Define cutting plane
-        axis = axis.upper()
-        if axis == 'X':
-            plane_normal = Vector((1, 0, 0))
-            plane_point = Vector((height, 0, 0))
-            project = lambda v: (v.y, v.z)
-        elif axis == 'Y':
-            plane_normal = Vector((0, 1, 0))
-            plane_point = Vector((0, height, 0))
-            project = lambda v: (v.x, v.z)
-        else:  # Z
-            plane_normal = Vector((0, 0, 1))
-            plane_point = Vector((0, 0, height))
-            project = lambda v: (v.x, v.y)
-
-        # Find intersection points with each edge
-        edge_intersections = []
-
-        for edge in mesh.edges:
-            v0 = world_matrix @ mesh.vertices[edge.vertices[0]].co
-            v1 = world_matrix @ mesh.vertices[edge.vertices[1]].co
-
-            intersection = intersect_line_plane(v0, v1, plane_point, plane_normal)
-
-            if intersection is not None:
-                # Check if intersection is within edge bounds
-                edge_vec = v1 - v0
-                if edge_vec.length > 0:
-                    t = (intersection - v0).dot(edge_vec) / edge_vec.dot(edge_vec)
-                    if -self.tolerance <= t <= 1 + self.tolerance:
-                        # Project to 2D
-                        point_2d = project(intersection)
-                        edge_intersections.append({
-                            'point': point_2d,
-                            'edge_key': tuple(sorted(edge.vertices)),
-                            'intersection_3d': intersection,
-                        })
-
-        # Build paths from intersections
-        paths = self._build_paths_from_intersections(edge_intersections, mesh, world_matrix, project)
-
-        # Calculate bounding box
-        all_points = [p for path in paths for p in path.points]
-        if all_points:
-            min_x = min(p[0] for p in all_points)
-            min_y = min(p[1] for p in all_points)
-            max_x = max(p[0] for p in all_points)
-            max_y = max(p[1] for p in all_points)
-            bbox = (min_x, min_y, max_x, max_y)
-        else:
-            bbox = (0, 0, 0, 0)
-
-        return CrossSectionResult(
-            paths=paths,
-            height=height,
-            bounding_box=bbox
-        )
-
-    def _build_paths_from_intersections(self, intersections: List[Dict],
-                                        mesh, world_matrix, project) -> List[Path2D]:
-        """Build connected paths from intersection points."""
-        if not intersections:
-            return []
+        return self.section_mesh(obj, [height], axis)[0]
+
+    def section_mesh(self, obj, heights: Sequence[float], axis: str = 'Z') -> List[CrossSectionResult]:
+        """
+        Cut a mesh at several heights in one upward sweep.
 
-        # For proper path building, we need to trace through faces
-        # This is a simplified version that groups nearby points
-
-        # Deduplicate points
-        unique_points = []
-        for inter in intersections:
-            point = inter['point']
-            is_dup = False
-            for up in unique_points:
-                if abs(up[0] - point[0]) < self.tolerance and abs(up[1] - point[1]) < self.tolerance:
-                    is_dup = True
-                    break
-            if not is_dup:
-                unique_points.append(point)
-
-        if len(unique_points) < 3:
+        Args:
+            obj: Blender mesh object, MeshData or path to a mesh file
+            heights: Heights along axis for the cutting planes
+            axis: Axis perpendicular to cutting plane ('X', 'Y', 'Z')
+
+        Returns:
+            One CrossSectionResult per height, in the order given
+        """
+        slicer = MeshSlicer(_axis_mesh(as_mesh_data(obj), axis))
+        heights = np.asarray(heights, dtype=np.float64).reshape(-1)
+        order = np.argsort(heights, kind="stable")
+
+        results: List[Optional[CrossSectionResult]] = [None] * len(heights)
+        for index, layer in zip(order.tolist(), slicer.iter_layers(heights[order])):
+            paths = self._classify_contours(layer.contours)
+            results[index] = CrossSectionResult(
+                paths=paths,
+                height=float(heights[index]),
+                bounding_box=contour_bounds(layer.contours),
+            )
+
+        return results
+
+    def _classify_contours(self, contours: List[np.ndarray]) -> List[Path2D]:
+        """
+        Mark contours as outlines or holes by how deeply they are nested.
+
+        Contours at an even depth are outlines and are wound counter-clockwise,
+        the ones at an odd depth are holes and are wound clockwise.
+        """
+        contours = [c for c in contours if abs(signed_area(c)) > self.tolerance ** 2]
+        if not contours:
             return []
 
-        # Simple convex hull approach for now
-        # (A full implementation would trace through mesh topology)
-        paths = [self._convex_hull_path(unique_points)]
+        probes = np.array([c[0] for c in contours])
+        depth = np.zeros(len(contours), dtype=np.int64)
+        for index, contour in enumerate(contours):
+            lo = contour.min(axis=0)
+            hi = contour.max(axis=0)
+            candidates = np.flatnonzero(np.all((probes >= lo) & (probes <= hi), axis=1))
+            candidates = candidates[candidates != index]
+            if len(candidates):
+                depth[candidates[_points_inside(probes[candidates], contour)]] += 1
 
+        paths = []
+        for contour, level in zip(contours, depth.tolist()):
+            is_outer = level % 2 == 0
+            if (signed_area(contour) > 0) != is_outer:
+                contour = contour[::-1]
+            paths.append(Path2D(
+                points=[tuple(p) for p in contour.tolist()],
+                is_closed=True,
+                is_outer=is_outer,
+            ))
         return paths
 
-    def _convex_hull_path(self, points: List[Tuple[float, float]]) -> Path2D:
-        """Create convex hull path from points (simplified)."""
-        # Graham scan algorithm for convex hull
-        def cross(o, a, b):
-            return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
-
-        points = sorted(set(points))
-        if len(points) <= 1:
-            return Path2D(points=points, is_closed=True)
-
-        # Build lower hull
-        lower = []
-        for p in points:
-            while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
-                lower.pop()
-            lower.append(p)
-
-        # Build upper hull
-        upper = []
-        for p in reversed(points):
-            while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
-                upper.pop()
-            upper.append(p)
-
-        hull = lower[:-1] + upper[:-1]
-        return Path2D(points=hull, is_closed=True, is_outer=True)
-
     def section_multiple(self, obj, start_height: float, end_height: float,
                         num_sections: int, axis: str = 'Z') -> List[CrossSectionResult]:
         """
         Create multiple cross-sections at regular intervals.
 
         Args:
-            obj: Blender mesh object
+            obj: Blender mesh object, MeshData or path to a mesh file
             start_height: Starting height
             end_height: Ending height
             num_sections: Number of sections to create
@@ -214,15 +169,82 @@ class CrossSectionTool:
         Returns:
             List of CrossSectionResult
         """
-        results = []
         step = (end_height - start_height) / max(num_sections - 1, 1)
+        heights = start_height + np.arange(max(num_sections, 0)) * step
+        return self.section_mesh(obj, heights, axis)
 
-        for i in range(num_sections):
-            height = start_height + i * step
-            result = self.section_at_height(obj, height, axis)
-            results.append(result)
 
-        return results
+def as_mesh_data(obj) -> MeshData:
+    """Welded triangle arrays for a mesh file, MeshData or Blender object."""
+    if isinstance(obj, (str, Path)):
+        return load_mesh_features(obj).mesh
+    if isinstance(obj, MeshData):
+        return merge_duplicate_vertices(obj)
+    if not HAS_BLENDER:
+        raise RuntimeError("This function requires Blender")
+
+    # Blender meshes share vertices between faces, so they are welded already
+    mesh = obj.data
+    mesh.calc_loop_triangles()
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+    mesh.vertices.foreach_get("co", coords)
+    faces = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int64)
+    mesh.loop_triangles.foreach_get("vertices", faces)
+
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    vertices = coords.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+    return MeshData(vertices=vertices, faces=faces.reshape(-1, 3), source=obj.name)
+
+
+def _axis_mesh(mesh: MeshData, axis: str) -> MeshData:
+    """
+    Reorder coordinates so the cutting axis becomes Z.
+
+    The two remaining axes become X and Y in the order of the section
+    projection, X -> (y, z) and Y -> (x, z). The Y order is a mirror image,
+    so its faces are rewound to keep them facing outward.
+    """
+    axis = axis.upper()
+    if axis == 'Z':
+        return mesh
+    if axis not in _AXIS_ORDER:
+        raise ValueError(f"Unknown axis: {axis}")
+
+    order, mirrored = _AXIS_ORDER[axis]
+    return MeshData(
+        vertices=np.asarray(mesh.vertices)[:, order],
+        faces=np.asarray(mesh.faces)[:, ::-1] if mirrored else mesh.faces,
+        source=mesh.source,
+    )
+
+
+def signed_area(points: np.ndarray) -> float:
+    """Shoelace area, positive for counter-clockwise loops."""
+    x, y = points[:, 0], points[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def _points_inside(points: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """Even-odd test of many points against one closed polygon."""
+    a = polygon[None, :, :]
+    b = np.roll(polygon, -1, axis=0)[None, :, :]
+    px = points[:, None, 0]
+    py = points[:, None, 1]
+
+    straddles = (a[..., 1] > py) != (b[..., 1] > py)
+    dy = np.where(straddles, b[..., 1] - a[..., 1], 1.0)
+    x_cross = a[..., 0] + (py - a[..., 1]) * (b[..., 0] - a[..., 0]) / dy
+    return (straddles & (px < x_cross)).sum(axis=1) % 2 == 1
+
+
+def contour_bounds(contours: List[np.ndarray]) -> Tuple[float, float, float, float]:
+    """Bounds of all contours as (min_x, min_y, max_x, max_y)."""
+    if not contours:
+        return (0, 0, 0, 0)
+    points = np.concatenate(contours)
+    lo = points.min(axis=0)
+    hi = points.max(axis=0)
+    return (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
 
 
 def create_cross_section(obj, height: float, axis: str = 'Z') -> CrossSectionResult:
@@ -230,7 +252,7 @@ def create_cross_section(obj, height: float, axis: str = 'Z') -> CrossSectionRes
     Convenience function to create a single cross-section.
 
     Args:
-        obj: Blender mesh object
+        obj: Blender mesh object, MeshData or path to a mesh file
         height: Height for cutting plane
         axis: Axis perpendicular to plane
 
@@ -247,7 +269,7 @@ def create_multiple_sections(obj, start: float, end: float,
     Convenience function to create multiple cross-sections.
 
     Args:
-        obj: Blender mesh object
+        obj: Blender mesh object, MeshData or path to a mesh file
         start: Start height
         end: End height
         count: Number of sections
@@ -7,18 +7,24 @@ Optimizes laser cutting paths to minimize:
 - Material damage from repeated passes
 
 Optimization strategies:
-1. Path ordering (TSP-like nearest neighbor)
+1. Path ordering (grid-indexed nearest neighbor, optional 2-opt/Or-opt)
 2. Path direction optimization (start/end points)
 3. Nested path ordering (inner before outer)
 4. Path simplification (point reduction)
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from typing import List, Tuple, Optional, Set
 import math
-from copy import deepcopy
+
+import numpy as np
 
 from .cross_section import Path2D
+from .path_ordering import order_paths
+
+PARALLEL_MIN_POINTS = 200_000  # Below this, simplifying in-process beats pool startup
+CHUNKS_PER_WORKER = 4  # Path batches handed to each worker process
 
 
 @dataclass
@@ -44,6 +50,9 @@ class PathOptimizer:
     """
     Optimizes laser cutting paths for efficiency.
 
+    Paths are never modified in place: every step returns the input
+    Path2D objects it leaves unchanged and new ones for those it changes.
+
     Usage:
         optimizer = PathOptimizer()
 
@@ -62,7 +71,9 @@ class PathOptimizer:
         self,
         origin: Tuple[float, float] = (0, 0),
         inner_first: bool = True,
-        simplify_tolerance: float = 0.0
+        simplify_tolerance: float = 0.0,
+        refine_time: float = 0.0,
+        workers: int = 1
     ):
         """
         Initialize path optimizer.
@@ -71,10 +82,14 @@ class PathOptimizer:
             origin: Laser starting position (x, y)
             inner_first: Cut inner/nested paths before outer paths
             simplify_tolerance: Point simplification tolerance (0 = no simplification)
+            refine_time: Seconds to spend improving the path order (0 = greedy order only)
+            workers: Processes used to simplify large jobs (1 = in-process)
         """
         self.origin = origin
         self.inner_first = inner_first
         self.simplify_tolerance = simplify_tolerance
+        self.refine_time = refine_time
+        self.workers = workers
 
     def optimize(self, paths: List[Path2D]) -> OptimizedPathSet:
         """
@@ -102,8 +117,8 @@ class PathOptimizer:
         original_travel = self._calculate_travel_distance(paths, self.origin)
         original_count = len(paths)
 
-        # Make copies to avoid modifying originals
-        working_paths = [deepcopy(p) for p in paths]
+        # Steps replace the paths they change, so the inputs are never modified
+        working_paths = list(paths)
 
         # Step 1: Simplify paths if tolerance set
         points_removed = 0
@@ -185,25 +200,50 @@ class PathOptimizer:
         """
         Simplify paths using Ramer-Douglas-Peucker algorithm.
 
+        Large jobs are split into batches simplified in a process pool
+        when ``workers`` is above one.
+
         Returns:
             Tuple of (simplified paths, points removed)
         """
+        arrays = [np.asarray(p.points, dtype=np.float64).reshape(-1, 2) for p in paths]
+        total_points = sum(len(a) for a in arrays)
+
+        if self.workers > 1 and total_points >= PARALLEL_MIN_POINTS:
+            kept = self._simplify_parallel(arrays, tolerance)
+        else:
+            kept = [rdp_keep(a, tolerance) for a in arrays]
+
         total_removed = 0
         simplified = []
 
-        for path in paths:
-            original_count = len(path.points)
-            new_points = self._rdp_simplify(path.points, tolerance)
-            total_removed += original_count - len(new_points)
+        for path, keep in zip(paths, kept):
+            removed = len(path.points) - len(keep)
+            if removed == 0:
+                simplified.append(path)
+                continue
 
+            total_removed += removed
             simplified.append(Path2D(
-                points=new_points,
+                points=[path.points[i] for i in keep.tolist()],
                 is_closed=path.is_closed,
                 is_outer=path.is_outer
             ))
 
         return simplified, total_removed
 
+    def _simplify_parallel(self, arrays: List[np.ndarray], tolerance: float) -> List[np.ndarray]:
+        """Simplify batches of similar point count across worker processes."""
+        sizes = np.cumsum([len(a) for a in arrays])
+        batches = self.workers * CHUNKS_PER_WORKER
+        cuts = np.searchsorted(sizes, np.linspace(0, sizes[-1], batches + 1)[1:-1])
+        bounds = [0] + sorted(set(cuts.tolist())) + [len(arrays)]
+        chunks = [arrays[a:b] for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            results = pool.map(_simplify_chunk, chunks, [tolerance] * len(chunks))
+            return [keep for chunk in results for keep in chunk]
+
     def _rdp_simplify(
         self,
         points: List[Tuple[float, float]],
@@ -213,45 +253,8 @@ class PathOptimizer:
         if len(points) <= 2:
             return points
 
-        # Find point with maximum distance from line between first and last
-        max_dist = 0
-        max_idx = 0
-
-        p1 = points[0]
-        p2 = points[-1]
-
-        for i in range(1, len(points) - 1):
-            dist = self._point_to_line_distance(points[i], p1, p2)
-            if dist > max_dist:
-                max_dist = dist
-                max_idx = i
-
-        # If max distance is greater than tolerance, recursively simplify
-        if max_dist > tolerance:
-            left = self._rdp_simplify(points[:max_idx + 1], tolerance)
-            right = self._rdp_simplify(points[max_idx:], tolerance)
-            return left[:-1] + right
-        else:
-            return [points[0], points[-1]]
-
-    def _point_to_line_distance(
-        self,
-        point: Tuple[float, float],
-        line_start: Tuple[float, float],
-        line_end: Tuple[float, float]
-    ) -> float:
-        """Calculate perpendicular distance from point to line."""
-        x0, y0 = point
-        x1, y1 = line_start
-        x2, y2 = line_end
-
-        # Line length
-        line_len = self._distance(line_start, line_end)
-        if line_len == 0:
-            return self._distance(point, line_start)
-
-        # Calculate perpendicular distance using cross product
-        return abs((y2 - y1) * x0 - (x2 - x1) * y0 + x2 * y1 - y2 * x1) / line_len
+        keep = rdp_keep(np.asarray(points, dtype=np.float64), tolerance)
+        return [points[i] for i in keep.tolist()]
 
     def _order_nested_paths(self, paths: List[Path2D]) -> List[Path2D]:
         """
@@ -297,56 +300,43 @@ class PathOptimizer:
         """
         Optimize path order using nearest neighbor heuristic.
 
-        This is a greedy approximation to the Traveling Salesman Problem.
+        This is a greedy approximation to the Traveling Salesman Problem,
+        using a grid index over path entry points and, if ``refine_time``
+        is set, improved by 2-opt/Or-opt. Closed paths are rotated to
+        start at their entry point and open paths reversed if entered at
+        their end.
         """
         if len(paths) <= 1:
             return paths
 
-        remaining = set(range(len(paths)))
-        ordered = []
-        current_pos = self.origin
-
-        while remaining:
-            # Find nearest path
-            best_idx = None
-            best_dist = float('inf')
-
-            for idx in remaining:
-                path = paths[idx]
-                if not path.points:
-                    continue
+        order, entries = order_paths(
+            [p.points for p in paths],
+            [p.is_closed for p in paths],
+            origin=self.origin,
+            time_limit=self.refine_time,
+        )
 
-                # Check distance to path start
-                dist_to_start = self._distance(current_pos, path.points[0])
-                if dist_to_start < best_dist:
-                    best_dist = dist_to_start
-                    best_idx = idx
-
-                # For closed paths, also check distance to any point
-                # (we can start anywhere on a closed path)
-                if path.is_closed:
-                    for point in path.points:
-                        dist = self._distance(current_pos, point)
-                        if dist < best_dist:
-                            best_dist = dist
-                            best_idx = idx
-
-            if best_idx is not None:
-                remaining.remove(best_idx)
-                ordered.append(paths[best_idx])
-
-                # Update current position
-                path = paths[best_idx]
-                if path.is_closed:
-                    current_pos = path.points[0]
-                else:
-                    current_pos = path.points[-1]
+        ordered = []
+        for idx, vertex in zip(order, entries):
+            path = paths[idx]
+            if vertex == 0:
+                ordered.append(path)
+            elif path.is_closed:
+                ordered.append(Path2D(
+                    points=path.points[vertex:] + path.points[:vertex],
+                    is_closed=True,
+                    is_outer=path.is_outer
+                ))
             else:
-                # Handle empty paths
-                for idx in list(remaining):
-                    remaining.remove(idx)
-                    ordered.append(paths[idx])
+                ordered.append(Path2D(
+                    points=list(reversed(path.points)),
+                    is_closed=False,
+                    is_outer=path.is_outer
+                ))
 
+        # Empty paths go last
+        visited = set(order)
+        ordered.extend(p for i, p in enumerate(paths) if i not in visited)
         return ordered
 
     def _optimize_directions(self, paths: List[Path2D]) -> List[Path2D]:
@@ -379,6 +369,11 @@ class PathOptimizer:
                         best_idx = i
 
                 # Rotate points to start at best_idx
+                if best_idx == 0:
+                    optimized.append(path)
+                    current_pos = path.points[0]
+                    continue
+
                 new_points = path.points[best_idx:] + path.points[:best_idx]
                 optimized.append(Path2D(
                     points=new_points,
@@ -412,7 +407,9 @@ def optimize_paths(
     paths: List[Path2D],
     origin: Tuple[float, float] = (0, 0),
     inner_first: bool = True,
-    simplify_tolerance: float = 0.0
+    simplify_tolerance: float = 0.0,
+    refine_time: float = 0.0,
+    workers: int = 1
 ) -> OptimizedPathSet:
     """
     Convenience function to optimize laser paths.
@@ -422,6 +419,8 @@ def optimize_paths(
         origin: Laser starting position
         inner_first: Cut inner paths before outer
         simplify_tolerance: Point simplification tolerance (0 = none)
+        refine_time: Seconds to spend improving the path order (0 = none)
+        workers: Processes used to simplify large jobs (1 = in-process)
 
     Returns:
         OptimizedPathSet with optimized paths and stats
@@ -429,11 +428,64 @@ def optimize_paths(
     optimizer = PathOptimizer(
         origin=origin,
         inner_first=inner_first,
-        simplify_tolerance=simplify_tolerance
+        simplify_tolerance=simplify_tolerance,
+        refine_time=refine_time,
+        workers=workers
     )
     return optimizer.optimize(paths)
 
 
+def rdp_keep(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Ramer-Douglas-Peucker simplification of a polyline.
+
+    Iterative: spans still to split are kept on a stack, and the distances
+    of all points in a span to its chord are computed at once.
+
+    Args:
+        points: (N, 2) polyline vertices
+        tolerance: Maximum distance of a dropped point from the result
+
+    Returns:
+        Sorted indices of the points to keep
+    """
+    n = len(points)
+    if n <= 2:
+        return np.arange(n)
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        start = points[first]
+        chord = points[last] - start
+        rel = points[first + 1:last] - start
+        length = math.hypot(chord[0], chord[1])
+        if length > 0:
+            dist = np.abs(rel[:, 0] * chord[1] - rel[:, 1] * chord[0]) / length
+        else:
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+
+        idx = int(np.argmax(dist))
+        if dist[idx] > tolerance:
+            split = first + 1 + idx
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+
+    return np.flatnonzero(keep)
+
+
+def _simplify_chunk(arrays: List[np.ndarray], tolerance: float) -> List[np.ndarray]:
+    """Simplify a batch of polylines (runs in a worker process)."""
+    return [rdp_keep(a, tolerance) for a in arrays]
+
+
 def format_optimization_stats(stats: OptimizationStats) -> str:
     """Format optimization statistics as human-readable string."""
     return (
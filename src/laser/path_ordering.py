@@ -0,0 +1,549 @@
+"""
+Path Ordering for Laser Jobs.
+
+Orders cutting paths to shorten the non-cutting travel between them:
+
+1. Nearest neighbour seed: a uniform grid over every point where a path
+   can be entered (any vertex of a closed path, either end of an open
+   one) answers "nearest unvisited entry" queries by searching rings of
+   cells outward, so each step only looks at the neighbourhood.
+2. Optional refinement: 2-opt (reverse a run of paths) and Or-opt (move
+   a run of up to three paths) within a window of tour positions. Each
+   round scores every move at once with NumPy and applies the improving
+   moves that do not touch each other, until nothing improves or the
+   time budget runs out.
+
+Reversing a run also reverses the direction each open path in it is cut.
+"""
+
+import math
+import random
+import time
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+Point = Tuple[float, float]
+
+ENTRIES_PER_CELL = 2.0  # Target average of entry points per grid cell
+TWO_OPT_WINDOW = 32  # Tour positions a reversed run may span
+OR_OPT_WINDOW = 24  # Tour positions a moved run may travel
+OR_OPT_MAX_RUN = 3  # Longest run of paths Or-opt moves
+
+_EPSILON = 1e-9
+
+
+class EntryGrid:
+    """
+    Uniform grid over path entry points with nearest-unvisited queries.
+
+    Visited paths are dropped lazily; the grid is rebuilt with larger cells
+    once most of its points are gone, which keeps ring searches short.
+    """
+
+    def __init__(self, points: np.ndarray, owners: np.ndarray):
+        """
+        Build the grid.
+
+        Args:
+            points: (M, 2) entry point coordinates
+            owners: (M,) index of the path each point belongs to
+        """
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.owners = np.asarray(owners, dtype=np.int64)
+        self._xs = self.points[:, 0].tolist()
+        self._ys = self.points[:, 1].tolist()
+        self._owner = self.owners.tolist()
+
+        count = int(self.owners.max()) + 1 if len(self.owners) else 0
+        self._alive = [True] * count
+        self._alive_points = len(self.points)
+
+        order = np.argsort(self.owners, kind="stable")
+        bounds = np.searchsorted(self.owners[order], np.arange(count + 1))
+        self._owned = [order[a:b].tolist() for a, b in zip(bounds[:-1], bounds[1:])]
+
+        self._build(np.arange(len(self.points)))
+
+    @property
+    def remaining(self) -> int:
+        """Number of entry points of unvisited paths."""
+        return self._alive_points
+
+    def nearest(self, x: float, y: float) -> int:
+        """
+        Find the nearest entry point of an unvisited path.
+
+        Args:
+            x: Query X
+            y: Query Y
+
+        Returns:
+            Point index, or -1 if every path has been visited
+        """
+        if self._alive_points == 0:
+            return -1
+
+        cell = self._cell
+        cx = math.floor((x - self._x0) / cell)
+        cy = math.floor((y - self._y0) / cell)
+        gw, gh = self._gw, self._gh
+        # Rings closer than the grid's edge, or beyond its far side, are empty
+        first_ring = max(-cx, cx - gw + 1, -cy, cy - gh + 1, 0)
+        last_ring = max(cx, gw - 1 - cx, cy, gh - 1 - cy, 0)
+
+        best, best_d2 = -1, math.inf
+        xs, ys, owner, alive = self._xs, self._ys, self._owner, self._alive
+        starts, ids, live = self._starts, self._ids, self._live
+
+        for r in range(first_ring, last_ring + 1):
+            for ix, iy in _ring(cx, cy, r, gw, gh):
+                key = iy * gw + ix
+                if live[key] == 0:
+                    continue
+                for pid in ids[starts[key]:starts[key + 1]]:
+                    if not alive[owner[pid]]:
+                        continue
+                    d2 = (xs[pid] - x) ** 2 + (ys[pid] - y) ** 2
+                    if d2 < best_d2:
+                        best, best_d2 = pid, d2
+
+            # Cells of the next ring are at least r cells away
+            if best >= 0 and best_d2 <= (r * cell) ** 2:
+                break
+
+        return best
+
+    def visit(self, owner: int) -> None:
+        """Mark a path as visited so its entry points are no longer returned."""
+        if not self._alive[owner]:
+            return
+        self._alive[owner] = False
+        for pid in self._owned[owner]:
+            self._live[self._cell_of[pid]] -= 1
+        self._alive_points -= len(self._owned[owner])
+
+        if self._alive_points and self._alive_points * 4 < self._built_points:
+            alive = np.array(self._alive, dtype=bool)[self.owners]
+            self._build(np.flatnonzero(alive))
+
+    def _build(self, ids: np.ndarray) -> None:
+        """Bucket the given points into cells sized for their density."""
+        pts = self.points[ids]
+        lo = pts.min(axis=0) if len(pts) else np.zeros(2)
+        hi = pts.max(axis=0) if len(pts) else np.zeros(2)
+        extent = np.maximum(hi - lo, _EPSILON)
+        per_cell = ENTRIES_PER_CELL / max(len(pts), 1)
+        # The second term keeps thin point sets from getting too many cells
+        cell = max(math.sqrt(extent[0] * extent[1] * per_cell), float(extent.max()) * per_cell)
+
+        self._x0, self._y0 = float(lo[0]), float(lo[1])
+        self._cell = cell
+        self._gw = int(extent[0] // cell) + 1
+        self._gh = int(extent[1] // cell) + 1
+
+        cells = np.zeros(len(self.points), dtype=np.int64)
+        grid = np.floor((pts - lo) / cell).astype(np.int64)
+        grid = np.minimum(grid, [self._gw - 1, self._gh - 1])
+        cells[ids] = grid[:, 1] * self._gw + grid[:, 0]
+
+        order = np.argsort(cells[ids], kind="stable")
+        sorted_ids = ids[order]
+        counts = np.bincount(cells[sorted_ids], minlength=self._gw * self._gh)
+
+        self._ids = sorted_ids.tolist()
+        self._starts = np.concatenate([[0], np.cumsum(counts)]).tolist()
+        self._live = counts.tolist()
+        self._cell_of = cells.tolist()
+        self._built_points = len(ids)
+
+
+def _ring(cx: int, cy: int, r: int, gw: int, gh: int):
+    """Cells of a ``gw`` x ``gh`` grid at Chebyshev distance ``r`` from (cx, cy)."""
+    if r == 0:
+        if 0 <= cx < gw and 0 <= cy < gh:
+            yield cx, cy
+        return
+
+    x_lo, x_hi = max(cx - r, 0), min(cx + r, gw - 1)
+    for iy in (cy - r, cy + r):
+        if 0 <= iy < gh:
+            for ix in range(x_lo, x_hi + 1):
+                yield ix, iy
+
+    y_lo, y_hi = max(cy - r + 1, 0), min(cy + r - 1, gh - 1)
+    for ix in (cx - r, cx + r):
+        if 0 <= ix < gw:
+            for iy in range(y_lo, y_hi + 1):
+                yield ix, iy
+
+
+class _Tour:
+    """
+    Visiting order with the entry and exit point of every path.
+
+    Position 0 is the origin and position n + 1 an end marker whose
+    coordinates are NaN, so travel to it costs nothing.
+    """
+
+    def __init__(self, origin: Point, order, entry, exit_, entry_vertex, exit_vertex):
+        nan = np.full((1, 2), np.nan)
+        start = np.array([origin], dtype=np.float64)
+        self.order = np.concatenate([[-1], order, [-1]]).astype(np.int64)
+        self.entry = np.concatenate([start, entry, nan])
+        self.exit = np.concatenate([start, exit_, nan])
+        self.entry_vertex = np.concatenate([[-1], entry_vertex, [-1]]).astype(np.int64)
+        self.exit_vertex = np.concatenate([[-1], exit_vertex, [-1]]).astype(np.int64)
+
+    @property
+    def size(self) -> int:
+        return len(self.order) - 2
+
+    def rearrange(self, start: int, positions: np.ndarray, flipped: np.ndarray) -> None:
+        """Replace positions from ``start`` on with the given ones, reversing flipped paths."""
+        end = start + len(positions)
+        entry, exit_ = self.entry[positions], self.exit[positions]
+        entry_vertex, exit_vertex = self.entry_vertex[positions], self.exit_vertex[positions]
+
+        self.order[start:end] = self.order[positions]
+        self.entry[start:end] = np.where(flipped[:, None], exit_, entry)
+        self.exit[start:end] = np.where(flipped[:, None], entry, exit_)
+        self.entry_vertex[start:end] = np.where(flipped, exit_vertex, entry_vertex)
+        self.exit_vertex[start:end] = np.where(flipped, entry_vertex, exit_vertex)
+
+
+def _gap(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Travel distance between point rows; the end marker costs nothing."""
+    return np.nan_to_num(np.hypot(a[..., 0] - b[..., 0], a[..., 1] - b[..., 1]))
+
+
+def _select_disjoint(gain: np.ndarray, lo: np.ndarray, hi: np.ndarray, size: int) -> np.ndarray:
+    """Pick improving moves, best first, whose position ranges do not overlap."""
+    taken = np.zeros(size + 2, dtype=bool)
+    chosen = []
+    for k in np.argsort(gain, kind="stable"):
+        if taken[lo[k]:hi[k] + 1].any():
+            continue
+        taken[lo[k]:hi[k] + 1] = True
+        chosen.append(k)
+    return np.array(chosen, dtype=np.int64)
+
+
+def _two_opt_round(tour: _Tour, window: int) -> float:
+    """Apply one batch of non-overlapping run reversals; returns the travel saved."""
+    n = tour.size
+    if n < 1:
+        return 0.0
+
+    i = np.arange(1, n + 1)[:, None]
+    j = i + np.arange(min(window, n))[None]
+    valid = j <= n
+    j = np.minimum(j, n)
+
+    ent, ext = tour.entry, tour.exit
+    delta = (
+        _gap(ext[i - 1], ext[j]) + _gap(ent[i], ent[j + 1]) -
+        _gap(ext[i - 1], ent[i]) - _gap(ext[j], ent[j + 1])
+    )
+    delta = np.where(valid, delta, 0.0)
+
+    best = delta.argmin(axis=1)
+    gain = delta[np.arange(n), best]
+    candidates = np.flatnonzero(gain < -_EPSILON)
+    if len(candidates) == 0:
+        return 0.0
+
+    first = candidates + 1
+    last = j[candidates, best[candidates]]
+    chosen = _select_disjoint(gain[candidates], first - 1, last + 1, n)
+
+    for k in chosen:
+        a, b = first[k], last[k]
+        positions = np.arange(b, a - 1, -1)
+        tour.rearrange(a, positions, np.ones(len(positions), dtype=bool))
+
+    return -float(gain[candidates][chosen].sum())
+
+
+def _or_opt_round(tour: _Tour, window: int, run: int) -> float:
+    """Apply one batch of non-overlapping run moves; returns the travel saved."""
+    n = tour.size
+    if n < run + 1:
+        return 0.0
+
+    ent, ext = tour.entry, tour.exit
+    s = np.arange(1, n - run + 2)[:, None]
+    e = s + run - 1
+
+    # Insert after position p, either before the run or after it
+    offsets = np.concatenate([-np.arange(2, window + 2), np.arange(run, run + window)])
+    p = s + offsets[None]
+    valid = (p >= 0) & (p <= n)
+    p = np.clip(p, 0, n)
+
+    removed = _gap(ext[s - 1], ent[e + 1]) - _gap(ext[s - 1], ent[s]) - _gap(ext[e], ent[e + 1])
+    closed = _gap(ext[p], ent[p + 1])
+    forward = _gap(ext[p], ent[s]) + _gap(ext[e], ent[p + 1]) - closed
+    backward = _gap(ext[p], ext[e]) + _gap(ent[s], ent[p + 1]) - closed
+
+    delta = np.stack([removed + forward, removed + backward], axis=2)
+    delta = np.where(valid[..., None], delta, 0.0)
+
+    flat = delta.reshape(len(s), -1)
+    best = flat.argmin(axis=1)
+    gain = flat[np.arange(len(s)), best]
+    candidates = np.flatnonzero(gain < -_EPSILON)
+    if len(candidates) == 0:
+        return 0.0
+
+    seg_start = s[candidates, 0]
+    target = p[candidates, best[candidates] // 2]
+    reverse = best[candidates] % 2 == 1
+    lo = np.minimum(target, seg_start - 1)
+    hi = np.maximum(target + 1, seg_start + run)
+    chosen = _select_disjoint(gain[candidates], lo, hi, n)
+
+    for k in chosen:
+        a, t = seg_start[k], target[k]
+        segment = np.arange(a, a + run)
+        flipped = np.full(run, reverse[k])
+        if reverse[k]:
+            segment = segment[::-1]
+
+        if t < a:
+            between = np.arange(t + 1, a)
+            positions = np.concatenate([segment, between])
+            tour.rearrange(t + 1, positions, np.concatenate([flipped, np.zeros(len(between), dtype=bool)]))
+        else:
+            between = np.arange(a + run, t + 1)
+            positions = np.concatenate([between, segment])
+            tour.rearrange(a, positions, np.concatenate([np.zeros(len(between), dtype=bool), flipped]))
+
+    return -float(gain[candidates][chosen].sum())
+
+
+def _entry_points(
+    paths: Sequence[Sequence[Point]], closed: Sequence[bool]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Entry point coordinates, owning path and vertex index within it."""
+    points, owners, vertices = [], [], []
+    for index, (pts, is_closed) in enumerate(zip(paths, closed)):
+        if not pts:
+            continue
+        if is_closed or len(pts) == 1:
+            points.extend(pts)
+            owners.extend([index] * len(pts))
+            vertices.extend(range(len(pts)))
+        else:
+            points.extend([pts[0], pts[-1]])
+            owners.extend([index, index])
+            vertices.extend([0, len(pts) - 1])
+
+    return (
+        np.array(points, dtype=np.float64).reshape(-1, 2),
+        np.array(owners, dtype=np.int64),
+        np.array(vertices, dtype=np.int64),
+    )
+
+
+def nearest_neighbour_tour(
+    paths: Sequence[Sequence[Point]],
+    closed: Sequence[bool],
+    origin: Point = (0.0, 0.0),
+) -> Tuple[List[int], List[int]]:
+    """
+    Greedy path order that always moves to the nearest unvisited entry.
+
+    Args:
+        paths: Point lists of the paths
+        closed: Whether each path is closed
+        origin: Laser starting position
+
+    Returns:
+        (path indices in visiting order, entry vertex of each visited path);
+        empty paths are left out
+    """
+    points, owners, vertices = _entry_points(paths, closed)
+    if len(points) == 0:
+        return [], []
+
+    grid = EntryGrid(points, owners)
+    order, entries = [], []
+    x, y = origin
+
+    while True:
+        pid = grid.nearest(x, y)
+        if pid < 0:
+            break
+        index = int(owners[pid])
+        vertex = int(vertices[pid])
+        grid.visit(index)
+        order.append(index)
+        entries.append(vertex)
+
+        pts = paths[index]
+        exit_vertex = vertex if closed[index] else len(pts) - 1 - vertex
+        x, y = pts[exit_vertex]
+
+    return order, entries
+
+
+def order_paths(
+    paths: Sequence[Sequence[Point]],
+    closed: Sequence[bool],
+    origin: Point = (0.0, 0.0),
+    time_limit: float = 0.0,
+) -> Tuple[List[int], List[int]]:
+    """
+    Order paths to shorten travel, refining the greedy seed for a while.
+
+    Args:
+        paths: Point lists of the paths
+        closed: Whether each path is closed
+        origin: Laser starting position
+        time_limit: Seconds to spend on 2-opt/Or-opt refinement (0 = seed only)
+
+    Returns:
+        (path indices in visiting order, entry vertex of each visited path);
+        empty paths are left out
+    """
+    order, entries = nearest_neighbour_tour(paths, closed, origin)
+    if time_limit <= 0 or len(order) < 3:
+        return order, entries
+
+    exits = [
+        v if closed[i] else len(paths[i]) - 1 - v
+        for i, v in zip(order, entries)
+    ]
+    tour = _Tour(
+        origin,
+        order,
+        np.array([paths[i][v] for i, v in zip(order, entries)], dtype=np.float64),
+        np.array([paths[i][v] for i, v in zip(order, exits)], dtype=np.float64),
+        entries,
+        exits,
+    )
+    _refine(tour, time_limit)
+
+    return tour.order[1:-1].tolist(), tour.entry_vertex[1:-1].tolist()
+
+
+def _refine(tour: _Tour, time_limit: float) -> float:
+    """Improve a tour with 2-opt and Or-opt rounds until stuck or out of time; returns the travel saved."""
+    deadline = time.perf_counter() + time_limit
+    saved = 0.0
+    while time.perf_counter() < deadline:
+        gained = _two_opt_round(tour, TWO_OPT_WINDOW)
+        for run in range(1, OR_OPT_MAX_RUN + 1):
+            if time.perf_counter() >= deadline:
+                break
+            gained += _or_opt_round(tour, OR_OPT_WINDOW, run)
+        saved += gained
+        if gained <= _EPSILON:
+            break
+    return saved
+
+
+def travel_distance(
+    paths: Sequence[Sequence[Point]],
+    closed: Sequence[bool],
+    order: Sequence[int],
+    entries: Sequence[int],
+    origin: Point = (0.0, 0.0),
+) -> float:
+    """Non-cutting travel for a given order and entry vertices."""
+    total = 0.0
+    x, y = origin
+    for index, vertex in zip(order, entries):
+        pts = paths[index]
+        ex, ey = pts[vertex]
+        total += math.hypot(ex - x, ey - y)
+        x, y = pts[vertex if closed[index] else len(pts) - 1 - vertex]
+    return total
+
+
+def _random_job(count: int, size: float, seed: int) -> Tuple[List[List[Point]], List[bool]]:
+    """Engraving-like job: short strokes and small closed outlines in random order."""
+    rng = random.Random(seed)
+    paths, closed = [], []
+    for _ in range(count):
+        x, y = rng.uniform(0, size), rng.uniform(0, size)
+        if rng.random() < 0.5:
+            angle = rng.uniform(0, 2 * math.pi)
+            length = rng.uniform(0.5, 5.0)
+            paths.append([(x, y), (x + length * math.cos(angle), y + length * math.sin(angle))])
+            closed.append(False)
+        else:
+            radius = rng.uniform(0.3, 2.0)
+            sides = rng.randint(4, 12)
+            paths.append([
+                (x + radius * math.cos(2 * math.pi * k / sides), y + radius * math.sin(2 * math.pi * k / sides))
+                for k in range(sides)
+            ])
+            closed.append(True)
+    return paths, closed
+
+
+def benchmark_ordering(
+    sizes: Sequence[int] = (1_000, 10_000, 50_000),
+    time_limit: float = 2.0,
+    plate_size: float = 400.0,
+    seed: int = 0,
+) -> List[Dict[str, float]]:
+    """
+    Measure travel reduction against wall time on random jobs.
+
+    Args:
+        sizes: Path counts to run
+        time_limit: Refinement budget per job in seconds
+        plate_size: Side of the square work area (mm)
+        seed: Random seed for the generated jobs
+
+    Returns:
+        One row per size with original, seeded and refined travel and timings
+    """
+    rows = []
+    for count in sizes:
+        paths, closed = _random_job(count, plate_size, seed)
+        original = travel_distance(paths, closed, range(count), [0] * count)
+
+        start = time.perf_counter()
+        order, entries = nearest_neighbour_tour(paths, closed)
+        seed_time = time.perf_counter() - start
+        seeded = travel_distance(paths, closed, order, entries)
+
+        start = time.perf_counter()
+        order, entries = order_paths(paths, closed, time_limit=time_limit)
+        refine_time = time.perf_counter() - start
+        refined = travel_distance(paths, closed, order, entries)
+
+        rows.append({
+            "paths": count,
+            "original_travel": original,
+            "seed_travel": seeded,
+            "seed_time": seed_time,
+            "refined_travel": refined,
+            "refine_time": refine_time,
+            "seed_reduction_percent": (1 - seeded / original) * 100 if original else 0.0,
+            "refined_reduction_percent": (1 - refined / original) * 100 if original else 0.0,
+        })
+    return rows
+
+
+def format_benchmark(rows: Sequence[Dict[str, float]]) -> str:
+    """Format benchmark rows as a text table."""
+    lines = [
+        f"{'Paths':>8} {'Original mm':>13} {'Seed mm':>11} {'Seed s':>8} "
+        f"{'Refined mm':>11} {'Total s':>8} {'Reduction':>10}"
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['paths']:>8} {row['original_travel']:>13.0f} {row['seed_travel']:>11.0f} "
+            f"{row['seed_time']:>8.2f} {row['refined_travel']:>11.0f} {row['refine_time']:>8.2f} "
+            f"{row['refined_reduction_percent']:>9.1f}%"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_benchmark(benchmark_ordering()))
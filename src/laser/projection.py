@@ -3,23 +3,28 @@
 
 Projects 3D models onto 2D planes (top, front, side views)
 to generate outline paths for laser cutting.
+
+Silhouettes are traced from plain triangle arrays, so large scan meshes
+project in one vectorized pass without Blender.
 """
 
 from dataclasses import dataclass, field
 from typing import List, Tuple, Optional, Set
 from pathlib import Path
-import math
+
+import numpy as np
 
 # Try to import Blender modules
 try:
     import bpy
-    import bmesh
-    from mathutils import Vector, Matrix
     HAS_BLENDER = True
 except ImportError:
     HAS_BLENDER = False
 
-from .cross_section import Path2D
+from .cross_section import Path2D, as_mesh_data, contour_bounds, signed_area
+from .silhouette import outline_loops, silhouette_edges, stitch_segments, view_projection
+
+KEY_PRECISION = 4  # Decimal places end points are matched to when connecting edges
 
 
 @dataclass
@@ -49,6 +54,9 @@ class ProjectionTool:
     - Side view (YZ plane, looking along X)
     - Isometric projection
 
+    Blender objects, MeshData and mesh files are all projected by the
+    headless silhouette engine in silhouette.py.
+
     Usage:
         tool = ProjectionTool()
         result = tool.project(obj, view='top')
@@ -66,245 +74,120 @@ class ProjectionTool:
 
     def project(self, obj, view: str = 'top') -> ProjectionResult:
         """
-        Project object to 2D outline.
+        Project object to its convex 2D outline.
 
         Args:
-            obj: Blender mesh object
+            obj: Blender mesh object, MeshData or path to a mesh file
             view: View direction ('top', 'front', 'side', 'iso')
 
         Returns:
-            ProjectionResult with outline paths
+            ProjectionResult with the convex hull of the shadow
         """
-        if not HAS_BLENDER:
-            raise RuntimeError("This function requires Blender")
-
-        mesh = obj.data
-        world_matrix = obj.matrix_world
-
-        # Define projection based on view
-        if view == 'top':
-            project = lambda v: (v.x, v.y)
-        elif view == 'front':
-            project = lambda v: (v.x, v.z)
-        elif view == 'side':
-            project = lambda v: (v.y, v.z)
-        elif view == 'iso':
-            # Isometric projection (30 degree angles)
-            angle = math.radians(30)
-            project = lambda v: (
-                v.x * math.cos(angle) - v.y * math.cos(angle),
-                v.z + v.x * math.sin(angle) + v.y * math.sin(angle)
-            )
-        else:
-            raise ValueError(f"Unknown view: {view}")
-
-        # Project all vertices
-        projected_verts = []
-        for v in mesh.vertices:
-            world_co = world_matrix @ v.co
-            projected_verts.append(project(world_co))
-
-        # Project all edges to build outline
-        edge_segments = []
-        for edge in mesh.edges:
-            p0 = projected_verts[edge.vertices[0]]
-            p1 = projected_verts[edge.vertices[1]]
-            edge_segments.append((p0, p1))
-
-        # Build outline paths from edges
-        # Using convex hull as simplified outline
-        all_points = list(set(projected_verts))
-        hull_points = self._convex_hull(all_points)
+        projection = view_projection(view)
+        mesh = as_mesh_data(obj)
+        points = np.asarray(mesh.vertices, dtype=np.float64) @ projection.T
+
+        # Hull corners are silhouette vertices, so only those are hulled
+        edges, _ = silhouette_edges(mesh, projection)
+        rim = points[np.unique(edges)] if len(edges) else points
+        hull_points = self._convex_hull([tuple(p) for p in rim.tolist()])
 
         paths = []
         if hull_points:
             paths.append(Path2D(points=hull_points, is_closed=True, is_outer=True))
 
-        # Calculate bounding box
-        if all_points:
-            min_x = min(p[0] for p in all_points)
-            min_y = min(p[1] for p in all_points)
-            max_x = max(p[0] for p in all_points)
-            max_y = max(p[1] for p in all_points)
-            bbox = (min_x, min_y, max_x, max_y)
-        else:
-            bbox = (0, 0, 0, 0)
-
         return ProjectionResult(
             paths=paths,
             view=view,
-            bounding_box=bbox
+            bounding_box=contour_bounds([points]) if len(points) else (0, 0, 0, 0)
         )
 
     def project_silhouette(self, obj, view: str = 'top') -> ProjectionResult:
         """
         Project object silhouette (true outline, not just vertices).
 
-        This traces the actual visible outline from the given view direction.
+        Overlapping parts are merged into one outline, and openings seen
+        straight through the object come back as holes.
+
+        Args:
+            obj: Blender mesh object, MeshData or path to a mesh file
+            view: View direction ('top', 'front', 'side', 'iso')
+
+        Returns:
+            ProjectionResult with counter-clockwise outlines and clockwise holes
         """
-        if not HAS_BLENDER:
-            raise RuntimeError("This function requires Blender")
-
-        # For true silhouette, we need to find edges where face normals
-        # point in opposite directions relative to view
-
-        mesh = obj.data
-        world_matrix = obj.matrix_world
-
-        # Define view direction
-        if view == 'top':
-            view_dir = Vector((0, 0, -1))
-            project = lambda v: (v.x, v.y)
-        elif view == 'front':
-            view_dir = Vector((0, 1, 0))
-            project = lambda v: (v.x, v.z)
-        elif view == 'side':
-            view_dir = Vector((1, 0, 0))
-            project = lambda v: (v.y, v.z)
-        else:
-            view_dir = Vector((0, 0, -1))
-            project = lambda v: (v.x, v.y)
-
-        # Create bmesh for topology access
-        bm = bmesh.new()
-        bm.from_mesh(mesh)
-        bm.edges.ensure_lookup_table()
-        bm.faces.ensure_lookup_table()
-
-        silhouette_edges = []
-
-        for edge in bm.edges:
-            if len(edge.link_faces) == 2:
-                # Interior edge - check if silhouette edge
-                f1, f2 = edge.link_faces
-                n1 = (world_matrix.to_3x3() @ f1.normal).normalized()
-                n2 = (world_matrix.to_3x3() @ f2.normal).normalized()
-
-                d1 = n1.dot(view_dir)
-                d2 = n2.dot(view_dir)
-
-                # Silhouette edge: one face visible, one not
-                if d1 * d2 < 0:
-                    v0 = world_matrix @ edge.verts[0].co
-                    v1 = world_matrix @ edge.verts[1].co
-                    silhouette_edges.append((project(v0), project(v1)))
-            elif len(edge.link_faces) == 1:
-                # Boundary edge - always include
-                v0 = world_matrix @ edge.verts[0].co
-                v1 = world_matrix @ edge.verts[1].co
-                silhouette_edges.append((project(v0), project(v1)))
-
-        bm.free()
-
-        # Connect edges into paths
-        paths = self._connect_edges_to_paths(silhouette_edges)
-
-        # Calculate bounding box
-        all_points = [p for seg in silhouette_edges for p in seg]
-        if all_points:
-            min_x = min(p[0] for p in all_points)
-            min_y = min(p[1] for p in all_points)
-            max_x = max(p[0] for p in all_points)
-            max_y = max(p[1] for p in all_points)
-            bbox = (min_x, min_y, max_x, max_y)
-        else:
-            bbox = (0, 0, 0, 0)
+        loops = outline_loops(as_mesh_data(obj), view)
+        paths = [
+            Path2D(
+                points=[tuple(p) for p in loop.tolist()],
+                is_closed=True,
+                is_outer=signed_area(loop) > 0,
+            )
+            for loop in loops
+        ]
 
         return ProjectionResult(
             paths=paths,
             view=view,
-            bounding_box=bbox
+            bounding_box=contour_bounds(loops)
         )
 
     def _convex_hull(self, points: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
         """Compute convex hull of 2D points."""
-        def cross(o, a, b):
-            return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
-
-        points = sorted(set(points))
-        if len(points) <= 1:
-            return points
-
-        lower = []
-        for p in points:
-            while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
-                lower.pop()
-            lower.append(p)
-
-        upper = []
-        for p in reversed(points):
-            while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
-                upper.pop()
-            upper.append(p)
-
-        return lower[:-1] + upper[:-1]
+        return convex_hull(points)
 
     def _connect_edges_to_paths(self, edges: List[Tuple[Tuple[float, float], Tuple[float, float]]]) -> List[Path2D]:
         """Connect edge segments into continuous paths."""
         if not edges:
             return []
 
-        # Build adjacency
-        point_edges = {}
-        for i, (p0, p1) in enumerate(edges):
-            k0 = self._point_key(p0)
-            k1 = self._point_key(p1)
-
-            if k0 not in point_edges:
-                point_edges[k0] = []
-            if k1 not in point_edges:
-                point_edges[k1] = []
-
-            point_edges[k0].append((i, p1))
-            point_edges[k1].append((i, p0))
-
-        # Trace paths
-        used = set()
+        segments = np.asarray(edges, dtype=np.float64).reshape(-1, 2, 2)
         paths = []
+        for points, is_closed in stitch_segments(
+            segments[:, 0], segments[:, 1], 10.0 ** -KEY_PRECISION, directed=False
+        ):
+            points = [tuple(p) for p in points.tolist()]
+            if not is_closed and len(points) > 2:
+                is_closed = self._points_close(points[-1], points[0])
+            paths.append(Path2D(points=points, is_closed=is_closed))
 
-        for start_idx, (p0, p1) in enumerate(edges):
-            if start_idx in used:
-                continue
-
-            path_points = [p0, p1]
-            used.add(start_idx)
+        return paths
 
-            # Extend forward
-            current = p1
-            while True:
-                key = self._point_key(current)
-                if key not in point_edges:
-                    break
+    def _points_close(self, p0: Tuple[float, float], p1: Tuple[float, float]) -> bool:
+        """Check if two points are close."""
+        return abs(p0[0] - p1[0]) < self.simplify_tolerance and abs(p0[1] - p1[1]) < self.simplify_tolerance
 
-                next_edge = None
-                for edge_idx, next_point in point_edges[key]:
-                    if edge_idx not in used:
-                        next_edge = (edge_idx, next_point)
-                        break
 
-                if next_edge is None:
-                    break
+def convex_hull(points: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """
+    Compute the convex hull of 2D points (Andrew's monotone chain).
 
-                used.add(next_edge[0])
-                path_points.append(next_edge[1])
-                current = next_edge[1]
+    Args:
+        points: Points as (x, y) tuples
 
-                # Check if closed
-                if self._points_close(current, p0):
-                    break
+    Returns:
+        Hull vertices in counter-clockwise order, starting at the lowest x
+    """
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
 
-            is_closed = self._points_close(path_points[-1], path_points[0])
-            paths.append(Path2D(points=path_points, is_closed=is_closed))
+    points = sorted(set(points))
+    if len(points) <= 1:
+        return points
 
-        return paths
+    lower = []
+    for p in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
 
-    def _point_key(self, p: Tuple[float, float], precision: int = 4) -> Tuple[int, int]:
-        """Create hashable key for point."""
-        return (round(p[0] * 10**precision), round(p[1] * 10**precision))
+    upper = []
+    for p in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
 
-    def _points_close(self, p0: Tuple[float, float], p1: Tuple[float, float]) -> bool:
-        """Check if two points are close."""
-        return abs(p0[0] - p1[0]) < self.simplify_tolerance and abs(p0[1] - p1[1]) < self.simplify_tolerance
+    return lower[:-1] + upper[:-1]
 
 
 def project_to_2d(obj, view: str = 'top') -> ProjectionResult:
@@ -312,8 +195,8 @@ def project_to_2d(obj, view: str = 'top') -> ProjectionResult:
     Convenience function to project object to 2D.
 
     Args:
-        obj: Blender mesh object
-        view: View direction ('top', 'front', 'side')
+        obj: Blender mesh object, MeshData or path to a mesh file
+        view: View direction ('top', 'front', 'side', 'iso')
 
     Returns:
         ProjectionResult
@@ -327,7 +210,7 @@ def project_outline(obj, view: str = 'top') -> ProjectionResult:
     Convenience function to get object silhouette/outline.
 
     Args:
-        obj: Blender mesh object
+        obj: Blender mesh object, MeshData or path to a mesh file
         view: View direction
 
     Returns:
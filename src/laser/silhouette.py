@@ -0,0 +1,500 @@
+"""
+Silhouette Outlines for Laser Cutting.
+
+Projects triangle meshes onto a view plane and traces the outline of the
+shadow they cast, without Blender:
+
+1. Faces are split by the sign of their normal along the view direction.
+   The boundary of the front-facing set, and of the back-facing set, are
+   the silhouette edges; each set's boundary is a closed chain whose
+   winding number at a point counts the faces of that set covering it.
+2. Silhouette edges are split wherever they cross or touch, testing only
+   edges that share a cell of a uniform grid. A piece is kept when the
+   shadow covers one side of it but not the other, which unions
+   overlapping loops, so folds and parts hidden behind others drop out.
+3. The kept pieces are stitched into loops through a hash of quantized
+   end points, with the shadow on their left: outlines run
+   counter-clockwise and holes clockwise.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.mesh_io import MeshData
+
+# Rows map world (x, y, z) to view (u, v), matching ProjectionTool
+_ISO = math.radians(30)
+VIEW_PROJECTIONS: Dict[str, np.ndarray] = {
+    'top': np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]),
+    'front': np.array([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]),
+    'side': np.array([[0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]),
+    'iso': np.array([
+        [math.cos(_ISO), -math.cos(_ISO), 0.0],
+        [math.sin(_ISO), math.sin(_ISO), 1.0],
+    ]),
+}
+
+QUANTIZE_RELATIVE = 1e-9  # Point hash cell as a fraction of the outline extent
+CELL_SEGMENTS = 4.0  # Target silhouette edges per grid cell
+MAX_CELLS = 1 << 22  # Upper bound on grid cells
+
+_EPSILON = 1e-9
+
+
+def view_projection(view: str) -> np.ndarray:
+    """
+    Look up the (2, 3) projection matrix of a named view.
+
+    Args:
+        view: View direction ('top', 'front', 'side', 'iso')
+
+    Returns:
+        Matrix mapping world points to view coordinates
+    """
+    if view not in VIEW_PROJECTIONS:
+        raise ValueError(f"Unknown view: {view}")
+    return VIEW_PROJECTIONS[view]
+
+
+def silhouette_edges(mesh: MeshData, projection: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the silhouette edges of a mesh for a view.
+
+    Args:
+        mesh: Welded triangle mesh
+        projection: (2, 3) matrix mapping world points to view coordinates
+
+    Returns:
+        (E, 2) vertex indices of every edge, and (E, 2) how many times it
+        runs from its first to its second vertex in the front and in the
+        back chain (negative when it runs the other way)
+    """
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    if len(faces) == 0:
+        return np.zeros((0, 2), dtype=np.int64), np.zeros((0, 2), dtype=np.int64)
+
+    # Normal along the view, i.e. the sign of the projected triangle area
+    tri = np.asarray(mesh.vertices, dtype=np.float64)[faces]
+    normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    facing = normals @ np.cross(projection[0], projection[1])
+    scale = np.abs(facing).max()
+    front = facing > scale * _EPSILON
+    back = facing < -scale * _EPSILON
+
+    # Back faces are reversed so both chains wind counter-clockwise in view
+    front_edges = faces[front][:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    back_edges = faces[back][:, [1, 0, 2, 1, 0, 2]].reshape(-1, 2)
+    edges = np.concatenate([front_edges, back_edges])
+    chain = np.repeat([0, 1], [len(front_edges), len(back_edges)])
+    if len(edges) == 0:
+        return np.zeros((0, 2), dtype=np.int64), np.zeros((0, 2), dtype=np.int64)
+
+    # Pack (edge, chain, direction) so one sort groups the uses of each edge
+    count = np.int64(max(len(mesh.vertices), 1))
+    lo = edges.min(axis=1)
+    hi = edges.max(axis=1)
+    packed = np.sort(((lo * count + hi) * 2 + chain) * 2 + (edges[:, 0] < edges[:, 1]))
+    group = packed >> 1
+    starts = np.flatnonzero(np.concatenate([[True], group[1:] != group[:-1]]))
+    net = np.add.reduceat((packed & 1) * 2 - 1, starts)
+
+    # Interior edges of a chain cancel with their twins; what is left is its boundary
+    boundary = net != 0
+    group, net = group[starts[boundary]], net[boundary]
+    key = group >> 1
+    new_edge = np.concatenate([[True], key[1:] != key[:-1]])
+    index = np.cumsum(new_edge) - 1
+
+    weights = np.zeros((int(new_edge.sum()), 2), dtype=np.int64)
+    weights[index, group & 1] = net
+    key = key[new_edge]
+    return np.stack([key // count, key % count], axis=1), weights
+
+
+def outline_loops(mesh: MeshData, view: str = 'top') -> List[np.ndarray]:
+    """
+    Trace the outline of a mesh's shadow on a view plane.
+
+    Args:
+        mesh: Welded triangle mesh
+        view: View direction ('top', 'front', 'side', 'iso')
+
+    Returns:
+        Closed (N, 2) loops; outlines counter-clockwise and holes clockwise
+    """
+    projection = view_projection(view)
+    edges, weights = silhouette_edges(mesh, projection)
+    if len(edges) == 0:
+        return []
+
+    points = np.asarray(mesh.vertices, dtype=np.float64) @ projection.T
+    start = points[edges[:, 0]]
+    end = points[edges[:, 1]]
+    extent = float(np.ptp(np.concatenate([start, end]), axis=0).max())
+    resolution = max(extent, 1.0) * QUANTIZE_RELATIVE
+
+    grid = _EdgeGrid(start, end, resolution)
+    piece_start, piece_end = _split_edges(start, end, resolution, grid)
+    piece_start, piece_end = _unique_pieces(piece_start, piece_end, resolution)
+    if len(piece_start) == 0:
+        return []
+
+    # Check the shadow just left and just right of every piece's middle
+    middle = (piece_start + piece_end) / 2
+    delta = piece_end - piece_start
+    left = np.stack([-delta[:, 1], delta[:, 0]], axis=1)
+    windings = winding_numbers(
+        np.concatenate([middle, middle]), start, end, weights, grid,
+        sides=np.concatenate([left, -left]), resolution=resolution,
+    )
+    covered = (windings > 0).any(axis=1).reshape(2, -1)
+
+    border = covered[0] != covered[1]
+    flip = covered[1][border]
+    piece_start, piece_end = piece_start[border], piece_end[border]
+    piece_start[flip], piece_end[flip] = piece_end[flip], piece_start[flip].copy()
+
+    return [points for points, closed in stitch_segments(piece_start, piece_end, resolution) if closed]
+
+
+def winding_numbers(
+    probes: np.ndarray,
+    start: np.ndarray,
+    end: np.ndarray,
+    weights: np.ndarray,
+    grid: Optional["_EdgeGrid"] = None,
+    sides: Optional[np.ndarray] = None,
+    resolution: float = 0.0,
+) -> np.ndarray:
+    """
+    Winding numbers of closed edge chains around probe points.
+
+    Winding numbers along the centre line of every grid row come from one
+    sorted table of the crossings on that line; each probe then only
+    corrects for the edges of its own cell between the centre line and
+    itself.
+
+    Args:
+        probes: (Q, 2) query points
+        start: (E, 2) edge start points
+        end: (E, 2) edge end points
+        weights: (E, C) weight of every edge in each of C chains
+        grid: Grid over the edges, built here if omitted
+        sides: (Q, 2) direction to nudge every probe in by an infinitely
+            small step, which decides probes lying on an edge
+        resolution: Distance within which a probe counts as on an edge
+
+    Returns:
+        (Q, C) winding number of every chain around every probe
+    """
+    probes = np.asarray(probes, dtype=np.float64).reshape(-1, 2)
+    weights = np.asarray(weights, dtype=np.float64).reshape(len(start), -1)
+    chains = weights.shape[1]
+    result = np.zeros((len(probes), chains))
+    if len(probes) == 0 or len(start) == 0:
+        return result.astype(np.int64)
+    if grid is None:
+        grid = _EdgeGrid(start, end)
+    if sides is None:
+        sides = np.zeros_like(probes)
+
+    # Crossings of every row's centre line, each counting for points to its left
+    row_span = grid.last[:, 1] - grid.first[:, 1] + 1
+    edge = np.repeat(np.arange(len(start)), row_span)
+    row = np.repeat(grid.first[:, 1], row_span) + _ranks(row_span)
+    centre = grid.origin[1] + (row + 0.5) * grid.cell
+    y_lo = np.minimum(start[edge, 1], end[edge, 1])
+    y_hi = np.maximum(start[edge, 1], end[edge, 1])
+    crosses = (y_lo <= centre) & (centre < y_hi)
+    edge, row, centre = edge[crosses], row[crosses], centre[crosses]
+    s, e = start[edge], end[edge]
+    x_cross = s[:, 0] + (centre - s[:, 1]) * (e[:, 0] - s[:, 0]) / (e[:, 1] - s[:, 1])
+    upward = np.where(e[:, 1] > s[:, 1], 1.0, -1.0)
+
+    # Sorting crossings and probes together counts the crossings left of each
+    # probe; probes nudged to the left go before crossings at the same X
+    probe_cell = grid.cell_of(probes)
+    probe_row = probe_cell[:, 1]
+    tie = np.concatenate([np.zeros(len(edge)), np.where(sides[:, 0] < 0, -1.0, 1.0)])
+    order = np.lexsort((tie, np.concatenate([x_cross, probes[:, 0]]), np.concatenate([row, probe_row])))
+    sorted_probe = order >= len(edge)
+    position = np.empty(len(probes), dtype=np.int64)
+    position[order[sorted_probe] - len(edge)] = np.cumsum(~sorted_probe)[sorted_probe]
+
+    crossing_order = np.lexsort((x_cross, row))
+    contribution = weights[edge[crossing_order]] * upward[crossing_order, None]
+    suffix = np.concatenate([np.cumsum(contribution[::-1], axis=0)[::-1], np.zeros((1, chains))])
+    row_end = np.searchsorted(row[crossing_order], probe_row, side="right")
+    result += suffix[position] - suffix[row_end]
+
+    # Edges of the probe's cell crossed on the way from the centre line
+    query, edge = grid.candidates(probe_cell)
+    px, py = probes[query, 0], probes[query, 1]
+    nx, ny = sides[query, 0], sides[query, 1]
+    centre = grid.origin[1] + (probe_row[query] + 0.5) * grid.cell
+    s, e = start[edge], end[edge]
+    d = e - s
+
+    # Ends exactly level with the probe are decided by the nudge
+    straddles = np.where(nx < 0, (s[:, 0] >= px) != (e[:, 0] >= px), (s[:, 0] > px) != (e[:, 0] > px))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y_cross = s[:, 1] + (px - s[:, 0]) * d[:, 1] / d[:, 0]
+    above = straddles & (centre <= y_cross) & (y_cross < py)
+    below = straddles & (py <= y_cross) & (y_cross < centre)
+
+    # Edges through the probe: compare the sides the centre line and the nudged probe are on
+    length = np.hypot(d[:, 0], d[:, 1])
+    side_of_centre = d[:, 0] * (centre - s[:, 1]) - d[:, 1] * (px - s[:, 0])
+    along = ((px - s[:, 0]) * d[:, 0] + (py - s[:, 1]) * d[:, 1]) / np.maximum(length * length, _EPSILON)
+    through = (
+        (np.abs(d[:, 0] * (py - s[:, 1]) - d[:, 1] * (px - s[:, 0])) <= resolution * length) &
+        (along >= 0) & (along <= 1) & (d[:, 0] != 0)
+    )
+    side_of_probe = d[:, 0] * ny - d[:, 1] * nx
+    crossed = through & (np.sign(side_of_centre) * np.sign(side_of_probe) < 0)
+    above = np.where(through, crossed & (py > centre), above)
+    below = np.where(through, crossed & (py < centre), below)
+
+    # Moving up across an edge that runs to the right enters its chain
+    rightward = np.where(d[:, 0] > 0, 1.0, -1.0)
+    step = (above.astype(np.float64) - below) * rightward
+    for column in range(chains):
+        result[:, column] += np.bincount(query, weights=step * weights[edge, column], minlength=len(probes))
+
+    return np.rint(result).astype(np.int64)
+
+
+class _EdgeGrid:
+    """
+    Uniform grid over 2D edges, each registered in every cell its box covers.
+
+    Silhouette edges bunch up along rims, so cells are sized from the
+    typical edge length as well as the average density.
+    """
+
+    def __init__(self, start: np.ndarray, end: np.ndarray, margin: float = 0.0):
+        lo = np.minimum(start, end) - margin
+        hi = np.maximum(start, end) + margin
+        self.origin = lo.min(axis=0)
+        extent = np.maximum(hi.max(axis=0) - self.origin, _EPSILON)
+
+        length = np.hypot(*(end - start).T)
+        cell = math.sqrt(extent[0] * extent[1] * CELL_SEGMENTS / len(start))
+        cell = min(cell, max(float(np.median(length)) / 2, _EPSILON))
+        self.cell = max(cell, math.sqrt(extent[0] * extent[1] / MAX_CELLS), float(extent.max()) / MAX_CELLS)
+        self.columns = int(extent[0] // self.cell) + 1
+        self.rows = int(extent[1] // self.cell) + 1
+
+        self.first = self.cell_of(lo)
+        self.last = self.cell_of(hi)
+        span_x = self.last[:, 0] - self.first[:, 0] + 1
+        per_edge = span_x * (self.last[:, 1] - self.first[:, 1] + 1)
+        edge = np.repeat(np.arange(len(start)), per_edge)
+        local = _ranks(per_edge)
+        keys = (
+            (self.first[edge, 1] + local // span_x[edge]) * self.columns
+            + self.first[edge, 0] + local % span_x[edge]
+        )
+        order = np.argsort(keys, kind="stable")
+        self.edges = edge[order]
+        self.keys = keys[order]
+
+    def cell_of(self, points: np.ndarray) -> np.ndarray:
+        """Column and row of the cells holding points, clamped to the grid."""
+        cells = np.floor((points - self.origin) / self.cell).astype(np.int64)
+        return np.clip(cells, 0, [self.columns - 1, self.rows - 1])
+
+    def candidates(self, cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(query index, edge index) pairs for the edges in each queried cell."""
+        keys = cells[:, 1] * self.columns + cells[:, 0]
+        first = np.searchsorted(self.keys, keys)
+        counts = np.searchsorted(self.keys, keys, side="right") - first
+        query = np.repeat(np.arange(len(keys)), counts)
+        return query, self.edges[np.repeat(first, counts) + _ranks(counts)]
+
+    def pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Distinct pairs of edges sharing at least one cell."""
+        bounds = np.flatnonzero(np.diff(self.keys)) + 1
+        counts = np.diff(np.concatenate([[0], bounds, [len(self.keys)]]))
+        starts = np.repeat(np.concatenate([[0], bounds]), counts)
+
+        # Every entry pairs with the entries after it in the same cell
+        after = starts + np.repeat(counts, counts) - np.arange(len(self.keys)) - 1
+        first = np.repeat(np.arange(len(self.keys)), after)
+        second = first + 1 + _ranks(after)
+        a, b = self.edges[first], self.edges[second]
+
+        # A pair is reported only by the lowest cell both edges cover
+        key = self.keys[first]
+        shared = np.maximum(self.first[a], self.first[b])
+        own = (key % self.columns == shared[:, 0]) & (key // self.columns == shared[:, 1])
+        return a[own], b[own]
+
+
+def stitch_segments(
+    start: np.ndarray,
+    end: np.ndarray,
+    resolution: float,
+    directed: bool = True,
+) -> List[Tuple[np.ndarray, bool]]:
+    """
+    Chain segments into paths through a hash of their quantized end points.
+
+    Args:
+        start: (S, 2) segment start points
+        end: (S, 2) segment end points
+        resolution: End points closer than about this share a hash cell
+        directed: Only follow segments from start to end
+
+    Returns:
+        (points, is_closed) for every path; closed paths do not repeat
+        their first point
+    """
+    start = np.asarray(start, dtype=np.float64).reshape(-1, 2)
+    end = np.asarray(end, dtype=np.float64).reshape(-1, 2)
+    count = len(start)
+    if count == 0:
+        return []
+
+    nodes, node_points = _quantize(np.concatenate([start, end]), resolution)
+    tail, head = nodes[:count], nodes[count:]
+    segment = np.arange(count)
+    if not directed:
+        tail, head = np.concatenate([tail, head]), np.concatenate([head, tail])
+        segment = np.concatenate([segment, segment])
+
+    # Half-edges grouped by the node they leave
+    order = np.argsort(tail, kind="stable")
+    offsets = np.searchsorted(tail[order], np.arange(len(node_points) + 1)).tolist()
+    leaving = order.tolist()
+    head_of = head.tolist()
+    segment_of = segment.tolist()
+    cursor = offsets[:-1]
+
+    # Open paths have to start at their ends, loops anywhere
+    out_degree = np.bincount(tail, minlength=len(node_points))
+    in_degree = np.bincount(head, minlength=len(node_points))
+    if directed:
+        ends = np.flatnonzero(out_degree > in_degree)
+    else:
+        ends = np.flatnonzero(out_degree % 2 == 1)
+    starts = np.concatenate([ends, np.flatnonzero(out_degree > 0)])
+
+    used = [False] * count
+    paths = []
+    for first in starts.tolist():
+        while True:
+            path = [first]
+            node = first
+            while True:
+                edge = -1
+                while cursor[node] < offsets[node + 1]:
+                    candidate = leaving[cursor[node]]
+                    cursor[node] += 1
+                    if not used[segment_of[candidate]]:
+                        edge = candidate
+                        break
+                if edge < 0:
+                    break
+                used[segment_of[edge]] = True
+                node = head_of[edge]
+                path.append(node)
+
+            if len(path) == 1:
+                break
+            closed = path[-1] == path[0]
+            if closed:
+                path.pop()
+            paths.append((node_points[path], closed))
+
+    return paths
+
+
+def _ranks(counts: np.ndarray) -> np.ndarray:
+    """Index of every element within its group, for groups of the given sizes."""
+    return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+def _quantize(points: np.ndarray, resolution: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Node index of every point, and the first point seen in every node."""
+    cells = np.floor(points / resolution).astype(np.int64)
+    cells -= cells.min(axis=0)
+    keys = cells[:, 0] * (cells[:, 1].max() + 1) + cells[:, 1]
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    return inverse.reshape(-1), points[first]
+
+
+def _split_edges(
+    start: np.ndarray,
+    end: np.ndarray,
+    resolution: float,
+    grid: _EdgeGrid,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split edges wherever another edge crosses or touches them.
+
+    A crossing point is computed once and shared by both edges, and points
+    where one edge ends on another use that end point, so the pieces meet
+    exactly.
+    """
+    first, second = grid.pairs()
+
+    splits = [
+        (np.arange(len(start)), np.zeros(len(start)), start),
+        (np.arange(len(start)), np.ones(len(start)), end),
+    ]
+
+    p, r = start[first], end[first] - start[first]
+    q, s = start[second], end[second] - start[second]
+    denom = r[:, 0] * s[:, 1] - r[:, 1] * s[:, 0]
+    qp = q - p
+    length = np.hypot(r[:, 0], r[:, 1]) * np.hypot(s[:, 0], s[:, 1])
+    crossing = np.abs(denom) > length * _EPSILON
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (qp[:, 0] * s[:, 1] - qp[:, 1] * s[:, 0]) / denom
+        u = (qp[:, 0] * r[:, 1] - qp[:, 1] * r[:, 0]) / denom
+
+    # Crossings in the middle of both edges
+    inner = crossing & (t > _EPSILON) & (t < 1 - _EPSILON) & (u > _EPSILON) & (u < 1 - _EPSILON)
+    point = p[inner] + t[inner, None] * r[inner]
+    splits.append((first[inner], t[inner], point))
+    splits.append((second[inner], u[inner], point))
+
+    # End points lying on the other edge, including along collinear overlaps
+    for host, other in ((first, second), (second, first)):
+        a, d = start[host], end[host] - start[host]
+        length2 = np.maximum(np.einsum("ij,ij->i", d, d), _EPSILON * _EPSILON)
+        for tip in (start[other], end[other]):
+            offset = tip - a
+            along = np.einsum("ij,ij->i", offset, d) / length2
+            across = np.abs(offset[:, 0] * d[:, 1] - offset[:, 1] * d[:, 0]) / np.sqrt(length2)
+            touch = (across <= resolution) & (along > _EPSILON) & (along < 1 - _EPSILON)
+            splits.append((host[touch], along[touch], tip[touch]))
+
+    edge = np.concatenate([s[0] for s in splits])
+    param = np.concatenate([s[1] for s in splits])
+    point = np.concatenate([s[2] for s in splits])
+    order = np.lexsort((param, edge))
+    edge, point = edge[order], point[order]
+
+    # Consecutive split points of the same edge bound one piece
+    same = edge[1:] == edge[:-1]
+    return point[:-1][same], point[1:][same]
+
+
+def _unique_pieces(
+    start: np.ndarray,
+    end: np.ndarray,
+    resolution: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Drop zero-length pieces and pieces covering the same span twice."""
+    nodes, node_points = _quantize(np.concatenate([start, end]), resolution)
+    tail, head = nodes[:len(start)], nodes[len(start):]
+    distinct = tail != head
+    tail, head = tail[distinct], head[distinct]
+
+    keys = np.minimum(tail, head) * np.int64(len(node_points)) + np.maximum(tail, head)
+    _, first = np.unique(keys, return_index=True)
+    return node_points[tail[first]], node_points[head[first]]
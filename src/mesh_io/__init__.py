@@ -0,0 +1,88 @@
+"""Mesh I/O module for Claude Fab Lab.
+
+Provides a shared loader that reads STL, OBJ and 3MF files into
+NumPy triangle arrays used by the analysis modules, and a persistent
+content-hash-keyed cache of those arrays, plus vectorized topology
+and ray-casting helpers built on them, and a streaming scanner for
+the bounds, volume and area of part files.
+"""
+
+from src.mesh_io.cache import (
+    ANALYSIS_VERSION,
+    MeshCache,
+    MeshFeatures,
+    configure_mesh_cache,
+    get_mesh_cache,
+    load_mesh_features,
+)
+from src.mesh_io.loader import (
+    SUPPORTED_FORMATS,
+    MeshData,
+    binary_stl_count,
+    is_binary_stl,
+    load_mesh,
+    merge_duplicate_vertices,
+    read_3mf,
+    read_ascii_stl,
+    read_binary_stl,
+    read_obj,
+    read_stl,
+)
+from src.mesh_io.raycast import (
+    TriangleGrid,
+    intersect_pairs,
+)
+from src.mesh_io.scan import (
+    MeshStats,
+    scan_folder,
+    scan_mesh,
+    scan_paths,
+    scan_stl,
+)
+from src.mesh_io.topology import (
+    boundary_loop_count,
+    close_pairs,
+    cluster_points,
+    connected_components,
+    edge_incidence,
+    edge_keys,
+    face_adjacency,
+    face_edges,
+    weld_points,
+)
+
+__all__ = [
+    "MeshData",
+    "SUPPORTED_FORMATS",
+    "load_mesh",
+    "read_stl",
+    "read_binary_stl",
+    "read_ascii_stl",
+    "read_obj",
+    "read_3mf",
+    "is_binary_stl",
+    "binary_stl_count",
+    "merge_duplicate_vertices",
+    "ANALYSIS_VERSION",
+    "MeshCache",
+    "MeshFeatures",
+    "configure_mesh_cache",
+    "get_mesh_cache",
+    "load_mesh_features",
+    "TriangleGrid",
+    "intersect_pairs",
+    "MeshStats",
+    "scan_folder",
+    "scan_mesh",
+    "scan_paths",
+    "scan_stl",
+    "boundary_loop_count",
+    "close_pairs",
+    "cluster_points",
+    "connected_components",
+    "edge_incidence",
+    "edge_keys",
+    "face_adjacency",
+    "face_edges",
+    "weld_points",
+]
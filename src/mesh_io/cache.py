@@ -0,0 +1,331 @@
+"""Content-addressed cache of loaded meshes and their derived arrays.
+
+Entries are keyed on the file's content hash plus ``ANALYSIS_VERSION`` and
+stored as one directory of ``.npy`` files per mesh, which are memory-mapped
+on load. The least recently used entries are evicted once the store grows
+past its size limit.
+"""
+
+import json
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from src.config import get_settings
+from src.mesh_io.loader import MeshData, load_mesh, merge_duplicate_vertices
+from src.utils import file_hash, get_logger
+
+logger = get_logger("mesh_io.cache")
+
+# Bump when the derived arrays or their on-disk layout change
+ANALYSIS_VERSION = 1
+HASH_ENTRIES = 4096  # File stamps whose content hash is remembered
+
+_ARRAY_NAMES = ("vertices", "faces", "normals", "face_normals", "face_areas", "face_centroids")
+
+
+@dataclass
+class MeshFeatures:
+    """A welded mesh together with the per-face arrays most analyzers need."""
+    mesh: MeshData
+    face_normals: np.ndarray  # (F, 3) unit normals from winding
+    face_areas: np.ndarray  # (F,) mm²
+    face_centroids: np.ndarray  # (F, 3)
+    bounds: np.ndarray  # (2, 3) min and max corner
+    signed_volume: float  # mm³
+    content_hash: str = ""
+
+    @property
+    def dimensions(self) -> Tuple[float, float, float]:
+        """Bounding box size along X, Y and Z."""
+        size = self.bounds[1] - self.bounds[0]
+        return float(size[0]), float(size[1]), float(size[2])
+
+    @property
+    def surface_area(self) -> float:
+        """Total surface area in mm²."""
+        return float(np.sum(self.face_areas, dtype=np.float64))
+
+    @classmethod
+    def from_mesh(cls, mesh: MeshData, content_hash: str = "") -> "MeshFeatures":
+        """Weld a mesh and compute its derived arrays."""
+        welded = merge_duplicate_vertices(mesh)
+        lo, hi = welded.bounds()
+        return cls(
+            mesh=welded,
+            face_normals=welded.face_normals(),
+            face_areas=welded.face_areas(),
+            face_centroids=welded.face_centroids(),
+            bounds=np.stack([lo, hi]),
+            signed_volume=welded.signed_volume(),
+            content_hash=content_hash,
+        )
+
+
+class MeshCache:
+    """
+    Persistent mesh feature cache.
+
+    A hit costs one content hash of the source file; the arrays themselves
+    are memory-mapped rather than re-parsed. Recently used entries are also
+    kept in memory.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_bytes: int = 512 * 1024 * 1024,
+        memory_entries: int = 8,
+        version: int = ANALYSIS_VERSION,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory for cache entries (default: data/mesh_cache)
+            max_bytes: Size limit of the on-disk store
+            memory_entries: Number of entries kept in memory
+            version: Analysis version included in every key
+        """
+        if cache_dir is None:
+            cache_dir = Path(get_settings().data_dir) / "mesh_cache"
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.version = version
+
+        self.hits = 0
+        self.misses = 0
+
+        self._memory: "OrderedDict[str, MeshFeatures]" = OrderedDict()
+        # (path, size, mtime) -> content hash, so unchanged files are hashed once
+        self._hashes: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key_for(self, path: Union[str, Path]) -> str:
+        """Get the cache key for a file."""
+        path = Path(path)
+        stat = path.stat()
+        stamp = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            digest = self._hashes.get(stamp)
+            if digest is not None:
+                self._hashes.move_to_end(stamp)
+        if digest is None:
+            digest = file_hash(path)
+            with self._lock:
+                self._hashes[stamp] = digest
+                while len(self._hashes) > HASH_ENTRIES:
+                    self._hashes.popitem(last=False)
+
+        return f"{digest}-v{self.version}"
+
+    def get(self, path: Union[str, Path]) -> Optional[MeshFeatures]:
+        """Look up cached features for a file without computing them."""
+        return self._lookup(self.key_for(path))
+
+    def load(self, path: Union[str, Path]) -> MeshFeatures:
+        """
+        Get features for a mesh file, loading and caching them on a miss.
+
+        Args:
+            path: Path to the mesh file
+
+        Returns:
+            Mesh features
+        """
+        key = self.key_for(path)
+        features = self._lookup(key)
+        if features is not None:
+            self.hits += 1
+            return features
+
+        self.misses += 1
+        features = MeshFeatures.from_mesh(load_mesh(path), content_hash=key)
+        self._remember(key, features)
+
+        try:
+            self._write_entry(key, features)
+            self._evict()
+        except OSError as e:
+            logger.warning(f"Could not write mesh cache entry: {e}")
+
+        return features
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._memory.clear()
+            self._hashes.clear()
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def disk_usage(self) -> int:
+        """Total bytes used by the on-disk store."""
+        return sum(size for _, _, size in self._entries())
+
+    def _lookup(self, key: str) -> Optional[MeshFeatures]:
+        """Find an entry in memory or on disk."""
+        with self._lock:
+            features = self._memory.get(key)
+            if features is not None:
+                self._memory.move_to_end(key)
+                return features
+
+        features = self._read_entry(key)
+        if features is not None:
+            self._remember(key, features)
+        return features
+
+    def _remember(self, key: str, features: MeshFeatures) -> None:
+        """Keep an entry in the in-memory LRU."""
+        with self._lock:
+            self._memory[key] = features
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _read_entry(self, key: str) -> Optional[MeshFeatures]:
+        """Memory-map an entry from disk."""
+        entry = self.cache_dir / key
+        meta_file = entry / "meta.json"
+        if not meta_file.exists():
+            return None
+
+        try:
+            meta = json.loads(meta_file.read_text())
+            arrays = {}
+            for name in _ARRAY_NAMES:
+                array_file = entry / f"{name}.npy"
+                arrays[name] = np.load(array_file, mmap_mode="r") if array_file.exists() else None
+
+            # Touch the entry so eviction sees it as recently used
+            os.utime(entry)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable mesh cache entry {key}: {e}")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+
+        mesh = MeshData(
+            vertices=arrays["vertices"],
+            faces=arrays["faces"],
+            normals=arrays["normals"],
+            source=meta.get("source", ""),
+        )
+        return MeshFeatures(
+            mesh=mesh,
+            face_normals=arrays["face_normals"],
+            face_areas=arrays["face_areas"],
+            face_centroids=arrays["face_centroids"],
+            bounds=np.array(meta["bounds"], dtype=np.float64),
+            signed_volume=float(meta["signed_volume"]),
+            content_hash=key,
+        )
+
+    def _write_entry(self, key: str, features: MeshFeatures) -> None:
+        """Write an entry atomically by renaming a finished temp directory."""
+        entry = self.cache_dir / key
+        if entry.exists():
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp = self.cache_dir / f".{key}.{uuid.uuid4().hex}.tmp"
+        temp.mkdir()
+
+        try:
+            arrays = {
+                "vertices": features.mesh.vertices,
+                "faces": features.mesh.faces,
+                "normals": features.mesh.normals,
+                "face_normals": features.face_normals,
+                "face_areas": features.face_areas,
+                "face_centroids": features.face_centroids,
+            }
+            for name, array in arrays.items():
+                if array is not None:
+                    np.save(temp / f"{name}.npy", np.ascontiguousarray(array))
+
+            meta = {
+                "version": self.version,
+                "source": features.mesh.source,
+                "bounds": features.bounds.tolist(),
+                "signed_volume": features.signed_volume,
+            }
+            (temp / "meta.json").write_text(json.dumps(meta))
+
+            os.replace(temp, entry)
+        except OSError:
+            shutil.rmtree(temp, ignore_errors=True)
+            # Another process may have written the same entry first
+            if not entry.exists():
+                raise
+
+    def _entries(self):
+        """List (path, last used, size) for every on-disk entry."""
+        if not self.cache_dir.exists():
+            return []
+
+        entries = []
+        for entry in self.cache_dir.iterdir():
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+            entries.append((entry, entry.stat().st_mtime, size))
+        return entries
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until under the size limit."""
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+
+        for entry, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            logger.debug(f"Evicted mesh cache entry {entry.name}")
+
+
+# Global cache instance
+_cache: Optional[MeshCache] = None
+
+
+def get_mesh_cache() -> MeshCache:
+    """Get the global mesh cache."""
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        _cache = MeshCache(max_bytes=settings.mesh_cache_max_mb * 1024 * 1024)
+    return _cache
+
+
+def configure_mesh_cache(cache: Optional[MeshCache]) -> None:
+    """Override the global mesh cache."""
+    global _cache
+    _cache = cache
+
+
+def load_mesh_features(path: Union[str, Path]) -> MeshFeatures:
+    """
+    Load a mesh file with its derived arrays, using the cache when enabled.
+
+    Args:
+        path: Path to an STL, OBJ or 3MF file
+
+    Returns:
+        Mesh features
+    """
+    if not get_settings().mesh_cache_enabled:
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Mesh file not found: {path}")
+        return MeshFeatures.from_mesh(load_mesh(path))
+    return get_mesh_cache().load(path)
@@ -0,0 +1,353 @@
+"""Shared mesh loader for STL, OBJ and 3MF files.
+
+Every format is loaded into the same ``MeshData`` structure: a float32
+vertex array and an int64 triangle index array. Binary STL files are
+memory-mapped and viewed through ``np.frombuffer`` so the only copy made
+is the one into the contiguous triangle array.
+"""
+
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.utils import get_logger
+
+logger = get_logger("mesh_io.loader")
+
+SUPPORTED_FORMATS = (".stl", ".obj", ".3mf")
+
+# Binary STL record: normal, three vertices, attribute byte count (50 bytes)
+STL_HEADER_SIZE = 84
+STL_RECORD_DTYPE = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attribute", "<u2"),
+])
+
+_STL_VERTEX_PATTERN = re.compile(
+    rb"vertex\s+(\S+)\s+(\S+)\s+(\S+)", re.IGNORECASE
+)
+_STL_NORMAL_PATTERN = re.compile(
+    rb"facet\s+normal\s+(\S+)\s+(\S+)\s+(\S+)", re.IGNORECASE
+)
+
+_3MF_CORE_NS = "{http://schemas.microsoft.com/3dmanufacturing/core/2015/02}"
+
+
+@dataclass
+class MeshData:
+    """Triangle mesh held as NumPy arrays."""
+    vertices: np.ndarray  # (V, 3) float32
+    faces: np.ndarray  # (F, 3) int64 indices into vertices
+    normals: Optional[np.ndarray] = None  # (F, 3) normals stored in the file (STL only)
+    source: str = ""
+    _triangles: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+
+    @property
+    def vertex_count(self) -> int:
+        """Number of vertices."""
+        return int(len(self.vertices))
+
+    @property
+    def face_count(self) -> int:
+        """Number of triangles."""
+        return int(len(self.faces))
+
+    @property
+    def is_empty(self) -> bool:
+        """True if the mesh has no triangles."""
+        return self.face_count == 0
+
+    @property
+    def triangles(self) -> np.ndarray:
+        """Contiguous (F, 3, 3) float32 array of triangle corners."""
+        if self._triangles is None:
+            self._triangles = np.ascontiguousarray(self.vertices[self.faces])
+        return self._triangles
+
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Axis-aligned bounds of all vertices as (min, max)."""
+        if self.vertex_count == 0:
+            zero = np.zeros(3, dtype=np.float64)
+            return zero, zero.copy()
+        return (
+            self.vertices.min(axis=0).astype(np.float64),
+            self.vertices.max(axis=0).astype(np.float64),
+        )
+
+    def dimensions(self) -> Tuple[float, float, float]:
+        """Bounding box size along X, Y and Z."""
+        lo, hi = self.bounds()
+        size = hi - lo
+        return float(size[0]), float(size[1]), float(size[2])
+
+    def _cross(self) -> np.ndarray:
+        """Unnormalized face normals (twice the face area in length)."""
+        tri = self.triangles
+        return np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+
+    def face_normals(self) -> np.ndarray:
+        """Unit face normals from vertex winding; zero for degenerate faces."""
+        cross = self._cross()
+        length = np.linalg.norm(cross, axis=1)
+        normals = np.zeros_like(cross)
+        valid = length > 1e-12
+        normals[valid] = cross[valid] / length[valid, None]
+        return normals
+
+    def face_areas(self) -> np.ndarray:
+        """Area of every face in mm²."""
+        return 0.5 * np.linalg.norm(self._cross(), axis=1)
+
+    def face_centroids(self) -> np.ndarray:
+        """Centroid of every face."""
+        return self.triangles.mean(axis=1)
+
+    def surface_area(self) -> float:
+        """Total surface area in mm²."""
+        return float(self.face_areas().sum(dtype=np.float64))
+
+    def signed_volume(self) -> float:
+        """Signed enclosed volume in mm³ (positive for outward winding)."""
+        if self.is_empty:
+            return 0.0
+        tri = self.triangles
+        det = np.einsum("ij,ij->i", tri[:, 0], np.cross(tri[:, 1], tri[:, 2]))
+        return float(det.sum(dtype=np.float64) / 6.0)
+
+
+def _header_count(path: Path) -> int:
+    """Read the triangle count stored in a binary STL header."""
+    with open(path, "rb") as f:
+        f.seek(80)
+        return int(np.frombuffer(f.read(4), dtype="<u4")[0])
+
+
+def is_binary_stl(path: Union[str, Path]) -> bool:
+    """
+    Check whether an STL file is binary by matching its size to the header count.
+
+    Some exporters pad binary files past the last record, so any file at
+    least as large as the header count requires is taken as binary. ASCII
+    files never qualify: the text bytes at the count offset decode to well
+    over a hundred million triangles.
+    """
+    path = Path(path)
+    size = path.stat().st_size
+    if size < STL_HEADER_SIZE:
+        return False
+    return size >= STL_HEADER_SIZE + _header_count(path) * STL_RECORD_DTYPE.itemsize
+
+
+def binary_stl_count(path: Union[str, Path]) -> int:
+    """Number of triangle records in a binary STL, ignoring trailing padding."""
+    path = Path(path)
+    size = path.stat().st_size
+    if size < STL_HEADER_SIZE:
+        return 0
+    available = (size - STL_HEADER_SIZE) // STL_RECORD_DTYPE.itemsize
+    return min(_header_count(path), available)
+
+
+def read_binary_stl(path: Union[str, Path]) -> MeshData:
+    """Read a binary STL by memory-mapping its triangle records."""
+    path = Path(path)
+    count = binary_stl_count(path)
+
+    if count <= 0:
+        return _empty_mesh(str(path))
+
+    records = np.memmap(path, dtype=STL_RECORD_DTYPE, mode="r", offset=STL_HEADER_SIZE, shape=(count,))
+    try:
+        triangles = np.ascontiguousarray(records["vertices"])
+        normals = np.ascontiguousarray(records["normal"])
+    finally:
+        del records
+
+    return _from_triangles(triangles, normals=normals, source=str(path))
+
+
+def read_ascii_stl(path: Union[str, Path]) -> MeshData:
+    """Read an ASCII STL file."""
+    path = Path(path)
+    content = path.read_bytes()
+
+    coords = _STL_VERTEX_PATTERN.findall(content)
+    count = len(coords) // 3
+    if count == 0:
+        return _empty_mesh(str(path))
+
+    triangles = np.array(coords[:count * 3]).astype(np.float32).reshape(count, 3, 3)
+
+    normals = None
+    normal_coords = _STL_NORMAL_PATTERN.findall(content)
+    if len(normal_coords) == count:
+        normals = np.array(normal_coords).astype(np.float32).reshape(count, 3)
+
+    return _from_triangles(triangles, normals=normals, source=str(path))
+
+
+def read_stl(path: Union[str, Path]) -> MeshData:
+    """Read an STL file, detecting binary or ASCII encoding."""
+    if is_binary_stl(path):
+        return read_binary_stl(path)
+    return read_ascii_stl(path)
+
+
+def read_obj(path: Union[str, Path]) -> MeshData:
+    """Read an OBJ file, fan-triangulating polygon faces."""
+    path = Path(path)
+    vertices: List[Tuple[float, float, float]] = []
+    faces: List[Tuple[int, int, int]] = []
+
+    with open(path, "r", errors="ignore") as f:
+        for line_number, line in enumerate(f, 1):
+            if line.startswith("v "):
+                parts = line.split()
+                if len(parts) >= 4:
+                    vertices.append((float(parts[1]), float(parts[2]), float(parts[3])))
+            elif line.startswith("f "):
+                indices = []
+                for p in line.split()[1:]:
+                    try:
+                        idx = int(p.split("/")[0])
+                    except ValueError:
+                        raise ValueError(
+                            f"Malformed OBJ face in {path.name} line {line_number}: {p!r}"
+                        ) from None
+                    # OBJ is 1-indexed; negative indices are relative to the end
+                    indices.append(idx - 1 if idx > 0 else len(vertices) + idx)
+                for i in range(1, len(indices) - 1):
+                    faces.append((indices[0], indices[i], indices[i + 1]))
+
+    vertex_array = np.array(vertices, dtype=np.float32).reshape(-1, 3)
+    face_array = np.array(faces, dtype=np.int64).reshape(-1, 3)
+
+    if len(face_array):
+        valid = (face_array >= 0).all(axis=1) & (face_array < len(vertex_array)).all(axis=1)
+        face_array = face_array[valid]
+
+    return MeshData(vertices=vertex_array, faces=face_array, source=str(path))
+
+
+def read_3mf(path: Union[str, Path]) -> MeshData:
+    """Read every mesh object from a 3MF package into one mesh."""
+    path = Path(path)
+    vertex_blocks: List[np.ndarray] = []
+    face_blocks: List[np.ndarray] = []
+    offset = 0
+
+    with zipfile.ZipFile(path, "r") as zf:
+        for name in zf.namelist():
+            if not name.endswith(".model"):
+                continue
+
+            with zf.open(name) as f:
+                vertices: List[Tuple[str, str, str]] = []
+                triangles: List[Tuple[str, str, str]] = []
+
+                for _, elem in ET.iterparse(f, events=("end",)):
+                    tag = elem.tag
+                    if tag == f"{_3MF_CORE_NS}vertex":
+                        vertices.append((elem.get("x", "0"), elem.get("y", "0"), elem.get("z", "0")))
+                    elif tag == f"{_3MF_CORE_NS}triangle":
+                        triangles.append((elem.get("v1", "0"), elem.get("v2", "0"), elem.get("v3", "0")))
+                    elif tag == f"{_3MF_CORE_NS}mesh":
+                        # Triangle indices are local to each mesh element
+                        if vertices:
+                            vertex_blocks.append(np.array(vertices).astype(np.float32).reshape(-1, 3))
+                            if triangles:
+                                face_blocks.append(np.array(triangles).astype(np.int64).reshape(-1, 3) + offset)
+                            offset += len(vertices)
+                        vertices, triangles = [], []
+                    elem.clear()
+
+    if not vertex_blocks:
+        return _empty_mesh(str(path))
+
+    vertex_array = np.concatenate(vertex_blocks)
+    face_array = np.concatenate(face_blocks) if face_blocks else np.zeros((0, 3), dtype=np.int64)
+    return MeshData(vertices=vertex_array, faces=face_array, source=str(path))
+
+
+def load_mesh(path: Union[str, Path]) -> MeshData:
+    """
+    Load a mesh file into a ``MeshData``.
+
+    Args:
+        path: Path to an STL (binary or ASCII), OBJ or 3MF file
+
+    Returns:
+        Loaded mesh
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the format is not supported or an OBJ face is malformed
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Mesh file not found: {path}")
+
+    suffix = path.suffix.lower()
+    if suffix == ".stl":
+        mesh = read_stl(path)
+    elif suffix == ".obj":
+        mesh = read_obj(path)
+    elif suffix == ".3mf":
+        mesh = read_3mf(path)
+    else:
+        raise ValueError(f"Unsupported mesh format: {path.suffix}")
+
+    logger.debug(f"Loaded {path.name}: {mesh.vertex_count} vertices, {mesh.face_count} faces")
+    return mesh
+
+
+def merge_duplicate_vertices(mesh: MeshData) -> MeshData:
+    """Return a copy of the mesh with exactly coincident vertices merged."""
+    if mesh.vertex_count == 0:
+        return mesh
+
+    unique, first, inverse = np.unique(
+        mesh.vertices, axis=0, return_index=True, return_inverse=True
+    )
+    # Keep vertices in first-occurrence order so indices stay stable
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    faces = rank[inverse.reshape(-1)][mesh.faces]
+    return MeshData(
+        vertices=np.ascontiguousarray(unique[order]),
+        faces=faces.astype(np.int64),
+        normals=mesh.normals,
+        source=mesh.source,
+    )
+
+
+def _from_triangles(
+    triangles: np.ndarray,
+    normals: Optional[np.ndarray] = None,
+    source: str = "",
+) -> MeshData:
+    """Build an unindexed mesh that shares memory with a triangle array."""
+    count = len(triangles)
+    return MeshData(
+        vertices=triangles.reshape(-1, 3),
+        faces=np.arange(count * 3, dtype=np.int64).reshape(count, 3),
+        normals=normals,
+        source=source,
+        _triangles=triangles,
+    )
+
+
+def _empty_mesh(source: str = "") -> MeshData:
+    """Create a mesh with no vertices or faces."""
+    return MeshData(
+        vertices=np.zeros((0, 3), dtype=np.float32),
+        faces=np.zeros((0, 3), dtype=np.int64),
+        source=source,
+    )
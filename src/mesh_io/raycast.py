@@ -0,0 +1,288 @@
+"""Batched ray casting against triangle meshes.
+
+Triangles are binned once into a sparse uniform grid. Rays then walk the
+grid together (3D DDA), and at each step only the triangles in the current
+cell of each ray are tested, so a batch of R rays costs roughly
+O(R x cells crossed x triangles per cell) instead of O(R x F).
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.utils import get_logger
+
+logger = get_logger("mesh_io.raycast")
+
+_EPSILON = 1e-9
+
+
+def intersect_pairs(
+    origins: np.ndarray,
+    directions: np.ndarray,
+    triangles: np.ndarray,
+) -> np.ndarray:
+    """
+    Moller-Trumbore intersection for matching rows of rays and triangles.
+
+    Args:
+        origins: (N, 3) ray origins
+        directions: (N, 3) ray directions
+        triangles: (N, 3, 3) triangle corners
+
+    Returns:
+        (N,) ray parameter of each hit, or inf where the ray misses
+    """
+    v0 = triangles[:, 0]
+    return _intersect(origins, directions, v0, triangles[:, 1] - v0, triangles[:, 2] - v0)
+
+
+def _intersect(
+    origins: np.ndarray,
+    directions: np.ndarray,
+    v0: np.ndarray,
+    e1: np.ndarray,
+    e2: np.ndarray,
+) -> np.ndarray:
+    """Moller-Trumbore on precomputed triangle edges."""
+    p = np.cross(directions, e2)
+    det = np.einsum("ij,ij->i", e1, p)
+    valid = np.abs(det) > _EPSILON
+    inv_det = np.where(valid, 1.0 / np.where(valid, det, 1.0), 0.0)
+
+    s = origins - v0
+    u = np.einsum("ij,ij->i", s, p) * inv_det
+    q = np.cross(s, e1)
+    v = np.einsum("ij,ij->i", directions, q) * inv_det
+    t = np.einsum("ij,ij->i", e2, q) * inv_det
+
+    hit = valid & (u >= -1e-7) & (v >= -1e-7) & (u + v <= 1 + 1e-7) & (t > 0)
+    return np.where(hit, t, np.inf)
+
+
+class TriangleGrid:
+    """
+    Sparse uniform grid over a triangle soup.
+
+    Each triangle is registered in every cell its bounding box overlaps.
+    Only occupied cells are stored, as a sorted key array with offsets into
+    a flat triangle list.
+    """
+
+    def __init__(
+        self,
+        triangles: np.ndarray,
+        cell_size: Optional[float] = None,
+        max_resolution: int = 256,
+    ):
+        """
+        Build the grid.
+
+        Args:
+            triangles: (F, 3, 3) triangle corners
+            cell_size: Edge length of a grid cell (chosen from the face count if omitted)
+            max_resolution: Maximum cells along the longest axis
+        """
+        self.triangles = np.ascontiguousarray(triangles, dtype=np.float64)
+        count = len(self.triangles)
+
+        # Edges are precomputed once rather than per ray-triangle pair
+        self._v0 = self.triangles[:, 0]
+        self._e1 = self.triangles[:, 1] - self._v0
+        self._e2 = self.triangles[:, 2] - self._v0
+
+        if count == 0:
+            self.origin = np.zeros(3)
+            self.cell_size = 1.0
+            self.dims = np.ones(3, dtype=np.int64)
+            self._keys = np.zeros(0, dtype=np.int64)
+            self._offsets = np.zeros(1, dtype=np.int64)
+            self._items = np.zeros(0, dtype=np.int64)
+            return
+
+        lo = self.triangles.min(axis=(0, 1))
+        hi = self.triangles.max(axis=(0, 1))
+        extent = np.maximum(hi - lo, 1e-6)
+
+        if cell_size is None:
+            # About two cells per cube-root of the face count on the longest axis
+            resolution = int(np.clip(np.ceil(2.0 * np.cbrt(count)), 1, max_resolution))
+            cell_size = float(extent.max() / resolution)
+
+        # Pad so triangles on the max faces of the box fall inside the grid
+        self.cell_size = float(cell_size)
+        self.origin = lo - 1e-6
+        self.dims = np.maximum(np.ceil((extent + 2e-6) / self.cell_size).astype(np.int64), 1)
+
+        tri_lo = self._cell_of(self.triangles.min(axis=1))
+        tri_hi = self._cell_of(self.triangles.max(axis=1))
+        self._keys, self._offsets, self._items = self._bin(tri_lo, tri_hi)
+
+        logger.debug(
+            f"Built triangle grid {tuple(self.dims)} with {len(self._keys)} occupied cells "
+            f"for {count} triangles"
+        )
+
+    def _cell_of(self, points: np.ndarray) -> np.ndarray:
+        """Integer cell coordinates of points, clamped to the grid."""
+        cells = np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, self.dims - 1)
+
+    def _key(self, cells: np.ndarray) -> np.ndarray:
+        """Flatten cell coordinates to a single key."""
+        return (cells[..., 0] * self.dims[1] + cells[..., 1]) * self.dims[2] + cells[..., 2]
+
+    def _bin(self, tri_lo: np.ndarray, tri_hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Register every triangle in the cells its bounding box covers."""
+        span = tri_hi - tri_lo + 1
+        per_tri = span.prod(axis=1)
+        tri_ids = np.repeat(np.arange(len(span)), per_tri)
+
+        # Local index of each (triangle, cell) entry within its triangle's box
+        starts = np.cumsum(per_tri) - per_tri
+        local = np.arange(per_tri.sum()) - np.repeat(starts, per_tri)
+        sy = span[tri_ids, 1]
+        sz = span[tri_ids, 2]
+        offset = np.stack([local // (sy * sz), (local // sz) % sy, local % sz], axis=1)
+
+        keys = self._key(tri_lo[tri_ids] + offset)
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        items = tri_ids[order]
+
+        unique_keys, first = np.unique(keys, return_index=True)
+        offsets = np.append(first, len(keys)).astype(np.int64)
+        return unique_keys, offsets, items
+
+    def _candidates(self, cell_keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Expand cell keys to (query index, triangle index) pairs."""
+        pos = np.minimum(np.searchsorted(self._keys, cell_keys), len(self._keys) - 1)
+        found = self._keys[pos] == cell_keys
+
+        starts = np.where(found, self._offsets[pos], 0)
+        counts = np.where(found, self._offsets[pos + 1] - self._offsets[pos], 0)
+
+        query = np.repeat(np.arange(len(cell_keys)), counts)
+        first = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return query, self._items[first + np.arange(counts.sum())]
+
+    def intersect(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        max_distance: float = np.inf,
+        ignore_faces: Optional[np.ndarray] = None,
+        batch_size: int = 32768,
+        max_pairs: int = 1_000_000,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the first triangle hit by each ray.
+
+        Args:
+            origins: (R, 3) ray origins
+            directions: (R, 3) ray directions (normalized internally)
+            max_distance: Ignore hits farther than this
+            ignore_faces: (R,) face index each ray should skip, e.g. its source face; -1 for none
+            batch_size: Rays traced together
+            max_pairs: Ray-triangle tests evaluated at once, which bounds peak memory
+
+        Returns:
+            (distance per ray or inf, hit face index per ray or -1)
+        """
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+        count = len(origins)
+
+        best_t = np.full(count, np.inf)
+        best_face = np.full(count, -1, dtype=np.int64)
+        if count == 0 or len(self._keys) == 0:
+            return best_t, best_face
+
+        length = np.linalg.norm(directions, axis=1)
+        directions = directions / np.where(length > 0, length, 1.0)[:, None]
+        if ignore_faces is None:
+            ignore_faces = np.full(count, -1, dtype=np.int64)
+        ignore_faces = np.asarray(ignore_faces, dtype=np.int64)
+
+        for start in range(0, count, batch_size):
+            batch = slice(start, start + batch_size)
+            best_t[batch], best_face[batch] = self._trace(
+                origins[batch], directions[batch], max_distance, ignore_faces[batch], max_pairs
+            )
+
+        return best_t, best_face
+
+    def _trace(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        max_distance: float,
+        ignore_faces: np.ndarray,
+        max_pairs: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Walk one batch of normalized rays through the grid."""
+        count = len(origins)
+        best_t = np.full(count, np.inf)
+        best_face = np.full(count, -1, dtype=np.int64)
+
+        # Clip each ray against the grid box (slab test)
+        box_lo = self.origin
+        box_hi = self.origin + self.dims * self.cell_size
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv = 1.0 / directions
+            t0 = (box_lo - origins) * inv
+            t1 = (box_hi - origins) * inv
+        t_near = np.nan_to_num(np.minimum(t0, t1), nan=-np.inf).max(axis=1)
+        t_far = np.nan_to_num(np.maximum(t0, t1), nan=np.inf).min(axis=1)
+        t_enter = np.maximum(t_near, 0.0)
+        t_limit = np.minimum(t_far, max_distance)
+
+        active = np.flatnonzero(t_enter <= t_limit)
+        if len(active) == 0:
+            return best_t, best_face
+
+        # DDA state for every active ray
+        start = origins[active] + directions[active] * t_enter[active, None]
+        cell = self._cell_of(start)
+        d = directions[active]
+        step = np.where(d > 0, 1, np.where(d < 0, -1, 0)).astype(np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            next_edge = self.origin + (cell + (step > 0)) * self.cell_size
+            t_max = np.where(step != 0, (next_edge - origins[active]) / d, np.inf)
+            t_delta = np.where(step != 0, self.cell_size / np.abs(d), np.inf)
+
+        while len(active):
+            query, tri = self._candidates(self._key(cell))
+
+            for chunk in range(0, len(query), max_pairs):
+                rays = active[query[chunk:chunk + max_pairs]]
+                faces = tri[chunk:chunk + max_pairs]
+                t = _intersect(
+                    origins[rays], directions[rays],
+                    self._v0[faces], self._e1[faces], self._e2[faces],
+                )
+                t[(faces == ignore_faces[rays]) | (t > t_limit[rays])] = np.inf
+
+                # Keep the nearest hit per ray
+                nearest = np.full(count, np.inf)
+                np.minimum.at(nearest, rays, t)
+                win = np.isfinite(t) & (t == nearest[rays]) & (t < best_t[rays])
+                best_t[rays[win]] = t[win]
+                best_face[rays[win]] = faces[win]
+
+            # A hit inside the current cell cannot be beaten by later cells
+            cell_exit = t_max.min(axis=1)
+            done = (best_t[active] <= cell_exit) | (cell_exit > t_limit[active])
+
+            axis = np.argmin(t_max, axis=1)
+            rows = np.arange(len(active))
+            cell[rows, axis] += step[rows, axis]
+            t_max[rows, axis] += t_delta[rows, axis]
+            done |= ((cell < 0) | (cell >= self.dims)).any(axis=1)
+
+            keep = ~done
+            active, cell, step, t_max, t_delta = (
+                active[keep], cell[keep], step[keep], t_max[keep], t_delta[keep]
+            )
+
+        return best_t, best_face
@@ -0,0 +1,259 @@
+"""Streaming mesh statistics for part intake.
+
+Queue and nesting intake only need a part's bounds, volume, surface area
+and triangle count. Binary STL files are read in fixed-size chunks into
+one reused buffer and viewed through ``np.frombuffer``, so memory use
+stays constant however large the file is; ASCII STL is parsed in chunks
+of lines the same way. Folders of parts are scanned by a process pool.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.mesh_io.loader import (
+    _STL_VERTEX_PATTERN,
+    STL_HEADER_SIZE,
+    STL_RECORD_DTYPE,
+    SUPPORTED_FORMATS,
+    MeshData,
+    binary_stl_count,
+    is_binary_stl,
+    load_mesh,
+)
+from src.utils import get_logger
+
+logger = get_logger("mesh_io.scan")
+
+CHUNK_TRIANGLES = 1 << 16  # Binary STL records read per chunk (3.2 MB)
+ASCII_CHUNK_BYTES = 1 << 22  # ASCII STL bytes read per chunk
+CHUNKS_PER_WORKER = 4  # File batches handed to each worker process
+
+
+@dataclass
+class MeshStats:
+    """Summary statistics of a mesh file."""
+    source: str
+    triangle_count: int = 0
+    minimum: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    maximum: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    volume: float = 0.0  # Signed enclosed volume (mm³), positive for outward winding
+    surface_area: float = 0.0  # mm²
+
+    @property
+    def is_empty(self) -> bool:
+        """True if the mesh has no triangles."""
+        return self.triangle_count == 0
+
+    def dimensions(self) -> Tuple[float, float, float]:
+        """Bounding box size along X, Y and Z."""
+        return (
+            self.maximum[0] - self.minimum[0],
+            self.maximum[1] - self.minimum[1],
+            self.maximum[2] - self.minimum[2],
+        )
+
+    @classmethod
+    def from_mesh(cls, mesh: MeshData) -> "MeshStats":
+        """Statistics of a mesh already in memory."""
+        accumulator = _Accumulator()
+        if not mesh.is_empty:
+            accumulator.add(mesh.triangles)
+        return accumulator.result(mesh.source)
+
+
+class _Accumulator:
+    """Running bounds, volume and area over chunks of triangles."""
+
+    def __init__(self):
+        self.count = 0
+        self.minimum = np.full(3, np.inf)
+        self.maximum = np.full(3, -np.inf)
+        self.volume = 0.0
+        self.area = 0.0
+
+    def add(self, triangles: np.ndarray) -> None:
+        """Fold a (N, 3, 3) chunk of triangle corners into the totals."""
+        if len(triangles) == 0:
+            return
+        corners = triangles.reshape(-1, 3)
+        np.minimum(self.minimum, corners.min(axis=0), out=self.minimum)
+        np.maximum(self.maximum, corners.max(axis=0), out=self.maximum)
+
+        tri = triangles.astype(np.float64)
+        cross = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+        # Signed volume of tetrahedra with the origin; v0 . (v1 x v2) == v0 . cross
+        self.volume += float(np.einsum("ij,ij->", tri[:, 0], cross)) / 6.0
+        self.area += 0.5 * float(np.sqrt(np.einsum("ij,ij->i", cross, cross)).sum())
+        self.count += len(tri)
+
+    def result(self, source: str) -> MeshStats:
+        """Statistics gathered so far."""
+        if self.count == 0:
+            return MeshStats(source=source)
+        return MeshStats(
+            source=source,
+            triangle_count=self.count,
+            minimum=tuple(float(v) for v in self.minimum),
+            maximum=tuple(float(v) for v in self.maximum),
+            volume=self.volume,
+            surface_area=self.area,
+        )
+
+
+def scan_binary_stl(path: Union[str, Path], chunk_triangles: int = CHUNK_TRIANGLES) -> MeshStats:
+    """
+    Scan a binary STL in fixed-size chunks.
+
+    Args:
+        path: Path to the STL file
+        chunk_triangles: Triangle records read per chunk
+
+    Returns:
+        Statistics of the mesh
+    """
+    path = Path(path)
+    remaining = binary_stl_count(path)
+    buffer = bytearray(min(remaining, chunk_triangles) * STL_RECORD_DTYPE.itemsize)
+    view = memoryview(buffer)
+    accumulator = _Accumulator()
+
+    with open(path, "rb") as f:
+        f.seek(STL_HEADER_SIZE)
+        while remaining > 0:
+            count = min(remaining, chunk_triangles)
+            read = f.readinto(view[:count * STL_RECORD_DTYPE.itemsize])
+            count = read // STL_RECORD_DTYPE.itemsize
+            if count == 0:
+                break
+            records = np.frombuffer(buffer, dtype=STL_RECORD_DTYPE, count=count)
+            accumulator.add(records["vertices"])
+            remaining -= count
+
+    return accumulator.result(str(path))
+
+
+def scan_ascii_stl(path: Union[str, Path], chunk_bytes: int = ASCII_CHUNK_BYTES) -> MeshStats:
+    """
+    Scan an ASCII STL in chunks of whole lines.
+
+    Args:
+        path: Path to the STL file
+        chunk_bytes: Bytes read per chunk
+
+    Returns:
+        Statistics of the mesh
+    """
+    path = Path(path)
+    accumulator = _Accumulator()
+    carry = b""
+    pending: List[Tuple[bytes, bytes, bytes]] = []
+
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_bytes)
+            text = carry + chunk
+            if chunk:
+                # A line cut by the chunk boundary is finished by the next chunk
+                cut = text.rfind(b"\n") + 1
+                text, carry = text[:cut], text[cut:]
+
+            pending.extend(_STL_VERTEX_PATTERN.findall(text))
+            complete = len(pending) // 3 * 3
+            if complete:
+                coords = np.array(pending[:complete]).astype(np.float32)
+                accumulator.add(coords.reshape(-1, 3, 3))
+                del pending[:complete]
+            if not chunk:
+                break
+
+    return accumulator.result(str(path))
+
+
+def scan_stl(path: Union[str, Path]) -> MeshStats:
+    """Scan an STL file, detecting binary or ASCII encoding."""
+    if is_binary_stl(path):
+        return scan_binary_stl(path)
+    return scan_ascii_stl(path)
+
+
+def scan_mesh(path: Union[str, Path]) -> MeshStats:
+    """
+    Gather the statistics of a mesh file.
+
+    STL files are streamed; OBJ and 3MF files are loaded whole.
+
+    Args:
+        path: Path to an STL (binary or ASCII), OBJ or 3MF file
+
+    Returns:
+        Statistics of the mesh
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the format is not supported
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Mesh file not found: {path}")
+    if path.suffix.lower() == ".stl":
+        return scan_stl(path)
+    return MeshStats.from_mesh(load_mesh(path))
+
+
+def scan_paths(paths: Sequence[Union[str, Path]], workers: int = 1) -> List[Optional[MeshStats]]:
+    """
+    Scan many mesh files, optionally across worker processes.
+
+    Args:
+        paths: Mesh files to scan
+        workers: Processes to scan with (1 = in-process)
+
+    Returns:
+        Statistics per path in the order given, None where a file could not be read
+    """
+    paths = [str(p) for p in paths]
+    if workers <= 1 or len(paths) <= 1:
+        return [_scan_or_none(p) for p in paths]
+
+    chunksize = max(1, len(paths) // (workers * CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_scan_or_none, paths, chunksize=chunksize))
+
+
+def scan_folder(
+    folder: Union[str, Path],
+    workers: int = 1,
+    recursive: bool = False,
+) -> Dict[str, MeshStats]:
+    """
+    Scan every supported mesh file in a folder.
+
+    Args:
+        folder: Folder holding the parts
+        workers: Processes to scan with (1 = in-process)
+        recursive: Also scan subfolders
+
+    Returns:
+        Statistics keyed by file path, in sorted path order; unreadable files are left out
+    """
+    folder = Path(folder)
+    pattern = "**/*" if recursive else "*"
+    paths = sorted(
+        p for p in folder.glob(pattern)
+        if p.is_file() and p.suffix.lower() in SUPPORTED_FORMATS
+    )
+    stats = scan_paths(paths, workers=workers)
+    return {str(p): s for p, s in zip(paths, stats) if s is not None}
+
+
+def _scan_or_none(path: str) -> Optional[MeshStats]:
+    """Scan one file in a worker, logging instead of raising on bad files."""
+    try:
+        return scan_mesh(path)
+    except Exception as e:
+        logger.warning(f"Could not scan {path}: {e}")
+        return None
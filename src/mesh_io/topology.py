@@ -0,0 +1,355 @@
+"""Vectorized mesh connectivity helpers.
+
+Edges are identified by packing their sorted vertex indices into a single
+int64 key, so adjacency is found with one sort instead of a dict of tuples.
+Nearby vertices are found through a spatial hash of quantized coordinates.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def face_edges(faces: np.ndarray) -> np.ndarray:
+    """Directed edges of every face as a (3F, 2) array, in face order."""
+    faces = np.asarray(faces, dtype=np.int64)
+    return faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+
+
+def edge_keys(faces: np.ndarray, vertex_count: int) -> np.ndarray:
+    """Packed undirected key for every face edge, shape (3F,)."""
+    edges = face_edges(faces)
+    lo = np.minimum(edges[:, 0], edges[:, 1])
+    hi = np.maximum(edges[:, 0], edges[:, 1])
+    return lo * np.int64(max(vertex_count, 1)) + hi
+
+
+def face_adjacency(faces: np.ndarray, vertex_count: int) -> np.ndarray:
+    """
+    Pairs of faces that share an edge.
+
+    Args:
+        faces: (F, 3) triangle indices
+        vertex_count: Number of vertices the indices refer to
+
+    Returns:
+        (P, 2) array of face index pairs
+    """
+    if len(faces) == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    keys = edge_keys(faces, vertex_count)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    face_ids = order // 3
+
+    # Faces on a shared edge end up next to each other after sorting;
+    # edges with more than two faces are chained, which keeps them connected
+    same = sorted_keys[1:] == sorted_keys[:-1]
+    return np.stack([face_ids[:-1][same], face_ids[1:][same]], axis=1)
+
+
+def edge_incidence(edges: np.ndarray, vertex_count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Distinct undirected edges and how many times each is used.
+
+    Args:
+        edges: (N, 2) vertex indices of every face edge
+        vertex_count: Number of vertices the indices refer to
+
+    Returns:
+        (E, 2) distinct edges with the lower index first, in order of first
+        use; (E,) number of uses of each; (N,) distinct edge of every input edge
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    if len(edges) == 0:
+        return np.zeros((0, 2), dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    lo = np.minimum(edges[:, 0], edges[:, 1])
+    hi = np.maximum(edges[:, 0], edges[:, 1])
+    keys = lo * np.int64(max(vertex_count, 1)) + hi
+    _, first, inverse, counts = np.unique(keys, return_index=True, return_inverse=True, return_counts=True)
+
+    # Renumber from sorted-key order to first-use order
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    distinct = np.stack([lo[first[order]], hi[first[order]]], axis=1)
+    return distinct, counts[order], rank[inverse.reshape(-1)]
+
+
+def boundary_loop_count(edges: np.ndarray) -> int:
+    """
+    Number of separate loops formed by boundary edges.
+
+    Loops that touch at a vertex count as one.
+
+    Args:
+        edges: (B, 2) vertex indices of the boundary edges
+
+    Returns:
+        Number of connected groups of boundary edges
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    if len(edges) == 0:
+        return 0
+    vertices, local = np.unique(edges, return_inverse=True)
+    count, _ = connected_components(len(vertices), local.reshape(-1, 2))
+    return count
+
+
+def connected_components(count: int, pairs: np.ndarray) -> Tuple[int, np.ndarray]:
+    """
+    Label connected components of a graph given as index pairs.
+
+    Uses vectorized union-find: roots are hooked onto the smaller root of
+    each pair, then pointers are jumped until every node points at its root.
+
+    Args:
+        count: Number of nodes
+        pairs: (P, 2) array of connected node indices
+
+    Returns:
+        (number of components, label per node numbered from 0)
+    """
+    labels = np.arange(count, dtype=np.int64)
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+
+    if count == 0:
+        return 0, labels
+
+    a, b = pairs[:, 0], pairs[:, 1]
+    while len(pairs):
+        root_a = labels[a]
+        root_b = labels[b]
+        differ = root_a != root_b
+        if not differ.any():
+            break
+
+        root_a, root_b = root_a[differ], root_b[differ]
+        smaller = np.minimum(root_a, root_b)
+        np.minimum.at(labels, root_a, smaller)
+        np.minimum.at(labels, root_b, smaller)
+
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+    roots, labels = np.unique(labels, return_inverse=True)
+    return len(roots), labels.reshape(-1)
+
+
+def cluster_points(points: np.ndarray, radius: float) -> Tuple[int, np.ndarray]:
+    """
+    Group points that lie within roughly ``radius`` of each other.
+
+    Points are hashed into cubic cells of edge ``radius`` and occupied cells
+    that touch (including diagonally) are joined, so any two points closer
+    than ``radius`` always share a cluster.
+
+    Args:
+        points: (N, 3) point coordinates
+        radius: Linking distance
+
+    Returns:
+        (number of clusters, label per point numbered from 0)
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(points) == 0:
+        return 0, np.zeros(0, dtype=np.int64)
+
+    cells = np.floor((points - points.min(axis=0)) / max(radius, 1e-9)).astype(np.int64)
+    dims = cells.max(axis=0) + 3
+
+    def pack(c: np.ndarray) -> np.ndarray:
+        # Offset by one so neighbour lookups never go negative
+        c = c + 1
+        return (c[:, 0] * dims[1] + c[:, 1]) * dims[2] + c[:, 2]
+
+    cell_keys, point_cell = np.unique(pack(cells), return_inverse=True)
+    point_cell = point_cell.reshape(-1)
+    occupied = np.unique(cells, axis=0)
+    occupied = occupied[np.argsort(pack(occupied))]
+
+    # Half of the 26-neighbourhood is enough since links are symmetric
+    offsets = np.array([
+        (dx, dy, dz)
+        for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+        if (dx, dy, dz) > (0, 0, 0)
+    ])
+
+    pairs = []
+    own = np.arange(len(cell_keys))
+    for offset in offsets:
+        neighbour = pack(occupied + offset)
+        pos = np.minimum(np.searchsorted(cell_keys, neighbour), len(cell_keys) - 1)
+        found = cell_keys[pos] == neighbour
+        pairs.append(np.stack([own[found], pos[found]], axis=1))
+
+    count, cell_labels = connected_components(len(cell_keys), np.concatenate(pairs))
+    return count, cell_labels[point_cell]
+
+
+def close_pairs(points: np.ndarray, radius: float) -> np.ndarray:
+    """
+    Find every pair of points closer than ``radius``.
+
+    Points are hashed into cubic cells of edge ``radius``, so a point's
+    neighbours all lie in its own cell or the 26 around it. Each occupied
+    cell is compared with itself and half of its neighbours, since pairs
+    are symmetric.
+
+    Args:
+        points: (N, 3) point coordinates
+        radius: Distance below which two points pair up
+
+    Returns:
+        (P, 2) array of point index pairs, lower index first
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(points) < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    radius = max(float(radius), 1e-12)
+    cells = np.floor((points - points.min(axis=0)) / radius).astype(np.int64)
+    dims = cells.max(axis=0) + 3
+
+    def pack(c: np.ndarray) -> np.ndarray:
+        # Offset by one so neighbour lookups never go negative
+        c = c + 1
+        return (c[:, 0] * dims[1] + c[:, 1]) * dims[2] + c[:, 2]
+
+    keys = pack(cells)
+    order = np.argsort(keys, kind="stable")
+    cell_keys, starts, sizes = np.unique(keys[order], return_index=True, return_counts=True)
+    occupied = cells[order[starts]]
+
+    offsets = [(0, 0, 0)] + [
+        (dx, dy, dz)
+        for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+        if (dx, dy, dz) > (0, 0, 0)
+    ]
+
+    pairs = []
+    for offset in offsets:
+        neighbour = pack(occupied + np.array(offset))
+        pos = np.minimum(np.searchsorted(cell_keys, neighbour), len(cell_keys) - 1)
+        found = cell_keys[pos] == neighbour
+        own, other = np.flatnonzero(found), pos[found]
+
+        # Every point of a cell against every point of its neighbour
+        per_cell = sizes[own] * sizes[other]
+        cell = np.repeat(np.arange(len(own)), per_cell)
+        local = np.arange(per_cell.sum()) - np.repeat(np.cumsum(per_cell) - per_cell, per_cell)
+        width = sizes[other][cell]
+        first = starts[own][cell] + local // width
+        second = starts[other][cell] + local % width
+        if offset == (0, 0, 0):
+            keep = first < second
+            first, second = first[keep], second[keep]
+
+        a, b = order[first], order[second]
+        delta = points[a] - points[b]
+        close = np.einsum("ij,ij->i", delta, delta) < radius * radius
+        pairs.append(np.stack([np.minimum(a, b)[close], np.maximum(a, b)[close]], axis=1))
+
+    return np.concatenate(pairs)
+
+
+def weld_points(points: np.ndarray, tolerance: float) -> Tuple[int, np.ndarray]:
+    """
+    Group points closer than ``tolerance`` to each other.
+
+    Exact copies, as in STL triangle soups, are collapsed first through a
+    hash of their coordinate bits. The distinct points are then hashed into
+    cubic cells of edge ``2 * tolerance`` on eight grids shifted by
+    ``tolerance`` along each axis. Two points closer than ``tolerance``
+    share a cell on at least one of them, so only points sharing a cell
+    are compared.
+
+    Args:
+        points: (N, 3) point coordinates
+        tolerance: Distance below which points are the same
+
+    Returns:
+        (number of groups, label per point numbered from 0 in order of
+        each group's first point)
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(points) == 0:
+        return 0, np.zeros(0, dtype=np.int64)
+
+    distinct, copy_of = _exact_copies(points)
+    unique = points[distinct]
+
+    tolerance = max(float(tolerance), 1e-12)
+    origin = unique.min(axis=0)
+    dims = np.floor((unique.max(axis=0) - origin + tolerance) / (2 * tolerance)) + 1
+    packable = float(np.prod(dims)) < 2.0 ** 62
+    dims = dims.astype(np.int64)
+
+    pairs = []
+    for shift in np.array([(x, y, z) for x in (0, 1) for y in (0, 1) for z in (0, 1)]):
+        cells = np.floor((unique - origin + shift * tolerance) / (2 * tolerance)).astype(np.int64)
+        if packable:
+            keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+        else:
+            # Too many cells to pack into one integer: number the occupied ones
+            keys = np.unique(cells, axis=0, return_inverse=True)[1].reshape(-1)
+        order = np.argsort(keys)
+        sorted_keys = keys[order]
+
+        # Every point pairs with the points after it in the same cell
+        bounds = np.flatnonzero(np.diff(sorted_keys)) + 1
+        starts = np.concatenate([[0], bounds])
+        sizes = np.diff(np.concatenate([starts, [len(keys)]]))
+        group_end = np.repeat(starts + sizes, sizes)
+        after = group_end - np.arange(len(keys)) - 1
+        first = np.repeat(np.arange(len(keys)), after)
+        second = first + 1 + np.arange(after.sum()) - np.repeat(np.cumsum(after) - after, after)
+        a, b = order[first], order[second]
+
+        close = np.einsum("ij,ij->i", unique[a] - unique[b], unique[a] - unique[b]) < tolerance * tolerance
+        pairs.append(np.stack([a[close], b[close]], axis=1))
+
+    count, labels = connected_components(len(unique), np.concatenate(pairs))
+
+    # Renumber groups by their first point
+    first = np.full(count, len(points))
+    np.minimum.at(first, labels, distinct)
+    rank = np.empty(count, dtype=np.int64)
+    rank[np.argsort(first)] = np.arange(count)
+    return count, rank[labels][copy_of]
+
+
+def _exact_copies(points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Collapse bit-identical points.
+
+    Returns:
+        Index of the first of every distinct point, and the distinct point
+        each point is a copy of
+    """
+    # Adding zero turns -0.0 into 0.0 so both hash alike
+    bits = np.ascontiguousarray(points + 0.0).view(np.uint64)
+    keys = np.zeros(len(points), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for column in range(3):
+            keys ^= bits[:, column]
+            keys ^= keys >> np.uint64(31)
+            keys *= np.uint64(0x9E3779B97F4A7C15)
+            keys ^= keys >> np.uint64(29)
+    order = np.argsort(keys)
+
+    # Hash collisions of different points only cost a few extra comparisons later
+    ordered = points[order]
+    same = (keys[order][1:] == keys[order][:-1]) & (ordered[1:] == ordered[:-1]).all(axis=1)
+    new = np.concatenate([[True], ~same])
+    copy_of = np.empty(len(points), dtype=np.int64)
+    copy_of[order] = np.cumsum(new) - 1
+
+    first = np.full(int(new.sum()), len(points))
+    np.minimum.at(first, copy_of, np.arange(len(points)))
+    return first, copy_of
@@ -15,10 +15,34 @@ from pathlib import Path
 from typing import List, Optional, Tuple
 import math
 
+import numpy as np
+
+from src.mesh_io import MeshData, MeshFeatures, SUPPORTED_FORMATS, load_mesh_features
+from src.mesh_io.raycast import TriangleGrid
+from src.mesh_io.topology import cluster_points, connected_components, face_adjacency
 from src.utils import get_logger
 
 logger = get_logger("monitoring.geometry")
 
+# Overhang reporting
+OVERHANG_REPORT_ANGLE = 30.0  # Degrees from vertical before a face is reported
+MIN_OVERHANG_REGION_AREA_MM2 = 1.0  # Smaller regions are treated as noise
+BED_CONTACT_TOLERANCE_MM = 0.05  # Faces this close to the bed are supported by it
+
+# Thickness analysis
+THIN_WALL_WARNING_MM = 0.8
+THIN_WALL_CRITICAL_MM = 0.4  # Single extrusion width
+THICKNESS_MAX_DISTANCE_MM = 5.0  # Rays stop here; thicker walls are not measured
+THICKNESS_MAX_SAMPLES = 50_000  # Rays cast per mesh
+THIN_WALL_CLUSTER_MM = 2.0  # Thin faces closer than this form one region
+MIN_THIN_WALL_REGION_AREA_MM2 = 1.0
+
+# Bridge detection
+BRIDGE_LAYER_HEIGHT_MM = 0.2  # Ceiling faces are grouped per layer of this height
+BRIDGE_MAX_TILT = 10.0  # Degrees a ceiling may deviate from horizontal
+BRIDGE_ANCHOR_TOLERANCE_MM = 1.0  # How close a wall must be to a span end to anchor it
+BRIDGE_REPORT_LENGTH = 5.0  # Shorter spans bridge reliably
+
 
 class IssueSeverity(str, Enum):
     """Severity of geometry issue."""
@@ -103,6 +127,9 @@ class GeometryAnalysisResult:
     surface_area_mm2: float = 0
     triangle_count: int = 0
 
+    # Per-face wall thickness in mm (NaN = not sampled, inf = thicker than measured)
+    thickness_field: Optional[np.ndarray] = None
+
     @property
     def has_critical_issues(self) -> bool:
         """Check if any critical issues exist."""
@@ -130,83 +157,110 @@ class GeometryAnalysisResult:
         return any(o.needs_support for o in self.overhangs)
 
 
-def _load_mesh(file_path: Path):
-    """Load a mesh from file. Returns trimesh if available, else None."""
+def _load_mesh(file_path: Path) -> Optional[MeshFeatures]:
+    """Load a mesh with its derived arrays. Returns None if it cannot be read."""
     try:
-        import trimesh
-        mesh = trimesh.load(str(file_path))
-        if hasattr(mesh, 'faces'):
-            return mesh
-        # Handle scene with multiple meshes
-        if hasattr(mesh, 'geometry'):
-            meshes = list(mesh.geometry.values())
-            if meshes:
-                return trimesh.util.concatenate(meshes)
+        if file_path.suffix.lower() in SUPPORTED_FORMATS:
+            return load_mesh_features(file_path)
+        return _load_with_trimesh(file_path)
+    except Exception as e:
+        logger.error(f"Failed to load mesh: {e}")
         return None
+
+
+def _load_with_trimesh(file_path: Path) -> Optional[MeshFeatures]:
+    """Load formats the shared loader does not read through trimesh."""
+    try:
+        import trimesh
     except ImportError:
-        logger.warning("trimesh not installed, using simplified analysis")
+        logger.warning("trimesh not installed, cannot read this format")
         return None
-    except Exception as e:
-        logger.error(f"Failed to load mesh: {e}")
+
+    mesh = trimesh.load(str(file_path))
+    # Handle scene with multiple meshes
+    if hasattr(mesh, 'geometry'):
+        meshes = list(mesh.geometry.values())
+        mesh = trimesh.util.concatenate(meshes) if meshes else None
+    if mesh is None or not hasattr(mesh, 'faces'):
         return None
 
+    return MeshFeatures.from_mesh(MeshData(
+        vertices=np.asarray(mesh.vertices, dtype=np.float32),
+        faces=np.asarray(mesh.faces, dtype=np.int64),
+        source=str(file_path),
+    ))
 
-def _analyze_overhangs(mesh) -> List[OverhangInfo]:
-    """Analyze mesh for overhangs."""
+
+def _analyze_overhangs(mesh: Optional[MeshFeatures]) -> List[OverhangInfo]:
+    """
+    Analyze mesh for overhangs.
+
+    Angles are computed for all faces at once, then downward-facing faces
+    above the reporting angle are grouped into edge-connected regions.
+    """
     overhangs = []
 
-    if mesh is None:
+    if mesh is None or mesh.mesh.is_empty:
         return overhangs
 
     try:
-        import numpy as np
-
-        # Get face normals
-        normals = mesh.face_normals
-
-        # Calculate angle from vertical (Z-up)
-        z_axis = np.array([0, 0, 1])
-        for i, normal in enumerate(normals):
-            # Angle between face normal and Z axis
-            # For downward-facing surfaces, the normal points down
-            dot = np.dot(normal, z_axis)
-            angle_rad = np.arccos(np.clip(dot, -1, 1))
-            angle_deg = np.degrees(angle_rad)
-
-            # Convert to overhang angle (90 = ceiling, 0 = floor)
-            overhang_angle = 180 - angle_deg if normal[2] < 0 else angle_deg
-
-            # Only consider downward-facing surfaces as overhangs
-            if normal[2] < -0.01:  # Normal pointing down
-                # Calculate actual overhang angle from horizontal
-                overhang_from_horiz = 90 - abs(np.degrees(np.arcsin(abs(normal[2]))))
-
-                if overhang_from_horiz > 30:  # Only report significant overhangs
-                    # Get face centroid
-                    face = mesh.faces[i]
-                    centroid = mesh.vertices[face].mean(axis=0)
-                    area = mesh.area_faces[i] if hasattr(mesh, 'area_faces') else 1.0
-
-                    # Determine severity
-                    if overhang_from_horiz > 60:
-                        severity = IssueSeverity.CRITICAL
-                    elif overhang_from_horiz > 45:
-                        severity = IssueSeverity.WARNING
-                    else:
-                        severity = IssueSeverity.INFO
-
-                    overhangs.append(OverhangInfo(
-                        angle=overhang_from_horiz,
-                        area_mm2=area,
-                        location=tuple(centroid),
-                        severity=severity,
-                    ))
-
-        # Deduplicate/cluster nearby overhangs
-        if len(overhangs) > 100:
-            # Just keep top 20 most severe
-            overhangs.sort(key=lambda x: (x.severity.value, -x.angle))
-            overhangs = overhangs[:20]
+        nz = np.asarray(mesh.face_normals[:, 2], dtype=np.float64)
+
+        # Overhang angle from vertical (0 = vertical wall, 90 = ceiling)
+        angles = np.degrees(np.arcsin(np.clip(np.abs(nz), 0.0, 1.0)))
+
+        # Faces resting on the build plate are supported by it
+        vertex_z = mesh.mesh.vertices[:, 2]
+        face_top = vertex_z[mesh.mesh.faces].max(axis=1)
+        on_bed = face_top <= mesh.bounds[0][2] + BED_CONTACT_TOLERANCE_MM
+
+        # Only consider downward-facing surfaces with significant overhang
+        candidates = np.flatnonzero(
+            (nz < -0.01) & (angles > OVERHANG_REPORT_ANGLE) & ~on_bed
+        )
+        if len(candidates) == 0:
+            return overhangs
+
+        region_count, labels = connected_components(
+            len(candidates),
+            face_adjacency(mesh.mesh.faces[candidates], mesh.mesh.vertex_count),
+        )
+
+        areas = np.asarray(mesh.face_areas[candidates], dtype=np.float64)
+        centroids = np.asarray(mesh.face_centroids[candidates], dtype=np.float64)
+
+        region_area = np.bincount(labels, weights=areas, minlength=region_count)
+        region_angle = np.zeros(region_count)
+        np.maximum.at(region_angle, labels, angles[candidates])
+
+        # Area-weighted centre of each region
+        safe_area = np.maximum(region_area, 1e-12)
+        region_center = np.stack([
+            np.bincount(labels, weights=areas * centroids[:, axis], minlength=region_count) / safe_area
+            for axis in range(3)
+        ], axis=1)
+
+        for region in np.flatnonzero(region_area >= MIN_OVERHANG_REGION_AREA_MM2):
+            angle = float(region_angle[region])
+
+            # Determine severity
+            if angle > 60:
+                severity = IssueSeverity.CRITICAL
+            elif angle > 45:
+                severity = IssueSeverity.WARNING
+            else:
+                severity = IssueSeverity.INFO
+
+            overhangs.append(OverhangInfo(
+                angle=angle,
+                area_mm2=float(region_area[region]),
+                location=tuple(float(c) for c in region_center[region]),
+                severity=severity,
+            ))
+
+        # Worst regions first
+        severity_rank = {IssueSeverity.CRITICAL: 0, IssueSeverity.WARNING: 1, IssueSeverity.INFO: 2}
+        overhangs.sort(key=lambda o: (severity_rank[o.severity], -o.area_mm2))
 
     except Exception as e:
         logger.warning(f"Overhang analysis error: {e}")
@@ -214,34 +268,137 @@ def _analyze_overhangs(mesh) -> List[OverhangInfo]:
     return overhangs
 
 
-def _analyze_thin_walls(mesh) -> List[ThinWallInfo]:
-    """Analyze mesh for thin walls."""
+def compute_thickness_field(
+    mesh: MeshFeatures,
+    max_samples: int = THICKNESS_MAX_SAMPLES,
+    max_distance: float = THICKNESS_MAX_DISTANCE_MM,
+    grid: Optional[TriangleGrid] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Measure wall thickness by casting rays inward from face centroids.
+
+    Each sampled face shoots a ray along its inverted normal; the distance to
+    the first face leaving the solid is the local wall thickness. Rays are
+    traced against a uniform grid built once per mesh. Large meshes are
+    subsampled, favouring bigger faces.
+
+    Args:
+        mesh: Mesh features to measure
+        max_samples: Maximum number of faces to cast rays from
+        max_distance: Walls thicker than this are not measured
+        grid: Prebuilt acceleration grid over the mesh triangles
+
+    Returns:
+        (thickness per face, index of the opposite face per face).
+        Thickness is NaN for faces that were not sampled and inf where no
+        opposite wall was found within max_distance; the opposite face is -1
+        in both cases.
+    """
+    face_count = mesh.mesh.face_count
+    thickness = np.full(face_count, np.nan)
+    opposite = np.full(face_count, -1, dtype=np.int64)
+    if face_count == 0:
+        return thickness, opposite
+
+    normals = np.asarray(mesh.face_normals, dtype=np.float64)
+    areas = np.asarray(mesh.face_areas, dtype=np.float64)
+    samples = np.flatnonzero(areas > 0)
+
+    if len(samples) > max_samples:
+        # Weighted sampling without replacement (Efraimidis-Spirakis keys)
+        rng = np.random.default_rng(0)
+        keys = np.log(rng.random(len(samples))) / areas[samples]
+        samples = np.sort(samples[np.argpartition(keys, -max_samples)[-max_samples:]])
+
+    if grid is None:
+        grid = TriangleGrid(mesh.mesh.triangles)
+
+    directions = -normals[samples]
+    origins = np.asarray(mesh.face_centroids[samples], dtype=np.float64)
+    distance, hit = grid.intersect(origins, directions, max_distance, ignore_faces=samples)
+
+    # Only a face pointing the same way as the ray closes the wall; hitting a
+    # face that points back means the ray left through a hole or flipped face
+    found = hit >= 0
+    exits = np.zeros(len(samples), dtype=bool)
+    exits[found] = np.einsum("ij,ij->i", normals[hit[found]], directions[found]) > 0
+    distance[~exits] = np.inf
+    hit[~exits] = -1
+
+    thickness[samples] = distance
+    opposite[samples] = hit
+    return thickness, opposite
+
+
+def _analyze_thin_walls(
+    mesh: Optional[MeshFeatures],
+    thickness: Optional[np.ndarray] = None,
+    opposite: Optional[np.ndarray] = None,
+) -> List[ThinWallInfo]:
+    """
+    Analyze mesh for thin walls.
+
+    Faces measured thinner than the warning threshold are grouped into
+    regions: faces sharing an edge, facing each other across the wall, or
+    lying close together all join the same region.
+    """
     thin_walls = []
 
-    if mesh is None:
+    if mesh is None or mesh.mesh.is_empty:
         return thin_walls
 
     try:
-        import numpy as np
-
-        # Simple approach: check for vertices that are very close together
-        # but belong to different faces (potential thin walls)
-
-        # For now, check bounding box aspect ratios as a simpler heuristic
-        bounds = mesh.bounds
-        dimensions = bounds[1] - bounds[0]
-
-        # Check for very thin dimensions
-        for i, dim in enumerate(dimensions):
-            if dim < 0.8 and dim > 0:  # Less than 0.8mm
-                axis = ['X', 'Y', 'Z'][i]
-                severity = IssueSeverity.CRITICAL if dim < 0.4 else IssueSeverity.WARNING
-                thin_walls.append(ThinWallInfo(
-                    thickness_mm=dim,
-                    height_mm=max(dimensions),
-                    location=tuple((bounds[0] + bounds[1]) / 2),
-                    severity=severity,
-                ))
+        if thickness is None or opposite is None:
+            thickness, opposite = compute_thickness_field(mesh)
+
+        sampled = ~np.isnan(thickness)
+        thin = np.flatnonzero(sampled & (thickness < THIN_WALL_WARNING_MM))
+        if len(thin) == 0:
+            return thin_walls
+
+        areas = np.asarray(mesh.face_areas, dtype=np.float64)
+        centroids = np.asarray(mesh.face_centroids[thin], dtype=np.float64)
+
+        # Local index of every thin face, -1 elsewhere
+        local = np.full(mesh.mesh.face_count, -1, dtype=np.int64)
+        local[thin] = np.arange(len(thin))
+
+        # Sampled centroids are about this far apart on average
+        spacing = math.sqrt(areas[sampled].sum() / max(sampled.sum(), 1))
+        _, near = cluster_points(centroids, max(THIN_WALL_CLUSTER_MM, 2 * spacing))
+        order = np.argsort(near, kind="stable")
+        same = near[order][1:] == near[order][:-1]
+
+        facing = local[opposite[thin]]
+        pairs = np.concatenate([
+            face_adjacency(mesh.mesh.faces[thin], mesh.mesh.vertex_count),
+            np.stack([order[:-1][same], order[1:][same]], axis=1),
+            np.stack([np.flatnonzero(facing >= 0), facing[facing >= 0]], axis=1),
+        ])
+        region_count, labels = connected_components(len(thin), pairs)
+
+        # Scale sampled area up to the whole surface
+        coverage = areas[sampled].sum() / max(areas.sum(), 1e-12)
+        region_area = np.bincount(labels, weights=areas[thin], minlength=region_count)
+
+        vertex_z = mesh.mesh.vertices[:, 2][mesh.mesh.faces[thin]]
+        region_top = np.full(region_count, -np.inf)
+        region_bottom = np.full(region_count, np.inf)
+        np.maximum.at(region_top, labels, vertex_z.max(axis=1))
+        np.minimum.at(region_bottom, labels, vertex_z.min(axis=1))
+
+        for region in np.flatnonzero(region_area / coverage >= MIN_THIN_WALL_REGION_AREA_MM2):
+            members = labels == region
+            weights = areas[thin][members]
+            value = float(np.median(thickness[thin][members]))
+            thin_walls.append(ThinWallInfo(
+                thickness_mm=value,
+                height_mm=float(region_top[region] - region_bottom[region]),
+                location=tuple(float(c) for c in np.average(centroids[members], axis=0, weights=weights)),
+                severity=IssueSeverity.CRITICAL if value < THIN_WALL_CRITICAL_MM else IssueSeverity.WARNING,
+            ))
+
+        thin_walls.sort(key=lambda t: t.thickness_mm)
 
     except Exception as e:
         logger.warning(f"Thin wall analysis error: {e}")
@@ -249,25 +406,135 @@ def _analyze_thin_walls(mesh) -> List[ThinWallInfo]:
     return thin_walls
 
 
-def _analyze_bridges(mesh) -> List[BridgeInfo]:
-    """Analyze mesh for bridges (unsupported spans)."""
+def _analyze_bridges(mesh: Optional[MeshFeatures]) -> List[BridgeInfo]:
+    """
+    Analyze mesh for bridges (unsupported spans).
+
+    Flat downward faces are grouped per print layer into connected ceiling
+    regions. A region is a bridge when walls drop away from it on two
+    opposite ends; the distance between those ends is the bridge span.
+    Ceilings anchored on one side only are cantilevers and are left to the
+    overhang analysis.
+    """
     bridges = []
 
-    # Bridge detection requires more sophisticated analysis
-    # For now, return empty list - would need layer-by-layer analysis
-    # to properly detect bridges
+    if mesh is None or mesh.mesh.is_empty:
+        return bridges
+
+    try:
+        faces = mesh.mesh.faces
+        vertices = np.asarray(mesh.mesh.vertices, dtype=np.float64)
+        normals = np.asarray(mesh.face_normals, dtype=np.float64)
+        centroids = np.asarray(mesh.face_centroids, dtype=np.float64)
+
+        vertex_z = vertices[:, 2][faces]
+        on_bed = vertex_z.max(axis=1) <= mesh.bounds[0][2] + BED_CONTACT_TOLERANCE_MM
+        flat_down = normals[:, 2] <= -math.cos(math.radians(BRIDGE_MAX_TILT))
+        candidates = np.flatnonzero(flat_down & ~on_bed)
+        if len(candidates) == 0:
+            return bridges
+
+        # Ceiling faces only join when they are printed in the same layer
+        layer = np.floor(centroids[candidates, 2] / BRIDGE_LAYER_HEIGHT_MM).astype(np.int64)
+        pairs = face_adjacency(faces[candidates], mesh.mesh.vertex_count)
+        pairs = pairs[layer[pairs[:, 0]] == layer[pairs[:, 1]]]
+        region_count, labels = connected_components(len(candidates), pairs)
+
+        # Region boundary edges: a ceiling face next to a face outside its region
+        local = np.full(len(faces), -1, dtype=np.int64)
+        local[candidates] = np.arange(len(candidates))
+        all_pairs = face_adjacency(faces, mesh.mesh.vertex_count)
+        all_pairs = np.concatenate([all_pairs, all_pairs[:, ::-1]])
+        inside = local[all_pairs[:, 0]]
+        outside = local[all_pairs[:, 1]]
+        boundary = (inside >= 0) & ((outside < 0) | (labels[np.maximum(outside, 0)] != labels[np.maximum(inside, 0)]))
+        ceiling_face = all_pairs[boundary, 0]
+        wall_face = all_pairs[boundary, 1]
+
+        # Walls holding a bridge up drop below it and are close to vertical
+        drops = vertex_z[wall_face].min(axis=1) < centroids[ceiling_face, 2] - BRIDGE_LAYER_HEIGHT_MM / 2
+        upright = np.abs(normals[wall_face, 2]) < math.sin(math.radians(BRIDGE_MAX_TILT))
+        anchor_region = labels[local[ceiling_face[drops & upright]]]
+        anchor_point = centroids[wall_face[drops & upright], :2]
+        anchor_normal = normals[wall_face[drops & upright], :2]
+
+        for region in range(region_count):
+            members = candidates[labels == region]
+            footprint = vertices[np.unique(faces[members])][:, :2]
+            if len(footprint) < 3:
+                continue
+
+            in_region = anchor_region == region
+            points = anchor_point[in_region]
+            wall_normals = anchor_normal[in_region]
+            center = footprint.mean(axis=0)
+            _, _, axes = np.linalg.svd(footprint - center, full_matrices=False)
+
+            span = None
+            for axis, cross in ((axes[1], axes[0]), (axes[0], axes[1])):
+                extent = (footprint - center) @ axis
+                low, high = extent.min(), extent.max()
+                length = high - low
+                tolerance = max(BRIDGE_ANCHOR_TOLERANCE_MM, 0.1 * length)
+
+                # Anchoring walls face across the gap along this axis
+                along = (points - center) @ axis
+                across = np.abs(wall_normals @ axis) > 0.5
+                anchored = (
+                    np.any(across & (along <= low + tolerance)) and
+                    np.any(across & (along >= high - tolerance))
+                )
+                if anchored and (span is None or length < span[0]):
+                    cross_extent = (footprint - center) @ cross
+                    span = (length, cross_extent.max() - cross_extent.min())
+
+            if span is None or span[0] < BRIDGE_REPORT_LENGTH:
+                continue
+
+            length, width = span
+            if length > 20:
+                severity = IssueSeverity.CRITICAL
+            elif length > 10:
+                severity = IssueSeverity.WARNING
+            else:
+                severity = IssueSeverity.INFO
+
+            bridges.append(BridgeInfo(
+                length_mm=float(length),
+                width_mm=float(width),
+                height_z=float(centroids[members, 2].mean()),
+                severity=severity,
+            ))
+
+        bridges.sort(key=lambda b: -b.length_mm)
+
+    except Exception as e:
+        logger.warning(f"Bridge analysis error: {e}")
 
     return bridges
 
 
-def _check_manifold(mesh) -> List[GeometryIssue]:
+def _check_manifold(mesh: Optional[MeshFeatures]) -> List[GeometryIssue]:
     """Check if mesh is watertight/manifold."""
     issues = []
 
-    if mesh is None:
+    if mesh is None or mesh.mesh.is_empty:
         return issues
 
     try:
+        import trimesh
+    except ImportError:
+        logger.warning("trimesh not installed, skipping manifold check")
+        return issues
+
+    try:
+        # Build from the cached welded arrays rather than reloading the file
+        mesh = trimesh.Trimesh(
+            vertices=mesh.mesh.vertices,
+            faces=mesh.mesh.faces,
+            process=False,
+        )
+
         if not mesh.is_watertight:
             issues.append(GeometryIssue(
                 issue_type="non_manifold",
@@ -317,18 +584,20 @@ def analyze_geometry(file_path: str) -> GeometryAnalysisResult:
 
     if mesh is not None:
         # Get basic mesh info
-        try:
-            bounds = mesh.bounds
-            result.bounding_box = tuple(bounds[1] - bounds[0])
-            result.volume_mm3 = abs(mesh.volume) if hasattr(mesh, 'volume') else 0
-            result.surface_area_mm2 = mesh.area if hasattr(mesh, 'area') else 0
-            result.triangle_count = len(mesh.faces) if hasattr(mesh, 'faces') else 0
-        except Exception as e:
-            logger.warning(f"Failed to get mesh info: {e}")
+        result.bounding_box = mesh.dimensions
+        result.volume_mm3 = abs(mesh.signed_volume)
+        result.surface_area_mm2 = mesh.surface_area
+        result.triangle_count = mesh.mesh.face_count
 
         # Run analyses
         result.overhangs = _analyze_overhangs(mesh)
-        result.thin_walls = _analyze_thin_walls(mesh)
+        try:
+            thickness, opposite = compute_thickness_field(mesh)
+        except Exception as e:
+            logger.warning(f"Thickness analysis error: {e}")
+        else:
+            result.thickness_field = thickness
+            result.thin_walls = _analyze_thin_walls(mesh, thickness, opposite)
         result.bridges = _analyze_bridges(mesh)
         result.other_issues = _check_manifold(mesh)
 
@@ -337,7 +606,7 @@ def analyze_geometry(file_path: str) -> GeometryAnalysisResult:
             issue_type="load_failed",
             severity=IssueSeverity.WARNING,
             message="Could not load mesh for detailed analysis",
-            suggestion="Install trimesh: pip install trimesh",
+            suggestion="Check that the file is a valid STL, OBJ or 3MF mesh",
         ))
 
     logger.info(f"Geometry analysis complete: {result.total_issues} issues found")
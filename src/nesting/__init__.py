@@ -1,6 +1,7 @@
 """Nesting module for optimizing part placement on build plate.
 
-Provides batch nesting to efficiently pack multiple parts.
+Provides batch nesting to efficiently pack multiple parts, as bounding
+boxes or convex footprints, across one or more build plates.
 """
 
 from src.nesting.batch_nester import (
@@ -12,6 +13,8 @@ from src.nesting.batch_nester import (
     create_nester,
     nest_parts,
 )
+from src.nesting.footprint import PolygonBin, convex_footprint, minkowski_sum
+from src.nesting.maxrects import MaxRectsBin
 
 __all__ = [
     "BatchNester",
@@ -21,4 +24,8 @@ __all__ = [
     "NestingStrategy",
     "create_nester",
     "nest_parts",
+    "MaxRectsBin",
+    "PolygonBin",
+    "convex_footprint",
+    "minkowski_sum",
 ]
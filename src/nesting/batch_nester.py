@@ -3,18 +3,39 @@
 Efficiently packs multiple parts to minimize print time and waste.
 """
 
+import hashlib
+import json
 import math
-from dataclasses import dataclass, field
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from src.utils import get_logger
+import numpy as np
+
+from src.mesh_io import load_mesh_features, scan_mesh, scan_paths
+from src.nesting.footprint import (
+    PolygonBin,
+    buffer_polygon,
+    convex_footprint,
+    polygon_area,
+    rotate_polygon,
+)
+from src.nesting.maxrects import MaxRectsBin
+from src.utils import file_hash, get_logger
 from src.config import get_settings
 
 logger = get_logger("nesting.batch_nester")
 
+LAYOUT_CACHE_SIZE = 32  # Footprint layouts kept in memory
+
+# Footprint layouts keyed on part contents and config, shared by all nesters
+_layout_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_layout_lock = threading.Lock()
+
 
 class NestingStrategy(str, Enum):
     """Nesting optimization strategies."""
@@ -35,6 +56,8 @@ class PlacedPart:
     width: float  # Part bounding box width
     depth: float  # Part bounding box depth
     height: float  # Part height
+    plate: int = 0  # Index of the plate (print batch) the part is on
+    footprint_area: float = 0.0  # Projected footprint area (mm²), 0 when not computed
 
     def to_dict(self) -> dict:
         """Convert to dictionary."""
@@ -47,6 +70,8 @@ class PlacedPart:
             "width": self.width,
             "depth": self.depth,
             "height": self.height,
+            "plate": self.plate,
+            "footprint_area": self.footprint_area,
         }
 
 
@@ -69,6 +94,13 @@ class NestingConfig:
     allow_rotation: bool = True  # Allow 90 degree rotations
     group_by_height: bool = False  # Group similar heights
 
+    # Footprint nesting
+    use_footprints: bool = False  # Nest convex footprints instead of bounding boxes
+    rotation_step: float = 90.0  # Rotation increment (degrees) tried for footprints
+
+    # Intake
+    scan_workers: int = 1  # Processes scanning part files for their bounds (1 = in-process)
+
     def to_dict(self) -> dict:
         """Convert to dictionary."""
         return {
@@ -80,6 +112,9 @@ class NestingConfig:
             "strategy": self.strategy.value,
             "allow_rotation": self.allow_rotation,
             "group_by_height": self.group_by_height,
+            "use_footprints": self.use_footprints,
+            "rotation_step": self.rotation_step,
+            "scan_workers": self.scan_workers,
         }
 
     @classmethod
@@ -94,6 +129,9 @@ class NestingConfig:
             strategy=NestingStrategy(data.get("strategy", "density")),
             allow_rotation=data.get("allow_rotation", True),
             group_by_height=data.get("group_by_height", False),
+            use_footprints=data.get("use_footprints", False),
+            rotation_step=data.get("rotation_step", 90.0),
+            scan_workers=data.get("scan_workers", 1),
         )
 
     @classmethod
@@ -119,6 +157,10 @@ class NestingResult:
     processing_time: float = 0.0
     error_message: Optional[str] = None
 
+    def parts_on_plate(self, plate: int) -> List[PlacedPart]:
+        """Get the parts placed on one plate."""
+        return [p for p in self.placed_parts if p.plate == plate]
+
     def to_dict(self) -> dict:
         """Convert to dictionary."""
         return {
@@ -169,37 +211,32 @@ class BatchNester:
             )
 
         try:
-            # Load part dimensions
-            parts = []
-            for path in part_paths:
-                dims = self._get_part_dimensions(path)
-                if dims:
-                    parts.append({
-                        "path": path,
-                        "name": Path(path).stem,
-                        "width": dims[0],
-                        "depth": dims[1],
-                        "height": dims[2],
-                    })
-                else:
-                    logger.warning(f"Could not load dimensions for: {path}")
-
-            if not parts:
-                return NestingResult(
-                    success=False,
-                    error_message="Could not load any part dimensions",
-                )
-
-            # Sort parts by strategy
-            parts = self._sort_parts(parts)
-
-            # Place parts on plate
-            placed, unplaced = self._place_parts(parts)
+            # Footprint layouts are slow to compute, so reuse them for the same parts
+            layout_key = self._layout_key(part_paths) if self.config.use_footprints else None
+            layout = _recall_layout(layout_key, part_paths) if layout_key else None
+
+            if layout is None:
+                parts = self._load_parts(part_paths)
+                if not parts:
+                    return NestingResult(
+                        success=False,
+                        error_message="Could not load any part dimensions",
+                    )
+
+                # Sort parts by strategy
+                parts = self._sort_parts(parts)
+
+                # Place parts on plate
+                layout = self._place_parts(parts)
+                if layout_key:
+                    _remember_layout(layout_key, part_paths, *layout)
+
+            placed, unplaced = layout
 
             # Calculate statistics
             utilization = self._calculate_utilization(placed)
             max_height = max((p.height for p in placed), default=0)
-            num_batches = 1 + len(unplaced) // max(1, len(placed)) if unplaced else 1
+            num_batches = max(1, len({p.plate for p in placed}))
 
             processing_time = (datetime.now() - start_time).total_seconds()
 
@@ -221,6 +258,36 @@ class BatchNester:
                 processing_time=(datetime.now() - start_time).total_seconds(),
             )
 
+    def _load_parts(self, part_paths: List[str]) -> List[dict]:
+        """Load the dimensions (and footprints, if used) of each part."""
+        parts = []
+        if not self.config.use_footprints:
+            dimensions = self._scan_dimensions(part_paths)
+
+        for index, path in enumerate(part_paths):
+            if self.config.use_footprints:
+                loaded = self._get_part_footprint(path)
+                dims, footprint = loaded if loaded else (None, None)
+            else:
+                dims, footprint = dimensions[index], None
+
+            if not dims:
+                logger.warning(f"Could not load dimensions for: {path}")
+                continue
+
+            part = {
+                "path": path,
+                "name": Path(path).stem,
+                "width": dims[0],
+                "depth": dims[1],
+                "height": dims[2],
+            }
+            if footprint is not None:
+                part["footprint"] = footprint
+            parts.append(part)
+
+        return parts
+
     def _get_part_dimensions(self, path: str) -> Optional[Tuple[float, float, float]]:
         """Get bounding box dimensions of a part."""
         mesh = Path(path)
@@ -228,41 +295,57 @@ class BatchNester:
             return None
 
         try:
-            # Parse mesh to get bounds
-            min_x = min_y = min_z = float('inf')
-            max_x = max_y = max_z = float('-inf')
-
-            if mesh.suffix.lower() == ".obj":
-                with open(mesh, "r") as f:
-                    for line in f:
-                        if line.startswith("v "):
-                            parts = line.split()
-                            if len(parts) >= 4:
-                                x, y, z = float(parts[1]), float(parts[2]), float(parts[3])
-                                min_x, max_x = min(min_x, x), max(max_x, x)
-                                min_y, max_y = min(min_y, y), max(max_y, y)
-                                min_z, max_z = min(min_z, z), max(max_z, z)
-
-            elif mesh.suffix.lower() == ".stl":
-                import re
-                with open(mesh, "r") as f:
-                    content = f.read()
-                vertex_pattern = r"vertex\s+([\d.e+-]+)\s+([\d.e+-]+)\s+([\d.e+-]+)"
-                for match in re.finditer(vertex_pattern, content, re.IGNORECASE):
-                    x, y, z = float(match.group(1)), float(match.group(2)), float(match.group(3))
-                    min_x, max_x = min(min_x, x), max(max_x, x)
-                    min_y, max_y = min(min_y, y), max(max_y, y)
-                    min_z, max_z = min(min_z, z), max(max_z, z)
-
-            if min_x == float('inf'):
+            stats = scan_mesh(mesh)
+            if stats.is_empty:
                 return None
 
-            return (max_x - min_x, max_y - min_y, max_z - min_z)
+            return stats.dimensions()
 
         except Exception as e:
             logger.warning(f"Error reading dimensions from {path}: {e}")
             return None
 
+    def _scan_dimensions(self, part_paths: List[str]) -> List[Optional[Tuple[float, float, float]]]:
+        """Bounding box dimensions of many parts, scanned across worker processes."""
+        if self.config.scan_workers <= 1:
+            return [self._get_part_dimensions(path) for path in part_paths]
+
+        existing = [path for path in part_paths if Path(path).exists()]
+        scanned = dict(zip(existing, scan_paths(existing, workers=self.config.scan_workers)))
+        return [
+            stats.dimensions() if stats is not None and not stats.is_empty else None
+            for stats in (scanned.get(path) for path in part_paths)
+        ]
+
+    def _get_part_footprint(
+        self, path: str
+    ) -> Optional[Tuple[Tuple[float, float, float], np.ndarray]]:
+        """Get bounding box dimensions and convex XY footprint of a part."""
+        if not Path(path).exists():
+            return None
+
+        try:
+            features = load_mesh_features(path)
+            if features.mesh.vertex_count == 0:
+                return None
+
+            return features.dimensions, convex_footprint(features.mesh.vertices[:, :2])
+
+        except Exception as e:
+            logger.warning(f"Error reading footprint from {path}: {e}")
+            return None
+
+    def _layout_key(self, part_paths: List[str]) -> Optional[str]:
+        """Cache key for a footprint layout, or None if a part file is missing."""
+        digests = []
+        for path in part_paths:
+            if not Path(path).is_file():
+                return None
+            digests.append(file_hash(path))
+
+        payload = json.dumps({"config": self.config.to_dict(), "parts": digests}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
     def _sort_parts(self, parts: List[dict]) -> List[dict]:
         """Sort parts based on nesting strategy."""
         if self.config.strategy == NestingStrategy.DENSITY:
@@ -285,60 +368,137 @@ class BatchNester:
             return parts
 
     def _place_parts(self, parts: List[dict]) -> Tuple[List[PlacedPart], List[str]]:
-        """Place parts on the build plate."""
+        """
+        Place parts on as many build plates as needed.
+
+        Each part goes on the first open plate with room for it, in its
+        best-fitting orientation; a new plate is opened when none has.
+        Spacing is added to every part and to the plate so that parts
+        keep their distance from each other but not from the margin.
+        """
+        if self.config.use_footprints:
+            return self._place_footprints(parts)
+
         placed = []
         unplaced = []
+        spacing = self.config.part_spacing
 
         # Available area
         usable_width = self.config.plate_width - 2 * self.config.edge_margin
         usable_depth = self.config.plate_depth - 2 * self.config.edge_margin
 
-        # Track occupied spaces
-        occupied = []  # List of (x, y, width, depth) rectangles
+        plates: List[MaxRectsBin] = []
 
         for part in parts:
-            width = part["width"]
-            depth = part["depth"]
-            height = part["height"]
-
-            # Check if part fits at all
-            if width > usable_width or depth > usable_depth:
-                if self.config.allow_rotation:
-                    # Try rotated
-                    if depth <= usable_width and width <= usable_depth:
-                        width, depth = depth, width
-                        rotation = 90.0
-                    else:
-                        unplaced.append(part["path"])
-                        continue
-                else:
-                    unplaced.append(part["path"])
-                    continue
+            width = part["width"] + spacing
+            depth = part["depth"] + spacing
+
+            position = None
+            for index, plate in enumerate(plates):
+                position = plate.find(width, depth, self.config.allow_rotation)
+                if position:
+                    break
             else:
-                rotation = 0.0
-
-            # Find position using bottom-left placement
-            position = self._find_position(width, depth, occupied, usable_width, usable_depth)
-
-            if position:
-                x, y = position
-                placed.append(PlacedPart(
-                    name=part["name"],
-                    file_path=part["path"],
-                    x=x + self.config.edge_margin,
-                    y=y + self.config.edge_margin,
-                    rotation=rotation,
-                    width=width,
-                    depth=depth,
-                    height=height,
-                ))
-                occupied.append((x, y, width + self.config.part_spacing,
-                               depth + self.config.part_spacing))
+                # Open a new plate, if the part fits on an empty one at all
+                plate = MaxRectsBin(usable_width + spacing, usable_depth + spacing)
+                position = plate.find(width, depth, self.config.allow_rotation)
+                if position:
+                    plates.append(plate)
+                    index = len(plates) - 1
+
+            if not position:
+                unplaced.append(part["path"])
+                continue
+
+            x, y, rotated = position
+            if rotated:
+                width, depth = depth, width
+            plate.place(x, y, width, depth)
+
+            placed.append(PlacedPart(
+                name=part["name"],
+                file_path=part["path"],
+                x=x + self.config.edge_margin,
+                y=y + self.config.edge_margin,
+                rotation=90.0 if rotated else 0.0,
+                width=width - spacing,
+                depth=depth - spacing,
+                height=part["height"],
+                plate=index,
+            ))
+
+        return placed, unplaced
+
+    def _place_footprints(self, parts: List[dict]) -> Tuple[List[PlacedPart], List[str]]:
+        """
+        Place convex part footprints on as many build plates as needed.
+
+        Every rotation step is tried and each part goes on the first plate
+        with room for it, at the free spot that keeps the bounding box of
+        that plate's contents smallest; ties go to the lowest, then
+        leftmost, spot. Footprints are grown by half the spacing on every
+        side and the plate by the same amount, as in rectangle mode.
+        Positions are the corner of the rotated footprint's bounding box.
+        """
+        placed = []
+        unplaced = []
+        spacing = self.config.part_spacing
+        angles = self._rotation_angles()
+
+        usable_width = self.config.plate_width - 2 * self.config.edge_margin
+        usable_depth = self.config.plate_depth - 2 * self.config.edge_margin
+
+        plates: List[PolygonBin] = []
+
+        for part in parts:
+            outlines = [rotate_polygon(part["footprint"], angle) for angle in angles]
+            shapes = [buffer_polygon(outline, spacing / 2) for outline in outlines]
+
+            position = None
+            for index, plate in enumerate(plates):
+                position = plate.find(shapes)
+                if position:
+                    break
             else:
+                # Open a new plate, if the part fits on an empty one at all
+                plate = PolygonBin(usable_width + spacing, usable_depth + spacing)
+                position = plate.find(shapes)
+                if position:
+                    plates.append(plate)
+                    index = len(plates) - 1
+
+            if not position:
                 unplaced.append(part["path"])
+                continue
+
+            x, y, choice = position
+            plate.place(shapes[choice], x, y)
+            outline = outlines[choice]
+            width, depth = outline.max(axis=0) - outline.min(axis=0)
+
+            placed.append(PlacedPart(
+                name=part["name"],
+                file_path=part["path"],
+                x=x + self.config.edge_margin,
+                y=y + self.config.edge_margin,
+                rotation=float(angles[choice]),
+                width=float(width),
+                depth=float(depth),
+                height=part["height"],
+                plate=index,
+                footprint_area=polygon_area(outline),
+            ))
 
         return placed, unplaced
 
+    def _rotation_angles(self) -> List[float]:
+        """Rotations (degrees) tried for footprints."""
+        if not self.config.allow_rotation:
+            return [0.0]
+        if self.config.rotation_step <= 0:
+            raise ValueError(f"Rotation step must be positive, got {self.config.rotation_step}")
+        return [float(a) for a in np.arange(0.0, 360.0 - 1e-9, self.config.rotation_step)]
+
     def _find_position(
         self,
         width: float,
@@ -347,16 +507,15 @@ class BatchNester:
         max_width: float,
         max_depth: float,
     ) -> Optional[Tuple[float, float]]:
-        """Find a position for a part using bottom-left algorithm."""
-        # Try positions at regular intervals
-        step = self.config.part_spacing
+        """Find a free position for a part next to occupied rectangles."""
+        plate = MaxRectsBin(max_width, max_depth)
+        for x, y, w, d in occupied:
+            plate.place(x, y, w, d)
 
-        for y in range(0, int(max_depth - depth) + 1, int(max(1, step))):
-            for x in range(0, int(max_width - width) + 1, int(max(1, step))):
-                if self._can_place(x, y, width, depth, occupied):
-                    return (float(x), float(y))
-
-        return None
+        position = plate.find(width, depth, allow_rotation=False)
+        if position is None:
+            return None
+        return position[0], position[1]
 
     def _can_place(
         self,
@@ -375,15 +534,15 @@ class BatchNester:
         return True
 
     def _calculate_utilization(self, placed: List[PlacedPart]) -> float:
-        """Calculate plate utilization percentage."""
+        """Calculate plate utilization percentage, averaged over plates."""
         if not placed:
             return 0.0
 
-        total_area = sum(p.width * p.depth for p in placed)
+        total_area = sum(p.footprint_area or p.width * p.depth for p in placed)
         plate_area = (
             (self.config.plate_width - 2 * self.config.edge_margin) *
             (self.config.plate_depth - 2 * self.config.edge_margin)
-        )
+        ) * len({p.plate for p in placed})
 
         return min(100.0, (total_area / plate_area) * 100)
 
@@ -399,11 +558,14 @@ class BatchNester:
             f"; Plate: {self.config.plate_width}x{self.config.plate_depth}mm",
             f"; Utilization: {result.plate_utilization:.1f}%",
             f"; Parts placed: {len(result.placed_parts)}",
+            f"; Plates: {result.num_batches}",
             "",
         ]
 
         for i, part in enumerate(result.placed_parts):
             lines.append(f"; Part {i + 1}: {part.name}")
+            if result.num_batches > 1:
+                lines.append(f";   Plate: {part.plate + 1}")
             lines.append(f";   Position: ({part.x:.1f}, {part.y:.1f})")
             lines.append(f";   Size: {part.width:.1f}x{part.depth:.1f}x{part.height:.1f}")
             lines.append(f";   Rotation: {part.rotation}\u00b0")
@@ -417,6 +579,44 @@ class BatchNester:
         return "\n".join(lines)
 
 
+def _recall_layout(
+    key: str, part_paths: List[str]
+) -> Optional[Tuple[List[PlacedPart], List[str]]]:
+    """Look up a cached layout and map it onto the given part paths."""
+    with _layout_lock:
+        entry = _layout_cache.get(key)
+        if entry is None:
+            return None
+        _layout_cache.move_to_end(key)
+
+    # Same contents in the same order, possibly under other paths
+    cached_paths, placed, unplaced = entry
+    renamed: Dict[str, List[str]] = {}
+    for old, new in zip(cached_paths, part_paths):
+        renamed.setdefault(old, []).append(new)
+    taken = {old: iter(new) for old, new in renamed.items()}
+
+    parts = []
+    for part in placed:
+        path = next(taken[part.file_path])
+        parts.append(replace(part, file_path=path, name=Path(path).stem))
+    return parts, [next(taken[path]) for path in unplaced]
+
+
+def _remember_layout(
+    key: str,
+    part_paths: List[str],
+    placed: List[PlacedPart],
+    unplaced: List[str],
+) -> None:
+    """Keep a layout in the in-memory LRU."""
+    with _layout_lock:
+        _layout_cache[key] = (list(part_paths), [replace(p) for p in placed], list(unplaced))
+        _layout_cache.move_to_end(key)
+        while len(_layout_cache) > LAYOUT_CACHE_SIZE:
+            _layout_cache.popitem(last=False)
+
+
 # Convenience functions
 def create_nester(
     plate_width: float = 256.0,
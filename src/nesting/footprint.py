@@ -0,0 +1,374 @@
+"""Convex footprint nesting with no-fit polygons.
+
+A part's footprint is the convex hull of its vertices projected onto the
+plate. For two convex polygons the no-fit polygon (NFP) - every position
+of the moving part at which it would overlap a placed one - is the
+Minkowski sum of the placed polygon and the mirrored moving polygon,
+found by merging their edges in angle order. The free positions on a
+plate are bounded by the plate and the NFPs, so only plate corners, NFP
+vertices and crossings of their edges are tested as candidate spots.
+"""
+
+import math
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.laser.projection import convex_hull
+
+FOOTPRINT_MAX_VERTICES = 24  # Larger hulls are replaced by a circumscribed polygon
+
+_EPSILON = 1e-6  # mm
+_CANDIDATE_CHUNK = 4096  # Candidate positions tested against the NFPs at once
+
+
+def convex_footprint(
+    points: np.ndarray,
+    max_vertices: int = FOOTPRINT_MAX_VERTICES,
+) -> np.ndarray:
+    """
+    Convex outline of a set of 2D points.
+
+    Points inside the polygon of the extreme points are dropped before the
+    hull is computed, which leaves few points for typical meshes. Hulls with
+    more than ``max_vertices`` corners are replaced by the circumscribed
+    polygon with that many equally spaced edge directions, so the outline
+    never shrinks.
+
+    Args:
+        points: (N, 2) point coordinates
+        max_vertices: Vertex limit of the outline
+
+    Returns:
+        (K, 2) outline vertices in counter-clockwise order
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(points) == 0:
+        raise ValueError("Cannot compute the footprint of an empty point set")
+
+    # Akl-Toussaint: extreme points along the axes and diagonals
+    x, y = points[:, 0], points[:, 1]
+    extremes = points[[
+        np.argmin(x), np.argmax(x), np.argmin(y), np.argmax(y),
+        np.argmin(x + y), np.argmax(x + y), np.argmin(x - y), np.argmax(x - y),
+    ]]
+    octagon = np.array(convex_hull([tuple(p) for p in extremes.tolist()]))
+    if len(octagon) >= 3:
+        interior = np.ones(len(points), dtype=bool)
+        for a, b in zip(octagon, np.roll(octagon, -1, axis=0)):
+            interior &= (b[0] - a[0]) * (y - a[1]) - (b[1] - a[1]) * (x - a[0]) > 0
+        points = points[~interior]
+
+    hull = np.array(convex_hull([tuple(p) for p in points.tolist()]), dtype=np.float64)
+    if len(hull) <= max_vertices:
+        return hull.reshape(-1, 2)
+
+    # Intersect the supporting lines of consecutive edge directions
+    angles = 2 * np.pi * np.arange(max_vertices) / max_vertices
+    normals = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    support = (hull @ normals.T).max(axis=0)
+    following = np.roll(np.arange(max_vertices), -1)
+    lines = np.stack([normals, normals[following]], axis=1)
+    offsets = np.stack([support, support[following]], axis=1)
+    return np.linalg.solve(lines, offsets[..., None])[..., 0]
+
+
+def rotate_polygon(polygon: np.ndarray, angle: float) -> np.ndarray:
+    """Rotate a polygon counter-clockwise about the origin by ``angle`` degrees."""
+    rad = math.radians(angle)
+    c, s = math.cos(rad), math.sin(rad)
+    return polygon @ np.array([[c, s], [-s, c]])
+
+
+def polygon_area(polygon: np.ndarray) -> float:
+    """Area of a simple polygon (shoelace formula)."""
+    x, y = polygon[:, 0], polygon[:, 1]
+    return 0.5 * abs(float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))))
+
+
+def minkowski_sum(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Minkowski sum of two convex polygons.
+
+    Args:
+        a: (N, 2) counter-clockwise vertices
+        b: (M, 2) counter-clockwise vertices
+
+    Returns:
+        Counter-clockwise vertices of the sum
+    """
+    start_a, edges_a, angles_a = _edge_form(a)
+    start_b, edges_b, angles_b = _edge_form(b)
+    edges = np.concatenate([edges_a, edges_b])
+    edges = edges[np.argsort(np.concatenate([angles_a, angles_b]), kind="stable")]
+    return start_a + start_b + np.concatenate([np.zeros((1, 2)), np.cumsum(edges, axis=0)[:-1]])
+
+
+def buffer_polygon(polygon: np.ndarray, distance: float) -> np.ndarray:
+    """
+    Grow a convex polygon by at least ``distance`` in every direction.
+
+    Uses the Minkowski sum with a regular octagon whose flat sides are
+    ``distance`` from its center.
+    """
+    if distance <= 0:
+        return polygon
+    angles = np.pi / 8 + np.arange(8) * np.pi / 4
+    radius = distance / math.cos(np.pi / 8)
+    octagon = radius * np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    return minkowski_sum(polygon, octagon)
+
+
+class PolygonBin:
+    """
+    Convex polygon placement on a single plate.
+
+    Coordinates start at the bottom-left corner of the plate. Placed
+    polygons are kept as angle-sorted edge lists, so the NFPs of a new
+    shape against all of them are built in one batched merge.
+    """
+
+    def __init__(self, width: float, depth: float):
+        """
+        Create an empty plate.
+
+        Args:
+            width: Plate width (X)
+            depth: Plate depth (Y)
+        """
+        self.width = float(width)
+        self.depth = float(depth)
+        self.used_area = 0.0
+        self.part_count = 0
+
+        self._polygons: List[np.ndarray] = []
+        # Lowest vertex, edges and edge angles of each placed polygon,
+        # padded with zero edges at infinite angle
+        self._starts = np.zeros((0, 2))
+        self._edges = np.zeros((0, 0, 2))
+        self._angles = np.zeros((0, 0))
+        # Bounding box of everything placed so far
+        self._lo = np.full(2, np.inf)
+        self._hi = np.full(2, -np.inf)
+
+    @property
+    def polygons(self) -> List[np.ndarray]:
+        """Placed polygons in plate coordinates."""
+        return [p.copy() for p in self._polygons]
+
+    @property
+    def occupancy(self) -> float:
+        """Fraction of the plate area used."""
+        area = self.width * self.depth
+        return self.used_area / area if area > 0 else 0.0
+
+    def find(self, shapes: Sequence[np.ndarray]) -> Optional[Tuple[float, float, int]]:
+        """
+        Find the best free spot for any of several shapes.
+
+        Spots that keep the bounding box of the plate's contents smallest
+        win, then the lowest and leftmost.
+
+        Args:
+            shapes: Candidate outlines of one part, e.g. one per rotation
+
+        Returns:
+            (x, y, index) placing the bounding box corner of ``shapes[index]``
+            at (x, y), or None if no shape fits
+        """
+        best = None
+        for index, shape in enumerate(shapes):
+            if self.used_area + polygon_area(shape) > self.width * self.depth + _EPSILON:
+                continue
+
+            shape = shape - shape.min(axis=0)
+            size = shape.max(axis=0)
+            spots = self._free_spots(shape, size)
+            if len(spots) == 0:
+                continue
+
+            lo = np.minimum(spots, self._lo)
+            hi = np.maximum(spots + size, self._hi)
+            area = np.round(np.prod(hi - lo, axis=1), 6)
+            pick = np.lexsort((spots[:, 0], spots[:, 1], area))[0]
+            score = (area[pick], spots[pick, 1], spots[pick, 0])
+
+            if best is None or score < best[0]:
+                best = (score, float(spots[pick, 0]), float(spots[pick, 1]), index)
+
+        if best is None:
+            return None
+        return best[1], best[2], best[3]
+
+    def place(self, shape: np.ndarray, x: float, y: float) -> None:
+        """
+        Mark a shape as placed with its bounding box corner at (x, y).
+
+        Args:
+            shape: Outline vertices in counter-clockwise order
+            x: Left edge of the bounding box
+            y: Bottom edge of the bounding box
+        """
+        placed = shape - shape.min(axis=0) + (x, y)
+        start, edges, angles = _edge_form(placed)
+
+        count, width = self._angles.shape
+        width = max(width, len(edges))
+        padded_edges = np.zeros((count + 1, width, 2))
+        padded_angles = np.full((count + 1, width), np.inf)
+        padded_edges[:count, :self._edges.shape[1]] = self._edges
+        padded_angles[:count, :self._angles.shape[1]] = self._angles
+        padded_edges[count, :len(edges)] = edges
+        padded_angles[count, :len(angles)] = angles
+
+        self._starts = np.concatenate([self._starts, start[None]])
+        self._edges = padded_edges
+        self._angles = padded_angles
+        self._polygons.append(placed)
+        self._lo = np.minimum(self._lo, placed.min(axis=0))
+        self._hi = np.maximum(self._hi, placed.max(axis=0))
+        self.used_area += polygon_area(shape)
+        self.part_count += 1
+
+    def _free_spots(self, shape: np.ndarray, size: np.ndarray) -> np.ndarray:
+        """Positions where a shape starting at the origin fits, as (N, 2)."""
+        # Inner-fit rectangle: positions that keep the shape on the plate
+        limit = np.array([self.width, self.depth]) - size
+        if (limit < -_EPSILON).any():
+            return np.zeros((0, 2))
+        limit = np.maximum(limit, 0.0)
+        corners = np.array([[0.0, 0.0], [limit[0], 0.0], [0.0, limit[1]], limit])
+
+        if not self._polygons:
+            return corners[:1]
+
+        start, end = self._no_fit_polygons(shape)
+        lo = np.minimum(start, end).min(axis=1)
+        hi = np.maximum(start, end).max(axis=1)
+        # NFPs entirely outside the inner-fit rectangle cannot block anything
+        near = (hi > _EPSILON).all(axis=1) & (lo < limit - _EPSILON).all(axis=1)
+        if not near.any():
+            return corners
+        start, end, lo, hi = start[near], end[near], lo[near], hi[near]
+
+        edge = end - start
+        length = np.linalg.norm(edge, axis=2)
+        valid = length > 0
+        normal = np.stack([-edge[..., 1], edge[..., 0]], axis=2) / np.maximum(length, _EPSILON)[..., None]
+        offset = np.einsum("kld,kld->kl", normal, start)
+
+        owner = np.nonzero(valid)[0]
+        start_v, end_v = start[valid], end[valid]
+        # Edges away from the inner-fit rectangle cannot produce spots on it
+        useful = (
+            (np.maximum(start_v, end_v) >= -_EPSILON) &
+            (np.minimum(start_v, end_v) <= limit + _EPSILON)
+        ).all(axis=1)
+        owner, start_v, end_v = owner[useful], start_v[useful], end_v[useful]
+
+        candidates = np.concatenate([
+            corners,
+            start_v,
+            _cross_boundary(start_v, end_v, limit),
+            _cross_edges(start_v, end_v, owner),
+        ])
+        inside = ((candidates >= -_EPSILON) & (candidates <= limit + _EPSILON)).all(axis=1)
+        candidates = np.clip(candidates[inside], 0.0, limit)
+
+        free = []
+        for first in range(0, len(candidates), _CANDIDATE_CHUNK):
+            chunk = candidates[first:first + _CANDIDATE_CHUNK]
+            # Only NFPs whose box holds a candidate can block it
+            boxed = (
+                (chunk[:, None] > lo[None] + _EPSILON) & (chunk[:, None] < hi[None] - _EPSILON)
+            ).all(axis=2)
+            point, nfp = np.nonzero(boxed)
+
+            # Blocked when strictly inside every edge of one NFP
+            dist = np.einsum("md,mld->ml", chunk[point], normal[nfp]) - offset[nfp]
+            inside = np.where(valid[nfp], dist > _EPSILON, True).all(axis=1)
+            blocked = np.zeros(len(chunk), dtype=bool)
+            blocked[point[inside]] = True
+            free.append(chunk[~blocked])
+        return np.concatenate(free)
+
+    def _no_fit_polygons(self, shape: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Edge start and end points of the NFP of ``shape`` against every placed polygon."""
+        start, edges, angles = _edge_form(-shape)
+        count = len(self._polygons)
+
+        edges = np.concatenate([self._edges, np.broadcast_to(edges, (count,) + edges.shape)], axis=1)
+        angles = np.concatenate([self._angles, np.broadcast_to(angles, (count, len(angles)))], axis=1)
+        order = np.argsort(angles, axis=1, kind="stable")
+        edges = np.take_along_axis(edges, order[..., None], axis=1)
+
+        # Padding edges sort last and have zero length
+        steps = np.cumsum(edges, axis=1) - edges
+        starts = (self._starts + start)[:, None] + steps
+        return starts, starts + edges
+
+
+def _edge_form(polygon: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Lowest vertex, edges from it and edge angles in [0, 2*pi) of a convex polygon."""
+    # Starting at the lowest (then leftmost) vertex makes the angles increase
+    first = np.lexsort((polygon[:, 0], polygon[:, 1]))[0]
+    polygon = np.roll(polygon, -first, axis=0)
+    edges = np.roll(polygon, -1, axis=0) - polygon
+    edges = edges[np.abs(edges).max(axis=1) > 0]
+    angles = np.arctan2(edges[:, 1], edges[:, 0])
+    angles[angles < 0] += 2 * np.pi
+    return polygon[0], edges, angles
+
+
+def _segment_crossings(
+    p: np.ndarray, r: np.ndarray, q: np.ndarray, s: np.ndarray
+) -> np.ndarray:
+    """Crossing points of segments p + t*r and q + u*s, row by row."""
+    denom = r[:, 0] * s[:, 1] - r[:, 1] * s[:, 0]
+    qp = q - p
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (qp[:, 0] * s[:, 1] - qp[:, 1] * s[:, 0]) / denom
+        u = (qp[:, 0] * r[:, 1] - qp[:, 1] * r[:, 0]) / denom
+    hit = (np.abs(denom) > 1e-12) & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+    return p[hit] + t[hit, None] * r[hit]
+
+
+def _cross_boundary(start: np.ndarray, end: np.ndarray, limit: np.ndarray) -> np.ndarray:
+    """Crossings of edges with the lines bounding the inner-fit rectangle."""
+    found = []
+    for axis in (0, 1):
+        for value in (0.0, limit[axis]):
+            a, b = start[:, axis], end[:, axis]
+            span = b - a
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = (value - a) / span
+            hit = (span != 0) & (t >= 0) & (t <= 1)
+            found.append(start[hit] + t[hit, None] * (end[hit] - start[hit]))
+    return np.concatenate(found)
+
+
+def _cross_edges(start: np.ndarray, end: np.ndarray, owner: np.ndarray) -> np.ndarray:
+    """
+    Crossings between edges of different polygons.
+
+    Edges are sorted by their left end, so the edges whose boxes overlap
+    an edge in X follow it directly in that order.
+    """
+    lo = np.minimum(start, end)
+    hi = np.maximum(start, end)
+    order = np.argsort(lo[:, 0], kind="stable")
+    start, end, lo, hi, owner = start[order], end[order], lo[order], hi[order], owner[order]
+
+    stop = np.searchsorted(lo[:, 0], hi[:, 0], side="right")
+    count = np.maximum(stop - np.arange(len(lo)) - 1, 0)
+    first = np.repeat(np.arange(len(lo)), count)
+    second = first + 1 + np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+
+    keep = (
+        (owner[first] != owner[second]) &
+        (lo[second, 1] <= hi[first, 1]) & (lo[first, 1] <= hi[second, 1])
+    )
+    first, second = first[keep], second[keep]
+    return _segment_crossings(
+        start[first], end[first] - start[first], start[second], end[second] - start[second]
+    )
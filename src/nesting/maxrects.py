@@ -0,0 +1,154 @@
+"""Maximal-rectangles bin packing.
+
+Each plate keeps the list of maximal free rectangles left after the parts
+placed so far. A new part goes into the free rectangle it fits most
+snugly (best short side fit), after which every free rectangle it
+overlaps is split into the up to four maximal pieces around it.
+Free rectangles are stored as one NumPy array, so scoring and splitting
+are vectorized over the whole list.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+_EPSILON = 1e-9
+
+
+class MaxRectsBin:
+    """
+    Free-space bookkeeping for a single plate.
+
+    Coordinates start at the bottom-left corner of the plate.
+    """
+
+    def __init__(self, width: float, depth: float):
+        """
+        Create an empty plate.
+
+        Args:
+            width: Plate width (X)
+            depth: Plate depth (Y)
+        """
+        self.width = float(width)
+        self.depth = float(depth)
+        self.used_area = 0.0
+        self.part_count = 0
+
+        # Rows of (x, y, width, depth)
+        self._free = np.array([[0.0, 0.0, self.width, self.depth]])
+
+    @property
+    def free_rects(self) -> np.ndarray:
+        """Maximal free rectangles as (x, y, width, depth) rows."""
+        return self._free.copy()
+
+    @property
+    def occupancy(self) -> float:
+        """Fraction of the plate area used."""
+        area = self.width * self.depth
+        return self.used_area / area if area > 0 else 0.0
+
+    def find(
+        self,
+        width: float,
+        depth: float,
+        allow_rotation: bool = True,
+    ) -> Optional[Tuple[float, float, bool]]:
+        """
+        Find the best free spot for a rectangle.
+
+        Args:
+            width: Rectangle width
+            depth: Rectangle depth
+            allow_rotation: Also try the rectangle turned by 90 degrees
+
+        Returns:
+            (x, y, rotated) of the best spot, or None if it does not fit
+        """
+        best = None
+        orientations = [(width, depth, False)]
+        if allow_rotation and abs(width - depth) > _EPSILON:
+            orientations.append((depth, width, True))
+
+        for w, d, rotated in orientations:
+            slack_w = self._free[:, 2] - w
+            slack_d = self._free[:, 3] - d
+            fits = np.flatnonzero((slack_w >= -_EPSILON) & (slack_d >= -_EPSILON))
+            if len(fits) == 0:
+                continue
+
+            # Smallest leftover side first, then the other side, then bottom-left
+            short = np.minimum(slack_w[fits], slack_d[fits])
+            long = np.maximum(slack_w[fits], slack_d[fits])
+            order = np.lexsort((self._free[fits, 0], self._free[fits, 1], long, short))
+            pick = fits[order[0]]
+            score = (short[order[0]], long[order[0]])
+
+            if best is None or score < best[0]:
+                best = (score, float(self._free[pick, 0]), float(self._free[pick, 1]), rotated)
+
+        if best is None:
+            return None
+        return best[1], best[2], best[3]
+
+    def place(self, x: float, y: float, width: float, depth: float) -> None:
+        """
+        Mark a rectangle as used and update the free rectangles.
+
+        Args:
+            x: Left edge
+            y: Bottom edge
+            width: Rectangle width
+            depth: Rectangle depth
+        """
+        free = self._free
+        fx, fy, fw, fd = free.T
+        overlap = (
+            (x < fx + fw - _EPSILON) & (x + width > fx + _EPSILON) &
+            (y < fy + fd - _EPSILON) & (y + depth > fy + _EPSILON)
+        )
+        kept = free[~overlap]
+        hit = free[overlap]
+        hx, hy, hw, hd = hit.T
+
+        # Up to four maximal pieces of every overlapped rectangle
+        pieces = np.concatenate([
+            np.stack([hx, hy, x - hx, hd], axis=1),  # left
+            np.stack([np.full_like(hx, x + width), hy, hx + hw - (x + width), hd], axis=1),  # right
+            np.stack([hx, hy, hw, y - hy], axis=1),  # below
+            np.stack([hx, np.full_like(hy, y + depth), hw, hy + hd - (y + depth)], axis=1),  # above
+        ])
+        pieces = pieces[(pieces[:, 2] > _EPSILON) & (pieces[:, 3] > _EPSILON)]
+
+        # Kept rectangles were maximal before, so only new pieces can be redundant
+        self._free = np.concatenate([kept, _prune(pieces, kept)])
+        self.used_area += width * depth
+        self.part_count += 1
+
+
+def _contains(outer: np.ndarray, inner: np.ndarray) -> np.ndarray:
+    """Matrix of whether each outer rectangle contains each inner one."""
+    ox, oy, ow, od = (outer[:, i, None] for i in range(4))
+    ix, iy, iw, id_ = (inner[None, :, i] for i in range(4))
+    return (
+        (ix >= ox - _EPSILON) & (iy >= oy - _EPSILON) &
+        (ix + iw <= ox + ow + _EPSILON) & (iy + id_ <= oy + od + _EPSILON)
+    )
+
+
+def _prune(pieces: np.ndarray, kept: np.ndarray) -> np.ndarray:
+    """Drop pieces contained in a kept rectangle or in another piece."""
+    if len(pieces) == 0:
+        return pieces
+
+    redundant = _contains(kept, pieces).any(axis=0) if len(kept) else np.zeros(len(pieces), dtype=bool)
+
+    among = _contains(pieces, pieces)
+    np.fill_diagonal(among, False)
+    # Of two identical pieces keep the first
+    identical = among & among.T
+    among &= ~np.tril(identical)
+    redundant |= among.any(axis=0)
+
+    return pieces[~redundant]
@@ -32,6 +32,7 @@ from config import (
     PRINTER_ACCESS_CODE,
     PRINTER_SERIAL,
 )
+from src.blender.worker_pool import BlenderWorkerPool
 from src.printer import (
     BambooConnection,
     PrinterCommands,
@@ -98,7 +99,8 @@ class PrintWorkflow:
     def __init__(
         self,
         config: Optional[WorkflowConfig] = None,
-        progress_callback: Optional[Callable[[WorkflowStage, str], None]] = None
+        progress_callback: Optional[Callable[[WorkflowStage, str], None]] = None,
+        worker_pool: Optional[BlenderWorkerPool] = None
     ):
         """
         Initialize workflow.
@@ -106,9 +108,12 @@ class PrintWorkflow:
         Args:
             config: Workflow configuration
             progress_callback: Callback for progress updates
+            worker_pool: Warm Blender workers to run actions on, shared
+                between workflows (default: start Blender per action)
         """
         self.config = config or WorkflowConfig()
         self.progress_callback = progress_callback
+        self.worker_pool = worker_pool
         self.current_stage = WorkflowStage.IDLE
 
         # Set defaults from config module
@@ -132,9 +137,15 @@ class PrintWorkflow:
         """
         Run Blender with given script arguments.
 
+        Uses the worker pool when one was given, otherwise starts a
+        one-shot Blender process.
+
         Returns:
             Parsed JSON result from Blender script
         """
+        if self.worker_pool is not None:
+            return self.worker_pool.run(script_args)
+
         runner_path = project_root / "src" / "blender" / "runner.py"
 
         cmd = [
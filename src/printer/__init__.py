@@ -6,10 +6,26 @@ from src.printer.print_preview import (
     generate_preview,
     export_preview_html,
 )
+from src.printer.ftps_pool import (
+    FTPSSessionPool,
+    UploadResult,
+    close_ftps_pools,
+    get_ftps_pool,
+)
+from src.printer.status_pipeline import StatusPipeline, Subscription
+from src.printer.simulator import PrinterSimulator, SimulatedPrinter
 
 __all__ = [
     "PrintPreview",
     "AMSSlotConfig",
     "generate_preview",
     "export_preview_html",
+    "FTPSSessionPool",
+    "UploadResult",
+    "close_ftps_pools",
+    "get_ftps_pool",
+    "StatusPipeline",
+    "Subscription",
+    "PrinterSimulator",
+    "SimulatedPrinter",
 ]
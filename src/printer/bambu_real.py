@@ -30,12 +30,14 @@ import time
 import threading
 from dataclasses import dataclass, field
 from enum import Enum
-from ftplib import FTP_TLS
 from pathlib import Path
-from typing import Optional, Callable, List, Dict, Any
+from typing import Optional, Callable, List, Dict, Any, Set
 
 import paho.mqtt.client as mqtt
 
+from src.printer.ftps_pool import FTPSSessionPool, get_ftps_pool
+from src.printer.status_pipeline import MAX_UPDATE_RATE, StatusCallback, StatusPipeline, Subscription
+
 
 class PrinterState(Enum):
     """Printer state enumeration."""
@@ -155,6 +157,43 @@ class PrinterStatus:
     last_update: float = 0.0
 
 
+GCODE_STATES = {
+    "IDLE": PrinterState.IDLE,
+    "PREPARE": PrinterState.PREPARING,
+    "RUNNING": PrinterState.PRINTING,
+    "PAUSE": PrinterState.PAUSED,
+    "FINISH": PrinterState.FINISHED,
+    "FAILED": PrinterState.ERROR,
+}
+SPEED_LEVELS = {1: 50, 2: 100, 3: 125, 4: 150}  # spd_lvl -> speed percent
+
+# Report key -> (PrinterStatus field, converter); reports only carry keys that changed
+PRINT_FIELDS = {
+    "gcode_state": ("state", lambda v: GCODE_STATES.get(v, PrinterState.UNKNOWN)),
+    "bed_temper": ("bed_temp", float),
+    "bed_target_temper": ("bed_temp_target", float),
+    "nozzle_temper": ("nozzle_temp", float),
+    "nozzle_target_temper": ("nozzle_temp_target", float),
+    "chamber_temper": ("chamber_temp", float),
+    "mc_percent": ("progress", int),
+    "layer_num": ("layer_current", int),
+    "total_layer_num": ("layer_total", int),
+    "mc_remaining_time": ("remaining_time", int),
+    "gcode_file": ("current_file", str),
+    "subtask_name": ("subtask_name", str),
+    "cooling_fan_speed": ("cooling_fan_speed", int),
+    "big_fan1_speed": ("aux_fan_speed", int),
+    "big_fan2_speed": ("chamber_fan_speed", int),
+    "spd_lvl": ("print_speed", lambda v: SPEED_LEVELS.get(int(v), 100)),
+    "print_error": ("error_code", int),
+    "fail_reason": ("error_message", str),
+}
+SYSTEM_FIELDS = {
+    "wifi_signal": ("wifi_signal", int),
+    "led_mode": ("light_state", str),
+}
+
+
 @dataclass
 class PrintResult:
     """Result of a print operation."""
@@ -173,7 +212,8 @@ class BambuRealPrinter:
     MQTT_PORT = 8883
     FTP_PORT = 990
 
-    def __init__(self, ip: str, access_code: str, serial: str):
+    def __init__(self, ip: str, access_code: str, serial: str,
+                 max_update_rate: float = MAX_UPDATE_RATE):
         """
         Initialize printer connection.
 
@@ -181,6 +221,7 @@ class BambuRealPrinter:
             ip: Printer IP address on local network
             access_code: 8-digit access code from printer screen
             serial: Printer serial number (for MQTT topics)
+            max_update_rate: Status updates per second sent to callbacks
         """
         self.ip = ip
         self.access_code = access_code
@@ -188,11 +229,20 @@ class BambuRealPrinter:
 
         self._mqtt_client: Optional[mqtt.Client] = None
         self._connected = False
+        self._connected_event = threading.Event()
         self._status = PrinterStatus()
-        self._callbacks: List[Callable[[PrinterStatus], None]] = []
+        self._callbacks: Dict[Callable[[PrinterStatus], None], Subscription] = {}
         self._message_lock = threading.Lock()
         self._request_id = 0
 
+        # Reports are parsed and fanned out off the MQTT network thread
+        self._pipeline = StatusPipeline(
+            self._parse_status,
+            lambda: self._status,
+            max_rate=max_update_rate,
+            on_overflow=self._request_push_all,
+        )
+
     def connect(self, timeout: float = 10.0) -> bool:
         """
         Connect to printer via MQTT.
@@ -226,36 +276,31 @@ class BambuRealPrinter:
             self._mqtt_client.on_message = self._on_message
             self._mqtt_client.on_disconnect = self._on_disconnect
 
-            # Connect
+            # Connect; reports only arrive once the network loop runs
+            self._connected_event.clear()
             self._mqtt_client.connect(self.ip, self.MQTT_PORT, keepalive=60)
+            self._pipeline.start()
             self._mqtt_client.loop_start()
 
-            # Wait for connection
-            start_time = time.time()
-            while not self._connected and time.time() - start_time < timeout:
-                time.sleep(0.1)
-
-            if self._connected:
-                # Subscribe to printer reports
-                topic = f"device/{self.serial}/report"
-                self._mqtt_client.subscribe(topic)
-
-                # Request initial status
-                self._request_push_all()
-
+            # Wait for the broker to accept us; on_connect subscribes
+            self._connected_event.wait(timeout)
             return self._connected
 
         except Exception as e:
+            self._pipeline.stop()
             print(f"Connection failed: {e}")
             return False
 
     def disconnect(self):
         """Disconnect from printer."""
         if self._mqtt_client:
-            self._mqtt_client.loop_stop()
+            # Disconnecting first wakes the network thread, so loop_stop returns at once
             self._mqtt_client.disconnect()
+            self._mqtt_client.loop_stop()
             self._mqtt_client = None
+        self._pipeline.stop()
         self._connected = False
+        self._connected_event.clear()
         self._status.state = PrinterState.OFFLINE
 
     @property
@@ -270,12 +315,28 @@ class BambuRealPrinter:
 
     def add_status_callback(self, callback: Callable[[PrinterStatus], None]):
         """Add callback for status updates."""
-        self._callbacks.append(callback)
+        if callback not in self._callbacks:
+            self._callbacks[callback] = self.subscribe(lambda status, changed: callback(status))
 
     def remove_status_callback(self, callback: Callable[[PrinterStatus], None]):
         """Remove status callback."""
-        if callback in self._callbacks:
-            self._callbacks.remove(callback)
+        subscription = self._callbacks.pop(callback, None)
+        if subscription:
+            subscription.unsubscribe()
+
+    def subscribe(self, callback: StatusCallback, fields: Optional[List[str]] = None) -> Subscription:
+        """
+        Receive only the status fields that changed.
+
+        Args:
+            callback: Called as callback(status, changed), where changed maps PrinterStatus
+                field names to their new values; may be a coroutine function
+            fields: PrinterStatus field names of interest (default: all)
+
+        Returns:
+            Subscription; call unsubscribe() to stop
+        """
+        return self._pipeline.subscribe(callback, fields)
 
     # ==================== File Operations ====================
 
@@ -295,44 +356,32 @@ class BambuRealPrinter:
             return PrintResult(False, f"File not found: {local_path}")
 
         remote_name = remote_name or local_path.name
+        remote_path = f"/cache/{remote_name}"
 
+        # Sessions are pooled per printer, so batches skip the handshake and login
         try:
-            # Connect via FTPS
-            ftp = FTP_TLS()
-            ftp.connect(self.ip, self.FTP_PORT, timeout=30)
-            ftp.login("bblp", self.access_code)
-            ftp.prot_p()  # Enable data encryption
-
-            # Upload to cache directory
-            file_size = local_path.stat().st_size
-            with open(local_path, 'rb') as f:
-                ftp.storbinary(f'STOR /cache/{remote_name}', f)
-
-            ftp.quit()
-
-            return PrintResult(
-                True,
-                f"Uploaded {remote_name} ({file_size / 1024 / 1024:.1f} MB)",
-                {"remote_path": f"/cache/{remote_name}", "size": file_size}
-            )
-
+            result = self._ftps.upload(local_path, remote_path)
         except Exception as e:
             return PrintResult(False, f"Upload failed: {e}")
+        if not result.success:
+            return PrintResult(False, result.message)
+
+        return PrintResult(
+            True,
+            f"Uploaded {remote_name} ({result.size / 1024 / 1024:.1f} MB)",
+            {
+                "remote_path": remote_path,
+                "size": result.size,
+                "attempts": result.attempts,
+                "checksum": result.checksum,
+                "verified": result.verified,
+            }
+        )
 
     def list_files(self) -> PrintResult:
         """List files on printer."""
         try:
-            ftp = FTP_TLS()
-            ftp.connect(self.ip, self.FTP_PORT, timeout=10)
-            ftp.login("bblp", self.access_code)
-            ftp.prot_p()
-
-            files = []
-            ftp.cwd('/cache')
-            ftp.retrlines('LIST', lambda x: files.append(x))
-
-            ftp.quit()
-
+            files = self._ftps.list_files('/cache')
             return PrintResult(True, "File list retrieved", {"files": files})
 
         except Exception as e:
@@ -341,19 +390,17 @@ class BambuRealPrinter:
     def delete_file(self, filename: str) -> PrintResult:
         """Delete file from printer."""
         try:
-            ftp = FTP_TLS()
-            ftp.connect(self.ip, self.FTP_PORT, timeout=10)
-            ftp.login("bblp", self.access_code)
-            ftp.prot_p()
-
-            ftp.delete(f'/cache/{filename}')
-            ftp.quit()
-
+            self._ftps.delete(f'/cache/{filename}')
             return PrintResult(True, f"Deleted {filename}")
 
         except Exception as e:
             return PrintResult(False, f"Failed to delete: {e}")
 
+    @property
+    def _ftps(self) -> FTPSSessionPool:
+        """Shared FTPS session pool for this printer."""
+        return get_ftps_pool(self.ip, self.access_code, port=self.FTP_PORT)
+
     # ==================== Print Control ====================
 
     def start_print(self, filename: str,
@@ -634,8 +681,14 @@ class BambuRealPrinter:
         if reason_code == 0:
             self._connected = True
             self._status.state = PrinterState.IDLE
+
+            # Subscriptions do not survive a reconnect, so renew them each time
+            client.subscribe(f"device/{self.serial}/report")
+            self._request_push_all()
         else:
             self._connected = False
+        # Wake connect() either way; a refused login need not wait out the timeout
+        self._connected_event.set()
 
     def _on_disconnect(self, client, userdata, flags, reason_code, properties):
         """MQTT disconnection callback."""
@@ -643,128 +696,94 @@ class BambuRealPrinter:
         self._status.state = PrinterState.OFFLINE
 
     def _on_message(self, client, userdata, message):
-        """Handle incoming MQTT messages."""
-        try:
-            payload = json.loads(message.payload.decode())
-            self._parse_status(payload)
+        """Handle incoming MQTT messages; parsing happens on the status pipeline."""
+        self._pipeline.submit(message.payload)
 
-            # Notify callbacks
-            for callback in self._callbacks:
-                try:
-                    callback(self._status)
-                except Exception as e:
-                    print(f"Callback error: {e}")
+    def _parse_status(self, data: dict) -> Set[str]:
+        """
+        Merge a status report into the cached status.
 
-        except Exception as e:
-            print(f"Message parse error: {e}")
+        Args:
+            data: Decoded report, usually a partial delta
 
-    def _parse_status(self, data: dict):
-        """Parse status from MQTT message."""
+        Returns:
+            Names of the PrinterStatus fields that changed
+        """
+        changed = set()
         with self._message_lock:
             self._status.last_update = time.time()
 
-            if "print" in data:
-                p = data["print"]
-
-                # State
-                if "gcode_state" in p:
-                    state_map = {
-                        "IDLE": PrinterState.IDLE,
-                        "PREPARE": PrinterState.PREPARING,
-                        "RUNNING": PrinterState.PRINTING,
-                        "PAUSE": PrinterState.PAUSED,
-                        "FINISH": PrinterState.FINISHED,
-                        "FAILED": PrinterState.ERROR,
-                    }
-                    self._status.state = state_map.get(
-                        p["gcode_state"], PrinterState.UNKNOWN
-                    )
-
-                # Temperatures
-                if "bed_temper" in p:
-                    self._status.bed_temp = float(p["bed_temper"])
-                if "bed_target_temper" in p:
-                    self._status.bed_temp_target = float(p["bed_target_temper"])
-                if "nozzle_temper" in p:
-                    self._status.nozzle_temp = float(p["nozzle_temper"])
-                if "nozzle_target_temper" in p:
-                    self._status.nozzle_temp_target = float(p["nozzle_target_temper"])
-                if "chamber_temper" in p:
-                    self._status.chamber_temp = float(p["chamber_temper"])
-
-                # Progress
-                if "mc_percent" in p:
-                    self._status.progress = int(p["mc_percent"])
-                if "layer_num" in p:
-                    self._status.layer_current = int(p["layer_num"])
-                if "total_layer_num" in p:
-                    self._status.layer_total = int(p["total_layer_num"])
-                if "mc_remaining_time" in p:
-                    self._status.remaining_time = int(p["mc_remaining_time"])
-                if "gcode_file" in p:
-                    self._status.current_file = p["gcode_file"]
-                if "subtask_name" in p:
-                    self._status.subtask_name = p["subtask_name"]
-
-                # Fans
-                if "cooling_fan_speed" in p:
-                    self._status.cooling_fan_speed = int(p["cooling_fan_speed"])
-                if "big_fan1_speed" in p:
-                    self._status.aux_fan_speed = int(p["big_fan1_speed"])
-                if "big_fan2_speed" in p:
-                    self._status.chamber_fan_speed = int(p["big_fan2_speed"])
-
-                # Speed
-                if "spd_lvl" in p:
-                    speed_map = {1: 50, 2: 100, 3: 125, 4: 150}
-                    self._status.print_speed = speed_map.get(int(p["spd_lvl"]), 100)
-
-                # Errors
-                if "print_error" in p:
-                    self._status.error_code = int(p["print_error"])
-                if "fail_reason" in p:
-                    self._status.error_message = p["fail_reason"]
-
-                # AMS
-                if "ams" in p:
-                    self._parse_ams_status(p["ams"])
-
-            if "system" in data:
-                s = data["system"]
-                if "wifi_signal" in s:
-                    self._status.wifi_signal = int(s["wifi_signal"])
-                if "led_mode" in s:
-                    self._status.light_state = s["led_mode"]
-
-    def _parse_ams_status(self, ams_data: dict):
-        """Parse AMS status from message."""
-        if "ams" not in ams_data:
-            return
+            p = data.get("print")
+            if isinstance(p, dict):
+                changed |= self._merge_fields(p, PRINT_FIELDS)
+                if isinstance(p.get("ams"), dict) and self._parse_ams_status(p["ams"]):
+                    changed.add("ams")
+
+            s = data.get("system")
+            if isinstance(s, dict):
+                changed |= self._merge_fields(s, SYSTEM_FIELDS)
+
+        return changed
+
+    def _merge_fields(self, report: dict, fields: Dict[str, tuple]) -> Set[str]:
+        """Set the status fields present in a report, returning those that changed."""
+        changed = set()
+        for key, (name, convert) in fields.items():
+            if key not in report:
+                continue
+            try:
+                value = convert(report[key])
+            except (TypeError, ValueError):
+                continue
+            if getattr(self._status, name) != value:
+                setattr(self._status, name, value)
+                changed.add(name)
+        return changed
+
+    def _parse_ams_status(self, ams_data: dict) -> bool:
+        """
+        Merge AMS status into the cached units and slots.
+
+        Args:
+            ams_data: The report's "ams" object
+
+        Returns:
+            True if anything changed
+        """
+        ams = self._status.ams
+        before = _ams_snapshot(ams)
 
-        units = []
-        for ams_unit in ams_data["ams"]:
+        for ams_unit in ams_data.get("ams", []):
             ams_id = int(ams_unit.get("id", 0))
-            slots = []
+            while len(ams.units) <= ams_id:
+                ams.units.append([])
+            slots = ams.units[ams_id]
 
             for tray in ams_unit.get("tray", []):
                 slot_id = int(tray.get("id", 0))
-                slots.append(AMSSlotInfo(
-                    slot_id=slot_id,
-                    ams_id=ams_id,
-                    material=tray.get("tray_type", ""),
-                    color=tray.get("tray_color", ""),
-                    remaining_percent=float(tray.get("remain", 0)),
-                    is_loaded=tray.get("tray_type", "") != ""
-                ))
-
-            units.append(slots)
-
-        self._status.ams.units = units
+                slot = next((s for s in slots if s.slot_id == slot_id), None)
+                if slot is None:
+                    slot = AMSSlotInfo(slot_id=slot_id, ams_id=ams_id)
+                    slots.append(slot)
+                    slots.sort(key=lambda s: s.slot_id)
+
+                if tray.keys() == {"id"}:
+                    # A bare id means the slot was emptied
+                    slot.material, slot.color, slot.remaining_percent = "", "", 0.0
+                if "tray_type" in tray:
+                    slot.material = tray["tray_type"]
+                if "tray_color" in tray:
+                    slot.color = tray["tray_color"]
+                if "remain" in tray:
+                    slot.remaining_percent = float(tray["remain"])
+                slot.is_loaded = slot.material != ""
 
         if "tray_now" in ams_data:
-            self._status.ams.current_slot = int(ams_data["tray_now"])
+            ams.current_slot = int(ams_data["tray_now"])
         if "ams_humidity" in ams_data:
-            self._status.ams.humidity = float(ams_data["ams_humidity"])
+            ams.humidity = float(ams_data["ams_humidity"])
+
+        return _ams_snapshot(ams) != before
 
     def _send_command(self, cmd: dict):
         """Send command via MQTT."""
@@ -791,6 +810,12 @@ class BambuRealPrinter:
         return self._request_id
 
 
+def _ams_snapshot(ams: AMSStatus) -> tuple:
+    """Comparable copy of the AMS status."""
+    units = [[(s.slot_id, s.material, s.color, s.remaining_percent) for s in unit] for unit in ams.units]
+    return units, ams.current_slot, ams.humidity
+
+
 def create_real_printer(ip: str, access_code: str, serial: str) -> BambuRealPrinter:
     """Factory function to create a real printer connection."""
     return BambuRealPrinter(ip, access_code, serial)
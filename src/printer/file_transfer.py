@@ -1,15 +1,16 @@
 """
 File transfer module for Bamboo Labs printers.
 
-Handles uploading print files to the printer via FTP/FTPS.
+Handles uploading print files to the printer via FTP/FTPS. Sessions
+come from the printer's shared pool, so they stay logged in between
+transfers.
 """
 
-import ftplib
-import ssl
 from pathlib import Path
 from typing import Optional, List, Callable
 from dataclasses import dataclass
-import io
+
+from src.printer.ftps_pool import BLOCK_SIZE, FTPSSessionPool, get_ftps_pool
 
 
 @dataclass
@@ -44,7 +45,8 @@ class PrinterFileTransfer:
         self,
         ip: str,
         access_code: str,
-        use_mock: bool = False
+        use_mock: bool = False,
+        block_size: int = BLOCK_SIZE
     ):
         """
         Initialize file transfer.
@@ -53,12 +55,15 @@ class PrinterFileTransfer:
             ip: Printer IP address
             access_code: Printer access code (used as FTP password)
             use_mock: Use mock for testing
+            block_size: Upload block size in bytes
         """
         self.ip = ip
         self.access_code = access_code
         self.use_mock = use_mock
+        self.block_size = block_size
 
-        self._ftp: Optional[ftplib.FTP_TLS] = None
+        self._pool: Optional[FTPSSessionPool] = None
+        self._timeout: Optional[float] = None
         self._connected = False
         self._mock_files: List[FileInfo] = []
 
@@ -77,15 +82,13 @@ class PrinterFileTransfer:
             return True
 
         try:
-            # Create SSL context that doesn't verify certificates
-            context = ssl.create_default_context()
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
+            # The pool is shared with other transfers, so the timeout is per session
+            self._pool = get_ftps_pool(self.ip, self.access_code, port=self.FTP_PORT)
+            self._timeout = timeout
 
-            self._ftp = ftplib.FTP_TLS(context=context)
-            self._ftp.connect(self.ip, self.FTP_PORT, timeout=timeout)
-            self._ftp.login(self.FTP_USER, self.access_code)
-            self._ftp.prot_p()  # Enable data channel encryption
+            # Checking a session out opens and logs it in unless one is idle
+            with self._pool.session(timeout):
+                pass
 
             self._connected = True
             return True
@@ -96,13 +99,8 @@ class PrinterFileTransfer:
             return False
 
     def disconnect(self):
-        """Disconnect from FTP server."""
-        if self._ftp:
-            try:
-                self._ftp.quit()
-            except:
-                pass
-        self._ftp = None
+        """Release the printer's session pool; its sessions stay open for reuse."""
+        self._pool = None
         self._connected = False
 
     @property
@@ -153,43 +151,26 @@ class PrinterFileTransfer:
                 bytes_transferred=file_size
             )
 
-        if not self._connected or not self._ftp:
+        if not self._connected or not self._pool:
             return TransferResult(
                 success=False,
                 message="Not connected to printer"
             )
 
         try:
-            file_size = local_path.stat().st_size
-            bytes_sent = 0
-
-            def upload_callback(data):
-                nonlocal bytes_sent
-                bytes_sent += len(data)
-                if progress_callback:
-                    progress_callback(bytes_sent, file_size)
-
-            # Ensure directory exists
-            dir_path = str(Path(remote_path).parent)
-            try:
-                self._ftp.mkd(dir_path)
-            except ftplib.error_perm:
-                pass  # Directory may already exist
-
-            # Upload file
-            with open(local_path, 'rb') as f:
-                self._ftp.storbinary(
-                    f'STOR {remote_path}',
-                    f,
-                    blocksize=8192,
-                    callback=upload_callback
-                )
+            result = self._pool.upload(
+                local_path,
+                remote_path,
+                block_size=self.block_size,
+                progress_callback=progress_callback,
+                timeout=self._timeout
+            )
 
             return TransferResult(
-                success=True,
-                message="Upload successful",
-                remote_path=remote_path,
-                bytes_transferred=bytes_sent
+                success=result.success,
+                message="Upload successful" if result.success else result.message,
+                remote_path=remote_path if result.success else None,
+                bytes_transferred=result.bytes_sent
             )
 
         except Exception as e:
@@ -224,7 +205,7 @@ class PrinterFileTransfer:
                 remote_path=remote_path
             )
 
-        if not self._connected or not self._ftp:
+        if not self._connected or not self._pool:
             return TransferResult(
                 success=False,
                 message="Not connected to printer"
@@ -240,15 +221,15 @@ class PrinterFileTransfer:
                 if progress_callback:
                     progress_callback(bytes_received)
 
-            with open(local_path, 'wb') as f:
+            with open(local_path, 'wb') as f, self._pool.session(self._timeout) as ftp:
                 def write_callback(data):
                     f.write(data)
                     download_callback(data)
 
-                self._ftp.retrbinary(
+                ftp.retrbinary(
                     f'RETR {remote_path}',
                     write_callback,
-                    blocksize=8192
+                    blocksize=self.block_size
                 )
 
             return TransferResult(
@@ -277,16 +258,14 @@ class PrinterFileTransfer:
         if self.use_mock:
             return [f for f in self._mock_files if f.path.startswith(path)]
 
-        if not self._connected or not self._ftp:
+        if not self._connected or not self._pool:
             return []
 
         try:
             files = []
-            self._ftp.cwd(path)
 
             # Get directory listing
-            listing = []
-            self._ftp.retrlines('LIST', listing.append)
+            listing = self._pool.list_files(path, timeout=self._timeout)
 
             for line in listing:
                 parts = line.split()
@@ -325,14 +304,14 @@ class PrinterFileTransfer:
                 remote_path=remote_path
             )
 
-        if not self._connected or not self._ftp:
+        if not self._connected or not self._pool:
             return TransferResult(
                 success=False,
                 message="Not connected to printer"
             )
 
         try:
-            self._ftp.delete(remote_path)
+            self._pool.delete(remote_path, timeout=self._timeout)
             return TransferResult(
                 success=True,
                 message="File deleted",
@@ -349,13 +328,12 @@ class PrinterFileTransfer:
         if self.use_mock:
             return any(f.path == remote_path for f in self._mock_files)
 
-        if not self._connected or not self._ftp:
+        if not self._connected or not self._pool:
             return False
 
         try:
-            self._ftp.size(remote_path)
-            return True
-        except:
+            return self._pool.size(remote_path, timeout=self._timeout) is not None
+        except Exception:
             return False
 
     def get_free_space(self) -> Optional[int]:
@@ -0,0 +1,495 @@
+"""
+Pooled FTPS sessions for printer file transfer.
+
+Every printer gets one pool of authenticated FTPS sessions that are kept
+open and handed out again, so a batch of uploads pays for the TLS
+handshake and login once instead of once per file. Data connections reuse
+the control connection's TLS session, which also spares them a full
+handshake.
+
+Uploads stream in large blocks. A dropped connection resumes from the size
+the printer already holds, using REST before STOR, instead of starting
+over. Afterwards the remote size is compared with the local file, and its
+checksum too when the server can hash files. Reading the file back to
+checksum it is opt-in: printers have no checksum command, and a readback
+doubles the transfer time.
+"""
+
+import ftplib
+import hashlib
+import socket
+import ssl
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.utils import get_logger
+
+logger = get_logger("printer.ftps")
+
+FTPS_PORT = 990
+FTPS_USER = "bblp"
+CONNECT_TIMEOUT = 30.0  # Seconds to open and log in a session
+MAX_SESSIONS = 2  # Concurrent sessions per printer
+IDLE_CHECK_AFTER = 15.0  # Idle sessions older than this are pinged before reuse (seconds)
+IDLE_TIMEOUT = 120.0  # Idle sessions older than this are closed instead of reused (seconds)
+BLOCK_SIZE = 1 << 20  # Upload block size (bytes)
+HASH_CHUNK = 4 << 20  # Read size when hashing local files (bytes)
+MAX_RETRIES = 5  # Reconnects per upload before giving up
+RETRY_DELAY = 0.5  # First pause before reconnecting, doubled per retry (seconds)
+MAX_RETRY_DELAY = 10.0
+
+# Server-side checksum commands, tried in order, with the matching local hash
+CHECKSUM_COMMANDS = (("XSHA256", "sha256"), ("XMD5", "md5"))
+
+# Errors after which the session is discarded and the transfer retried
+TRANSIENT_ERRORS = (OSError, EOFError, ftplib.error_temp, ftplib.error_reply)
+
+SessionFactory = Callable[[], ftplib.FTP]
+
+
+class SessionReuseFTP_TLS(ftplib.FTP_TLS):
+    """
+    FTP_TLS for printers.
+
+    Printers speak implicit FTPS, so the control connection is wrapped in
+    TLS before the greeting rather than upgraded with AUTH TLS. Data
+    connections resume the control connection's TLS session.
+    """
+
+    def connect(self, host="", port=0, timeout=-999, source_address=None):
+        if host:
+            self.host = host
+        if port > 0:
+            self.port = port
+        if timeout != -999:
+            self.timeout = timeout
+        if source_address is not None:
+            self.source_address = source_address
+        sock = socket.create_connection((self.host, self.port), self.timeout, source_address=self.source_address)
+        self.af = sock.family
+        self.sock = self.context.wrap_socket(sock, server_hostname=self.host)
+        self.file = self.sock.makefile("r", encoding=self.encoding)
+        self.welcome = self.getresp()
+        return self.welcome
+
+    def ntransfercmd(self, cmd, rest=None):
+        conn, size = ftplib.FTP.ntransfercmd(self, cmd, rest)
+        if self._prot_p:
+            conn = self.context.wrap_socket(conn, server_hostname=self.host, session=self.sock.session)
+        return conn, size
+
+
+def insecure_context() -> ssl.SSLContext:
+    """TLS context for printers, which present self-signed certificates."""
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def file_digest(path: Path, algorithm: str = "sha256") -> str:
+    """Hex digest of a local file, read in large chunks."""
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class UploadResult:
+    """Result of a pooled upload."""
+
+    success: bool
+    message: str
+    remote_path: str
+    size: int = 0
+    bytes_sent: int = 0
+    attempts: int = 0
+    resumed_from: List[int] = field(default_factory=list)  # Offset of every resumed attempt
+    checksum: str = ""  # Local digest, as "algorithm:hex"
+    verified: str = ""  # "checksum", "readback", "size" or "" if not verified
+
+
+class FTPSSessionPool:
+    """
+    Pool of authenticated FTPS sessions to one printer.
+
+    Sessions are checked out with ``session()`` and returned afterwards.
+    A session that fails while in use is closed, not returned.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        password: str,
+        user: str = FTPS_USER,
+        port: int = FTPS_PORT,
+        max_sessions: int = MAX_SESSIONS,
+        timeout: float = CONNECT_TIMEOUT,
+        session_factory: Optional[SessionFactory] = None,
+    ):
+        """
+        Initialize the pool; sessions are opened on first use.
+
+        Args:
+            host: Printer address
+            password: Printer access code
+            user: FTP user name
+            port: FTPS port
+            max_sessions: Sessions that may be in use at once
+            timeout: Socket timeout for sessions in seconds
+            session_factory: Creates an unconnected session (default: SessionReuseFTP_TLS)
+        """
+        self.host = host
+        self.password = password
+        self.user = user
+        self.port = port
+        self.max_sessions = max_sessions
+        self.timeout = timeout
+        self.session_factory = session_factory or (lambda: SessionReuseFTP_TLS(context=insecure_context()))
+
+        self._idle: List[Tuple[ftplib.FTP, float]] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_sessions)
+        self._closed = False
+
+        self.sessions_opened = 0
+        self.sessions_reused = 0
+
+    @property
+    def idle_count(self) -> int:
+        """Number of open sessions waiting to be reused."""
+        with self._lock:
+            return len(self._idle)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None) -> Iterator[ftplib.FTP]:
+        """
+        Check out an authenticated session.
+
+        Args:
+            timeout: Socket timeout for this checkout in seconds (default: the pool's)
+
+        Raises:
+            RuntimeError: If the pool is closed
+        """
+        if self._closed:
+            raise RuntimeError("FTPS session pool is closed")
+
+        self._slots.acquire()
+        ftp = None
+        try:
+            ftp = self._checkout(self.timeout if timeout is None else timeout)
+            yield ftp
+        except ftplib.error_perm:
+            raise  # The server refused one command; the session itself is fine
+        except BaseException:
+            if ftp is not None:
+                _close(ftp)
+                ftp = None
+            raise
+        finally:
+            if ftp is not None:
+                self._checkin(ftp)
+            self._slots.release()
+
+    def _checkout(self, timeout: float) -> ftplib.FTP:
+        """Reuse the most recent live idle session or open a new one."""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                ftp, since = self._idle.pop()
+
+            idle = time.monotonic() - since
+            if idle > IDLE_TIMEOUT:
+                _close(ftp)
+                continue
+            if idle > IDLE_CHECK_AFTER:
+                try:
+                    ftp.voidcmd("NOOP")
+                except TRANSIENT_ERRORS + (ftplib.error_perm,):
+                    _close(ftp)
+                    continue
+
+            with self._lock:
+                self.sessions_reused += 1
+            _set_timeout(ftp, timeout)
+            return ftp
+
+        return self._open(timeout)
+
+    def _open(self, timeout: float) -> ftplib.FTP:
+        """Open, log in and secure a new session."""
+        ftp = self.session_factory()
+        try:
+            ftp.connect(self.host, self.port, timeout=timeout)
+            ftp.login(self.user, self.password)
+            if isinstance(ftp, ftplib.FTP_TLS):
+                ftp.prot_p()
+        except BaseException:
+            _close(ftp)
+            raise
+
+        with self._lock:
+            self.sessions_opened += 1
+        logger.debug(f"Opened FTPS session to {self.host}:{self.port}")
+        return ftp
+
+    def _checkin(self, ftp: ftplib.FTP) -> None:
+        """Return a healthy session to the idle list."""
+        with self._lock:
+            if not self._closed:
+                self._idle.append((ftp, time.monotonic()))
+                return
+        _close(ftp, quit=True)
+
+    def close(self) -> None:
+        """Log out of every idle session; sessions in use close when returned."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for ftp, _ in idle:
+            _close(ftp, quit=True)
+
+    def __enter__(self) -> "FTPSSessionPool":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    # ==================== Operations ====================
+
+    def upload(
+        self,
+        local_path: Path,
+        remote_path: str,
+        block_size: int = BLOCK_SIZE,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        verify: bool = True,
+        readback: bool = False,
+        retries: int = MAX_RETRIES,
+        timeout: Optional[float] = None,
+    ) -> UploadResult:
+        """
+        Upload a file, resuming after dropped connections.
+
+        Args:
+            local_path: Local file
+            remote_path: Destination path on the printer
+            block_size: Bytes sent per block
+            progress_callback: Callback(bytes_on_printer, total_bytes)
+            verify: Compare remote size, and checksum if the server can hash files, afterwards
+            readback: Download the file to checksum it when the server has no checksum command
+            retries: Reconnects before giving up
+            timeout: Socket timeout in seconds (default: the pool's)
+
+        Returns:
+            UploadResult; failures are reported in it rather than raised
+        """
+        local_path = Path(local_path)
+        if not local_path.exists():
+            return UploadResult(False, f"Local file not found: {local_path}", remote_path)
+
+        size = local_path.stat().st_size
+        result = UploadResult(False, "", remote_path, size=size)
+        offset = 0
+
+        with open(local_path, "rb") as f:
+            while True:
+                result.attempts += 1
+                try:
+                    with self.session(timeout) as ftp:
+                        ftp.voidcmd("TYPE I")
+                        if result.bytes_sent:
+                            # Our STOR reached the printer; continue from what it holds
+                            offset = self._resume_offset(ftp, remote_path, size)
+                            result.resumed_from.append(offset)
+                        else:
+                            # Nothing sent yet, so a file already there is stale: overwrite it
+                            offset = 0
+                        if offset == 0:
+                            _make_parent(ftp, remote_path)
+
+                        sent = offset
+
+                        def on_block(data: bytes) -> None:
+                            nonlocal sent
+                            sent += len(data)
+                            result.bytes_sent += len(data)
+                            if progress_callback:
+                                progress_callback(sent, size)
+
+                        f.seek(offset)
+                        ftp.storbinary(f"STOR {remote_path}", f, block_size, on_block, rest=offset or None)
+
+                        if verify:
+                            self._verify(ftp, local_path, remote_path, size, readback, result)
+                    break
+
+                except TRANSIENT_ERRORS as e:
+                    if result.attempts > retries:
+                        result.message = f"Upload failed after {result.attempts} attempts: {e}"
+                        return result
+                    delay = min(RETRY_DELAY * 2 ** (result.attempts - 1), MAX_RETRY_DELAY)
+                    logger.warning(f"Upload of {remote_path} interrupted ({e}), resuming in {delay:.1f}s")
+                    time.sleep(delay)
+
+                except (ftplib.error_perm, ValueError) as e:
+                    result.message = f"Upload failed: {e}"
+                    return result
+
+        result.success = True
+        resumed = f", resumed {len(result.resumed_from)}x" if result.resumed_from else ""
+        result.message = f"Uploaded {remote_path} ({size / 1024 / 1024:.1f} MB{resumed})"
+        return result
+
+    def _resume_offset(self, ftp: ftplib.FTP, remote_path: str, size: int) -> int:
+        """Bytes of a partial upload already on the printer."""
+        remote = _remote_size(ftp, remote_path)
+        if remote is None or remote > size:
+            return 0
+        return remote
+
+    def _verify(
+        self,
+        ftp: ftplib.FTP,
+        local_path: Path,
+        remote_path: str,
+        size: int,
+        readback: bool,
+        result: UploadResult,
+    ) -> None:
+        """
+        Check the uploaded file against the local one.
+
+        Raises:
+            ValueError: If the size or checksum differs
+        """
+        remote_size = _remote_size(ftp, remote_path)
+        if remote_size is not None and remote_size != size:
+            raise ValueError(f"Size mismatch for {remote_path}: {remote_size} on printer, {size} local")
+        result.verified = "size" if remote_size is not None else ""
+
+        for command, algorithm in CHECKSUM_COMMANDS:
+            try:
+                response = ftp.sendcmd(f"{command} {remote_path}")
+            except ftplib.error_perm:
+                continue
+            remote_digest = response.split()[-1].lower()
+            result.checksum = f"{algorithm}:{file_digest(local_path, algorithm)}"
+            if remote_digest != result.checksum.split(":", 1)[1]:
+                raise ValueError(f"{algorithm} mismatch for {remote_path}")
+            result.verified = "checksum"
+            return
+
+        result.checksum = f"sha256:{file_digest(local_path)}"
+        if readback:
+            digest = hashlib.sha256()
+            ftp.retrbinary(f"RETR {remote_path}", digest.update, BLOCK_SIZE)
+            if digest.hexdigest() != result.checksum.split(":", 1)[1]:
+                raise ValueError(f"sha256 mismatch for {remote_path}")
+            result.verified = "readback"
+
+    def list_files(self, path: str, timeout: Optional[float] = None) -> List[str]:
+        """
+        List a directory on the printer.
+
+        Returns:
+            Raw LIST lines
+        """
+        lines: List[str] = []
+        with self.session(timeout) as ftp:
+            ftp.retrlines(f"LIST {path}", lines.append)
+        return lines
+
+    def delete(self, remote_path: str, timeout: Optional[float] = None) -> None:
+        """Delete a file on the printer."""
+        with self.session(timeout) as ftp:
+            ftp.delete(remote_path)
+
+    def size(self, remote_path: str, timeout: Optional[float] = None) -> Optional[int]:
+        """Size of a file on the printer, or None if it does not exist."""
+        with self.session(timeout) as ftp:
+            ftp.voidcmd("TYPE I")
+            return _remote_size(ftp, remote_path)
+
+
+def _remote_size(ftp: ftplib.FTP, remote_path: str) -> Optional[int]:
+    """SIZE of a remote file, or None if the server has no such file."""
+    try:
+        return ftp.size(remote_path)
+    except ftplib.error_perm:
+        return None
+
+
+def _set_timeout(ftp: ftplib.FTP, timeout: float) -> None:
+    """Apply a socket timeout to a session and its future data connections."""
+    ftp.timeout = timeout
+    sock = getattr(ftp, "sock", None)
+    if sock is not None:
+        sock.settimeout(timeout)
+
+
+def _make_parent(ftp: ftplib.FTP, remote_path: str) -> None:
+    """Create the remote file's directory if it is missing."""
+    parent = str(Path(remote_path).parent)
+    if parent in ("/", "."):
+        return
+    try:
+        ftp.mkd(parent)
+    except ftplib.error_perm:
+        pass  # Directory may already exist
+
+
+def _close(ftp: ftplib.FTP, quit: bool = False) -> None:
+    """Close a session, politely if asked, ignoring errors from a dead connection."""
+    if quit:
+        try:
+            ftp.quit()
+            return
+        except Exception:
+            pass
+    try:
+        ftp.close()
+    except Exception:
+        pass
+
+
+_pools: Dict[Tuple[str, int, str], FTPSSessionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_ftps_pool(host: str, password: str, port: int = FTPS_PORT) -> FTPSSessionPool:
+    """
+    Get the shared session pool for a printer, creating it on first use.
+
+    Args:
+        host: Printer address
+        password: Printer access code
+        port: FTPS port
+
+    Returns:
+        The printer's FTPSSessionPool
+    """
+    key = (host, port, password)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = FTPSSessionPool(host, password, port=port)
+            _pools[key] = pool
+        return pool
+
+
+def close_ftps_pools() -> None:
+    """Close every shared session pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
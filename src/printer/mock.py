@@ -91,7 +91,8 @@ class MockPrinter:
                 message=f"File not found: {filename}"
             )
 
-        if self._status.state != PrinterState.IDLE:
+        # Like a real printer, a finished one takes the next job once its plate is cleared
+        if self._status.state not in (PrinterState.IDLE, PrinterState.FINISHED):
             return PrintResult(
                 success=False,
                 message=f"Printer not idle (state: {self._status.state.value})"
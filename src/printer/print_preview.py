@@ -13,13 +13,19 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import json
+import math
 
+from src.estimator.cost_estimator import CostEstimator
+from src.estimator.gcode_analyzer import GcodeAnalysis, analyze_3mf, analyze_gcode
 from src.materials.material_db import get_material, Material
 from src.materials.compatibility import check_multi_material_compatibility
+from src.mesh_io.scan import scan_mesh
 from src.utils import get_logger, format_duration
 
 logger = get_logger("printer.preview")
 
+DEFAULT_LAYER_HEIGHT = 0.2  # mm, for estimates from unsliced meshes
+
 
 # Common filament colors (CSS color values)
 FILAMENT_COLORS = {
@@ -186,7 +192,7 @@ def generate_preview(
     elif path.suffix.lower() == ".3mf":
         estimate = _parse_3mf_estimate(path)
     else:
-        # For STL files, estimate based on typical slicing settings
+        # For meshes, estimate based on typical slicing settings
         estimate = _estimate_from_stl(path)
 
     preview = PrintPreview(
@@ -202,10 +208,21 @@ def generate_preview(
 
 
 def _parse_gcode_estimate(path: Path) -> Optional[PrintEstimate]:
-    """Parse print estimate from GCODE file."""
+    """Estimate from the moves of a GCODE file, or its header comments if that fails."""
     if not path.exists():
         return None
 
+    try:
+        analysis = analyze_gcode(path)
+        if analysis.move_count:
+            return _estimate_from_analysis(analysis)
+    except Exception as e:
+        logger.warning(f"Failed to analyze GCODE, using header comments: {e}")
+    return _parse_gcode_header(path)
+
+
+def _parse_gcode_header(path: Path) -> Optional[PrintEstimate]:
+    """Parse print estimate from GCODE header comments."""
     try:
         # Read first 100 lines for metadata
         with open(path, "r") as f:
@@ -254,28 +271,49 @@ def _parse_gcode_estimate(path: Path) -> Optional[PrintEstimate]:
 
 
 def _parse_3mf_estimate(path: Path) -> Optional[PrintEstimate]:
-    """Parse print estimate from 3MF file."""
-    # 3MF is a ZIP file with XML content
-    # For now, return a placeholder
+    """Estimate from the sliced G-code in a 3MF, or from its mesh if unsliced."""
+    if not path.exists():
+        return None
+
+    try:
+        analysis = analyze_3mf(path)
+        if analysis is not None and analysis.move_count:
+            return _estimate_from_analysis(analysis)
+    except Exception as e:
+        logger.warning(f"Failed to analyze 3MF G-code: {e}")
+    return _estimate_from_stl(path)
+
+
+def _estimate_from_stl(path: Path) -> Optional[PrintEstimate]:
+    """Estimate print parameters from a mesh's volume and dimensions."""
+    if not path.exists():
+        return None
+
+    try:
+        stats = scan_mesh(path)
+    except Exception as e:
+        logger.warning(f"Failed to scan mesh: {e}")
+        return None
+
+    width, depth, height = stats.dimensions()
+    estimate = CostEstimator().estimate_print(abs(stats.volume), layer_height_mm=DEFAULT_LAYER_HEIGHT)
     return PrintEstimate(
-        total_time_seconds=0,
-        material_usage_grams={},
-        total_layers=0,
-        max_z_height=0,
-        print_volume=(0, 0, 0),
+        total_time_seconds=estimate.print_time_seconds,
+        material_usage_grams={1: estimate.total_weight_grams} if estimate.total_weight_grams else {},
+        total_layers=math.ceil(round(height / DEFAULT_LAYER_HEIGHT, 6)) if height > 0 else 0,
+        max_z_height=height,
+        print_volume=(width, depth, height),
     )
 
 
-def _estimate_from_stl(path: Path) -> Optional[PrintEstimate]:
-    """Estimate print parameters from STL file dimensions."""
-    # Would use trimesh here to get actual dimensions
-    # For now, return placeholder
+def _estimate_from_analysis(analysis: GcodeAnalysis) -> PrintEstimate:
+    """Convert a G-code analysis to a preview estimate; tools map to 1-based slots."""
     return PrintEstimate(
-        total_time_seconds=0,
-        material_usage_grams={},
-        total_layers=0,
-        max_z_height=0,
-        print_volume=(0, 0, 0),
+        total_time_seconds=analysis.total_time_seconds,
+        material_usage_grams={tool + 1: grams for tool, grams in analysis.grams_by_tool.items() if grams > 0},
+        total_layers=analysis.total_layers,
+        max_z_height=analysis.max_z,
+        print_volume=analysis.dimensions(),
     )
 
 
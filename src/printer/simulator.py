@@ -0,0 +1,952 @@
+"""
+Local simulator of Bambu Lab printers for load and soak testing.
+
+Each simulated printer listens on localhost the way a real one listens on
+the LAN. It runs an MQTT broker stand-in on its own TLS port and an
+implicit FTPS server on another. The real BambuRealPrinter and its FTPS
+session pool connect to them unchanged. Message throughput, reconnects and
+uploads can therefore be measured without hardware, and one process can
+simulate dozens of printers.
+
+A simulated printer publishes push_status deltas at ``report_rate`` and
+answers pushall with a full report. It acts on project_file, pause,
+resume, stop and temperature gcode_line commands. A print starts only if
+its file was uploaded. It then heats up, runs and finishes
+``print_speedup`` times faster than real time.
+
+Example:
+    with PrinterSimulator(count=24, report_rate=5) as sim:
+        printer = sim.client(sim.printers[0])
+        printer.connect()
+        printer.upload_file("model.3mf")
+        printer.start_print("model.3mf")
+"""
+
+import asyncio
+import json
+import random
+import shutil
+import socket
+import socketserver
+import ssl
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from src.utils import get_logger
+
+logger = get_logger("printer.simulator")
+
+CERT_DAYS = 1  # Validity of the self-signed certificate made at start-up
+ACCESS_USER = "bblp"
+REPORT_RATE = 1.0  # push_status reports per second per printer
+PRINT_SPEEDUP = 60.0  # Simulated seconds per real second
+PRINT_SECONDS = 1800.0  # Simulated duration of every print
+PRINT_LAYERS = 200
+BED_TARGET = 60.0  # °C while printing
+NOZZLE_TARGET = 220.0
+AMBIENT_TEMP = 25.0
+BED_HEAT_RATE = 1.0  # °C per simulated second
+NOZZLE_HEAT_RATE = 4.0
+MAX_CLIENT_BUFFER = 1 << 20  # Bytes queued to a slow MQTT client before its reports are dropped
+DATA_TIMEOUT = 30.0  # Seconds to wait for an FTPS data connection
+TRANSFER_CHUNK = 256 << 10  # Bytes per FTPS data read or write
+
+# MQTT 3.1.1 control packet types
+CONNECT, CONNACK, PUBLISH, PUBACK = 1, 2, 3, 4
+SUBSCRIBE, SUBACK, UNSUBSCRIBE, UNSUBACK = 8, 9, 10, 11
+PINGREQ, PINGRESP, DISCONNECT = 12, 13, 14
+
+ACTIVE_STATES = ("PREPARE", "RUNNING", "PAUSE")
+AMS_COLORS = ("FFFFFFFF", "000000FF", "FF0000FF", "0000FFFF")
+
+
+def topic_matches(pattern: str, topic: str) -> bool:
+    """Whether an MQTT topic filter, with + and # wildcards, matches a topic."""
+    parts = topic.split("/")
+    for i, level in enumerate(pattern.split("/")):
+        if level == "#":
+            return True
+        if i >= len(parts) or (level != "+" and level != parts[i]):
+            return False
+    return len(pattern.split("/")) == len(parts)
+
+
+class SimulatedPrinter:
+    """State and behaviour of one simulated printer, without any I/O."""
+
+    def __init__(self, serial: str, access_code: str, storage: Path,
+                 print_speedup: float = PRINT_SPEEDUP, seed: int = 0):
+        """
+        Initialize an idle printer.
+
+        Args:
+            serial: Serial number, used in MQTT topics
+            access_code: Password for MQTT and FTPS
+            storage: Directory holding the printer's SD card
+            print_speedup: Simulated seconds per real second
+            seed: Seed for temperature noise
+        """
+        self.serial = serial
+        self.access_code = access_code
+        self.storage = storage
+        self.print_speedup = print_speedup
+        self.mqtt_port = 0
+        self.ftps_port = 0
+        (storage / "cache").mkdir(parents=True, exist_ok=True)
+
+        self.report: Dict[str, Any] = {
+            "gcode_state": "IDLE",
+            "mc_percent": 0,
+            "mc_remaining_time": 0,
+            "layer_num": 0,
+            "total_layer_num": 0,
+            "gcode_file": "",
+            "subtask_name": "",
+            "bed_temper": AMBIENT_TEMP,
+            "bed_target_temper": 0.0,
+            "nozzle_temper": AMBIENT_TEMP,
+            "nozzle_target_temper": 0.0,
+            "chamber_temper": AMBIENT_TEMP,
+            "spd_lvl": 2,
+            "cooling_fan_speed": "0",
+            "big_fan1_speed": "0",
+            "big_fan2_speed": "0",
+            "print_error": 0,
+            "fail_reason": "",
+            "wifi_signal": "-45dBm",
+        }
+        self.ams = {
+            "tray_now": "255",
+            "ams": [{"id": "0", "humidity": "4", "tray": [
+                {"id": str(i), "tray_type": "PLA", "tray_color": color, "remain": 100}
+                for i, color in enumerate(AMS_COLORS)
+            ]}],
+        }
+
+        self.sequence = 0
+        self.reports_sent = 0
+        self.reports_dropped = 0
+        self.commands_received = 0
+        self.mqtt_connections = 0
+        self.ftps_logins = 0
+        self.bytes_uploaded = 0
+        self.uploads_completed = 0
+        self.drop_upload_after: Optional[int] = None  # Bytes the next upload receives before the link drops
+
+        self._rng = random.Random(seed)
+        self._temps = {"bed_temper": AMBIENT_TEMP, "nozzle_temper": AMBIENT_TEMP}
+        self._elapsed = 0.0  # Simulated seconds of the current print
+        self._sessions: Set["_MQTTSession"] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current gcode_state."""
+        return self.report["gcode_state"]
+
+    def path(self, remote_path: str) -> Path:
+        """
+        Local file behind a path on the printer.
+
+        Raises:
+            ValueError: If the path leaves the printer's storage
+        """
+        local = (self.storage / remote_path.lstrip("/")).resolve()
+        if local != self.storage.resolve() and self.storage.resolve() not in local.parents:
+            raise ValueError(f"Path outside printer storage: {remote_path}")
+        return local
+
+    def full_report(self) -> dict:
+        """Report answering pushall."""
+        return self._wrap({**self.report, "ams": self.ams}, msg=0)
+
+    def tick(self, seconds: float) -> Optional[dict]:
+        """
+        Advance the simulation.
+
+        Args:
+            seconds: Real seconds since the last tick
+
+        Returns:
+            push_status delta of the fields that changed, or None
+        """
+        before = dict(self.report)
+        self._advance(seconds * self.print_speedup)
+        delta = {key: value for key, value in self.report.items() if before[key] != value}
+        return self._wrap(delta) if delta else None
+
+    def handle_command(self, command: dict) -> List[dict]:
+        """
+        Act on a request published by a client.
+
+        Args:
+            command: Decoded request
+
+        Returns:
+            Reports to publish in reply
+        """
+        self.commands_received += 1
+        if command.get("pushing", {}).get("command") == "pushall":
+            return [self.full_report()]
+
+        request = command.get("print")
+        if not isinstance(request, dict):
+            return []
+        before = dict(self.report)
+        name = request.get("command")
+        error = ""
+
+        if name == "project_file":
+            error = self._start_print(request)
+        elif name == "pause" and self.state == "RUNNING":
+            self.report["gcode_state"] = "PAUSE"
+        elif name == "resume" and self.state == "PAUSE":
+            self.report["gcode_state"] = "RUNNING"
+        elif name == "stop" and self.state in ACTIVE_STATES:
+            # Bambu firmware reports a cancelled print as failed
+            self.report["gcode_state"] = "FAILED"
+            self.report["bed_target_temper"] = self.report["nozzle_target_temper"] = 0.0
+        elif name == "gcode_line":
+            self._run_gcode(str(request.get("param", "")))
+
+        reply = {key: value for key, value in self.report.items() if before[key] != value}
+        reply.update(command=name, sequence_id=request.get("sequence_id", ""),
+                     result="failed" if error else "success")
+        if error:
+            reply["reason"] = error
+        return [{"print": reply}]
+
+    def _start_print(self, request: dict) -> str:
+        """Start a project_file print, returning an error message on failure."""
+        if self.state in ACTIVE_STATES:
+            return "printer busy"
+        url = str(request.get("url", ""))
+        remote = url[len("file://"):] if url.startswith("file://") else url
+        try:
+            exists = self.path(remote).is_file()
+        except ValueError:
+            exists = False
+        if not exists:
+            return f"file not found: {remote}"
+
+        self._elapsed = 0.0
+        self.report.update(
+            gcode_state="PREPARE",
+            gcode_file=remote,
+            subtask_name=request.get("subtask_name", Path(remote).name),
+            mc_percent=0,
+            layer_num=0,
+            total_layer_num=PRINT_LAYERS,
+            mc_remaining_time=int(PRINT_SECONDS // 60),
+            bed_target_temper=BED_TARGET,
+            nozzle_target_temper=NOZZLE_TARGET,
+            print_error=0,
+        )
+        return ""
+
+    def _run_gcode(self, gcode: str) -> None:
+        """Apply the temperature commands in a gcode_line request."""
+        for line in gcode.splitlines():
+            words = line.split()
+            if not words:
+                continue
+            target = {"M140": "bed_target_temper", "M190": "bed_target_temper",
+                      "M104": "nozzle_target_temper", "M109": "nozzle_target_temper"}.get(words[0].upper())
+            for word in words[1:]:
+                if target and word[:1].upper() == "S":
+                    try:
+                        self.report[target] = float(word[1:])
+                    except ValueError:
+                        pass
+
+    def _advance(self, seconds: float) -> None:
+        """Move temperatures and the current print forward by simulated seconds."""
+        for key, rate in (("bed_temper", BED_HEAT_RATE), ("nozzle_temper", NOZZLE_HEAT_RATE)):
+            target = self.report[key.replace("_temper", "_target_temper")] or AMBIENT_TEMP
+            actual = self._temps[key]
+            step = min(abs(target - actual), rate * seconds)
+            self._temps[key] = actual + step if target > actual else actual - step
+            # Sensors jitter, so temperatures appear in nearly every report
+            self.report[key] = round(self._temps[key] + self._rng.uniform(-0.3, 0.3), 1)
+
+        if self.state == "PREPARE":
+            if all(abs(self._temps[k] - self.report[k.replace("_temper", "_target_temper")]) < 1
+                   for k in self._temps):
+                self.report["gcode_state"] = "RUNNING"
+                self.report["cooling_fan_speed"] = "15"
+        elif self.state == "RUNNING":
+            self._elapsed = min(PRINT_SECONDS, self._elapsed + seconds)
+            fraction = self._elapsed / PRINT_SECONDS
+            self.report.update(
+                mc_percent=int(fraction * 100),
+                layer_num=int(fraction * PRINT_LAYERS),
+                mc_remaining_time=int((PRINT_SECONDS - self._elapsed) // 60),
+            )
+            if self._elapsed >= PRINT_SECONDS:
+                self.report.update(gcode_state="FINISH", cooling_fan_speed="0",
+                                   bed_target_temper=0.0, nozzle_target_temper=0.0)
+
+    def _wrap(self, fields: dict, msg: int = 1) -> dict:
+        """Wrap fields in a push_status report."""
+        self.sequence += 1
+        return {"print": {**fields, "command": "push_status", "msg": msg, "sequence_id": str(self.sequence)}}
+
+
+class _MQTTSession:
+    """One client connection to a printer's broker stand-in."""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.subscriptions: Set[str] = set()
+
+    def wants(self, topic: str) -> bool:
+        return any(topic_matches(pattern, topic) for pattern in self.subscriptions)
+
+
+def _encode_length(length: int) -> bytes:
+    """MQTT variable length encoding."""
+    out = bytearray()
+    while True:
+        byte, length = length % 128, length // 128
+        out.append(byte | (0x80 if length else 0))
+        if not length:
+            return bytes(out)
+
+
+def _publish_packet(topic: str, payload: bytes) -> bytes:
+    """QoS 0 PUBLISH packet."""
+    name = topic.encode()
+    body = struct.pack("!H", len(name)) + name + payload
+    return bytes([PUBLISH << 4]) + _encode_length(len(body)) + body
+
+
+async def _read_packet(reader: asyncio.StreamReader) -> tuple:
+    """Read one MQTT packet as (type, flags, body)."""
+    header = (await reader.readexactly(1))[0]
+    length, shift = 0, 0
+    while True:
+        byte = (await reader.readexactly(1))[0]
+        length += (byte & 0x7F) << shift
+        if not byte & 0x80:
+            break
+        shift += 7
+        if shift > 21:
+            raise ValueError("malformed remaining length")
+    body = await reader.readexactly(length) if length else b""
+    return header >> 4, header & 0x0F, body
+
+
+def _read_string(body: bytes, offset: int) -> tuple:
+    """Read a length-prefixed MQTT string, returning it and the next offset."""
+    (length,) = struct.unpack_from("!H", body, offset)
+    start = offset + 2
+    return body[start:start + length], start + length
+
+
+def _parse_connect(body: bytes) -> tuple:
+    """Client keepalive, user name and password from a CONNECT body."""
+    _, offset = _read_string(body, 0)  # Protocol name
+    flags = body[offset + 1]
+    (keepalive,) = struct.unpack_from("!H", body, offset + 2)
+    _, offset = _read_string(body, offset + 4)  # Client ID
+    if flags & 0x04:  # Will topic and message
+        _, offset = _read_string(body, offset)
+        _, offset = _read_string(body, offset)
+    user = password = b""
+    if flags & 0x80:
+        user, offset = _read_string(body, offset)
+    if flags & 0x40:
+        password, offset = _read_string(body, offset)
+    return keepalive, user.decode(errors="replace"), password.decode(errors="replace")
+
+
+def _self_signed_context(host: str) -> ssl.SSLContext:
+    """
+    Server TLS context with a throwaway self-signed certificate.
+
+    Real printers present self-signed certificates too, and clients do not
+    check them, so a fresh key is made for every simulator instead of
+    shipping one with the package.
+
+    Raises:
+        RuntimeError: If the openssl command is not available
+    """
+    openssl = shutil.which("openssl")
+    if openssl is None:
+        raise RuntimeError("The printer simulator needs the openssl command to make its certificate")
+
+    workdir = Path(tempfile.mkdtemp(prefix="printer-sim-cert-"))
+    try:
+        key, cert = workdir / "key.pem", workdir / "cert.pem"
+        subprocess.run(
+            [openssl, "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+             "-keyout", str(key), "-out", str(cert), "-days", str(CERT_DAYS),
+             "-subj", f"/CN={host}"],
+            check=True, capture_output=True,
+        )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return context
+
+
+class _FTPSServer(socketserver.ThreadingTCPServer):
+    """Implicit FTPS server for one printer's storage."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple, printer: SimulatedPrinter, context: ssl.SSLContext):
+        self.printer = printer
+        self.context = context
+        super().__init__(address, _FTPSHandler)
+
+
+class _FTPSHandler(socketserver.BaseRequestHandler):
+    """One FTPS control connection."""
+
+    def handle(self) -> None:
+        server: _FTPSServer = self.server
+        self.printer = server.printer
+        try:
+            self.conn = server.context.wrap_socket(self.request, server_side=True)
+        except (ssl.SSLError, OSError):
+            return
+        self.file = self.conn.makefile("rb")
+        self.user = ""
+        self.logged_in = False
+        self.protected = False
+        self.rest = 0
+        self.passive: Optional[socket.socket] = None
+        try:
+            self.reply("220 Bambu printer simulator ready")
+            while True:
+                line = self.file.readline()
+                if not line:
+                    break
+                command, _, arg = line.decode(errors="replace").strip().partition(" ")
+                if not self.dispatch(command.upper(), arg):
+                    break
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.close_passive()
+            self.conn.close()
+
+    def reply(self, line: str) -> None:
+        self.conn.sendall(f"{line}\r\n".encode())
+
+    def dispatch(self, command: str, arg: str) -> bool:
+        """Run one command; returns False to end the session."""
+        if command == "QUIT":
+            self.reply("221 Goodbye")
+            return False
+        if command == "USER":
+            self.user = arg
+            self.reply("331 Password required")
+        elif command == "PASS":
+            self.logged_in = self.user == ACCESS_USER and arg == self.printer.access_code
+            if self.logged_in:
+                with self.printer._lock:
+                    self.printer.ftps_logins += 1
+                self.reply("230 Logged in")
+            else:
+                self.reply("530 Login incorrect")
+        elif not self.logged_in:
+            self.reply("530 Please login with USER and PASS")
+        elif command in ("NOOP", "TYPE", "PBSZ", "MODE", "STRU"):
+            self.reply("200 OK")
+        elif command == "PROT":
+            self.protected = arg.upper() == "P"
+            self.reply("200 Protection level set")
+        elif command == "SYST":
+            self.reply("215 UNIX Type: L8")
+        elif command == "PWD":
+            self.reply('257 "/"')
+        elif command == "CWD":
+            self.reply("250 OK")
+        elif command == "PASV":
+            self.open_passive()
+            host, port = self.passive.getsockname()[:2]
+            self.reply(f"227 Entering Passive Mode ({host.replace('.', ',')},{port >> 8},{port & 0xFF})")
+        elif command == "EPSV":
+            self.open_passive()
+            self.reply(f"229 Entering Extended Passive Mode (|||{self.passive.getsockname()[1]}|)")
+        elif command == "REST":
+            self.rest = int(arg)
+            self.reply(f"350 Restarting at {self.rest}")
+        else:
+            handler = getattr(self, f"do_{command.lower()}", None)
+            if handler is None:
+                self.reply(f"502 {command} not implemented")
+            else:
+                try:
+                    handler(self.printer.path(arg or "/"))
+                except ValueError as e:
+                    self.reply(f"550 {e}")
+        return True
+
+    # ==================== Files ====================
+
+    def do_size(self, path: Path) -> None:
+        if path.is_file():
+            self.reply(f"213 {path.stat().st_size}")
+        else:
+            self.reply("550 No such file")
+
+    def do_dele(self, path: Path) -> None:
+        if path.is_file():
+            path.unlink()
+            self.reply("250 Deleted")
+        else:
+            self.reply("550 No such file")
+
+    def do_mkd(self, path: Path) -> None:
+        if path.exists():
+            self.reply("550 Already exists")
+        else:
+            path.mkdir(parents=True)
+            self.reply(f'257 "{path.name}" created')
+
+    def do_list(self, path: Path) -> None:
+        if not path.is_dir():
+            self.reply("550 No such directory")
+            return
+        lines = []
+        for entry in sorted(path.iterdir()):
+            kind = "drwxr-xr-x" if entry.is_dir() else "-rw-r--r--"
+            size = entry.stat().st_size if entry.is_file() else 0
+            lines.append(f"{kind} 1 root root {size} Jan 01 00:00 {entry.name}\r\n")
+        self.send_data("".join(lines).encode())
+
+    def do_retr(self, path: Path) -> None:
+        if not path.is_file():
+            self.reply("550 No such file")
+            return
+        with open(path, "rb") as f:
+            f.seek(self.rest)
+            self.rest = 0
+            self.send_data(f)
+
+    def do_stor(self, path: Path) -> None:
+        offset, self.rest = self.rest, 0
+        if not path.parent.is_dir():
+            self.reply("553 No such directory")
+            return
+        data = self.accept_data()
+        if data is None:
+            return
+
+        printer = self.printer
+        received = 0
+        with open(path, "r+b" if offset and path.exists() else "wb") as f:
+            f.truncate(offset)
+            f.seek(offset)
+            while True:
+                chunk = data.recv(TRANSFER_CHUNK)
+                if not chunk:
+                    break
+                drop = printer.drop_upload_after
+                if drop is not None and received + len(chunk) > drop:
+                    # Simulate the Wi-Fi link dropping mid-transfer
+                    f.write(chunk[:max(drop - received, 0)])
+                    printer.drop_upload_after = None
+                    data.close()
+                    raise ConnectionResetError("simulated link drop")
+                f.write(chunk)
+                received += len(chunk)
+        with printer._lock:
+            printer.bytes_uploaded += received
+            printer.uploads_completed += 1
+        self.finish_data(data)
+        self.reply("226 Transfer complete")
+
+    # ==================== Data connections ====================
+
+    def open_passive(self) -> None:
+        self.close_passive()
+        self.passive = socket.create_server((self.conn.getsockname()[0], 0))
+        self.passive.settimeout(DATA_TIMEOUT)
+
+    def close_passive(self) -> None:
+        if self.passive is not None:
+            self.passive.close()
+            self.passive = None
+
+    def accept_data(self) -> Optional[socket.socket]:
+        """Accept the client's data connection after a 150 reply."""
+        if self.passive is None:
+            self.reply("425 Use PASV first")
+            return None
+        self.reply("150 Opening data connection")
+        try:
+            data, _ = self.passive.accept()
+            data.settimeout(DATA_TIMEOUT)
+            if self.protected:
+                data = self.server.context.wrap_socket(data, server_side=True)
+        except (OSError, ssl.SSLError):
+            self.reply("425 Cannot open data connection")
+            return None
+        finally:
+            self.close_passive()
+        return data
+
+    def send_data(self, source) -> None:
+        """Send bytes or a file over a data connection."""
+        data = self.accept_data()
+        if data is None:
+            return
+        if isinstance(source, bytes):
+            data.sendall(source)
+        else:
+            for chunk in iter(lambda: source.read(TRANSFER_CHUNK), b""):
+                data.sendall(chunk)
+        self.finish_data(data)
+        self.reply("226 Transfer complete")
+
+    def finish_data(self, data: socket.socket) -> None:
+        """Close a data connection, with a TLS close_notify exchange if protected."""
+        try:
+            if isinstance(data, ssl.SSLSocket):
+                data = data.unwrap()
+        except (OSError, ssl.SSLError):
+            pass
+        data.close()
+
+
+class PrinterSimulator:
+    """
+    Simulates a room of printers on localhost.
+
+    MQTT brokers and report timers share one event loop in a background
+    thread; every FTPS server handles its connections in threads.
+    """
+
+    def __init__(
+        self,
+        count: int = 1,
+        report_rate: float = REPORT_RATE,
+        print_speedup: float = PRINT_SPEEDUP,
+        host: str = "127.0.0.1",
+        storage_dir: Optional[Path] = None,
+        seed: int = 0,
+    ):
+        """
+        Initialize the simulated printers; call start() to open their ports.
+
+        Args:
+            count: Number of printers
+            report_rate: push_status reports per second per printer
+            print_speedup: Simulated seconds per real second
+            host: Address the printers listen on
+            storage_dir: Directory for uploaded files (default: a temporary directory)
+            seed: Seed for access codes and sensor noise
+        """
+        self.report_rate = report_rate
+        self.host = host
+        self._own_storage = storage_dir is None
+        self.storage_dir = Path(storage_dir or tempfile.mkdtemp(prefix="printer-sim-"))
+
+        rng = random.Random(seed)
+        self.printers = [
+            SimulatedPrinter(
+                serial=f"01S00C{i:09d}",
+                access_code=f"{rng.randrange(10 ** 8):08d}",
+                storage=self.storage_dir / f"printer{i:03d}",
+                print_speedup=print_speedup,
+                seed=seed + i,
+            )
+            for i in range(count)
+        ]
+
+        self._context: Optional[ssl.SSLContext] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._mqtt_servers: List[asyncio.AbstractServer] = []
+        self._tasks: List[asyncio.Task] = []
+        self._ftps_servers: List[_FTPSServer] = []
+
+    @property
+    def running(self) -> bool:
+        """Whether the printers are listening."""
+        return self._loop is not None
+
+    def start(self) -> None:
+        """Open every printer's MQTT and FTPS ports."""
+        if self.running:
+            return
+
+        if self._context is None:
+            self._context = _self_signed_context(self.host)
+        for printer in self.printers:
+            server = _FTPSServer((self.host, printer.ftps_port), printer, self._context)
+            printer.ftps_port = server.server_address[1]
+            threading.Thread(target=server.serve_forever, name=f"ftps-{printer.serial}", daemon=True).start()
+            self._ftps_servers.append(server)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="printer-simulator", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start_mqtt(), self._loop).result()
+        logger.info(f"Simulating {len(self.printers)} printers on {self.host}")
+
+    async def _start_mqtt(self) -> None:
+        loop = asyncio.get_running_loop()
+        for printer in self.printers:
+            server = await asyncio.start_server(
+                lambda r, w, p=printer: self._mqtt_session(p, r, w),
+                self.host, printer.mqtt_port, ssl=self._context,
+            )
+            printer.mqtt_port = server.sockets[0].getsockname()[1]
+            self._mqtt_servers.append(server)
+            self._tasks.append(loop.create_task(self._report(printer)))
+
+    def stop(self) -> None:
+        """Close every port and, if the simulator created it, the storage directory."""
+        if not self.running:
+            return
+        loop, self._loop = self._loop, None
+        asyncio.run_coroutine_threadsafe(self._stop_mqtt(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
+
+        # Each shutdown waits out a poll interval, so stop the servers together
+        stoppers = [threading.Thread(target=server.shutdown) for server in self._ftps_servers]
+        for thread in stoppers:
+            thread.start()
+        for thread, server in zip(stoppers, self._ftps_servers):
+            thread.join()
+            server.server_close()
+        self._ftps_servers.clear()
+        if self._own_storage:
+            shutil.rmtree(self.storage_dir, ignore_errors=True)
+
+    async def _stop_mqtt(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for server in self._mqtt_servers:
+            server.close()
+        for printer in self.printers:
+            for session in list(printer._sessions):
+                session.writer.transport.abort()
+        self._tasks.clear()
+        self._mqtt_servers.clear()
+
+    def __enter__(self) -> "PrinterSimulator":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def client(self, printer: SimulatedPrinter, **kwargs):
+        """
+        Real printer client pointed at a simulated printer.
+
+        Args:
+            printer: Simulated printer
+            **kwargs: Further BambuRealPrinter arguments
+
+        Returns:
+            Unconnected BambuRealPrinter
+        """
+        from src.printer.bambu_real import BambuRealPrinter
+
+        client = BambuRealPrinter(self.host, printer.access_code, printer.serial, **kwargs)
+        client.MQTT_PORT = printer.mqtt_port
+        client.FTP_PORT = printer.ftps_port
+        return client
+
+    def drop_connections(self, printer: SimulatedPrinter) -> None:
+        """Cut every MQTT client of a printer, as a Wi-Fi dropout would."""
+        def drop():
+            for session in list(printer._sessions):
+                session.writer.transport.abort()
+        self._loop.call_soon_threadsafe(drop)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters summed over all printers."""
+        keys = ("reports_sent", "reports_dropped", "commands_received", "mqtt_connections",
+                "ftps_logins", "bytes_uploaded", "uploads_completed")
+        return {key: sum(getattr(p, key) for p in self.printers) for key in keys}
+
+    # ==================== MQTT ====================
+
+    async def _report(self, printer: SimulatedPrinter) -> None:
+        """Publish push_status deltas at the report rate."""
+        interval = 1.0 / self.report_rate
+        # Spread printers over the interval, as real ones are not in step
+        await asyncio.sleep(random.Random(printer.serial).uniform(0, interval))
+        last = time.monotonic()
+        while True:
+            now = time.monotonic()
+            report = printer.tick(now - last)
+            last = now
+            if report is not None:
+                self._publish(printer, report)
+            await asyncio.sleep(interval)
+
+    def _publish(self, printer: SimulatedPrinter, report: dict) -> None:
+        """Send a report to every subscribed client of a printer."""
+        topic = f"device/{printer.serial}/report"
+        packet = None
+        for session in printer._sessions:
+            if not session.wants(topic):
+                continue
+            if session.writer.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+                printer.reports_dropped += 1
+                continue
+            packet = packet or _publish_packet(topic, json.dumps(report).encode())
+            session.writer.write(packet)
+            printer.reports_sent += 1
+
+    async def _mqtt_session(self, printer: SimulatedPrinter, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """Serve one MQTT client connection."""
+        session = _MQTTSession(writer)
+        try:
+            kind, _, body = await asyncio.wait_for(_read_packet(reader), DATA_TIMEOUT)
+            if kind != CONNECT:
+                return
+            keepalive, user, password = _parse_connect(body)
+            accepted = user == ACCESS_USER and password == printer.access_code
+            writer.write(bytes([CONNACK << 4, 2, 0, 0 if accepted else 5]))
+            if not accepted:
+                await writer.drain()
+                return
+
+            printer.mqtt_connections += 1
+            printer._sessions.add(session)
+            # Brokers drop clients silent for 1.5 keepalive periods
+            timeout = keepalive * 1.5 if keepalive else None
+            while True:
+                kind, flags, body = await asyncio.wait_for(_read_packet(reader), timeout)
+                if kind == PUBLISH:
+                    self._on_publish(printer, session, flags, body)
+                elif kind == SUBSCRIBE:
+                    packet_id, offset, granted = body[:2], 2, bytearray()
+                    while offset < len(body):
+                        pattern, offset = _read_string(body, offset)
+                        offset += 1  # Requested QoS; only QoS 0 is delivered
+                        session.subscriptions.add(pattern.decode())
+                        granted.append(0)
+                    writer.write(bytes([SUBACK << 4]) + _encode_length(2 + len(granted)) + packet_id + granted)
+                elif kind == UNSUBSCRIBE:
+                    offset = 2
+                    while offset < len(body):
+                        pattern, offset = _read_string(body, offset)
+                        session.subscriptions.discard(pattern.decode())
+                    writer.write(bytes([UNSUBACK << 4, 2]) + body[:2])
+                elif kind == PINGREQ:
+                    writer.write(bytes([PINGRESP << 4, 0]))
+                elif kind == DISCONNECT:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError,
+                ssl.SSLError, ValueError, struct.error):
+            pass
+        finally:
+            printer._sessions.discard(session)
+            writer.transport.abort()
+
+    def _on_publish(self, printer: SimulatedPrinter, session: _MQTTSession, flags: int, body: bytes) -> None:
+        """Handle a client's PUBLISH, which carries a printer request."""
+        topic, offset = _read_string(body, 0)
+        qos = (flags >> 1) & 0x03
+        if qos:
+            session.writer.write(bytes([PUBACK << 4, 2]) + body[offset:offset + 2])
+            offset += 2
+        if topic.decode() != f"device/{printer.serial}/request":
+            return
+        try:
+            command = json.loads(body[offset:])
+        except ValueError:
+            return
+        if isinstance(command, dict):
+            for report in printer.handle_command(command):
+                self._publish(printer, report)
+
+
+def benchmark_simulator(
+    counts: Sequence[int] = (1, 12, 48),
+    report_rate: float = 10.0,
+    duration: float = 2.0,
+    upload_size: int = 8 << 20,
+) -> List[Dict[str, Any]]:
+    """
+    Measure the real client code against simulated printers.
+
+    For each fleet size, one client per printer connects and receives
+    reports for ``duration`` seconds. One file is uploaded and one
+    printer's connection is dropped to time the reconnect.
+
+    Args:
+        counts: Fleet sizes to measure
+        report_rate: push_status reports per second per printer
+        duration: Seconds to receive reports for
+        upload_size: Bytes of the uploaded file
+
+    Returns:
+        One row per fleet size with connect time, report throughput,
+        upload speed and reconnect time
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        upload = Path(tmp) / "benchmark.3mf"
+        upload.write_bytes(random.Random(0).randbytes(upload_size))
+
+        for count in counts:
+            with PrinterSimulator(count, report_rate=report_rate) as sim:
+                clients = [sim.client(printer) for printer in sim.printers]
+                start = time.perf_counter()
+                connected = sum(client.connect(timeout=10) for client in clients)
+                connect_seconds = time.perf_counter() - start
+
+                received = sum(client._pipeline.messages_received for client in clients)
+                time.sleep(duration)
+                received = sum(client._pipeline.messages_received for client in clients) - received
+
+                start = time.perf_counter()
+                uploaded = clients[0].upload_file(str(upload))
+                upload_seconds = time.perf_counter() - start
+
+                before = clients[0]._pipeline.messages_received
+                start = time.perf_counter()
+                sim.drop_connections(sim.printers[0])
+                while clients[0]._pipeline.messages_received == before or not clients[0].is_connected:
+                    if time.perf_counter() - start > 30:
+                        break
+                    time.sleep(0.01)
+                reconnect_seconds = time.perf_counter() - start
+
+                for client in clients:
+                    client._ftps.close()
+                    client.disconnect()
+
+            rows.append({
+                "printers": count,
+                "connected": connected,
+                "connect_s": connect_seconds,
+                "reports_per_s": received / duration,
+                "expected_per_s": count * report_rate,
+                "upload_mb_s": upload_size / 1e6 / upload_seconds if uploaded.success else 0.0,
+                "reconnect_s": reconnect_seconds,
+            })
+    return rows
+
+
+def format_simulator_benchmark(rows: List[Dict[str, Any]]) -> str:
+    """Render benchmark_simulator rows as a table."""
+    lines = [f"{'printers':>8} {'connect s':>10} {'reports/s':>10} {'expected':>9} {'upload MB/s':>12} {'reconnect s':>12}"]
+    for row in rows:
+        lines.append(
+            f"{row['printers']:>8} {row['connect_s']:>10.2f} {row['reports_per_s']:>10.1f} "
+            f"{row['expected_per_s']:>9.1f} {row['upload_mb_s']:>12.1f} {row['reconnect_s']:>12.2f}"
+        )
+    return "\n".join(lines)
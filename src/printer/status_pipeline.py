@@ -0,0 +1,331 @@
+"""
+Asyncio pipeline for printer status reports.
+
+The MQTT network thread only hands raw payloads to an event loop through
+a bounded queue, so parsing and callbacks can never stall keepalives.
+On the loop, each report is decoded and merged into the cached status,
+which yields the set of fields that actually changed. Bursts are
+coalesced so subscribers hear at most ``max_rate`` updates per second.
+Each subscriber gets only the changed fields it asked for. Every
+subscriber has its own mailbox, so a slow one falls behind on its own
+and sees merged changes, without delaying the others. Callbacks get a
+copy of the status taken at delivery, since the loop keeps merging new
+reports into the cached one while they run.
+"""
+
+import asyncio
+import copy
+import inspect
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from src.utils import get_logger
+
+logger = get_logger("printer.status")
+
+QUEUE_SIZE = 256  # Raw payloads waiting to be parsed
+MAX_UPDATE_RATE = 10.0  # Updates per second sent to subscribers
+STOP_TIMEOUT = 5.0  # Seconds to wait for the loop thread to finish
+
+# Applies a decoded report to the cached status, returning the names of changed fields
+ApplyReport = Callable[[dict], Set[str]]
+StatusCallback = Callable[[Any, Dict[str, Any]], Any]
+
+
+class Subscription:
+    """One subscriber's filter and mailbox of pending changes."""
+
+    def __init__(self, pipeline: "StatusPipeline", callback: StatusCallback, fields: Optional[Iterable[str]]):
+        self.pipeline = pipeline
+        self.callback = callback
+        self.fields = set(fields) if fields is not None else None
+        self.deliveries = 0
+
+        self._pending: Dict[str, Any] = {}
+        self._status: Any = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def unsubscribe(self) -> None:
+        """Stop receiving updates."""
+        self.pipeline._unsubscribe(self)
+
+    def _offer(self, status: Any, changed: Dict[str, Any]) -> None:
+        """Queue the changes this subscriber wants (runs on the loop)."""
+        if self.fields is not None:
+            changed = {name: value for name, value in changed.items() if name in self.fields}
+        if not changed:
+            return
+        self._pending.update(changed)
+        self._status = status
+        self._wake.set()
+
+    def _start(self) -> None:
+        """Start delivering on the running loop."""
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._deliver())
+
+    async def _deliver(self) -> None:
+        """Hand pending changes to the callback, merging whatever arrives meanwhile."""
+        is_async = inspect.iscoroutinefunction(self.callback)
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            changes, self._pending = self._pending, {}
+            try:
+                # The loop keeps updating the cached status while the callback runs
+                status = copy.deepcopy(self._status)
+                changes = {name: getattr(status, name, value) for name, value in changes.items()}
+                if is_async:
+                    await self.callback(status, changes)
+                else:
+                    # Sync callbacks run in a worker thread so they cannot block the loop
+                    await asyncio.to_thread(self.callback, status, changes)
+                self.deliveries += 1
+            except Exception as e:
+                logger.warning(f"Status callback error: {e}")
+
+
+class StatusPipeline:
+    """
+    Parses, coalesces and fans out status reports on an event loop.
+
+    The pipeline runs on a loop of its own in a background thread, or on
+    a loop the caller passes to ``start``.
+    """
+
+    def __init__(
+        self,
+        apply: ApplyReport,
+        snapshot: Callable[[], Any],
+        max_rate: float = MAX_UPDATE_RATE,
+        queue_size: int = QUEUE_SIZE,
+        on_overflow: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Initialize the pipeline; call start() before submitting reports.
+
+        Args:
+            apply: Merges a decoded report into the cached status and returns changed field names
+            snapshot: Returns the cached status object; subscribers get copies of it
+            max_rate: Updates per second sent to subscribers
+            queue_size: Raw payloads buffered before the oldest are dropped
+            on_overflow: Called after payloads were dropped, e.g. to request a full report
+        """
+        self.apply = apply
+        self.snapshot = snapshot
+        self.max_rate = max_rate
+        self.queue_size = queue_size
+        self.on_overflow = on_overflow
+
+        self.messages_received = 0
+        self.messages_dropped = 0
+        self.parse_errors = 0
+        self.updates_published = 0
+
+        self._subscriptions: List[Subscription] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
+        self._pending: Set[str] = set()
+        self._overflowed = False
+        self._publish_handle: Optional[asyncio.TimerHandle] = None
+        self._last_publish = float("-inf")
+
+    @property
+    def running(self) -> bool:
+        """Whether the pipeline accepts reports."""
+        return self._loop is not None
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        Start consuming reports.
+
+        Args:
+            loop: Running loop to use (default: a new loop in a background thread)
+        """
+        if self.running:
+            return
+
+        if loop is not None:
+            self._loop = loop
+            if _running_loop() is loop:
+                self._setup()
+            else:
+                asyncio.run_coroutine_threadsafe(self._setup_async(), loop).result()
+            return
+
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(lambda: (self._setup(), ready.set()))
+            loop.run_forever()
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
+        self._loop = loop
+        self._thread = threading.Thread(target=run, name="printer-status", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    async def _setup_async(self) -> None:
+        self._setup()
+
+    def _setup(self) -> None:
+        """Create the queue and tasks on the loop."""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._consumer = asyncio.get_running_loop().create_task(self._consume())
+        for subscription in self._subscriptions:
+            subscription._start()
+
+    def stop(self) -> None:
+        """Stop consuming; pending reports are discarded."""
+        loop, thread = self._loop, self._thread
+        if loop is None:
+            return
+        self._loop = None
+        self._thread = None
+
+        if thread is None:
+            self._teardown()
+            return
+        loop.call_soon_threadsafe(lambda: (self._teardown(), loop.stop()))
+        thread.join(STOP_TIMEOUT)
+
+    def _teardown(self) -> None:
+        """Cancel the loop's tasks."""
+        if self._publish_handle is not None:
+            self._publish_handle.cancel()
+            self._publish_handle = None
+        if self._consumer is not None:
+            self._consumer.cancel()
+            self._consumer = None
+        for subscription in self._subscriptions:
+            if subscription._task is not None:
+                subscription._task.cancel()
+                subscription._task = None
+
+    def submit(self, payload: bytes) -> None:
+        """
+        Hand a raw report to the loop. Safe to call from any thread and never blocks.
+
+        Args:
+            payload: Raw MQTT payload
+        """
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._enqueue, payload)
+        except RuntimeError:
+            pass  # Loop closed while stopping
+
+    def subscribe(self, callback: StatusCallback, fields: Optional[Iterable[str]] = None) -> Subscription:
+        """
+        Receive status updates.
+
+        Args:
+            callback: Called as callback(status, changed) where changed maps field names
+                to new values; may be a coroutine function
+            fields: Field names of interest (default: all)
+
+        Returns:
+            Subscription handle
+        """
+        subscription = Subscription(self, callback, fields)
+        self._subscriptions.append(subscription)
+        loop = self._loop
+        if loop is not None:
+            if _running_loop() is loop:
+                subscription._start()
+            else:
+                loop.call_soon_threadsafe(subscription._start)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+        task = subscription._task
+        loop = self._loop
+        if task is not None:
+            subscription._task = None
+            if loop is not None and _running_loop() is not loop:
+                loop.call_soon_threadsafe(task.cancel)
+            else:
+                task.cancel()
+
+    # ==================== Loop side ====================
+
+    def _enqueue(self, payload: bytes) -> None:
+        """Queue a payload, dropping the oldest when full."""
+        if self._queue is None:
+            return
+        self.messages_received += 1
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.messages_dropped += 1
+            if not self._overflowed and self.on_overflow is not None:
+                # Dropped deltas are lost, so ask once for a full report to resync
+                try:
+                    self.on_overflow()
+                except Exception as e:
+                    logger.warning(f"Overflow handler error: {e}")
+            self._overflowed = True
+        self._queue.put_nowait(payload)
+
+    async def _consume(self) -> None:
+        """Decode and merge reports as they arrive."""
+        while True:
+            payload = await self._queue.get()
+            if self._queue.empty():
+                self._overflowed = False
+            try:
+                report = json.loads(payload)
+                if not isinstance(report, dict):
+                    raise ValueError("report is not an object")
+                changed = self.apply(report)
+            except Exception as e:
+                self.parse_errors += 1
+                logger.debug(f"Status report parse error: {e}")
+                continue
+
+            if changed:
+                self._pending |= changed
+                self._schedule_publish()
+
+    def _schedule_publish(self) -> None:
+        """Publish now, or once the rate limit allows."""
+        if self._publish_handle is not None:
+            return
+        interval = 1.0 / self.max_rate if self.max_rate > 0 else 0.0
+        delay = self._last_publish + interval - time.monotonic()
+        if delay <= 0:
+            self._publish()
+        else:
+            self._publish_handle = asyncio.get_running_loop().call_later(delay, self._publish)
+
+    def _publish(self) -> None:
+        """Send the fields changed since the last update to subscribers."""
+        self._publish_handle = None
+        self._last_publish = time.monotonic()
+        names, self._pending = self._pending, set()
+
+        status = self.snapshot()
+        changed = {name: getattr(status, name) for name in names}
+        self.updates_published += 1
+        for subscription in list(self._subscriptions):
+            if subscription._task is not None:
+                subscription._offer(status, changed)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """The loop running in this thread, if any."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
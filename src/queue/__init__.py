@@ -10,6 +10,11 @@ from src.queue.scheduler import (
     QueueScheduler,
     SchedulingStrategy,
 )
+from src.queue.fleet import (
+    FleetConfig,
+    FleetManager,
+    FleetPrinter,
+)
 
 __all__ = [
     "PrintJob",
@@ -18,4 +23,7 @@ __all__ = [
     "PrintQueue",
     "QueueScheduler",
     "SchedulingStrategy",
+    "FleetConfig",
+    "FleetManager",
+    "FleetPrinter",
 ]
@@ -0,0 +1,558 @@
+"""Fleet manager for many printers sharing one print queue.
+
+One process holds a connection to every printer in the room and
+dispatches jobs from a single queue. Each printer's state, loaded AMS
+materials and nozzle are tracked from its status callbacks; whenever a
+printer frees up, the next ready jobs are matched to the best idle
+machine:
+
+- it must carry the job's nozzle and have the job's material loaded
+  (printers with no AMS information are assumed to take any spool)
+- a slot already holding the right colour beats a material-only match
+- among equals, the least utilised printer wins, spreading wear
+
+A printer that refuses a job is backed off for a while so the job is
+retried elsewhere rather than bounced straight back to it. A job the
+printer accepts but reports as an error, or never shows as running
+within the start timeout, fails and backs the printer off the same way.
+
+Dispatch latency (from when a job and a printer were both available to
+the print starting) and per-printer utilisation are kept as metrics.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from src.queue.job_queue import JobStatus, PrintJob, PrintQueue
+from src.utils import get_logger
+
+logger = get_logger("queue.fleet")
+
+ACTIVE_STATES = ("preparing", "printing", "paused")  # Printer states while a job runs
+LATENCY_HISTORY = 1000  # Dispatch latencies kept for metrics
+NOZZLE_TOLERANCE = 1e-6  # mm
+
+# Starts a job on a printer: (printer, job) -> result with .success and .message
+JobLauncher = Callable[[Any, PrintJob], Any]
+
+
+@dataclass
+class FleetConfig:
+    """Configuration for the fleet manager."""
+    auto_dispatch: bool = True  # Dispatch whenever a printer frees up
+    require_plate_clear: bool = True  # Finished printers wait for plate_cleared()
+    max_parallel: int = 16  # Printers connected or started at once
+    launch_backoff: float = 60.0  # Seconds a printer is skipped after a failed launch
+    start_timeout: float = 300.0  # Seconds a launched job has to show as running
+
+
+@dataclass
+class FleetPrinter:
+    """A printer in the fleet and what is known about it."""
+    name: str
+    printer: Any
+    nozzle_diameter: float = 0.4
+    materials: Dict[int, Tuple[str, str]] = field(default_factory=dict)  # AMS slot -> (material, color)
+
+    connected: bool = False
+    state: str = "offline"
+    plate_clear: bool = True
+    job: Optional[PrintJob] = None
+    job_seen_active: bool = False  # Printer has reported the job running
+    launched_at: Optional[float] = None  # When the launcher returned for the current job
+    last_error: str = ""
+    backoff_until: Optional[float] = None  # Skipped by dispatch until then after a failed launch
+
+    # Accounting (monotonic seconds)
+    online_since: Optional[float] = None
+    idle_since: Optional[float] = None
+    busy_since: Optional[float] = None
+    busy_seconds: float = 0.0
+    jobs_completed: int = 0
+    jobs_failed: int = 0
+
+    @property
+    def available(self) -> bool:
+        """Whether the printer can take a job now."""
+        return (
+            self.connected
+            and self.job is None
+            and self.plate_clear
+            and self.state in ("idle", "finished")
+        )
+
+    def backing_off(self, now: float) -> bool:
+        """Whether the printer is being skipped after a failed launch."""
+        return self.backoff_until is not None and now < self.backoff_until
+
+    def utilisation(self, now: Optional[float] = None) -> float:
+        """Fraction of online time spent printing."""
+        if self.online_since is None:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        busy = self.busy_seconds
+        if self.busy_since is not None:
+            busy += now - self.busy_since
+        online = now - self.online_since
+        return min(1.0, busy / online) if online > 0 else 0.0
+
+    def can_print(self, job: PrintJob) -> bool:
+        """Whether the printer has the job's nozzle and material."""
+        if job.nozzle_diameter is not None and abs(job.nozzle_diameter - self.nozzle_diameter) > NOZZLE_TOLERANCE:
+            return False
+        return not self.materials or self.find_slot(job) is not None
+
+    def find_slot(self, job: PrintJob) -> Optional[int]:
+        """AMS slot for a job, preferring one loaded with its colour."""
+        material = job.material.lower()
+        matches = [slot for slot, (m, _) in sorted(self.materials.items()) if m.lower() == material]
+        for slot in matches:
+            if self.materials[slot][1].lower() == job.color.lower():
+                return slot
+        return matches[0] if matches else None
+
+    def to_dict(self, now: Optional[float] = None) -> dict:
+        """Convert to dictionary."""
+        return {
+            "name": self.name,
+            "connected": self.connected,
+            "state": self.state,
+            "available": self.available,
+            "nozzle_diameter": self.nozzle_diameter,
+            "materials": {slot: list(loaded) for slot, loaded in self.materials.items()},
+            "job": self.job.id if self.job else None,
+            "utilisation": self.utilisation(now),
+            "jobs_completed": self.jobs_completed,
+            "jobs_failed": self.jobs_failed,
+            "last_error": self.last_error,
+            "backing_off": self.backing_off(time.monotonic() if now is None else now),
+        }
+
+
+def launch_job(printer: Any, job: PrintJob) -> Any:
+    """
+    Upload a job's file to a printer and start it.
+
+    Args:
+        printer: BambuRealPrinter or MockPrinter
+        job: Job to start
+
+    Returns:
+        Result of the failed upload, or of starting the print
+    """
+    from src.printer.mock import MockPrinter
+
+    path = Path(job.file_path)
+    if isinstance(printer, MockPrinter):
+        size = path.stat().st_size if path.exists() else 1024
+        upload = printer.upload_file(path.name, size)
+    else:
+        upload = printer.upload_file(str(path))
+    if not upload.success:
+        return upload
+
+    if isinstance(printer, MockPrinter) or job.ams_slot is None:
+        return printer.start_print(path.name)
+    return printer.start_print(path.name, ams_mapping=[job.ams_slot])
+
+
+class FleetManager:
+    """
+    Dispatches jobs from one queue across many printers.
+
+    Printers are driven by their status callbacks, so one process can
+    watch the whole room; dispatch itself only holds the fleet lock
+    while choosing, and starts the chosen prints in parallel.
+    """
+
+    def __init__(
+        self,
+        queue: PrintQueue,
+        config: Optional[FleetConfig] = None,
+        launcher: JobLauncher = launch_job,
+        on_job_start: Optional[Callable[[PrintJob, str], None]] = None,
+        on_job_complete: Optional[Callable[[PrintJob, str], None]] = None,
+        on_job_failed: Optional[Callable[[PrintJob, str], None]] = None,
+    ):
+        """
+        Initialize the fleet.
+
+        Args:
+            queue: The print queue shared by all printers
+            config: Fleet configuration
+            launcher: Starts a job on a printer
+            on_job_start: Callback with the job and printer name when a print starts
+            on_job_complete: Callback with the job and printer name when a print completes
+            on_job_failed: Callback with the job and error message when a job fails
+        """
+        self.queue = queue
+        self.config = config or FleetConfig()
+        self.launcher = launcher
+        self.on_job_start = on_job_start
+        self.on_job_complete = on_job_complete
+        self.on_job_failed = on_job_failed
+
+        self.printers: Dict[str, FleetPrinter] = {}
+        self.dispatches = 0
+        self._latencies: List[float] = []
+        self._waiting_since: Dict[str, float] = {}  # Job ID -> when first seen ready
+        self._auto_slots: Set[str] = set()  # Jobs whose AMS slot was picked at dispatch
+        self._callbacks: List[Tuple[Callable[[PrintJob, str], None], PrintJob, str]] = []
+        self._lock = threading.RLock()
+
+    # ==================== Printers ====================
+
+    def add_printer(
+        self,
+        name: str,
+        printer: Any,
+        nozzle_diameter: float = 0.4,
+        materials: Optional[Dict[int, Tuple[str, str]]] = None,
+    ) -> FleetPrinter:
+        """
+        Add a printer to the fleet; call connect_all() to bring it online.
+
+        Args:
+            name: Unique printer name
+            printer: BambuRealPrinter, MockPrinter or compatible connection
+            nozzle_diameter: Installed nozzle in mm
+            materials: Loaded AMS slots as {slot: (material, color)}; replaced by
+                the printer's own AMS report when it sends one
+
+        Returns:
+            The fleet's record of the printer
+        """
+        if name in self.printers:
+            raise ValueError(f"Printer already in fleet: {name}")
+        entry = FleetPrinter(name, printer, nozzle_diameter, dict(materials or {}))
+        with self._lock:
+            self.printers[name] = entry
+        return entry
+
+    def remove_printer(self, name: str) -> bool:
+        """Remove an idle printer from the fleet."""
+        with self._lock:
+            entry = self.printers.get(name)
+            if entry is None or entry.job is not None:
+                return False
+            del self.printers[name]
+        if entry.connected:
+            entry.printer.disconnect()
+        return True
+
+    def connect_all(self) -> int:
+        """
+        Connect every offline printer, several at a time.
+
+        Returns:
+            Number of printers online
+        """
+        pending = [entry for entry in self.printers.values() if not entry.connected]
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.config.max_parallel, len(pending))) as executor:
+                results = list(executor.map(self._connect, pending))
+            logger.info(f"Connected {sum(results)}/{len(pending)} printers")
+
+        if self.config.auto_dispatch:
+            self.dispatch()
+        return sum(1 for entry in self.printers.values() if entry.connected)
+
+    def _connect(self, entry: FleetPrinter) -> bool:
+        """Connect one printer and start following its status."""
+        try:
+            connected = entry.printer.connect()
+        except Exception as e:
+            connected = False
+            entry.last_error = str(e)
+        if not connected:
+            logger.warning(f"Could not connect to {entry.name}")
+            return False
+
+        now = time.monotonic()
+        with self._lock:
+            entry.connected = True
+            entry.online_since = now
+            self._update(entry, entry.printer.status, now)
+        self._run_callbacks()
+        entry.printer.add_status_callback(lambda status, name=entry.name: self._on_status(name, status))
+        return True
+
+    def disconnect_all(self) -> None:
+        """Disconnect every printer."""
+        entries = [entry for entry in self.printers.values() if entry.connected]
+        for entry in entries:
+            entry.connected = False
+        if entries:
+            with ThreadPoolExecutor(max_workers=min(self.config.max_parallel, len(entries))) as executor:
+                list(executor.map(lambda entry: entry.printer.disconnect(), entries))
+
+    def plate_cleared(self, name: str) -> None:
+        """Mark a finished printer's plate as cleared so it can take the next job."""
+        with self._lock:
+            entry = self.printers[name]
+            entry.plate_clear = True
+            self._mark_idle(entry, time.monotonic())
+        if self.config.auto_dispatch:
+            self.dispatch()
+
+    # ==================== Status ====================
+
+    def _on_status(self, name: str, status: Any) -> None:
+        """Status callback from one printer."""
+        with self._lock:
+            entry = self.printers.get(name)
+            if entry is None or not entry.connected:
+                return
+            freed = self._update(entry, status, time.monotonic())
+        self._run_callbacks()
+        if freed and self.config.auto_dispatch:
+            self.dispatch()
+
+    def _update(self, entry: FleetPrinter, status: Any, now: float) -> bool:
+        """
+        Apply a printer status report; called with the lock held.
+
+        Returns:
+            True if the printer became available
+        """
+        was_available = entry.available
+        entry.state = getattr(status.state, "value", str(status.state))
+
+        ams = getattr(status, "ams", None)
+        if ams is not None and ams.units:
+            entry.materials = {
+                slot.global_slot_id: (slot.material, slot.color)
+                for slot in ams.get_all_slots() if slot.is_loaded
+            }
+
+        job = entry.job
+        if job is not None:
+            if entry.state in ACTIVE_STATES:
+                entry.job_seen_active = True
+                job.update_progress(status.progress, status.layer_current, status.layer_total)
+            elif entry.job_seen_active and entry.state in ("finished", "error", "idle"):
+                self._finish_job(entry, entry.state == "finished", now)
+            elif entry.launched_at is not None:
+                # Launched but never reported running
+                if entry.state == "error":
+                    self._finish_job(entry, False, now)
+                elif now - entry.launched_at > self.config.start_timeout:
+                    self._finish_job(
+                        entry, False, now,
+                        f"Printer {entry.name} did not start the job within {self.config.start_timeout:g}s",
+                    )
+
+        if entry.available and not was_available:
+            self._mark_idle(entry, now)
+            return True
+        if entry.backoff_until is not None and not entry.backing_off(now):
+            # Back-off over: offer the printer to dispatch again
+            entry.backoff_until = None
+            return entry.available
+        return False
+
+    def _finish_job(self, entry: FleetPrinter, success: bool, now: float, message: Optional[str] = None) -> None:
+        """Close out the printer's job; called with the lock held."""
+        job = entry.job
+        entry.job = None
+        entry.launched_at = None
+        entry.busy_seconds += now - entry.busy_since
+        entry.busy_since = None
+        if entry.job_seen_active:
+            # An idle printer was stopped and cleared by hand; otherwise a part is on the plate
+            entry.plate_clear = entry.state == "idle" or not self.config.require_plate_clear
+        else:
+            # Nothing was printed; keep the printer out of dispatch as for a refused launch
+            entry.backoff_until = now + self.config.launch_backoff
+
+        job.complete(success)
+        self._auto_slots.discard(job.id)
+        self.queue.save()
+        if success:
+            entry.jobs_completed += 1
+            logger.info(f"Job {job.id} completed on {entry.name}")
+            if self.on_job_complete:
+                self._callbacks.append((self.on_job_complete, job, entry.name))
+        else:
+            entry.jobs_failed += 1
+            message = message or f"Printer {entry.name} reported {entry.state}"
+            logger.warning(f"Job {job.id} failed: {message}")
+            if self.on_job_failed:
+                self._callbacks.append((self.on_job_failed, job, message))
+
+    def _run_callbacks(self) -> None:
+        """Run job callbacks queued under the lock, now that it is released."""
+        with self._lock:
+            callbacks, self._callbacks = self._callbacks, []
+        for callback, job, detail in callbacks:
+            callback(job, detail)
+
+    def _mark_idle(self, entry: FleetPrinter, now: float) -> None:
+        """Start the printer's idle clock if it can take a job."""
+        if entry.available and entry.idle_since is None:
+            entry.idle_since = now
+
+    # ==================== Dispatch ====================
+
+    def dispatch(self) -> List[Tuple[str, PrintJob]]:
+        """
+        Start ready jobs on the best idle printers.
+
+        Returns:
+            (printer name, job) for each print started
+        """
+        with self._lock:
+            assignments = self._assign(time.monotonic())
+        if not assignments:
+            return []
+
+        if len(assignments) == 1:
+            results = [self._launch(*assignments[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.config.max_parallel, len(assignments))) as executor:
+                results = list(executor.map(lambda a: self._launch(*a), assignments))
+
+        started = []
+        with self._lock:
+            for (entry, job, ready_at), (result, launched_at) in zip(assignments, results):
+                if result is not None and result.success:
+                    started.append((entry.name, job))
+                    entry.launched_at = launched_at
+                    self.dispatches += 1
+                    self._latencies.append(launched_at - ready_at)
+                    self._waiting_since.pop(job.id, None)
+                    continue
+                # Put the job back for another printer, and keep this one out of
+                # dispatch for a while so the job is not handed straight back
+                message = getattr(result, "message", "launch failed")
+                logger.warning(f"Could not start job {job.id} on {entry.name}: {message}")
+                entry.last_error = message
+                entry.job = None
+                entry.busy_since = None
+                entry.backoff_until = launched_at + self.config.launch_backoff
+                self._mark_idle(entry, entry.backoff_until)
+                job.status = JobStatus.PENDING
+                job.started_at = None
+                if job.id in self._auto_slots:
+                    # The slot belonged to this printer's AMS
+                    self._auto_slots.discard(job.id)
+                    job.ams_slot = None
+            del self._latencies[:-LATENCY_HISTORY]
+            self.queue.save()
+
+        for name, job in started:
+            logger.info(f"Started job {job.id} on {name}")
+            if self.on_job_start:
+                self.on_job_start(job, name)
+        return started
+
+    def _assign(self, now: float) -> List[Tuple[FleetPrinter, PrintJob, float]]:
+        """Match ready jobs to idle printers; called with the lock held."""
+        idle = [entry for entry in self.printers.values() if entry.available and not entry.backing_off(now)]
+        assignments = []
+        for job_id in self.queue.order:
+            if not idle:
+                break
+            job = self.queue.jobs[job_id]
+            if not job.can_start or not self.queue.dependencies_met(job):
+                continue
+            waiting_since = self._waiting_since.setdefault(job.id, now)
+
+            candidates = [entry for entry in idle if entry.can_print(job)]
+            if not candidates:
+                continue
+            entry = min(candidates, key=lambda e: self._rank(e, job, now))
+            idle.remove(entry)
+
+            if job.ams_slot is None and entry.materials:
+                job.ams_slot = entry.find_slot(job)
+                self._auto_slots.add(job.id)
+            job.start()
+            entry.job = job
+            entry.job_seen_active = False
+            entry.launched_at = None
+            entry.busy_since = now
+            ready_at = max(waiting_since, entry.idle_since or now)
+            entry.idle_since = None
+            assignments.append((entry, job, ready_at))
+        return assignments
+
+    @staticmethod
+    def _rank(entry: FleetPrinter, job: PrintJob, now: float) -> tuple:
+        """Sort key for printers able to take a job; lower is better."""
+        slot = entry.find_slot(job)
+        if slot is None:
+            match = 2  # Unknown spools
+        elif entry.materials[slot][1].lower() == job.color.lower():
+            match = 0
+        else:
+            match = 1
+        return match, entry.utilisation(now), entry.name
+
+    def _launch(self, entry: FleetPrinter, job: PrintJob, ready_at: float) -> Tuple[Any, float]:
+        """Start one job, returning the launcher's result and when it returned."""
+        try:
+            result = self.launcher(entry.printer, job)
+        except Exception as e:
+            logger.warning(f"Launcher error on {entry.name}: {e}")
+            result = None
+        return result, time.monotonic()
+
+    # ==================== Metrics ====================
+
+    def get_metrics(self) -> dict:
+        """
+        Get dispatch latency and utilisation metrics.
+
+        Returns:
+            Dictionary with dispatch count, latency summary in seconds,
+            utilisation per printer and fleet, and printer state counts
+        """
+        now = time.monotonic()
+        with self._lock:
+            latencies = sorted(self._latencies)
+            utilisation = {name: entry.utilisation(now) for name, entry in self.printers.items()}
+            states: Dict[str, int] = {}
+            for entry in self.printers.values():
+                states[entry.state] = states.get(entry.state, 0) + 1
+            busy = sum(1 for entry in self.printers.values() if entry.job is not None)
+
+        return {
+            "dispatches": self.dispatches,
+            "dispatch_latency": {
+                "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+                "p50": _percentile(latencies, 50),
+                "p95": _percentile(latencies, 95),
+                "max": latencies[-1] if latencies else 0.0,
+            },
+            "utilisation": utilisation,
+            "fleet_utilisation": sum(utilisation.values()) / len(utilisation) if utilisation else 0.0,
+            "printers_busy": busy,
+            "printer_states": states,
+        }
+
+    def get_status(self) -> dict:
+        """Get fleet status."""
+        now = time.monotonic()
+        counts = self.queue.count()
+        with self._lock:
+            printers = [entry.to_dict(now) for entry in self.printers.values()]
+        return {
+            "printers": printers,
+            "jobs_pending": counts[JobStatus.PENDING] + counts[JobStatus.READY],
+            "jobs_printing": counts[JobStatus.PRINTING],
+            "jobs_completed": counts[JobStatus.COMPLETED],
+            "jobs_failed": counts[JobStatus.FAILED],
+        }
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(percent / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
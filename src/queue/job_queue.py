@@ -65,6 +65,7 @@ class PrintJob:
     material: str = "pla"
     color: str = "white"
     ams_slot: Optional[int] = None
+    nozzle_diameter: Optional[float] = None  # mm; any printer's nozzle if None
 
     # Print settings
     quality: str = "normal"  # draft, normal, fine
@@ -76,6 +77,7 @@ class PrintJob:
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
     estimated_time_seconds: int = 0
+    estimated_filament_grams: float = 0.0
 
     # Progress
     progress_percent: float = 0
@@ -204,6 +206,10 @@ class PrintQueue:
             json.dump(data, f, indent=2)
         logger.debug("Queue saved")
 
+    def save(self) -> None:
+        """Save the queue after its jobs were changed in place."""
+        self._save()
+
     def add_job(
         self,
         file_path: str,
@@ -224,13 +230,17 @@ class PrintQueue:
             material: Material type
             color: Filament color
             depends_on: List of job IDs this depends on
-            **kwargs: Additional job settings
+            **kwargs: Additional job settings; time, filament and layer
+                estimates are read from sliced G-code or 3MF files if not given
 
         Returns:
             The created PrintJob
         """
         path = Path(file_path)
         job_name = name or path.stem
+        if "estimated_time_seconds" not in kwargs:
+            for key, value in _estimate_from_file(path).items():
+                kwargs.setdefault(key, value)
 
         job = PrintJob(
             id=str(uuid4())[:8],
@@ -295,13 +305,13 @@ class PrintQueue:
         """Get the next job ready to print."""
         for job_id in self.order:
             job = self.jobs[job_id]
-            if job.can_start and self._dependencies_met(job):
+            if job.can_start and self.dependencies_met(job):
                 job.status = JobStatus.READY
                 return job
         return None
 
-    def _dependencies_met(self, job: PrintJob) -> bool:
-        """Check if all dependencies are completed."""
+    def dependencies_met(self, job: PrintJob) -> bool:
+        """Check if all of a job's dependencies are completed."""
         for dep_id in job.depends_on:
             dep = self.jobs.get(dep_id)
             if dep and dep.status != JobStatus.COMPLETED:
@@ -428,3 +438,24 @@ class PrintQueue:
     def __len__(self) -> int:
         """Get total number of jobs."""
         return len(self.jobs)
+
+
+def _estimate_from_file(path: Path) -> dict:
+    """Job estimates from the moves of a sliced G-code or 3MF file."""
+    from src.estimator.gcode_analyzer import analyze_3mf, analyze_gcode
+
+    suffix = path.suffix.lower()
+    if suffix not in (".gcode", ".3mf") or not path.exists():
+        return {}
+    try:
+        analysis = analyze_gcode(path) if suffix == ".gcode" else analyze_3mf(path)
+    except Exception as e:
+        logger.warning(f"Could not analyze {path.name}: {e}")
+        return {}
+    if analysis is None or not analysis.move_count:
+        return {}
+    return {
+        "estimated_time_seconds": int(round(analysis.total_time_seconds)),
+        "estimated_filament_grams": analysis.filament_grams,
+        "total_layers": analysis.total_layers,
+    }
@@ -1,6 +1,7 @@
 """Slicing module for advanced print preparation.
 
-Provides adaptive layer height optimization and slicing utilities.
+Provides a sweep-line Z slicer, adaptive layer height optimization
+and slicing utilities.
 """
 
 from src.slicing.adaptive_layers import (
@@ -12,6 +13,12 @@ from src.slicing.adaptive_layers import (
     create_optimizer,
     analyze_layers,
 )
+from src.slicing.slicer import (
+    MeshSlicer,
+    SliceLayer,
+    ZProfile,
+    slice_mesh,
+)
 
 __all__ = [
     "AdaptiveLayerOptimizer",
@@ -21,4 +28,8 @@ __all__ = [
     "OptimizationStrategy",
     "create_optimizer",
     "analyze_layers",
+    "MeshSlicer",
+    "SliceLayer",
+    "ZProfile",
+    "slice_mesh",
 ]
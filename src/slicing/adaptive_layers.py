@@ -11,11 +11,17 @@ from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
+from src.mesh_io import MeshData, load_mesh_features
+from src.slicing.slicer import MeshSlicer, ZProfile
 from src.utils import get_logger
 from src.config import get_settings
 
 logger = get_logger("slicing.adaptive_layers")
 
+LAYER_HEIGHT_STEP = 0.01  # Planned layer heights are rounded down to this step
+
 
 class OptimizationStrategy(str, Enum):
     """Layer height optimization strategies."""
@@ -32,7 +38,7 @@ class LayerRegion:
     end_z: float  # End height in mm
     layer_height: float  # Layer height for this region in mm
     reason: str  # Why this layer height was chosen
-    curvature: float = 0.0  # Average surface curvature
+    curvature: float = 0.0  # Steepest surface slope as |normal Z| (0 = vertical walls, 1 = flat)
     overhang_angle: float = 0.0  # Max overhang angle in region
 
     def to_dict(self) -> dict:
@@ -58,6 +64,8 @@ class LayerConfig:
     # Quality thresholds
     quality_threshold: float = 0.5  # Curvature threshold for fine layers
     overhang_threshold: float = 45.0  # Angle threshold for fine layers
+    cusp_height: float = 0.1  # Maximum stair-step height on sloped surfaces in mm
+    max_height_change: float = 0.1  # Layer height change allowed per mm of Z
 
     # Strategy
     strategy: OptimizationStrategy = OptimizationStrategy.BALANCED
@@ -73,6 +81,8 @@ class LayerConfig:
             "default_layer_height": self.default_layer_height,
             "quality_threshold": self.quality_threshold,
             "overhang_threshold": self.overhang_threshold,
+            "cusp_height": self.cusp_height,
+            "max_height_change": self.max_height_change,
             "strategy": self.strategy.value,
             "nozzle_diameter": self.nozzle_diameter,
         }
@@ -86,6 +96,8 @@ class LayerConfig:
             default_layer_height=data.get("default_layer_height", 0.20),
             quality_threshold=data.get("quality_threshold", 0.5),
             overhang_threshold=data.get("overhang_threshold", 45.0),
+            cusp_height=data.get("cusp_height", 0.1),
+            max_height_change=data.get("max_height_change", 0.1),
             strategy=OptimizationStrategy(data.get("strategy", "balanced")),
             nozzle_diameter=data.get("nozzle_diameter", 0.4),
         )
@@ -99,6 +111,7 @@ class LayerConfig:
                 max_layer_height=0.16,
                 default_layer_height=0.12,
                 quality_threshold=0.3,
+                cusp_height=0.05,
                 strategy=strategy,
             )
         elif strategy == OptimizationStrategy.SPEED:
@@ -107,6 +120,7 @@ class LayerConfig:
                 max_layer_height=0.32,
                 default_layer_height=0.28,
                 quality_threshold=0.7,
+                cusp_height=0.2,
                 strategy=strategy,
             )
         else:  # BALANCED
@@ -118,6 +132,7 @@ class LayerResult:
     """Result of adaptive layer analysis."""
     success: bool
     regions: List[LayerRegion] = field(default_factory=list)
+    layers: List[Tuple[float, float]] = field(default_factory=list)  # (top Z, height) per layer
     total_layers: int = 0
     estimated_time_savings: float = 0.0  # Percentage time saved vs uniform
     quality_score: float = 0.0  # 0-100 quality estimate
@@ -130,6 +145,7 @@ class LayerResult:
         return {
             "success": self.success,
             "regions": [r.to_dict() for r in self.regions],
+            "layers": [list(layer) for layer in self.layers],
             "total_layers": self.total_layers,
             "estimated_time_savings": self.estimated_time_savings,
             "quality_score": self.quality_score,
@@ -179,7 +195,7 @@ class AdaptiveLayerOptimizer:
             # Load and analyze mesh
             vertices, faces = self._load_mesh(mesh)
 
-            if not vertices:
+            if len(vertices) == 0:
                 return LayerResult(
                     success=False,
                     error_message="Failed to load mesh or mesh is empty",
@@ -195,20 +211,20 @@ class AdaptiveLayerOptimizer:
                     error_message="Invalid model height",
                 )
 
-            # Analyze geometry at different heights
-            regions = self._analyze_geometry(vertices, faces, z_min, z_max)
+            # Plan the layer stack from the surface slope at every height
+            regions, layers, quality_score = self._analyze_geometry(vertices, faces, z_min, z_max)
 
             # Calculate statistics
-            total_layers = self._count_layers(regions)
+            total_layers = len(layers)
             uniform_layers = math.ceil(model_height / self.config.default_layer_height)
             time_savings = max(0, (1 - total_layers / uniform_layers) * 100) if uniform_layers > 0 else 0
-            quality_score = self._calculate_quality_score(regions)
 
             analysis_time = (datetime.now() - start_time).total_seconds()
 
             return LayerResult(
                 success=True,
                 regions=regions,
+                layers=layers,
                 total_layers=total_layers,
                 estimated_time_savings=time_savings,
                 quality_score=quality_score,
@@ -224,161 +240,123 @@ class AdaptiveLayerOptimizer:
                 analysis_time=(datetime.now() - start_time).total_seconds(),
             )
 
-    def _load_mesh(self, mesh_path: Path) -> Tuple[List[Tuple[float, float, float]], List[Tuple[int, int, int]]]:
-        """Load mesh vertices and faces."""
-        vertices = []
-        faces = []
-
+    def _load_mesh(self, mesh_path: Path) -> Tuple[np.ndarray, np.ndarray]:
+        """Load mesh vertices and faces as arrays."""
         try:
-            if mesh_path.suffix.lower() == ".obj":
-                with open(mesh_path, "r") as f:
-                    for line in f:
-                        if line.startswith("v "):
-                            parts = line.split()
-                            if len(parts) >= 4:
-                                vertices.append((
-                                    float(parts[1]),
-                                    float(parts[2]),
-                                    float(parts[3]),
-                                ))
-                        elif line.startswith("f "):
-                            parts = line.split()[1:]
-                            # Handle both "1" and "1/2/3" formats
-                            indices = []
-                            for p in parts[:3]:  # Just triangles
-                                idx = int(p.split("/")[0]) - 1
-                                indices.append(idx)
-                            if len(indices) == 3:
-                                faces.append(tuple(indices))
-
-            elif mesh_path.suffix.lower() == ".stl":
-                # ASCII STL parser
-                with open(mesh_path, "r") as f:
-                    content = f.read()
-
-                if "solid" in content.lower() and "vertex" in content.lower():
-                    # ASCII STL
-                    import re
-                    vertex_pattern = r"vertex\s+([\d.e+-]+)\s+([\d.e+-]+)\s+([\d.e+-]+)"
-                    matches = re.findall(vertex_pattern, content, re.IGNORECASE)
-                    for i, match in enumerate(matches):
-                        vertices.append((float(match[0]), float(match[1]), float(match[2])))
-                        if (i + 1) % 3 == 0:
-                            base = len(vertices) - 3
-                            faces.append((base, base + 1, base + 2))
-
+            features = load_mesh_features(mesh_path)
+            return features.mesh.vertices, features.mesh.faces
         except Exception as e:
             logger.warning(f"Error loading mesh: {e}")
+            return np.zeros((0, 3), dtype=np.float32), np.zeros((0, 3), dtype=np.int64)
 
-        return vertices, faces
-
-    def _get_z_bounds(self, vertices: List[Tuple[float, float, float]]) -> Tuple[float, float]:
+    def _get_z_bounds(self, vertices: np.ndarray) -> Tuple[float, float]:
         """Get min and max Z values."""
-        if not vertices:
+        if len(vertices) == 0:
             return 0.0, 0.0
 
-        z_values = [v[2] for v in vertices]
-        return min(z_values), max(z_values)
+        z_values = np.asarray(vertices, dtype=np.float64)[:, 2]
+        return float(z_values.min()), float(z_values.max())
 
     def _analyze_geometry(
         self,
-        vertices: List[Tuple[float, float, float]],
-        faces: List[Tuple[int, int, int]],
-        z_min: float,
-        z_max: float,
-    ) -> List[LayerRegion]:
-        """Analyze geometry at different Z heights."""
-        regions = []
-        model_height = z_max - z_min
-
-        # Sample at regular intervals
-        sample_interval = self.config.max_layer_height
-        num_samples = max(1, int(model_height / sample_interval))
-
-        for i in range(num_samples):
-            start_z = z_min + i * sample_interval
-            end_z = min(z_min + (i + 1) * sample_interval, z_max)
-
-            # Analyze this region
-            curvature = self._estimate_curvature(vertices, faces, start_z, end_z)
-            overhang = self._estimate_overhang(vertices, faces, start_z, end_z)
-
-            # Determine appropriate layer height
-            layer_height, reason = self._select_layer_height(curvature, overhang)
-
-            regions.append(LayerRegion(
-                start_z=start_z,
-                end_z=end_z,
-                layer_height=layer_height,
-                reason=reason,
-                curvature=curvature,
-                overhang_angle=overhang,
-            ))
-
-        # Merge adjacent regions with same layer height
-        regions = self._merge_regions(regions)
-
-        return regions
-
-    def _estimate_curvature(
-        self,
-        vertices: List[Tuple[float, float, float]],
-        faces: List[Tuple[int, int, int]],
+        vertices: np.ndarray,
+        faces: np.ndarray,
         z_min: float,
         z_max: float,
-    ) -> float:
-        """Estimate surface curvature in a Z range."""
-        # Simplified curvature estimation based on vertex density variation
-        region_vertices = [v for v in vertices if z_min <= v[2] <= z_max]
-
-        if len(region_vertices) < 3:
-            return 0.0
+    ) -> Tuple[List[LayerRegion], List[Tuple[float, float]], float]:
+        """
+        Plan layer heights from the surface slope at every height.
 
-        # Calculate variance in X and Y positions as proxy for curvature
-        x_vals = [v[0] for v in region_vertices]
-        y_vals = [v[1] for v in region_vertices]
+        A layer of height h on a surface whose normal has Z component n
+        leaves a stair step (cusp) of about h * |n|. The slicer profiles the
+        steepest |n| crossing every thin Z band, which gives the tallest
+        layer that keeps the cusp under ``cusp_height`` there. That limit is
+        smoothed so heights ramp gradually, then layers are stacked bottom
+        to top, each as tall as every band it spans allows.
 
-        x_variance = self._variance(x_vals)
-        y_variance = self._variance(y_vals)
+        Returns:
+            (regions of equal layer height, (top Z, height) per layer, quality score)
+        """
+        config = self.config
+        profile = MeshSlicer(MeshData(vertices=vertices, faces=faces)).z_profile(
+            config.min_layer_height / 2
+        )
+        allowed = self._allowed_heights(profile.max_slope, profile.resolution)
+
+        layers = []
+        z = z_min
+        while z_max - z > 1e-6:
+            first = profile.band_of(z)
+            height = allowed[first]
+
+            # Shrink until the layer fits under every band it covers
+            while True:
+                limit = allowed[first:profile.band_of(z + height - 1e-9) + 1].min()
+                if limit >= height - 1e-9:
+                    break
+                height = limit
+
+            height = max(config.min_layer_height, math.floor(height / LAYER_HEIGHT_STEP + 1e-6) * LAYER_HEIGHT_STEP)
+            remaining = z_max - z
+            if remaining - height < config.min_layer_height:
+                # Avoid a sliver layer at the top
+                height = remaining if remaining / 2 < config.min_layer_height else remaining / 2
+
+            z += height
+            layers.append((round(z, 6), round(height, 6)))
+
+        regions = self._build_regions(layers, profile, z_min)
+        quality_score = self._calculate_quality_score(layers, profile, z_min)
+        return regions, layers, quality_score
+
+    def _allowed_heights(self, max_slope: np.ndarray, resolution: float) -> np.ndarray:
+        """Tallest layer allowed in every band, with limited change along Z."""
+        config = self.config
+        with np.errstate(divide="ignore"):
+            allowed = config.cusp_height / max_slope
+        allowed = np.clip(allowed, config.min_layer_height, config.max_layer_height)
 
-        # Normalize to 0-1 range
-        curvature = min(1.0, math.sqrt(x_variance + y_variance) / 10.0)
-        return curvature
+        # Lipschitz smoothing: h[i] <= h[j] + step * |i - j|, as a forward and a backward pass
+        ramp = np.arange(len(allowed)) * config.max_height_change * resolution
+        allowed = np.minimum(allowed, ramp + np.minimum.accumulate(allowed - ramp))
+        backward = np.minimum.accumulate((allowed + ramp)[::-1])[::-1] - ramp
+        return np.minimum(allowed, backward)
 
-    def _estimate_overhang(
+    def _build_regions(
         self,
-        vertices: List[Tuple[float, float, float]],
-        faces: List[Tuple[int, int, int]],
+        layers: List[Tuple[float, float]],
+        profile: ZProfile,
         z_min: float,
-        z_max: float,
-    ) -> float:
-        """Estimate maximum overhang angle in a Z range."""
-        max_overhang = 0.0
-
-        for face in faces:
-            if face[0] >= len(vertices) or face[1] >= len(vertices) or face[2] >= len(vertices):
-                continue
-
-            v0 = vertices[face[0]]
-            v1 = vertices[face[1]]
-            v2 = vertices[face[2]]
+    ) -> List[LayerRegion]:
+        """Group consecutive layers of the same height into regions."""
+        config = self.config
+        regions = []
+        start = z_min
 
-            # Check if face is in Z range
-            face_z = (v0[2] + v1[2] + v2[2]) / 3
-            if not (z_min <= face_z <= z_max):
+        for i, (top, height) in enumerate(layers):
+            if i + 1 < len(layers) and abs(layers[i + 1][1] - height) < 1e-6:
                 continue
 
-            # Calculate face normal
-            normal = self._calculate_normal(v0, v1, v2)
-            if normal is None:
-                continue
+            bands = slice(profile.band_of(start), profile.band_of(top - 1e-9) + 1)
+            slope = float(profile.max_slope[bands].max())
+            if slope == 0.0:
+                reason = "Vertical walls"
+            elif height <= config.min_layer_height + 1e-6:
+                reason = "Shallow slope"
+            else:
+                reason = "Sloped surface"
 
-            # Overhang angle from horizontal (90 - angle from vertical)
-            vertical_component = abs(normal[2])
-            angle = 90 - math.degrees(math.acos(min(1.0, vertical_component)))
-            max_overhang = max(max_overhang, angle)
+            regions.append(LayerRegion(
+                start_z=start,
+                end_z=top,
+                layer_height=height,
+                reason=reason,
+                curvature=slope,
+                overhang_angle=float(profile.max_overhang[bands].max()),
+            ))
+            start = top
 
-        return max_overhang
+        return regions
 
     def _calculate_normal(
         self,
@@ -403,43 +381,6 @@ class AdaptiveLayerOptimizer:
 
         return (nx / length, ny / length, nz / length)
 
-    def _variance(self, values: List[float]) -> float:
-        """Calculate variance of a list of values."""
-        if len(values) < 2:
-            return 0.0
-
-        mean = sum(values) / len(values)
-        return sum((x - mean) ** 2 for x in values) / len(values)
-
-    def _select_layer_height(self, curvature: float, overhang: float) -> Tuple[float, str]:
-        """Select appropriate layer height based on geometry."""
-        config = self.config
-
-        # Check strategy
-        if config.strategy == OptimizationStrategy.QUALITY:
-            # Prefer finer layers
-            if curvature > config.quality_threshold or overhang > config.overhang_threshold:
-                return config.min_layer_height, "High detail region"
-            else:
-                return config.default_layer_height, "Standard quality"
-
-        elif config.strategy == OptimizationStrategy.SPEED:
-            # Prefer coarser layers
-            if overhang > 60:  # Only fine for extreme overhangs
-                return config.default_layer_height, "Overhang support"
-            else:
-                return config.max_layer_height, "Speed optimized"
-
-        else:  # BALANCED
-            if curvature > config.quality_threshold:
-                return config.min_layer_height, "High curvature detected"
-            elif overhang > config.overhang_threshold:
-                return config.min_layer_height + 0.04, "Moderate overhang"
-            elif curvature < 0.1 and overhang < 20:
-                return config.max_layer_height, "Flat region"
-            else:
-                return config.default_layer_height, "Standard region"
-
     def _merge_regions(self, regions: List[LayerRegion]) -> List[LayerRegion]:
         """Merge adjacent regions with same layer height."""
         if not regions:
@@ -464,33 +405,33 @@ class AdaptiveLayerOptimizer:
 
         return merged
 
-    def _count_layers(self, regions: List[LayerRegion]) -> int:
-        """Count total layers across all regions."""
-        total = 0
-        for region in regions:
-            height = region.end_z - region.start_z
-            if region.layer_height > 0:
-                total += math.ceil(height / region.layer_height)
-        return total
+    def _calculate_quality_score(
+        self,
+        layers: List[Tuple[float, float]],
+        profile: ZProfile,
+        z_min: float,
+    ) -> float:
+        """
+        Calculate estimated quality score (0-100).
 
-    def _calculate_quality_score(self, regions: List[LayerRegion]) -> float:
-        """Calculate estimated quality score (0-100)."""
-        if not regions:
+        Layers lose points in proportion to how far their cusp height
+        exceeds ``cusp_height``, which happens where even the minimum layer
+        height is too coarse for the slope.
+        """
+        if not layers:
             return 0.0
 
-        # Score based on using appropriate layer heights
-        score = 100.0
-
-        for region in regions:
-            # Penalty for coarse layers in curved areas
-            if region.curvature > 0.3 and region.layer_height > 0.15:
-                score -= 10 * region.curvature
+        tops = np.array([top for top, _ in layers])
+        heights = np.array([height for _, height in layers])
+        starts = tops - heights
 
-            # Penalty for coarse layers in overhang areas
-            if region.overhang_angle > 45 and region.layer_height > 0.12:
-                score -= 5
+        # Steepest slope within each layer from the profile's running maxima
+        first = ((starts - z_min) // profile.resolution).astype(np.int64).clip(0, len(profile.z) - 1)
+        last = ((tops - 1e-9 - z_min) // profile.resolution).astype(np.int64).clip(0, len(profile.z) - 1)
+        slope = np.array([profile.max_slope[a:b + 1].max() for a, b in zip(first, last)])
 
-        return max(0, min(100, score))
+        excess = np.clip(heights * slope / self.config.cusp_height - 1.0, 0.0, 1.0)
+        return float(100.0 * (1.0 - excess.mean()))
 
     def get_layer_heights_at_z(self, result: LayerResult, z: float) -> float:
         """Get the layer height at a specific Z position."""
@@ -513,7 +454,26 @@ class AdaptiveLayerOptimizer:
             lines.append(f";   Reason: {region.reason}")
             lines.append("")
 
-        return "\n".join(lines)
+        # Per-layer table: one row per layer with its top Z and height
+        lines.append("layer,z,height")
+        for i, (top, height) in enumerate(result.layers or self._layers_from_regions(result.regions)):
+            lines.append(f"{i + 1},{top:.3f},{height:.3f}")
+
+        return "\n".join(lines) + "\n"
+
+    def _layers_from_regions(self, regions: List[LayerRegion]) -> List[Tuple[float, float]]:
+        """Expand regions into evenly divided layers."""
+        layers = []
+        for region in regions:
+            span = region.end_z - region.start_z
+            if region.layer_height <= 0 or span <= 0:
+                continue
+            count = math.ceil(span / region.layer_height - 1e-6)
+            height = span / count
+            layers.extend(
+                (region.start_z + (i + 1) * height, height) for i in range(count)
+            )
+        return layers
 
 
 # Convenience functions
@@ -0,0 +1,371 @@
+"""Sweep-line Z slicer.
+
+Triangles are sorted by their lowest Z once. Slice planes are then visited
+bottom to top while an active list holds only the triangles that can still
+cross the current plane, so slicing a whole model costs O(F log F) plus the
+size of the output instead of rescanning every face for every layer.
+
+Each layer yields closed contour polygons together with its cross-section
+area, perimeter and the steepest overhang printed since the previous layer.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.mesh_io import MeshData, load_mesh_features
+from src.utils import get_logger
+
+logger = get_logger("slicing.slicer")
+
+BED_CONTACT_TOLERANCE_MM = 0.05  # Faces this close to the bed are not overhangs
+_SLOPE_LEVELS = 100  # Normal Z is profiled in steps of 0.01
+
+
+@dataclass
+class SliceLayer:
+    """Cross-section of a mesh at one Z height."""
+    z: float
+    contours: List[np.ndarray] = field(default_factory=list)  # Closed (N, 2) XY loops
+    area: float = 0.0  # Net cross-section area in mm² (holes subtracted)
+    perimeter: float = 0.0  # Total contour length in mm
+    max_overhang: float = 0.0  # Degrees from vertical (90 = ceiling) since the previous layer
+    open_paths: int = 0  # Chains that did not close, from holes in the mesh
+
+    @property
+    def contour_count(self) -> int:
+        """Number of closed contours."""
+        return len(self.contours)
+
+    @property
+    def is_empty(self) -> bool:
+        """Check if the plane misses the mesh."""
+        return self.perimeter == 0.0
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "z": self.z,
+            "area": self.area,
+            "perimeter": self.perimeter,
+            "max_overhang": self.max_overhang,
+            "contour_count": self.contour_count,
+            "open_paths": self.open_paths,
+        }
+
+
+@dataclass
+class ZProfile:
+    """Per-band summary of the faces crossing each Z band of a mesh."""
+    z: np.ndarray  # Bottom of every band in mm
+    resolution: float  # Band height in mm
+    max_slope: np.ndarray  # Largest |normal Z| of sloped faces (0 = vertical walls only)
+    max_overhang: np.ndarray  # Steepest overhang in degrees from vertical
+
+    def band_of(self, z: float) -> int:
+        """Index of the band containing a height, clamped to the profile."""
+        return int(np.clip((z - self.z[0]) // self.resolution, 0, len(self.z) - 1))
+
+
+class MeshSlicer:
+    """
+    Slices a mesh into horizontal layers with a sweep line.
+
+    Contours are linked through shared mesh edges, so the mesh should be
+    welded (as ``MeshFeatures.mesh`` is). Outer contours run
+    counter-clockwise seen from above and holes run clockwise. Vertices on
+    a plane count as above it, so a plane at the very bottom of a part
+    misses it while one at the very top returns its outline.
+    """
+
+    def __init__(self, mesh: MeshData):
+        """
+        Prepare the sweep.
+
+        Args:
+            mesh: Welded mesh to slice
+        """
+        self.mesh = mesh
+        self._vertices = np.asarray(mesh.vertices, dtype=np.float64)
+        self._faces = np.asarray(mesh.faces, dtype=np.int64)
+
+        face_z = self._vertices[:, 2][self._faces] if len(self._faces) else np.zeros((0, 3))
+        self._z_min = face_z.min(axis=1) if len(face_z) else np.zeros(0)
+        self._z_max = face_z.max(axis=1) if len(face_z) else np.zeros(0)
+        self._order = None
+        self._sorted_z_min = None
+
+        # Normal Z of every face, and overhang angle of downward faces (0 for the rest)
+        self._normal_z = np.zeros(len(self._faces))
+        self._overhang = np.zeros(len(self._faces))
+        if len(self._faces):
+            self._normal_z = np.asarray(mesh.face_normals()[:, 2], dtype=np.float64)
+            on_bed = self._z_max <= self._z_min.min() + BED_CONTACT_TOLERANCE_MM
+            downward = (self._normal_z < 0) & ~on_bed
+            self._overhang[downward] = np.degrees(np.arcsin(np.clip(-self._normal_z[downward], 0.0, 1.0)))
+
+    @classmethod
+    def from_file(cls, mesh_path: Union[str, Path]) -> "MeshSlicer":
+        """Create a slicer for a mesh file through the mesh cache."""
+        return cls(load_mesh_features(mesh_path).mesh)
+
+    @property
+    def z_range(self) -> Tuple[float, float]:
+        """Lowest and highest Z of the mesh."""
+        if len(self._faces) == 0:
+            return 0.0, 0.0
+        return float(self._z_min.min()), float(self._z_max.max())
+
+    def slice_at(self, heights: Sequence[float], with_contours: bool = True) -> List[SliceLayer]:
+        """
+        Slice at the given heights.
+
+        Args:
+            heights: Plane heights in mm (sorted ascending if they are not)
+            with_contours: Link segments into contour polygons; statistics
+                are computed either way
+
+        Returns:
+            One layer per height, in ascending order
+        """
+        return list(self.iter_layers(heights, with_contours))
+
+    def slice_uniform(
+        self,
+        layer_height: float,
+        first_layer_height: Optional[float] = None,
+        with_contours: bool = True,
+    ) -> List[SliceLayer]:
+        """
+        Slice at the middle of every layer of a uniform layer stack.
+
+        Args:
+            layer_height: Layer height in mm
+            first_layer_height: Height of the first layer (defaults to layer_height)
+            with_contours: Link segments into contour polygons
+
+        Returns:
+            Layers from bottom to top
+        """
+        if layer_height <= 0:
+            raise ValueError("Layer height must be positive")
+
+        bottom, top = self.z_range
+        first = first_layer_height or layer_height
+        heights = [bottom + first / 2]
+        if top - bottom > first:
+            count = int(np.ceil((top - bottom - first) / layer_height))
+            heights.extend(bottom + first + (np.arange(count) + 0.5) * layer_height)
+
+        return self.slice_at(heights, with_contours)
+
+    def z_profile(self, resolution: float) -> "ZProfile":
+        """
+        Summarize the faces crossing every thin Z band of the mesh.
+
+        Each face is spread over the bands its Z range covers with difference
+        arrays, one row per quantized value, so the whole profile costs
+        O(F + bands) with no per-plane work.
+
+        Args:
+            resolution: Band height in mm
+
+        Returns:
+            Profile from the bottom to the top of the mesh
+        """
+        if resolution <= 0:
+            raise ValueError("Resolution must be positive")
+
+        bottom, top = self.z_range
+        count = max(1, int(np.ceil((top - bottom) / resolution)))
+        first = np.clip(((self._z_min - bottom) / resolution).astype(np.int64), 0, count - 1)
+        last = np.clip(((self._z_max - bottom) / resolution).astype(np.int64), 0, count - 1)
+
+        # Flat faces do not cause stair-stepping and are left out of the slope
+        sloped = self._z_max - self._z_min > 1e-9
+        slope_level = np.ceil(np.abs(self._normal_z) * _SLOPE_LEVELS).astype(np.int64)
+        slope = _max_over_bands(first[sloped], last[sloped], slope_level[sloped], _SLOPE_LEVELS + 1, count)
+        overhang = _max_over_bands(first, last, np.ceil(self._overhang).astype(np.int64), 91, count)
+
+        return ZProfile(
+            z=bottom + np.arange(count) * resolution,
+            resolution=float(resolution),
+            max_slope=np.maximum(slope, 0) / _SLOPE_LEVELS,
+            max_overhang=np.maximum(overhang, 0).astype(np.float64),
+        )
+
+    def iter_layers(self, heights: Sequence[float], with_contours: bool = True) -> Iterator[SliceLayer]:
+        """Sweep upward through the heights, yielding one layer at a time."""
+        heights = np.sort(np.asarray(heights, dtype=np.float64).reshape(-1))
+        if self._order is None:
+            self._order = np.argsort(self._z_min, kind="stable")
+            self._sorted_z_min = self._z_min[self._order]
+
+        active = np.zeros(0, dtype=np.int64)
+        cursor = 0
+
+        for z in heights:
+            # Add triangles that start at or below this plane
+            end = int(np.searchsorted(self._sorted_z_min, z, side="right"))
+            if end > cursor:
+                active = np.concatenate([active, self._order[cursor:end]])
+                cursor = end
+
+            # Everything still active touched the slab since the last plane
+            max_overhang = float(self._overhang[active].max()) if len(active) else 0.0
+
+            # Drop triangles that end below this plane
+            active = active[self._z_max[active] >= z]
+
+            layer = self._slice_plane(float(z), active, with_contours)
+            layer.max_overhang = max_overhang
+            yield layer
+
+    def _slice_plane(self, z: float, active: np.ndarray, with_contours: bool) -> SliceLayer:
+        """Intersect the active triangles with one plane."""
+        layer = SliceLayer(z=z)
+        if len(active) == 0:
+            return layer
+
+        faces = self._faces[active]
+        # Vertices on the plane count as above it, which keeps every crossing
+        # edge shared by exactly two segments
+        above = self._vertices[:, 2][faces] >= z
+        above_count = above.sum(axis=1)
+        crossing = (above_count == 1) | (above_count == 2)
+        if not crossing.any():
+            return layer
+
+        faces = faces[crossing]
+        above = above[crossing]
+        lone_above = above_count[crossing] == 1
+
+        # The vertex alone on its side of the plane, and the two after it in winding order
+        lone = np.where(lone_above[:, None], above, ~above).argmax(axis=1)
+        rows = np.arange(len(faces))
+        a = faces[rows, lone]
+        b = faces[rows, (lone + 1) % 3]
+        c = faces[rows, (lone + 2) % 3]
+
+        p_ab = self._edge_point(a, b, z)
+        p_ac = self._edge_point(a, c, z)
+        key_ab = self._edge_key(a, b)
+        key_ac = self._edge_key(a, c)
+
+        # Orient segments so the solid is on the left when seen from above
+        start = np.where(lone_above[:, None], p_ab, p_ac)
+        end = np.where(lone_above[:, None], p_ac, p_ab)
+        start_key = np.where(lone_above, key_ab, key_ac)
+        end_key = np.where(lone_above, key_ac, key_ab)
+
+        delta = end - start
+        layer.perimeter = float(np.hypot(delta[:, 0], delta[:, 1]).sum())
+        layer.area = float(0.5 * (start[:, 0] * end[:, 1] - end[:, 0] * start[:, 1]).sum())
+
+        if with_contours:
+            layer.contours, layer.open_paths = _link_segments(start, end, start_key, end_key)
+
+        return layer
+
+    def _edge_point(self, a: np.ndarray, b: np.ndarray, z: float) -> np.ndarray:
+        """XY point where edges a-b cross the plane."""
+        pa = self._vertices[a]
+        pb = self._vertices[b]
+        dz = pb[:, 2] - pa[:, 2]
+        t = np.where(dz != 0, (z - pa[:, 2]) / np.where(dz != 0, dz, 1.0), 0.0)
+        return pa[:, :2] + (pb[:, :2] - pa[:, :2]) * t[:, None]
+
+    def _edge_key(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Packed undirected edge key, as in ``mesh_io.edge_keys``."""
+        return np.minimum(a, b) * np.int64(max(len(self._vertices), 1)) + np.maximum(a, b)
+
+
+def _max_over_bands(
+    first: np.ndarray,
+    last: np.ndarray,
+    levels: np.ndarray,
+    level_count: int,
+    band_count: int,
+) -> np.ndarray:
+    """Highest level among the ranges covering each band, -1 where none do."""
+    if len(levels) == 0:
+        return np.full(band_count, -1, dtype=np.int64)
+
+    # +1 where a range starts and -1 after it ends, one row per level
+    width = band_count + 1
+    starts = np.bincount(levels * width + first, minlength=level_count * width)
+    ends = np.bincount(levels * width + last + 1, minlength=level_count * width)
+    coverage = np.cumsum((starts - ends).reshape(level_count, width), axis=1)[:, :band_count] > 0
+
+    highest = level_count - 1 - coverage[::-1].argmax(axis=0)
+    return np.where(coverage.any(axis=0), highest, -1)
+
+
+def _link_segments(
+    start: np.ndarray,
+    end: np.ndarray,
+    start_key: np.ndarray,
+    end_key: np.ndarray,
+) -> Tuple[List[np.ndarray], int]:
+    """Chain oriented segments into contours through their shared edge keys."""
+    count = len(start)
+    order = np.argsort(start_key, kind="stable")
+    pos = np.minimum(np.searchsorted(start_key[order], end_key), count - 1)
+    following = np.where(start_key[order][pos] == end_key, order[pos], -1)
+
+    has_previous = np.zeros(count, dtype=bool)
+    has_previous[following[following >= 0]] = True
+
+    following = following.tolist()
+    visited = np.zeros(count, dtype=bool)
+    contours = []
+    open_paths = 0
+
+    # Open chains are walked from their first segment, then the loops
+    for first in np.concatenate([np.flatnonzero(~has_previous), np.arange(count)]).tolist():
+        if visited[first]:
+            continue
+
+        path = []
+        current = first
+        while current >= 0 and not visited[current]:
+            visited[current] = True
+            path.append(current)
+            current = following[current]
+
+        if current != first:
+            open_paths += 1
+            continue
+
+        points = start[path]
+        # Planes through vertices leave zero-length segments behind
+        step = np.roll(points, -1, axis=0) - points
+        points = points[np.abs(step).max(axis=1) > 1e-12]
+        if len(points) >= 3:
+            contours.append(points)
+
+    return contours, open_paths
+
+
+def slice_mesh(
+    mesh_path: Union[str, Path],
+    layer_height: float = 0.2,
+    with_contours: bool = True,
+) -> List[SliceLayer]:
+    """
+    Slice a mesh file into uniform layers.
+
+    Args:
+        mesh_path: Path to an STL, OBJ or 3MF file
+        layer_height: Layer height in mm
+        with_contours: Link segments into contour polygons
+
+    Returns:
+        Layers from bottom to top
+    """
+    slicer = MeshSlicer.from_file(mesh_path)
+    layers = slicer.slice_uniform(layer_height, with_contours=with_contours)
+    logger.debug(f"Sliced {mesh_path} into {len(layers)} layers")
+    return layers
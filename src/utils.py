@@ -41,7 +41,7 @@ def file_hash(path: Union[str, Path], algorithm: str = "sha256") -> str:
     path = Path(path)
     h = hashlib.new(algorithm)
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
             h.update(chunk)
     return h.hexdigest()
 
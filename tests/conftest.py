@@ -0,0 +1,18 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_mesh_cache(tmp_path):
+    """Keep the global mesh cache out of the working tree's data directory."""
+    try:
+        from src.mesh_io import MeshCache, configure_mesh_cache
+    except ImportError:
+        # Without NumPy nothing can load meshes through the cache
+        yield
+        return
+
+    configure_mesh_cache(MeshCache(cache_dir=tmp_path / "mesh_cache"))
+    yield
+    configure_mesh_cache(None)
@@ -0,0 +1,89 @@
+"""Mesh builders shared by the geometry tests."""
+
+import struct
+
+import numpy as np
+
+from src.mesh_io import MeshData
+
+
+def box_mesh(x0, y0, z0, x1, y1, z1, inward=False):
+    """Vertices and faces of an axis-aligned box, wound outward unless inward."""
+    vertices = np.array([
+        (x0, y0, z0), (x1, y0, z0), (x1, y1, z0), (x0, y1, z0),
+        (x0, y0, z1), (x1, y0, z1), (x1, y1, z1), (x0, y1, z1),
+    ], dtype=np.float64)
+    faces = np.array([
+        (0, 2, 1), (0, 3, 2), (4, 5, 6), (4, 6, 7),
+        (0, 1, 5), (0, 5, 4), (1, 2, 6), (1, 6, 5),
+        (2, 3, 7), (2, 7, 6), (3, 0, 4), (3, 4, 7),
+    ], dtype=np.int64)
+    if inward:
+        faces = faces[:, ::-1]
+    return vertices, faces
+
+
+def mesh_of(*boxes):
+    """Combine (bounds, inward) boxes into one unwelded mesh."""
+    vertices, faces = [], []
+    for bounds, inward in boxes:
+        v, f = box_mesh(*bounds, inward=inward)
+        faces.append(f + 8 * len(vertices))
+        vertices.append(v)
+    return MeshData(vertices=np.concatenate(vertices), faces=np.concatenate(faces))
+
+
+def prism(polygon, z0, z1):
+    """Extrude a counter-clockwise polygon that is star-shaped from its first vertex."""
+    n = len(polygon)
+    vertices = np.array([(x, y, z0) for x, y in polygon] + [(x, y, z1) for x, y in polygon], dtype=np.float64)
+    faces = []
+    for i in range(1, n - 1):
+        faces.append((0, i + 1, i))
+        faces.append((n, n + i, n + i + 1))
+    for i in range(n):
+        j = (i + 1) % n
+        faces.append((i, j, n + j))
+        faces.append((i, n + j, n + i))
+    return MeshData(vertices=vertices, faces=np.array(faces, dtype=np.int64))
+
+
+def signed_area(points):
+    """Shoelace area of a point list."""
+    points = np.asarray(points)
+    x, y = points[:, 0], points[:, 1]
+    return 0.5 * float(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y))
+
+
+def t_shape():
+    """A 10mm deep T: a post under a 30mm slab whose arms overhang 20mm up."""
+    profile = [(10, 20), (10, 0), (20, 0), (20, 20), (30, 20), (30, 25), (0, 25), (0, 20)]
+    mesh = prism(profile, 0, 10)
+    # Stand the extruded profile up in XZ; swapping axes mirrors, so flip the winding
+    return MeshData(vertices=mesh.vertices[:, [0, 2, 1]], faces=mesh.faces[:, ::-1].copy())
+
+
+def write_binary_stl(path, triangles, header=b"\x00" * 80):
+    """Write triangles as a binary STL file."""
+    with open(path, "wb") as f:
+        f.write(header.ljust(80, b"\x00")[:80])
+        f.write(struct.pack("<I", len(triangles)))
+        for tri in triangles:
+            f.write(struct.pack("<fff", 0, 0, 0))
+            for v in tri:
+                f.write(struct.pack("<fff", *v))
+            f.write(struct.pack("<H", 0))
+
+
+def write_ascii_stl(path, triangles):
+    """Write triangles as an ASCII STL file."""
+    lines = ["solid test"]
+    for tri in triangles:
+        lines.append("  facet normal 0 0 0")
+        lines.append("    outer loop")
+        for v in tri:
+            lines.append(f"      vertex {v[0]} {v[1]} {v[2]}")
+        lines.append("    endloop")
+        lines.append("  endfacet")
+    lines.append("endsolid test")
+    path.write_text("\n".join(lines))
@@ -331,7 +331,7 @@ f 1 2 3
 
         assert len(vertices) == 3
         assert len(faces) == 1
-        assert vertices[0] == (0.0, 0.0, 0.0)
+        assert tuple(vertices[0]) == (0.0, 0.0, 0.0)
 
     def test_load_stl_mesh(self, optimizer, tmp_path):
         """Test loading STL mesh."""
@@ -381,45 +381,6 @@ endsolid test
         assert abs(normal[2]) > 0.9
 
 
-class TestLayerSelection:
-    """Tests for layer height selection."""
-
-    @pytest.fixture
-    def optimizer(self):
-        """Create an optimizer."""
-        return AdaptiveLayerOptimizer()
-
-    def test_select_for_high_curvature(self, optimizer):
-        """Test layer selection for high curvature."""
-        height, reason = optimizer._select_layer_height(
-            curvature=0.8,  # High
-            overhang=0.0,
-        )
-
-        assert height == optimizer.config.min_layer_height
-        assert "curvature" in reason.lower() or "detail" in reason.lower()
-
-    def test_select_for_overhang(self, optimizer):
-        """Test layer selection for overhangs."""
-        height, reason = optimizer._select_layer_height(
-            curvature=0.0,
-            overhang=60.0,  # Steep overhang
-        )
-
-        # Should select finer layer for overhang
-        assert height <= optimizer.config.default_layer_height
-
-    def test_select_for_flat_region(self, optimizer):
-        """Test layer selection for flat regions."""
-        height, reason = optimizer._select_layer_height(
-            curvature=0.05,  # Very flat
-            overhang=10.0,  # Minimal overhang
-        )
-
-        assert height == optimizer.config.max_layer_height
-        assert "flat" in reason.lower()
-
-
 class TestRegionMerging:
     """Tests for region merging."""
 
@@ -460,6 +421,110 @@ class TestRegionMerging:
         assert merged == []
 
 
+class TestCuspSchedule:
+    """Tests for cusp-height driven layer planning."""
+
+    @pytest.fixture
+    def pyramid(self, tmp_path):
+        """Square pyramid with 45 degree sides on a 10mm wall base."""
+        mesh_path = tmp_path / "pyramid.obj"
+        mesh_path.write_text("""v 0 0 0
+v 20 0 0
+v 20 20 0
+v 0 20 0
+v 0 0 10
+v 20 0 10
+v 20 20 10
+v 0 20 10
+v 10 10 20
+f 1 3 2
+f 1 4 3
+f 1 2 6
+f 1 6 5
+f 2 3 7
+f 2 7 6
+f 3 4 8
+f 3 8 7
+f 4 1 5
+f 4 5 8
+f 5 6 9
+f 6 7 9
+f 7 8 9
+f 8 5 9
+""")
+        return str(mesh_path)
+
+    def test_layers_follow_slope(self, pyramid):
+        """Test walls get coarse layers and the 45 degree roof finer ones."""
+        optimizer = AdaptiveLayerOptimizer()
+        result = optimizer.analyze_model(pyramid)
+        config = optimizer.config
+
+        assert result.success is True
+        assert result.total_layers == len(result.layers)
+        assert result.layers[0][1] == pytest.approx(config.max_layer_height)
+
+        # Cusp limit on a 45 degree slope, rounded down to the height step
+        roof = [height for top, height in result.layers if top > 12]
+        assert max(roof) == pytest.approx(0.14)
+
+    def test_layers_stack_to_model_height(self, pyramid):
+        """Test the layer stack covers the model exactly."""
+        result = analyze_layers(pyramid)
+
+        assert result.layers[-1][0] == pytest.approx(result.model_height)
+        assert sum(height for _, height in result.layers) == pytest.approx(result.model_height)
+
+    def test_heights_within_limits_and_smooth(self, pyramid):
+        """Test heights stay in range and ramp gradually."""
+        optimizer = AdaptiveLayerOptimizer()
+        result = optimizer.analyze_model(pyramid)
+        config = optimizer.config
+        heights = [height for _, height in result.layers[:-2]]
+
+        assert min(heights) >= config.min_layer_height - 1e-9
+        assert max(heights) <= config.max_layer_height + 1e-9
+        for lower, upper in zip(heights, heights[1:]):
+            assert abs(upper - lower) <= config.max_height_change * max(lower, upper) + 0.011
+
+    def test_fewer_layers_than_uniform(self, tmp_path):
+        """Test vertical walls save layers over a uniform stack."""
+        mesh_path = tmp_path / "block.obj"
+        mesh_path.write_text("""v 0 0 0
+v 10 0 0
+v 10 10 0
+v 0 10 0
+v 0 0 30
+v 10 0 30
+v 10 10 30
+v 0 10 30
+f 1 3 2
+f 1 4 3
+f 5 6 7
+f 5 7 8
+f 1 2 6
+f 1 6 5
+f 2 3 7
+f 2 7 6
+f 3 4 8
+f 3 8 7
+f 4 1 5
+f 4 5 8
+""")
+        result = analyze_layers(str(mesh_path))
+
+        assert result.total_layers < math.ceil(result.model_height / 0.20)
+        assert result.estimated_time_savings > 0
+        assert result.quality_score == pytest.approx(100.0)
+
+    def test_finer_cusp_means_more_layers(self, pyramid):
+        """Test the quality preset plans more layers than speed."""
+        quality = analyze_layers(pyramid, strategy="quality")
+        speed = analyze_layers(pyramid, strategy="speed")
+
+        assert quality.total_layers > speed.total_layers
+
+
 class TestExport:
     """Tests for export functionality."""
 
@@ -491,6 +556,23 @@ class TestExport:
         assert "0.20mm" in output
         assert "0.12mm" in output
 
+    def test_export_layer_table(self, optimizer, test_result):
+        """Test every layer gets a row in the height table."""
+        output = optimizer.export_to_gcode_variable_layer(test_result)
+        rows = output.split("layer,z,height\n")[1].splitlines()
+
+        assert len(rows) == 50 + 84
+        assert rows[0] == "1,0.200,0.200"
+        assert rows[-1].startswith("134,20.000,")
+
+    def test_export_planned_layers(self, optimizer):
+        """Test planned layers are exported as they are."""
+        result = LayerResult(success=True, layers=[(0.2, 0.2), (0.3, 0.1)], total_layers=2)
+
+        output = optimizer.export_to_gcode_variable_layer(result)
+
+        assert output.endswith("1,0.200,0.200\n2,0.300,0.100\n")
+
 
 class TestConvenienceFunctions:
     """Tests for convenience functions."""
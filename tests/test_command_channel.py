@@ -0,0 +1,176 @@
+"""Tests for the interactive session's socket command channel."""
+
+import threading
+import time
+
+import pytest
+
+from src.blender import command_interpreter
+from src.blender.command_channel import ChannelClient, ChannelServer
+from src.blender.framing import FrameDecoder, encode_message
+
+
+def echo_handler(command, progress):
+    """Handler answering with the command it received."""
+    params = command.get("params", {})
+    for step in range(params.get("steps", 0)):
+        progress(f"step {step}", {"step": step})
+    time.sleep(params.get("delay", 0))
+    if command.get("action") == "fail":
+        raise RuntimeError("boom")
+    return {"success": True, "message": command.get("action"), "data": params}
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Channel server polled from a background thread, as Blender's timer would."""
+    server = ChannelServer(echo_handler, tmp_path / "channel.sock")
+    server.start()
+    stop = threading.Event()
+
+    def serve():
+        while not stop.is_set():
+            server.poll()
+            time.sleep(0.001)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield server
+    stop.set()
+    thread.join()
+    server.stop()
+
+
+@pytest.fixture
+def client(server):
+    """Client connected to the server."""
+    with ChannelClient(server.path) as client:
+        yield client
+
+
+class TestFrameDecoder:
+    """Tests for decoding messages from a byte stream."""
+
+    def test_split_across_reads(self):
+        """Test messages cut at arbitrary points are reassembled."""
+        data = encode_message({"id": 1}) + encode_message({"id": 2, "text": "é" * 10})
+        decoder = FrameDecoder()
+        messages = []
+        for i in range(0, len(data), 3):
+            messages.extend(decoder.feed(data[i:i + 3]))
+
+        assert [m["id"] for m in messages] == [1, 2]
+
+    def test_oversized_frame(self):
+        """Test a frame over the limit is rejected."""
+        with pytest.raises(ConnectionError):
+            FrameDecoder().feed(b"\xff\xff\xff\xff")
+
+
+class TestChannel:
+    """Tests for requests over the channel."""
+
+    def test_request(self, client):
+        """Test a command gets its result."""
+        result = client.request({"action": "height", "params": {"value": 5}})
+
+        assert result == {"success": True, "message": "height", "data": {"value": 5}}
+
+    def test_pipelined_requests(self, client):
+        """Test several commands in flight are answered by id."""
+        pending = [client.send({"action": f"cmd{i}", "params": {}}) for i in range(20)]
+
+        assert [p.result(5)["message"] for p in pending] == [f"cmd{i}" for i in range(20)]
+
+    def test_progress_stream(self, client):
+        """Test progress messages arrive before the result."""
+        seen = []
+        result = client.request(
+            {"action": "load", "params": {"steps": 3}},
+            on_progress=lambda message, data: seen.append((message, data["step"])),
+        )
+
+        assert result["success"]
+        assert seen == [("step 0", 0), ("step 1", 1), ("step 2", 2)]
+
+    def test_handler_error(self, client):
+        """Test a failing command is reported, not dropped."""
+        result = client.request({"action": "fail", "params": {}})
+
+        assert not result["success"]
+        assert "boom" in result["message"]
+
+    def test_timeout(self, client):
+        """Test a slow command times out and its late answer is ignored."""
+        with pytest.raises(TimeoutError):
+            client.request({"action": "slow", "params": {"delay": 0.3}}, timeout=0.05)
+
+        assert client.request({"action": "next", "params": {}})["message"] == "next"
+
+    def test_several_clients(self, server):
+        """Test clients on separate connections get their own answers."""
+        clients = [ChannelClient(server.path) for _ in range(3)]
+        for c in clients:
+            c.connect()
+        try:
+            results = [c.request({"action": f"client{i}", "params": {}}) for i, c in enumerate(clients)]
+            assert [r["message"] for r in results] == ["client0", "client1", "client2"]
+            assert server.client_count == 3
+        finally:
+            for c in clients:
+                c.close()
+
+    def test_ping(self, client):
+        """Test the heartbeat is answered."""
+        assert client.ping()
+
+    def test_server_stop_fails_pending(self, server):
+        """Test requests fail once the server goes away."""
+        client = ChannelClient(server.path)
+        client.connect()
+        pending = client.send({"action": "slow", "params": {"delay": 0.2}})
+        server.stop()
+
+        assert not pending.result(5)["success"]
+        assert not client.ping()
+        client.close()
+
+    def test_live_socket_not_replaced(self, server):
+        """Test a second server refuses a path a live session serves."""
+        with pytest.raises(OSError):
+            ChannelServer(echo_handler, server.path).start()
+
+
+class TestCommandInterpreter:
+    """Tests for send_command and the heartbeat over the channel."""
+
+    @pytest.fixture(autouse=True)
+    def channel_path(self, monkeypatch, tmp_path):
+        """Point the interpreter at a socket in the test directory."""
+        monkeypatch.setattr(command_interpreter, "CHANNEL_SOCKET", tmp_path / "channel.sock")
+        yield
+        if command_interpreter._client is not None:
+            command_interpreter._client.close()
+            command_interpreter._client = None
+
+    def test_not_connected(self):
+        """Test commands fail fast with no Blender session."""
+        assert not command_interpreter.is_blender_connected()
+        result = command_interpreter.send_command({"action": "status", "params": {}})
+
+        assert not result["success"]
+        assert "not connected" in result["message"]
+
+    def test_send_command(self, server):
+        """Test commands and the heartbeat go over the channel."""
+        assert command_interpreter.is_blender_connected()
+        result = command_interpreter.send_command({"action": "status", "params": {}})
+
+        assert result["success"]
+        assert result["message"] == "status"
+
+    def test_send_command_timeout(self, server):
+        """Test a slow command gives the timeout response."""
+        result = command_interpreter.send_command({"action": "slow", "params": {"delay": 0.3}}, timeout=0.05)
+
+        assert result == {"success": False, "message": "Timeout waiting for Blender response"}
@@ -0,0 +1,86 @@
+"""Tests for the headless cross-section engine."""
+
+import pytest
+
+from src.laser.cross_section import CrossSectionTool, create_multiple_sections
+from tests.mesh_helpers import mesh_of, prism, signed_area
+
+
+@pytest.fixture
+def hollow_box():
+    """A 20mm box with a 10mm cavity in the middle."""
+    return mesh_of(((0, 0, 0, 20, 20, 20), False), ((5, 5, 5, 15, 15, 15), True))
+
+
+class TestCrossSectionTool:
+    """Tests for CrossSectionTool on triangle arrays."""
+
+    def test_hole_is_kept(self, hollow_box):
+        """Test a section through a cavity keeps the hole."""
+        result = CrossSectionTool().section_at_height(hollow_box, 10.0)
+
+        outer = [p for p in result.paths if p.is_outer]
+        holes = [p for p in result.paths if not p.is_outer]
+        assert len(outer) == 1 and len(holes) == 1
+        assert signed_area(outer[0].points) == pytest.approx(400.0)
+        assert signed_area(holes[0].points) == pytest.approx(-100.0)
+        assert result.bounding_box == pytest.approx((0, 0, 20, 20))
+
+    def test_concave_outline(self):
+        """Test concave outlines are not replaced by their hull."""
+        outline = [(0, 0), (20, 0), (20, 10), (10, 10), (10, 20), (0, 20)]
+        result = CrossSectionTool().section_at_height(prism(outline, 0, 5), 2.5)
+
+        assert len(result.paths) == 1
+        assert result.paths[0].is_outer
+        assert signed_area(result.paths[0].points) == pytest.approx(300.0)
+        assert (10.0, 10.0) in result.paths[0].points
+
+    def test_reversed_winding_is_classified_by_nesting(self):
+        """Test outlines and holes come from nesting, not file winding."""
+        # Both boxes wound outward: the inner loop is still a hole by nesting
+        mesh = mesh_of(((0, 0, 0, 20, 20, 20), False), ((5, 5, 5, 15, 15, 15), False))
+        result = CrossSectionTool().section_at_height(mesh, 10.0)
+
+        holes = [p for p in result.paths if not p.is_outer]
+        assert len(holes) == 1
+        assert signed_area(holes[0].points) < 0
+
+    @pytest.mark.parametrize("axis, size", [("X", (30, 10)), ("Y", (20, 10)), ("Z", (20, 30))])
+    def test_axes(self, axis, size):
+        """Test sections along every axis."""
+        mesh = mesh_of(((0, 0, 0, 20, 30, 10), False))
+        result = CrossSectionTool().section_at_height(mesh, 5.0, axis=axis)
+
+        assert len(result.paths) == 1
+        assert result.paths[0].is_outer
+        assert (result.width, result.depth) == pytest.approx(size)
+        assert signed_area(result.paths[0].points) == pytest.approx(size[0] * size[1])
+
+    def test_invalid_axis(self, hollow_box):
+        """Test an unknown axis is rejected."""
+        with pytest.raises(ValueError):
+            CrossSectionTool().section_at_height(hollow_box, 1.0, axis="W")
+
+    def test_miss(self, hollow_box):
+        """Test a plane missing the mesh gives no paths."""
+        result = CrossSectionTool().section_at_height(hollow_box, 30.0)
+        assert result.paths == []
+        assert result.bounding_box == (0, 0, 0, 0)
+
+    def test_section_multiple(self, hollow_box):
+        """Test evenly spaced sections in one sweep."""
+        results = CrossSectionTool().section_multiple(hollow_box, 17.5, 2.5, 4)
+
+        assert [r.height for r in results] == pytest.approx([17.5, 12.5, 7.5, 2.5])
+        assert [len(r.paths) for r in results] == [1, 2, 2, 1]
+
+    def test_mesh_file(self, tmp_path, hollow_box):
+        """Test sectioning a mesh file path."""
+        path = tmp_path / "hollow.obj"
+        lines = [f"v {x} {y} {z}" for x, y, z in hollow_box.vertices]
+        lines += [f"f {a + 1} {b + 1} {c + 1}" for a, b, c in hollow_box.faces]
+        path.write_text("\n".join(lines) + "\n")
+
+        results = create_multiple_sections(str(path), 2.5, 17.5, 3)
+        assert [len(r.paths) for r in results] == [1, 2, 1]
@@ -4,6 +4,8 @@ import pytest
 from pathlib import Path
 import tempfile
 
+import numpy as np
+
 from src.monitoring.geometry_analyzer import (
     GeometryAnalysisResult,
     OverhangInfo,
@@ -12,7 +14,9 @@ from src.monitoring.geometry_analyzer import (
     GeometryIssue,
     IssueSeverity,
     analyze_geometry,
+    compute_thickness_field,
 )
+from src.mesh_io import load_mesh_features
 from src.monitoring.failure_predictor import (
     FailurePredictor,
     FailureRisk,
@@ -23,6 +27,45 @@ from src.monitoring.failure_predictor import (
 )
 
 
+def write_voxel_obj(path, xs, ys, zs, filled):
+    """Write the closed surface of filled grid cells as an OBJ file."""
+    coords = (xs, ys, zs)
+    filled = np.asarray(filled, dtype=bool)
+    index = {}
+    vertex_lines = []
+    face_lines = []
+
+    def vertex_id(point):
+        if point not in index:
+            index[point] = len(index) + 1
+            vertex_lines.append("v {} {} {}".format(*point))
+        return index[point]
+
+    for cell in zip(*np.nonzero(filled)):
+        for axis in range(3):
+            b, c = (axis + 1) % 3, (axis + 2) % 3
+            for side in (0, 1):
+                neighbour = list(cell)
+                neighbour[axis] += 1 if side else -1
+                if 0 <= neighbour[axis] < filled.shape[axis] and filled[tuple(neighbour)]:
+                    continue
+
+                corners = []
+                for db, dc in ((0, 0), (1, 0), (1, 1), (0, 1)):
+                    point = [0, 0, 0]
+                    point[axis] = coords[axis][cell[axis] + side]
+                    point[b] = coords[b][cell[b] + db]
+                    point[c] = coords[c][cell[c] + dc]
+                    corners.append(vertex_id(tuple(point)))
+                if not side:
+                    corners.reverse()
+
+                face_lines.append(f"f {corners[0]} {corners[1]} {corners[2]}")
+                face_lines.append(f"f {corners[0]} {corners[2]} {corners[3]}")
+
+    path.write_text("\n".join(vertex_lines + face_lines) + "\n")
+
+
 class TestGeometryAnalyzer:
     """Tests for geometry analysis."""
 
@@ -62,6 +105,118 @@ endsolid test
         # Should complete without errors
         assert isinstance(result, GeometryAnalysisResult)
 
+    def test_overhang_regions(self, tmp_path):
+        """Test connected overhang faces are reported as one region each."""
+        obj_file = tmp_path / "shelves.obj"
+        obj_file.write_text("""v 0 0 0
+v 10 0 0
+v 0 10 0
+v 0 0 10
+v 10 0 10
+v 10 10 10
+v 0 10 10
+v 20 0 10
+v 30 0 10
+v 30 10 10
+v 20 10 10
+f 1 3 2
+f 4 7 6
+f 4 6 5
+f 8 11 10
+f 8 10 9
+""")
+        result = analyze_geometry(str(obj_file))
+
+        # Two separate ceilings; the face on the bed is not an overhang
+        assert len(result.overhangs) == 2
+        for overhang in result.overhangs:
+            assert overhang.area_mm2 == pytest.approx(100.0)
+            assert overhang.angle == pytest.approx(90.0)
+            assert overhang.severity == IssueSeverity.CRITICAL
+            assert overhang.location[2] == pytest.approx(10.0)
+
+    def test_thin_wall_detected(self, tmp_path):
+        """Test a 0.3mm plate is measured and reported as one region."""
+        path = tmp_path / "plate.obj"
+        write_voxel_obj(path, [0, 20], [0, 0.3], [0, 10], np.ones((1, 1, 1)))
+
+        result = analyze_geometry(str(path))
+
+        assert len(result.thin_walls) == 1
+        wall = result.thin_walls[0]
+        assert wall.thickness_mm == pytest.approx(0.3, abs=1e-4)
+        assert wall.height_mm == pytest.approx(10.0)
+        assert wall.severity == IssueSeverity.CRITICAL
+        assert result.thickness_field.shape == (result.triangle_count,)
+
+    def test_thick_part_has_no_thin_walls(self, tmp_path):
+        """Test walls beyond the ray range are not reported."""
+        path = tmp_path / "cube.obj"
+        write_voxel_obj(path, [0, 10], [0, 10], [0, 10], np.ones((1, 1, 1)))
+
+        thickness, opposite = compute_thickness_field(load_mesh_features(path))
+
+        assert np.isinf(thickness).all()
+        assert (opposite == -1).all()
+        assert analyze_geometry(str(path)).thin_walls == []
+
+    def test_thickness_sampling(self, tmp_path):
+        """Test only sampled faces get a thickness value."""
+        path = tmp_path / "plate.obj"
+        write_voxel_obj(path, [0, 20], [0, 0.3], [0, 10], np.ones((1, 1, 1)))
+
+        thickness, _ = compute_thickness_field(load_mesh_features(path), max_samples=4)
+
+        assert (~np.isnan(thickness)).sum() == 4
+
+    def test_bridge_span(self, tmp_path):
+        """Test a deck between two pillars is a bridge of the gap length."""
+        filled = np.zeros((3, 1, 2), dtype=bool)
+        filled[[0, 2], 0, 0] = True
+        filled[:, 0, 1] = True
+        path = tmp_path / "arch.obj"
+        write_voxel_obj(path, [0, 5, 25, 30], [0, 8], [0, 10, 15], filled)
+
+        result = analyze_geometry(str(path))
+
+        assert len(result.bridges) == 1
+        bridge = result.bridges[0]
+        assert bridge.length_mm == pytest.approx(20.0)
+        assert bridge.width_mm == pytest.approx(8.0)
+        assert bridge.height_z == pytest.approx(10.0)
+        assert bridge.severity == IssueSeverity.WARNING
+
+    def test_cantilever_is_not_bridge(self, tmp_path):
+        """Test a ceiling anchored on one side only is not a bridge."""
+        filled = np.zeros((3, 1, 2), dtype=bool)
+        filled[0, 0, 0] = True
+        filled[:, 0, 1] = True
+        path = tmp_path / "shelf.obj"
+        write_voxel_obj(path, [0, 5, 25, 30], [0, 8], [0, 10, 15], filled)
+
+        result = analyze_geometry(str(path))
+
+        assert result.bridges == []
+        assert len(result.overhangs) == 1
+
+    def test_thickness_failure_keeps_other_analyses(self, tmp_path, monkeypatch):
+        """Test a failing thickness pass does not abort the whole analysis."""
+        def fail(mesh):
+            raise MemoryError("grid too large")
+
+        monkeypatch.setattr("src.monitoring.geometry_analyzer.compute_thickness_field", fail)
+        filled = np.zeros((3, 1, 2), dtype=bool)
+        filled[0, 0, 0] = True
+        filled[:, 0, 1] = True
+        path = tmp_path / "shelf.obj"
+        write_voxel_obj(path, [0, 5, 25, 30], [0, 8], [0, 10, 15], filled)
+
+        result = analyze_geometry(str(path))
+
+        assert result.thickness_field is None
+        assert result.thin_walls == []
+        assert len(result.overhangs) == 1
+
     def test_geometry_result_properties(self):
         """Test GeometryAnalysisResult properties."""
         result = GeometryAnalysisResult(
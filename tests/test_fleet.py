@@ -0,0 +1,282 @@
+"""Tests for the multi-printer fleet manager."""
+
+import threading
+import time
+
+import pytest
+
+from src.printer.connection import PrinterState
+from src.printer.mock import MockPrinter
+from src.queue.fleet import FleetConfig, FleetManager
+from src.queue.job_queue import JobStatus, PrintQueue
+
+
+def finish(mock, state=PrinterState.FINISHED):
+    """End a mock printer's simulated print with the given state."""
+    mock._printing = False
+    if mock._print_thread:
+        mock._print_thread.join()
+    mock.status.state = state
+    mock._notify_callbacks()
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Empty print queue."""
+    return PrintQueue(tmp_path / "queue.json")
+
+
+@pytest.fixture
+def model(tmp_path):
+    """A small model file."""
+    path = tmp_path / "part.stl"
+    path.write_text("solid part\nendsolid part")
+    return str(path)
+
+
+@pytest.fixture
+def fleet(queue):
+    """Fleet manager that disconnects its printers afterwards."""
+    fleet = FleetManager(queue, FleetConfig(max_parallel=64))
+    yield fleet
+    for entry in fleet.printers.values():
+        entry.printer._printing = False
+    fleet.disconnect_all()
+
+
+class TestFleetDispatch:
+    """Tests for dispatching one queue across printers."""
+
+    def test_large_fleet(self, fleet, queue, model):
+        """Test 50 simulated printers connect together and each takes one job."""
+        for i in range(60):
+            queue.add_job(file_path=model, name=f"job{i}")
+        for i in range(50):
+            fleet.add_printer(f"p{i:02d}", MockPrinter())
+
+        start = time.monotonic()
+        assert fleet.connect_all() == 50
+        assert time.monotonic() - start < 5
+
+        busy = [entry for entry in fleet.printers.values() if entry.job]
+        assert len(busy) == 50
+        assert len({entry.job.id for entry in busy}) == 50
+        assert all(entry.printer.status.state != PrinterState.IDLE for entry in busy)
+        assert queue.count()[JobStatus.PRINTING] == 50
+        assert queue.count()[JobStatus.PENDING] == 10
+
+        metrics = fleet.get_metrics()
+        assert metrics["dispatches"] == 50
+        assert metrics["printers_busy"] == 50
+        assert 0 <= metrics["dispatch_latency"]["p50"] <= metrics["dispatch_latency"]["max"] < 5
+
+    def test_material_and_nozzle_matching(self, fleet, queue, model):
+        """Test jobs go only to printers with their nozzle and material."""
+        fleet.add_printer("pla", MockPrinter(), materials={0: ("PLA", "white")})
+        fleet.add_printer("petg", MockPrinter(), materials={0: ("PLA", "black"), 1: ("PETG", "black")})
+        fleet.add_printer("wide", MockPrinter(), nozzle_diameter=0.6, materials={0: ("PLA", "white")})
+        fleet.connect_all()
+
+        petg = queue.add_job(file_path=model, material="PETG", color="black")
+        wide = queue.add_job(file_path=model, material="PLA", nozzle_diameter=0.6)
+        abs_job = queue.add_job(file_path=model, material="ABS")
+        started = dict((job.id, name) for name, job in fleet.dispatch())
+
+        assert started == {petg.id: "petg", wide.id: "wide"}
+        assert petg.ams_slot == 1
+        assert abs_job.status == JobStatus.PENDING
+
+    def test_prefers_loaded_color(self, fleet, queue, model):
+        """Test a printer with the job's colour loaded wins over a material-only match."""
+        fleet.add_printer("a", MockPrinter(), materials={0: ("PLA", "white")})
+        fleet.add_printer("b", MockPrinter(), materials={0: ("PLA", "white"), 2: ("PLA", "red")})
+        fleet.connect_all()
+
+        job = queue.add_job(file_path=model, material="pla", color="red")
+
+        assert fleet.dispatch() == [("b", job)]
+        assert job.ams_slot == 2
+
+    def test_failed_launch_requeues(self, queue, model):
+        """Test a job the printer refuses goes back to the queue."""
+        fleet = FleetManager(queue, launcher=lambda printer, job: printer.start_print("missing.3mf"))
+        fleet.add_printer("p", MockPrinter())
+        fleet.connect_all()
+
+        job = queue.add_job(file_path=model)
+
+        assert fleet.dispatch() == []
+        assert job.status == JobStatus.PENDING
+        assert fleet.printers["p"].available
+        assert "File not found" in fleet.printers["p"].last_error
+        assert fleet.printers["p"].backing_off(time.monotonic())
+        assert fleet.dispatch() == []
+
+    def test_failed_launch_retries_elsewhere(self, queue, model):
+        """Test a refused job moves to another printer without the first printer's AMS slot."""
+        seen = []
+
+        def launcher(printer, job):
+            seen.append((fleet_names[id(printer)], job.ams_slot))
+            if printer is refusing:
+                return printer.start_print("missing.3mf")
+            return printer.start_print("part.stl")
+
+        fleet = FleetManager(queue, launcher=launcher)
+        refusing, accepting = MockPrinter(), MockPrinter()
+        accepting.upload_file("part.stl", 1024)
+        fleet_names = {id(refusing): "a", id(accepting): "b"}
+        fleet.add_printer("a", refusing, materials={3: ("PLA", "red")})
+        fleet.add_printer("b", accepting)
+        job = queue.add_job(file_path=model, material="PLA", color="red")
+        fleet.printers["b"].plate_clear = False
+        fleet.connect_all()
+
+        assert seen == [("a", 3)]
+        assert job.status == JobStatus.PENDING
+        assert job.ams_slot is None
+
+        fleet.plate_cleared("b")
+
+        assert seen == [("a", 3), ("b", None)]
+        assert fleet.printers["b"].job is job
+        accepting._printing = False
+        fleet.disconnect_all()
+
+    def test_backoff_expiry_redispatches(self, queue, model):
+        """Test a backed-off printer is offered jobs again once its back-off ends."""
+        calls = []
+
+        def launcher(printer, job):
+            calls.append(job.id)
+            return printer.start_print("part.stl" if len(calls) > 1 else "missing.3mf")
+
+        fleet = FleetManager(queue, FleetConfig(launch_backoff=0.0), launcher=launcher)
+        mock = MockPrinter()
+        mock.upload_file("part.stl", 1024)
+        fleet.add_printer("p", mock)
+        fleet.connect_all()
+        job = queue.add_job(file_path=model)
+
+        assert fleet.dispatch() == []
+        mock._notify_callbacks()
+
+        assert calls == [job.id, job.id]
+        assert job.status == JobStatus.PRINTING
+        mock._printing = False
+        fleet.disconnect_all()
+
+
+class TestFleetLifecycle:
+    """Tests for following printers through their jobs."""
+
+    def test_callbacks_run_without_lock(self, fleet, queue, model):
+        """Test completion callbacks run after the fleet lock is released."""
+        held = []
+
+        def on_complete(job, name):
+            # Another thread must be able to take the lock while the callback runs
+            def probe():
+                acquired = fleet._lock.acquire(timeout=1)
+                if acquired:
+                    fleet._lock.release()
+                held.append(not acquired)
+
+            thread = threading.Thread(target=probe)
+            thread.start()
+            thread.join()
+
+        fleet.on_job_complete = on_complete
+        queue.add_job(file_path=model)
+        fleet.add_printer("p", MockPrinter())
+        fleet.connect_all()
+
+        finish(fleet.printers["p"].printer)
+
+        assert held == [False]
+
+    def test_next_job_after_plate_cleared(self, fleet, queue, model):
+        """Test a finished printer waits for its plate to be cleared."""
+        completed = []
+        fleet.on_job_complete = lambda job, name: completed.append((job.id, name))
+        first = queue.add_job(file_path=model)
+        second = queue.add_job(file_path=model)
+        fleet.add_printer("p", MockPrinter())
+        fleet.connect_all()
+        mock = fleet.printers["p"].printer
+
+        finish(mock)
+
+        assert first.status == JobStatus.COMPLETED
+        assert completed == [(first.id, "p")]
+        assert second.status == JobStatus.PENDING
+
+        fleet.plate_cleared("p")
+
+        assert second.status == JobStatus.PRINTING
+        assert fleet.printers["p"].job is second
+        assert fleet.printers["p"].jobs_completed == 1
+        assert 0 < fleet.get_metrics()["utilisation"]["p"] <= 1
+
+    def test_error_fails_job(self, queue, model):
+        """Test a printer error fails its job and, without plate checks, frees the printer."""
+        fleet = FleetManager(queue, FleetConfig(require_plate_clear=False))
+        failed = []
+        fleet.on_job_failed = lambda job, message: failed.append(message)
+        first = queue.add_job(file_path=model)
+        fleet.add_printer("p", MockPrinter())
+        fleet.connect_all()
+        mock = fleet.printers["p"].printer
+
+        finish(mock, PrinterState.ERROR)
+        assert first.status == JobStatus.FAILED
+        assert failed == ["Printer p reported error"]
+
+        second = queue.add_job(file_path=model)
+        finish(mock, PrinterState.IDLE)
+
+        assert second.status == JobStatus.PRINTING
+        mock._printing = False
+        fleet.disconnect_all()
+
+    def test_error_before_start_fails_job(self, queue, model):
+        """Test an error reported before the job ever ran fails it instead of leaving it assigned."""
+        fleet = FleetManager(queue, launcher=lambda printer, job: printer.upload_file("part.stl", 1024))
+        failed = []
+        fleet.on_job_failed = lambda job, message: failed.append(message)
+        job = queue.add_job(file_path=model)
+        fleet.add_printer("p", MockPrinter())
+        fleet.connect_all()
+        mock = fleet.printers["p"].printer
+        assert fleet.printers["p"].job is job
+
+        mock.status.state = PrinterState.ERROR
+        mock._notify_callbacks()
+
+        assert job.status == JobStatus.FAILED
+        assert failed == ["Printer p reported error"]
+        assert fleet.printers["p"].job is None
+        assert fleet.printers["p"].backing_off(time.monotonic())
+        fleet.disconnect_all()
+
+    def test_start_timeout_fails_job(self, queue, model):
+        """Test a job the printer never starts fails once the start timeout passes."""
+        fleet = FleetManager(
+            queue,
+            FleetConfig(start_timeout=0.0),
+            launcher=lambda printer, job: printer.upload_file("part.stl", 1024),
+        )
+        failed = []
+        fleet.on_job_failed = lambda job, message: failed.append(message)
+        job = queue.add_job(file_path=model)
+        fleet.add_printer("p", MockPrinter())
+        fleet.connect_all()
+        mock = fleet.printers["p"].printer
+
+        mock._notify_callbacks()
+
+        assert job.status == JobStatus.FAILED
+        assert failed == ["Printer p did not start the job within 0s"]
+        assert fleet.printers["p"].plate_clear
+        assert fleet.printers["p"].jobs_failed == 1
+        fleet.disconnect_all()
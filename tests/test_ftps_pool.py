@@ -0,0 +1,306 @@
+"""Tests for pooled FTPS sessions and resumable uploads."""
+
+import ftplib
+import hashlib
+import time
+
+import pytest
+
+from src.printer import file_transfer, ftps_pool
+from src.printer.file_transfer import PrinterFileTransfer
+from src.printer.ftps_pool import BLOCK_SIZE, IDLE_CHECK_AFTER, FTPSSessionPool
+
+
+class FakeServer:
+    """In-memory FTP server state shared by the sessions connected to it."""
+
+    def __init__(self, hashes=True):
+        self.files = {}
+        self.hashes = hashes
+        self.logins = 0
+        self.drop_after = None  # Bytes the next STOR receives before the connection drops
+        self.corrupt = False
+        self.block_sizes = []
+        self.reads = 0
+        self.refuse_connects = 0  # Connections refused before any are accepted
+        self.directories = []
+
+    def connect(self):
+        """Factory for sessions to this server."""
+        return FakeFTP(self)
+
+
+class FakeFTP:
+    """The parts of ftplib.FTP the pool uses, backed by a FakeServer."""
+
+    def __init__(self, server):
+        self.server = server
+        self.dead = False
+
+    def _check(self):
+        if self.dead:
+            raise EOFError("connection closed")
+
+    def connect(self, host, port, timeout=None):
+        if self.server.refuse_connects:
+            self.server.refuse_connects -= 1
+            raise ConnectionRefusedError("connection refused")
+        self.timeout = timeout
+        return "220 ready"
+
+    def login(self, user, password):
+        if password != "secret":
+            raise ftplib.error_perm("530 Login incorrect")
+        self.server.logins += 1
+        return "230 ok"
+
+    def voidcmd(self, cmd):
+        self._check()
+        return "200 ok"
+
+    def sendcmd(self, cmd):
+        self._check()
+        command, path = cmd.split(" ", 1)
+        if not self.server.hashes or command != "XSHA256":
+            raise ftplib.error_perm("500 Unknown command")
+        return f"250 {hashlib.sha256(bytes(self.server.files[path])).hexdigest()}"
+
+    def storbinary(self, cmd, fp, blocksize=8192, callback=None, rest=None):
+        self._check()
+        self.server.block_sizes.append(blocksize)
+        path = cmd[len("STOR "):]
+        data = self.server.files.setdefault(path, bytearray())
+        del data[rest or 0:]
+        while True:
+            block = fp.read(blocksize)
+            if not block:
+                break
+            if self.server.drop_after is not None:
+                keep = max(self.server.drop_after, 0)
+                if keep < len(block):
+                    data.extend(block[:keep])
+                    self.server.drop_after = None
+                    self.dead = True
+                    raise ConnectionResetError("connection reset by peer")
+                self.server.drop_after -= len(block)
+            data.extend(block)
+            if callback:
+                callback(block)
+        if self.server.corrupt:
+            data[0] ^= 0xFF
+        return "226 done"
+
+    def size(self, path):
+        self._check()
+        if path not in self.server.files:
+            raise ftplib.error_perm("550 No such file")
+        return len(self.server.files[path])
+
+    def retrbinary(self, cmd, callback, blocksize=8192, rest=None):
+        self._check()
+        self.server.reads += 1
+        data = bytes(self.server.files[cmd[len("RETR "):]])
+        for i in range(0, len(data), blocksize):
+            callback(data[i:i + blocksize])
+        return "226 done"
+
+    def retrlines(self, cmd, callback):
+        self._check()
+        directory = cmd[len("LIST "):].rstrip("/") + "/"
+        for path, data in self.server.files.items():
+            if path.startswith(directory):
+                callback(f"-rw-r--r-- 1 user group {len(data)} Jan 1 00:00 {path[len(directory):]}")
+        return "226 done"
+
+    def delete(self, path):
+        self._check()
+        if path not in self.server.files:
+            raise ftplib.error_perm("550 No such file")
+        del self.server.files[path]
+        return "250 deleted"
+
+    def mkd(self, path):
+        self.server.directories.append(path)
+        raise ftplib.error_perm("550 exists")
+
+    def quit(self):
+        self.dead = True
+
+    def close(self):
+        self.dead = True
+
+
+@pytest.fixture
+def server():
+    """Fake printer FTP server."""
+    return FakeServer()
+
+
+@pytest.fixture
+def pool(server, monkeypatch):
+    """Session pool to the fake server, retrying without delay."""
+    monkeypatch.setattr(ftps_pool, "RETRY_DELAY", 0)
+    with FTPSSessionPool("printer", "secret", session_factory=server.connect) as pool:
+        yield pool
+
+
+@pytest.fixture
+def payload(tmp_path):
+    """A 1 MB file of varied bytes."""
+    path = tmp_path / "model.3mf"
+    path.write_bytes(bytes(range(256)) * 4096)
+    return path
+
+
+class TestSessionPool:
+    """Tests for session reuse."""
+
+    def test_batch_reuses_session(self, pool, server, payload):
+        """Test a batch of uploads logs in once."""
+        for i in range(5):
+            assert pool.upload(payload, f"/cache/part{i}.3mf").success
+
+        assert server.logins == 1
+        assert pool.sessions_opened == 1
+        assert pool.sessions_reused == 4
+        assert pool.idle_count == 1
+
+    def test_stale_session_replaced(self, pool, server, payload):
+        """Test an idle session that died is replaced before use."""
+        with pool.session() as ftp:
+            pass
+        ftp.dead = True
+        pool._idle[0] = (ftp, time.monotonic() - IDLE_CHECK_AFTER - 1)
+
+        assert pool.upload(payload, "/cache/model.3mf").success
+        assert pool.sessions_opened == 2
+
+    def test_refused_command_keeps_session(self, pool):
+        """Test a command the server refuses does not cost the session."""
+        with pytest.raises(ftplib.error_perm):
+            pool.delete("/cache/missing.3mf")
+
+        assert pool.idle_count == 1
+
+    def test_closed_pool(self, pool):
+        """Test a closed pool hands out no sessions."""
+        pool.close()
+
+        with pytest.raises(RuntimeError):
+            with pool.session():
+                pass
+
+
+class TestUpload:
+    """Tests for resumable, verified uploads."""
+
+    def test_large_blocks_and_checksum(self, pool, server, payload):
+        """Test uploads stream in large blocks and verify by server checksum."""
+        result = pool.upload(payload, "/cache/model.3mf")
+
+        assert result.success
+        assert server.block_sizes == [BLOCK_SIZE]
+        assert server.files["/cache/model.3mf"] == payload.read_bytes()
+        assert result.verified == "checksum"
+        assert result.checksum == f"sha256:{hashlib.sha256(payload.read_bytes()).hexdigest()}"
+
+    def test_size_without_checksum_command(self, pool, server, payload):
+        """Test only the size is checked, without a readback, when the server cannot hash files."""
+        server.hashes = False
+
+        assert pool.upload(payload, "/cache/model.3mf").verified == "size"
+        assert server.reads == 0
+
+    def test_readback_on_request(self, pool, server, payload):
+        """Test the file is read back when asked and the server cannot hash it."""
+        server.hashes = False
+
+        assert pool.upload(payload, "/cache/model.3mf", readback=True).verified == "readback"
+        assert server.reads == 1
+
+    def test_resume_after_drop(self, pool, server, payload):
+        """Test a dropped upload continues from what the printer already has."""
+        server.drop_after = 300_000
+        progress = []
+
+        result = pool.upload(payload, "/cache/model.3mf", block_size=65536,
+                             progress_callback=lambda sent, total: progress.append(sent))
+
+        size = payload.stat().st_size
+        assert result.success
+        assert result.attempts == 2
+        assert result.resumed_from == [300_000]
+        assert result.bytes_sent == size - 300_000 + 4 * 65536
+        assert server.files["/cache/model.3mf"] == payload.read_bytes()
+        assert progress[-1] == size
+
+    def test_retry_before_sending_overwrites_stale_file(self, pool, server, payload):
+        """Test a retry that sent nothing yet replaces an older file instead of appending to it."""
+        server.files["/cache/model.3mf"] = bytearray(b"old" * 100)
+        server.hashes = False
+        server.refuse_connects = 1
+
+        result = pool.upload(payload, "/cache/model.3mf")
+
+        assert result.success
+        assert result.attempts == 2
+        assert result.resumed_from == []
+        assert server.files["/cache/model.3mf"] == payload.read_bytes()
+        assert server.directories == ["/cache"]
+
+    def test_gives_up_after_retries(self, pool, server, payload, monkeypatch):
+        """Test an upload that keeps dropping fails after the retry limit."""
+        monkeypatch.setattr(FakeFTP, "_check", lambda self: (_ for _ in ()).throw(EOFError("down")))
+
+        result = pool.upload(payload, "/cache/model.3mf", retries=2)
+
+        assert not result.success
+        assert result.attempts == 3
+        assert "after 3 attempts" in result.message
+
+    def test_checksum_mismatch(self, pool, server, payload):
+        """Test a corrupted upload is reported."""
+        server.corrupt = True
+
+        result = pool.upload(payload, "/cache/model.3mf")
+
+        assert not result.success
+        assert "mismatch" in result.message
+
+
+class TestPrinterFileTransfer:
+    """Tests for PrinterFileTransfer on the shared pool."""
+
+    def test_transfers_share_sessions(self, pool, server, payload, monkeypatch):
+        """Test separate transfer objects to one printer reuse the same session."""
+        monkeypatch.setattr(file_transfer, "get_ftps_pool", lambda ip, code, port: pool)
+
+        for name in ("a.3mf", "b.3mf"):
+            transfer = PrinterFileTransfer("printer", "secret")
+            assert transfer.connect()
+            result = transfer.upload_file(payload, f"/cache/{name}")
+            transfer.disconnect()
+            assert result.success
+            assert result.bytes_transferred == payload.stat().st_size
+
+        transfer = PrinterFileTransfer("printer", "secret")
+        transfer.connect()
+        assert sorted(f.name for f in transfer.list_files("/cache")) == ["a.3mf", "b.3mf"]
+        assert transfer.file_exists("/cache/a.3mf")
+        assert transfer.delete_file("/cache/a.3mf").success
+        assert not transfer.file_exists("/cache/a.3mf")
+        assert server.logins == 1
+
+    def test_timeout_is_per_session(self, pool, server, payload, monkeypatch):
+        """Test a transfer's timeout applies to its sessions without changing the shared pool."""
+        monkeypatch.setattr(file_transfer, "get_ftps_pool", lambda ip, code, port: pool)
+        default = pool.timeout
+
+        transfer = PrinterFileTransfer("printer", "secret")
+        assert transfer.connect(timeout=5.0)
+
+        assert pool.timeout == default
+        with pool.session() as ftp:
+            assert ftp.timeout == default
+        with pool.session(5.0) as ftp:
+            assert ftp.timeout == 5.0
@@ -0,0 +1,198 @@
+"""Tests for the streaming G-code analyzer."""
+
+import math
+import zipfile
+
+import pytest
+
+from src.estimator import gcode_analyzer
+from src.estimator.cost_estimator import CostEstimator
+from src.estimator.gcode_analyzer import (
+    MotionLimits,
+    analyze_3mf,
+    analyze_gcode,
+    analyze_gcode_bytes,
+    clear_analysis_cache,
+    write_sample_gcode,
+)
+from src.printer.print_preview import create_ams_config, generate_preview
+from src.queue.job_queue import PrintQueue
+
+# 100 mm/s moves at 1000 mm/s²: 5 mm to reach speed, 0.1 s each way
+HEADER = "G90\nM83\nM204 S1000\n"
+
+
+def analyze(text, **kwargs):
+    """Analyze G-code text."""
+    return analyze_gcode_bytes(text.encode(), **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """Start every test with an empty analysis cache."""
+    clear_analysis_cache()
+    yield
+    clear_analysis_cache()
+
+
+@pytest.fixture
+def sample(tmp_path):
+    """A small synthetic sliced file."""
+    path = tmp_path / "sample.gcode"
+    write_sample_gcode(path, 0.3)
+    return path
+
+
+class TestMotion:
+    """Tests for timing moves through the planner model."""
+
+    def test_single_move(self):
+        """Test a move from rest accelerates, cruises and stops."""
+        result = analyze(HEADER + "G1 X100 E5 F6000\n")
+
+        assert result.total_time_seconds == pytest.approx(1.1)
+        assert result.extrusion_mm == pytest.approx(5.0)
+        assert result.move_count == 1
+
+    def test_straight_junction_keeps_speed(self):
+        """Test collinear moves take as long as one move, and a reversal stops."""
+        straight = analyze(HEADER + "G1 X50 F6000\nG1 X100\n")
+        reverse = analyze(HEADER + "G1 X50 F6000\nG1 X0\n")
+
+        assert straight.total_time_seconds == pytest.approx(1.1)
+        assert reverse.total_time_seconds == pytest.approx(1.2)
+
+    def test_corner_slows_to_junction_speed(self):
+        """Test a right-angle corner is taken at the junction deviation speed."""
+        limits = MotionLimits(junction_deviation=0.05)
+        result = analyze(HEADER + "G1 X100 F6000\nG1 X100 Y100\n", limits=limits)
+
+        sin_half = math.sqrt(0.5)
+        corner = math.sqrt(1000 * 0.05 * sin_half / (1 - sin_half))
+        braking = (100 - corner) / 1000
+        cruise = (100 - 5 - (100 ** 2 - corner ** 2) / 2000) / 100
+        assert result.total_time_seconds == pytest.approx(2 * (0.1 + braking + cruise))
+
+    def test_arc_and_dwell(self):
+        """Test arcs are timed along their length and dwells add their time."""
+        result = analyze(
+            "G90\nM83\nM204 S100000\nG1 X10 F600\nG4 P1500\nG3 X-10 Y0 I-10 J0 E2\n",
+            limits=MotionLimits(max_acceleration=100000),
+        )
+
+        assert result.total_time_seconds == pytest.approx(1.0 + 1.5 + math.pi, rel=1e-3)
+        assert result.extrusion_mm == pytest.approx(2.0)
+
+
+class TestExtrusionAndLayers:
+    """Tests for filament and layer statistics."""
+
+    def test_absolute_extrusion_with_resets(self):
+        """Test absolute E with G92 resets matches the same moves in relative E."""
+        absolute = analyze("M82\nG92 E0\nG1 Z0.2 F600\nG1 X10 E1 F3000\nG1 X20 E2\nG92 E0\n"
+                           "G1 E-0.5 F1800\nG1 E0\nG1 X30 E1.5 F3000 ; E99\n")
+        relative = analyze("M83\nG1 Z0.2 F600\nG1 X10 E1 F3000\nG1 X20 E1\n"
+                           "G1 E-0.5 F1800\nG1 E0.5\nG1 X30 E1.5 F3000 ; E99\n")
+
+        assert absolute.extrusion_mm == pytest.approx(3.5)
+        assert relative.extrusion_mm == pytest.approx(3.5)
+        assert absolute.total_time_seconds == pytest.approx(relative.total_time_seconds)
+        limits = MotionLimits()
+        assert absolute.filament_grams == pytest.approx(3.5 * limits.filament_area * 1.24 / 1000)
+
+    def test_layers_and_histogram(self):
+        """Test layers start where extrusion changes height, travel hops do not."""
+        layers = "".join(
+            f"G1 Z{z + 0.4:.2f} F600\nG1 X0 Y0\nG1 Z{z:.2f}\nG1 X10 E1\nG1 X0 E1\n"
+            for z in (0.2, 0.4, 0.6, 0.7, 0.8)
+        )
+        result = analyze("M83\n" + layers + "T1\nG1 X10 E0.5\n")
+
+        assert [layer.z for layer in result.layers] == [0.2, 0.4, 0.6, 0.7, 0.8]
+        assert [layer.height for layer in result.layers] == pytest.approx([0.2, 0.2, 0.2, 0.1, 0.1])
+        assert result.layer_height_histogram == {0.1: 2, 0.2: 3}
+        assert result.layers[-1].extrusion_mm == pytest.approx(2.5)
+        assert sum(layer.time_seconds for layer in result.layers) == pytest.approx(result.total_time_seconds)
+        assert result.extrusion_by_tool == {0: pytest.approx(10.0), 1: pytest.approx(0.5)}
+        assert result.max_z == pytest.approx(0.8)
+
+
+class TestStreaming:
+    """Tests for chunked parsing and caching."""
+
+    def test_chunks_match_whole_file(self, sample):
+        """Test small chunks, parsed in order or by workers, give the same result."""
+        whole = analyze_gcode(sample, use_cache=False)
+        chunked = analyze_gcode(sample, use_cache=False, chunk_bytes=20_000)
+        parallel = analyze_gcode(sample, use_cache=False, chunk_bytes=100_000, workers=2)
+
+        assert whole.move_count > 5000
+        for result in (chunked, parallel):
+            assert result.move_count == whole.move_count
+            assert result.total_layers == whole.total_layers
+            assert result.extrusion_mm == pytest.approx(whole.extrusion_mm)
+            assert result.total_time_seconds == pytest.approx(whole.total_time_seconds, rel=1e-9)
+
+    def test_cached_by_content(self, sample, tmp_path):
+        """Test a file with the same content reuses the analysis, and edits do not."""
+        first = analyze_gcode(sample)
+        copy = tmp_path / "copy.gcode"
+        copy.write_bytes(sample.read_bytes())
+
+        assert analyze_gcode(copy) is first
+        assert first.content_hash
+
+        with open(copy, "a") as f:
+            f.write("G1 X0 Y0 F12000\n")
+        assert analyze_gcode(copy) is not first
+
+    def test_hash_memo_bounded(self, tmp_path, monkeypatch):
+        """Test remembered file hashes are capped, dropping the least recently used."""
+        monkeypatch.setattr(gcode_analyzer, "HASH_ENTRIES", 2)
+
+        for i in range(4):
+            path = tmp_path / f"part{i}.gcode"
+            path.write_text(HEADER + f"G1 X{i + 1} F6000\n")
+            analyze_gcode(path)
+
+        assert [stamp[0] for stamp in gcode_analyzer._hashes] == [
+            str((tmp_path / f"part{i}.gcode").resolve()) for i in (2, 3)
+        ]
+
+
+class TestIntegration:
+    """Tests for previews, queue and cost estimates using the analyzer."""
+
+    def test_preview_reads_moves(self, sample, tmp_path):
+        """Test previews of G-code and sliced 3MF files use the analysis."""
+        analysis = analyze_gcode(sample)
+        sliced = tmp_path / "part.3mf"
+        with zipfile.ZipFile(sliced, "w") as archive:
+            archive.writestr("Metadata/plate_1.gcode", sample.read_bytes())
+        config = create_ams_config(["pla"])
+
+        for path in (sample, sliced):
+            estimate = generate_preview(str(path), config).estimate
+            assert estimate.total_time_seconds == pytest.approx(analysis.total_time_seconds)
+            assert estimate.total_layers == analysis.total_layers
+            assert estimate.material_usage_grams[1] == pytest.approx(analysis.filament_grams)
+        assert analyze_3mf(sliced).content_hash != analysis.content_hash
+
+    def test_queue_and_cost_use_moves(self, sample, tmp_path):
+        """Test queued jobs and cost estimates take their time and filament from the file."""
+        analysis = analyze_gcode(sample)
+        queue = PrintQueue(tmp_path / "queue.json")
+
+        job = queue.add_job(str(sample))
+        manual = queue.add_job(str(sample), estimated_time_seconds=60)
+        cost = CostEstimator().estimate_from_gcode(sample, material="petg")
+
+        assert job.estimated_time_seconds == round(analysis.total_time_seconds)
+        assert job.total_layers == analysis.total_layers
+        assert job.estimated_filament_grams == pytest.approx(analysis.filament_grams)
+        assert manual.estimated_time_seconds == 60
+        assert cost.print_time_seconds == analysis.total_time_seconds
+        assert cost.filament_length_meters == pytest.approx(analysis.extrusion_mm / 1000)
+        assert cost.total_weight_grams == pytest.approx(analysis.filament_grams * 1.27 / 1.24)
+        assert cost.layer_height_mm == 0.2
+        assert cost.total_cost > cost.cost_breakdown.material_cost > 0
@@ -0,0 +1,561 @@
+"""Tests for shared mesh I/O module."""
+
+import zipfile
+
+import numpy as np
+import pytest
+
+from src.mesh_io import (
+    MeshCache,
+    MeshData,
+    MeshFeatures,
+    MeshStats,
+    TriangleGrid,
+    boundary_loop_count,
+    close_pairs,
+    cluster_points,
+    connected_components,
+    edge_incidence,
+    face_adjacency,
+    intersect_pairs,
+    is_binary_stl,
+    load_mesh,
+    merge_duplicate_vertices,
+    read_3mf,
+    read_obj,
+    read_stl,
+    scan_folder,
+    scan_mesh,
+    scan_paths,
+    scan_stl,
+    weld_points,
+)
+from src.mesh_io import cache as mesh_cache
+from src.mesh_io.scan import scan_ascii_stl, scan_binary_stl
+from tests.mesh_helpers import write_ascii_stl, write_binary_stl
+
+# Closed unit-10 cube as 12 outward-wound triangles
+CUBE_TRIANGLES = [
+    [(0, 0, 0), (0, 10, 0), (10, 10, 0)],
+    [(0, 0, 0), (10, 10, 0), (10, 0, 0)],
+    [(0, 0, 10), (10, 0, 10), (10, 10, 10)],
+    [(0, 0, 10), (10, 10, 10), (0, 10, 10)],
+    [(0, 0, 0), (10, 0, 0), (10, 0, 10)],
+    [(0, 0, 0), (10, 0, 10), (0, 0, 10)],
+    [(0, 10, 0), (0, 10, 10), (10, 10, 10)],
+    [(0, 10, 0), (10, 10, 10), (10, 10, 0)],
+    [(0, 0, 0), (0, 0, 10), (0, 10, 10)],
+    [(0, 0, 0), (0, 10, 10), (0, 10, 0)],
+    [(10, 0, 0), (10, 10, 0), (10, 10, 10)],
+    [(10, 0, 0), (10, 10, 10), (10, 0, 10)],
+]
+
+
+class TestBinarySTL:
+    """Tests for binary STL loading."""
+
+    def test_detect_binary(self, tmp_path):
+        """Test binary detection by file size."""
+        path = tmp_path / "cube.stl"
+        write_binary_stl(path, CUBE_TRIANGLES)
+
+        assert is_binary_stl(path)
+
+    def test_binary_with_solid_header(self, tmp_path):
+        """Test binary STL whose header starts with 'solid'."""
+        path = tmp_path / "cube.stl"
+        write_binary_stl(path, CUBE_TRIANGLES, header=b"solid exported by slicer")
+
+        mesh = read_stl(path)
+
+        assert mesh.face_count == 12
+
+    def test_padded_binary(self, tmp_path):
+        """Test bytes past the last record are ignored, not parsed as ASCII."""
+        path = tmp_path / "cube.stl"
+        write_binary_stl(path, CUBE_TRIANGLES)
+        with open(path, "ab") as f:
+            f.write(b"\x00" * 64)
+
+        assert is_binary_stl(path)
+        assert read_stl(path).face_count == 12
+        assert scan_stl(path).triangle_count == 12
+
+    def test_triangles_contiguous(self, tmp_path):
+        """Test binary triangles are contiguous float32."""
+        path = tmp_path / "cube.stl"
+        write_binary_stl(path, CUBE_TRIANGLES)
+
+        mesh = load_mesh(path)
+
+        assert mesh.triangles.shape == (12, 3, 3)
+        assert mesh.triangles.dtype == np.float32
+        assert mesh.triangles.flags["C_CONTIGUOUS"]
+
+    def test_volume_and_area(self, tmp_path):
+        """Test derived volume and area."""
+        path = tmp_path / "cube.stl"
+        write_binary_stl(path, CUBE_TRIANGLES)
+
+        mesh = load_mesh(path)
+
+        assert mesh.signed_volume() == pytest.approx(1000.0)
+        assert mesh.surface_area() == pytest.approx(600.0)
+        assert mesh.dimensions() == (10.0, 10.0, 10.0)
+
+
+class TestAsciiSTL:
+    """Tests for ASCII STL loading."""
+
+    def test_load_ascii(self, tmp_path):
+        """Test ASCII STL loads the same as binary."""
+        path = tmp_path / "cube.stl"
+        write_ascii_stl(path, CUBE_TRIANGLES)
+
+        mesh = load_mesh(path)
+
+        assert not is_binary_stl(path)
+        assert mesh.face_count == 12
+        assert mesh.signed_volume() == pytest.approx(1000.0)
+
+    def test_stored_normals(self, tmp_path):
+        """Test facet normals are kept when present."""
+        path = tmp_path / "tri.stl"
+        path.write_text("""solid test
+facet normal 0.866 0 -0.5
+  outer loop
+    vertex 0 0 5
+    vertex 10 0 5
+    vertex 5 10 8
+  endloop
+endfacet
+endsolid test""")
+
+        mesh = load_mesh(path)
+
+        assert mesh.normals is not None
+        assert mesh.normals[0][2] == pytest.approx(-0.5)
+
+
+class TestOBJ:
+    """Tests for OBJ loading."""
+
+    def test_quad_triangulation(self, tmp_path):
+        """Test quads are fan-triangulated."""
+        path = tmp_path / "quad.obj"
+        path.write_text("v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf 1 2 3 4\n")
+
+        mesh = read_obj(path)
+
+        assert mesh.vertex_count == 4
+        assert mesh.face_count == 2
+
+    def test_slash_and_negative_indices(self, tmp_path):
+        """Test v/vt/vn and relative indices."""
+        path = tmp_path / "tri.obj"
+        path.write_text("v 0 0 0\nv 1 0 0\nv 0 1 0\nf -3/1/1 -2/2/2 -1/3/3\n")
+
+        mesh = read_obj(path)
+
+        assert mesh.faces.tolist() == [[0, 1, 2]]
+
+    def test_malformed_face(self, tmp_path):
+        """Test a bad face index names the file and line."""
+        path = tmp_path / "bad.obj"
+        path.write_text("v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 x\n")
+
+        with pytest.raises(ValueError, match="bad.obj line 4"):
+            read_obj(path)
+
+    def test_face_area(self, tmp_path):
+        """Test face areas."""
+        path = tmp_path / "tri.obj"
+        path.write_text("v 0 0 0\nv 2 0 0\nv 0 2 0\nf 1 2 3\n")
+
+        mesh = read_obj(path)
+
+        assert mesh.face_areas()[0] == pytest.approx(2.0)
+        assert mesh.face_normals()[0][2] == pytest.approx(1.0)
+
+
+class TestThreeMF:
+    """Tests for 3MF loading."""
+
+    def test_multiple_objects(self, tmp_path):
+        """Test indices are offset for each mesh object."""
+        ns = "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"
+        mesh_xml = (
+            "<mesh><vertices>"
+            '<vertex x="0" y="0" z="0"/><vertex x="1" y="0" z="0"/><vertex x="0" y="1" z="0"/>'
+            "</vertices><triangles>"
+            '<triangle v1="0" v2="1" v3="2"/>'
+            "</triangles></mesh>"
+        )
+        model = (
+            f'<model xmlns="{ns}"><resources>'
+            f'<object id="1">{mesh_xml}</object>'
+            f'<object id="2">{mesh_xml}</object>'
+            "</resources></model>"
+        )
+        path = tmp_path / "parts.3mf"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("3D/3dmodel.model", model)
+
+        mesh = read_3mf(path)
+
+        assert mesh.vertex_count == 6
+        assert mesh.faces.tolist() == [[0, 1, 2], [3, 4, 5]]
+
+
+class TestLoadMesh:
+    """Tests for load_mesh dispatch and helpers."""
+
+    def test_missing_file(self, tmp_path):
+        """Test missing file raises."""
+        with pytest.raises(FileNotFoundError):
+            load_mesh(tmp_path / "missing.stl")
+
+    def test_unsupported_format(self, tmp_path):
+        """Test unsupported suffix raises."""
+        path = tmp_path / "model.ply"
+        path.write_text("ply")
+
+        with pytest.raises(ValueError):
+            load_mesh(path)
+
+    def test_empty_mesh(self):
+        """Test empty mesh properties."""
+        mesh = MeshData(
+            vertices=np.zeros((0, 3), dtype=np.float32),
+            faces=np.zeros((0, 3), dtype=np.int64),
+        )
+
+        assert mesh.is_empty
+        assert mesh.signed_volume() == 0.0
+        assert mesh.dimensions() == (0.0, 0.0, 0.0)
+
+    def test_merge_duplicate_vertices(self, tmp_path):
+        """Test coincident STL corners are shared in first-seen order."""
+        path = tmp_path / "cube.stl"
+        write_binary_stl(path, CUBE_TRIANGLES)
+
+        merged = merge_duplicate_vertices(load_mesh(path))
+
+        assert merged.vertex_count == 8
+        assert merged.faces[0].tolist() == [0, 1, 2]
+        assert merged.signed_volume() == pytest.approx(1000.0)
+
+
+class TestMeshCache:
+    """Tests for the content-hash-keyed mesh cache."""
+
+    @pytest.fixture
+    def cube_stl(self, tmp_path):
+        """Create a binary cube STL."""
+        path = tmp_path / "cube.stl"
+        write_binary_stl(path, CUBE_TRIANGLES)
+        return path
+
+    def test_features_from_mesh(self, cube_stl):
+        """Test derived arrays are computed on a welded mesh."""
+        features = MeshFeatures.from_mesh(load_mesh(cube_stl))
+
+        assert features.mesh.vertex_count == 8
+        assert features.face_normals.shape == (12, 3)
+        assert features.signed_volume == pytest.approx(1000.0)
+        assert features.surface_area == pytest.approx(600.0)
+        assert features.dimensions == (10.0, 10.0, 10.0)
+
+    def test_miss_then_hit(self, cube_stl, tmp_path):
+        """Test second load is served from cache."""
+        cache = MeshCache(cache_dir=tmp_path / "cache")
+
+        cache.load(cube_stl)
+        cache.load(cube_stl)
+
+        assert cache.misses == 1
+        assert cache.hits == 1
+
+    def test_persists_across_instances(self, cube_stl, tmp_path):
+        """Test entries are read back from disk as memory maps."""
+        MeshCache(cache_dir=tmp_path / "cache").load(cube_stl)
+
+        cache = MeshCache(cache_dir=tmp_path / "cache")
+        features = cache.get(cube_stl)
+
+        assert features is not None
+        assert isinstance(features.face_areas, np.memmap)
+        assert features.signed_volume == pytest.approx(1000.0)
+
+    def test_key_follows_content(self, cube_stl, tmp_path):
+        """Test identical content shares a key and version changes it."""
+        copy = tmp_path / "copy.stl"
+        copy.write_bytes(cube_stl.read_bytes())
+        cache = MeshCache(cache_dir=tmp_path / "cache")
+
+        assert cache.key_for(cube_stl) == cache.key_for(copy)
+        assert MeshCache(cache_dir=tmp_path / "cache", version=99).key_for(cube_stl) != cache.key_for(cube_stl)
+
+    def test_lru_eviction(self, tmp_path):
+        """Test oldest entries are evicted past the size limit."""
+        cache = MeshCache(cache_dir=tmp_path / "cache", max_bytes=1)
+
+        for i in range(3):
+            path = tmp_path / f"part{i}.stl"
+            write_binary_stl(path, CUBE_TRIANGLES[: i + 2])
+            cache.load(path)
+
+        assert len(list((tmp_path / "cache").iterdir())) <= 1
+
+    def test_hash_memo_bounded(self, tmp_path, monkeypatch):
+        """Test remembered file hashes are capped, dropping the least recently used."""
+        monkeypatch.setattr(mesh_cache, "HASH_ENTRIES", 2)
+        cache = MeshCache(cache_dir=tmp_path / "cache")
+
+        paths = []
+        for i in range(4):
+            path = tmp_path / f"part{i}.stl"
+            write_binary_stl(path, CUBE_TRIANGLES[: i + 1])
+            cache.key_for(path)
+            paths.append(str(path.resolve()))
+
+        assert [stamp[0] for stamp in cache._hashes] == paths[2:]
+
+    def test_clear(self, cube_stl, tmp_path):
+        """Test clearing removes the store."""
+        cache = MeshCache(cache_dir=tmp_path / "cache")
+        cache.load(cube_stl)
+
+        cache.clear()
+
+        assert cache.disk_usage() == 0
+        assert cache.get(cube_stl) is None
+
+
+class TestTopology:
+    """Tests for vectorized connectivity helpers."""
+
+    def test_face_adjacency(self):
+        """Test faces sharing an edge are paired."""
+        faces = np.array([[0, 1, 2], [0, 2, 3], [4, 5, 6]])
+
+        pairs = face_adjacency(faces, vertex_count=7)
+
+        assert sorted(map(sorted, pairs.tolist())) == [[0, 1]]
+
+    def test_connected_components(self):
+        """Test chained pairs collapse into one component."""
+        pairs = np.array([[4, 3], [3, 2], [0, 1]])
+
+        count, labels = connected_components(6, pairs)
+
+        assert count == 3
+        assert labels[2] == labels[3] == labels[4]
+        assert labels[0] == labels[1]
+        assert labels[5] not in (labels[0], labels[2])
+
+    def test_components_without_pairs(self):
+        """Test isolated nodes are their own components."""
+        count, labels = connected_components(3, np.zeros((0, 2), dtype=np.int64))
+
+        assert count == 3
+        assert labels.tolist() == [0, 1, 2]
+
+    def test_cluster_points(self):
+        """Test nearby points share a cluster and distant ones do not."""
+        points = np.array([[0, 0, 0], [0.5, 0, 0], [0.9, 0.9, 0.9], [5, 5, 5], [5.4, 5, 5]])
+
+        count, labels = cluster_points(points, radius=1.0)
+
+        assert count == 2
+        assert labels[0] == labels[1] == labels[2]
+        assert labels[3] == labels[4] != labels[0]
+
+    def test_close_pairs(self):
+        """Test close pairs match a brute-force distance check."""
+        points = np.random.default_rng(1).uniform(0, 20, (400, 3))
+
+        pairs = close_pairs(points, radius=3.0)
+
+        distances = np.linalg.norm(points[:, None] - points[None], axis=-1)
+        expected = np.argwhere(np.triu(distances < 3.0, k=1))
+        assert sorted(map(tuple, pairs.tolist())) == sorted(map(tuple, expected.tolist()))
+
+    def test_edge_incidence(self):
+        """Test edges are counted once per use, in order of first use."""
+        edges = np.array([[1, 0], [2, 1], [0, 1], [1, 2], [1, 2]])
+
+        distinct, uses, inverse = edge_incidence(edges, vertex_count=3)
+
+        assert distinct.tolist() == [[0, 1], [1, 2]]
+        assert uses.tolist() == [2, 3]
+        assert inverse.tolist() == [0, 1, 0, 1, 1]
+
+    def test_boundary_loop_count(self):
+        """Test boundary edges are grouped into separate loops."""
+        edges = np.array([[0, 1], [1, 2], [2, 0], [5, 6], [6, 7], [7, 8], [8, 5]])
+
+        assert boundary_loop_count(edges) == 2
+        assert boundary_loop_count(np.zeros((0, 2))) == 0
+
+    def test_weld_points(self):
+        """Test points closer than the tolerance share a label, across cell borders too."""
+        points = np.array([[0, 0, 0], [0.9, 0, 0], [2.0, 0, 0], [2.95, 0, 0], [5, 5, 5]])
+
+        count, labels = weld_points(points, tolerance=1.0)
+
+        assert count == 3
+        assert labels[0] == labels[1]
+        assert labels[2] == labels[3] != labels[0]
+        assert labels[4] not in (labels[0], labels[2])
+
+    def test_weld_points_huge_extent(self):
+        """Test grids too large to pack into one key still weld."""
+        points = np.array([[0, 0, 0], [1e9, 1e9, 1e9], [1e9, 1e9, 1e9 + 1e-5]])
+
+        count, labels = weld_points(points, tolerance=1e-4)
+
+        assert count == 2
+        assert labels[1] == labels[2]
+
+
+class TestRaycast:
+    """Tests for grid-accelerated ray casting."""
+
+    @pytest.fixture
+    def cube(self):
+        """Cube triangles as a float array."""
+        return np.array(CUBE_TRIANGLES, dtype=np.float64)
+
+    def test_intersect_pairs(self):
+        """Test single ray-triangle hits and misses."""
+        triangles = np.array([[(0, 0, 5), (10, 0, 5), (0, 10, 5)]] * 2, dtype=np.float64)
+        origins = np.array([[1, 1, 0], [9, 9, 0]], dtype=np.float64)
+        directions = np.array([[0, 0, 1], [0, 0, 1]], dtype=np.float64)
+
+        t = intersect_pairs(origins, directions, triangles)
+
+        assert t[0] == pytest.approx(5.0)
+        assert np.isinf(t[1])
+
+    def test_nearest_hit(self, cube):
+        """Test rays report the first face they cross."""
+        grid = TriangleGrid(cube, cell_size=2.5)
+
+        t, face = grid.intersect([[5, 5, -5], [5, 5, 5]], [[0, 0, 1], [1, 0, 0]])
+
+        assert t.tolist() == pytest.approx([5.0, 5.0])
+        assert face[0] in (0, 1)
+        assert face[1] in (10, 11)
+
+    def test_max_distance_and_ignore(self, cube):
+        """Test hits past the limit and on ignored faces are dropped."""
+        grid = TriangleGrid(cube)
+
+        t, face = grid.intersect([[5, 5, -5]], [[0, 0, 1]], max_distance=4.0)
+        assert np.isinf(t[0]) and face[0] == -1
+
+        origin = np.array([[2.5, 7.5, 0.0]])
+        t, face = grid.intersect(origin, [[0, 0, 1]], ignore_faces=np.array([0]))
+        assert t[0] == pytest.approx(10.0)
+
+    def test_matches_brute_force(self, cube):
+        """Test the grid agrees with testing every triangle."""
+        rng = np.random.default_rng(1)
+        origins = rng.uniform(1, 9, size=(200, 3))
+        directions = rng.normal(size=(200, 3))
+        directions /= np.linalg.norm(directions, axis=1)[:, None]
+
+        t, _ = TriangleGrid(cube, cell_size=1.0).intersect(origins, directions, batch_size=64)
+
+        brute = intersect_pairs(
+            np.repeat(origins, 12, axis=0),
+            np.repeat(directions, 12, axis=0),
+            np.tile(cube, (200, 1, 1)),
+        ).reshape(200, 12).min(axis=1)
+        assert np.allclose(t, brute)
+
+
+class TestMeshScan:
+    """Tests for the streaming mesh statistics scanner."""
+
+    def test_binary_stats(self, tmp_path):
+        """Test binary STL statistics of the cube."""
+        path = tmp_path / "cube.stl"
+        write_binary_stl(path, CUBE_TRIANGLES)
+
+        stats = scan_mesh(path)
+
+        assert stats.triangle_count == 12
+        assert stats.minimum == (0, 0, 0)
+        assert stats.maximum == (10, 10, 10)
+        assert stats.dimensions() == (10, 10, 10)
+        assert stats.volume == pytest.approx(1000)
+        assert stats.surface_area == pytest.approx(600)
+
+    def test_chunks_match_whole_file(self, tmp_path):
+        """Test small chunks give the same totals as loading the mesh."""
+        rng = np.random.default_rng(3)
+        triangles = rng.uniform(-50, 50, size=(1000, 3, 3)).tolist()
+        path = tmp_path / "soup.stl"
+        write_binary_stl(path, triangles)
+        mesh = load_mesh(path)
+
+        stats = scan_binary_stl(path, chunk_triangles=7)
+
+        assert stats.triangle_count == 1000
+        assert stats.volume == pytest.approx(mesh.signed_volume(), rel=1e-6)
+        assert stats.surface_area == pytest.approx(mesh.surface_area(), rel=1e-6)
+        assert np.allclose(stats.minimum, mesh.bounds()[0])
+
+    def test_ascii_small_chunks(self, tmp_path):
+        """Test ASCII lines split across chunk boundaries are parsed whole."""
+        path = tmp_path / "cube.stl"
+        write_ascii_stl(path, CUBE_TRIANGLES)
+
+        stats = scan_ascii_stl(path, chunk_bytes=13)
+
+        assert stats.triangle_count == 12
+        assert stats.volume == pytest.approx(1000)
+        assert stats.maximum == (10, 10, 10)
+
+    def test_obj_fallback(self, tmp_path):
+        """Test non-STL files are measured from the loaded mesh."""
+        path = tmp_path / "tri.obj"
+        path.write_text("v 0 0 0\nv 4 0 0\nv 0 3 0\nf 1 2 3\n")
+
+        stats = scan_mesh(path)
+
+        assert stats.triangle_count == 1
+        assert stats.surface_area == pytest.approx(6)
+
+    def test_empty_and_missing(self, tmp_path):
+        """Test empty files give empty stats and missing files raise."""
+        path = tmp_path / "empty.stl"
+        write_binary_stl(path, [])
+
+        assert scan_mesh(path).is_empty
+        with pytest.raises(FileNotFoundError):
+            scan_mesh(tmp_path / "missing.stl")
+
+    def test_scan_folder_with_workers(self, tmp_path):
+        """Test a folder is scanned by a pool and unreadable files are skipped."""
+        for i in range(3):
+            write_binary_stl(tmp_path / f"part_{i}.stl", [[(0, 0, 0), (i + 1, 0, 0), (0, 1, 0)]])
+        (tmp_path / "notes.txt").write_text("not a mesh")
+        (tmp_path / "broken.3mf").write_text("not a zip")
+
+        stats = scan_folder(tmp_path, workers=2)
+
+        assert sorted(stats) == [str(tmp_path / f"part_{i}.stl") for i in range(3)]
+        assert [s.dimensions()[0] for s in stats.values()] == [1, 2, 3]
+
+    def test_scan_paths_keeps_order(self, tmp_path):
+        """Test per-path results line up with the input, None for failures."""
+        path = tmp_path / "cube.stl"
+        write_binary_stl(path, CUBE_TRIANGLES)
+
+        stats = scan_paths([tmp_path / "missing.stl", path])
+
+        assert stats[0] is None
+        assert isinstance(stats[1], MeshStats)
@@ -0,0 +1,245 @@
+"""Tests for standalone mesh analysis."""
+
+import numpy as np
+import pytest
+
+from src.blender.mesh_repair import (
+    MeshAnalyzer,
+    MeshIssueType,
+    TriangleMeshRepairer,
+    analyze_mesh,
+    benchmark_repair,
+    format_repair_benchmark,
+    repair_mesh_data,
+)
+from src.mesh_io import MeshData
+
+CUBE_VERTICES = [
+    (0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+    (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1),
+]
+
+CUBE_QUADS = [
+    (0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4),
+    (2, 3, 7, 6), (0, 4, 7, 3), (1, 2, 6, 5),
+]
+
+
+def cube_soup():
+    """Unwelded triangle soup of the cube, one triangle per row."""
+    triangles = [
+        (quad[0], quad[i], quad[i + 1]) for quad in CUBE_QUADS for i in (1, 2)
+    ]
+    vertices = np.array([CUBE_VERTICES[v] for tri in triangles for v in tri], dtype=np.float64)
+    return vertices, np.arange(len(vertices)).reshape(-1, 3)
+
+
+def signed_volume(vertices, faces):
+    """Enclosed volume, positive when faces point outward."""
+    tri = np.asarray(vertices, dtype=np.float64)[faces]
+    return float(np.einsum("ij,ij->", tri[:, 0], np.cross(tri[:, 1], tri[:, 2]))) / 6
+
+
+def issues_of(analysis, issue_type):
+    """Issues of one type."""
+    return [i for i in analysis.issues if i.issue_type == issue_type]
+
+
+class TestMeshAnalyzer:
+    """Tests for MeshAnalyzer on raw vertex and face data."""
+
+    def test_closed_cube(self):
+        """Test a closed quad cube has no issues."""
+        analysis = analyze_mesh(CUBE_VERTICES, CUBE_QUADS)
+
+        assert analysis.is_printable
+        assert analysis.edge_count == 12
+        assert analysis.issue_count == 0
+        assert analysis.bounding_box == ((0, 0, 0), (1, 1, 1))
+
+    def test_missing_face_is_one_hole(self):
+        """Test one missing face is one hole with its rim reported."""
+        analysis = analyze_mesh(CUBE_VERTICES, CUBE_QUADS[:-1])
+
+        assert analysis.hole_count == 1
+        assert not analysis.is_watertight
+        assert len(issues_of(analysis, MeshIssueType.HOLE)) == 4
+
+    def test_two_holes_counted_as_loops(self):
+        """Test holes are counted as boundary loops, not edges."""
+        analysis = analyze_mesh(CUBE_VERTICES, CUBE_QUADS[:4])
+
+        # Removing two opposite faces leaves two separate rims
+        assert analysis.hole_count == 2
+
+    def test_non_manifold_edge(self):
+        """Test an edge shared by three faces is reported."""
+        vertices = [(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1)]
+        faces = [(0, 1, 2), (1, 0, 3), (0, 1, 4)]
+        analysis = analyze_mesh(vertices, faces)
+
+        assert analysis.non_manifold_edge_count == 1
+        assert not analysis.is_manifold
+        issue = issues_of(analysis, MeshIssueType.NON_MANIFOLD_EDGE)[0]
+        assert issue.element_indices == [0, 1]
+        assert issue.location == (0.5, 0, 0)
+        assert "3 faces" in issue.description
+
+    def test_loose_and_duplicate_vertices(self):
+        """Test unused and near-coincident vertices are reported."""
+        vertices = CUBE_VERTICES + [(0.5, 0.5, 0.5), (0, 0, 0.00005)]
+        analysis = analyze_mesh(vertices, CUBE_QUADS)
+
+        assert analysis.loose_vertex_count == 2
+        assert analysis.duplicate_vertex_count == 1
+        assert issues_of(analysis, MeshIssueType.DUPLICATE_VERTEX)[0].element_indices == [0, 9]
+
+    def test_degenerate_face(self):
+        """Test zero-area faces are reported."""
+        vertices = [(0, 0, 0), (1, 0, 0), (2, 0, 0), (0, 1, 0)]
+        analysis = analyze_mesh(vertices, [(0, 1, 2), (0, 1, 3)])
+
+        degenerate = issues_of(analysis, MeshIssueType.DEGENERATE_FACE)
+        assert [i.element_indices for i in degenerate] == [[0]]
+
+    def test_duplicate_groups_match_pairwise_scan(self):
+        """Test the spatial hash finds the same groups as comparing every pair."""
+        rng = np.random.default_rng(5)
+        points = rng.uniform(0, 0.01, size=(300, 3))
+
+        groups = MeshAnalyzer(merge_threshold=0.001)._find_duplicate_vertices(points)
+
+        # Every close pair ends up in one group, and every group is linked by close pairs
+        distance = np.linalg.norm(points[:, None] - points[None], axis=2)
+        label = np.arange(len(points))
+        for index, group in enumerate(groups):
+            label[group] = len(points) + index
+        close_i, close_j = np.nonzero(np.triu(distance < 0.001, 1))
+        assert np.all(label[close_i] == label[close_j])
+        assert sum(len(g) for g in groups) == len(np.unique(np.concatenate([close_i, close_j])))
+
+    def test_numpy_input(self):
+        """Test NumPy arrays are accepted as well as lists."""
+        analysis = MeshAnalyzer().analyze_mesh_data(
+            np.array(CUBE_VERTICES, dtype=np.float32),
+            np.array(CUBE_QUADS),
+        )
+
+        assert analysis.is_printable
+        assert analysis.face_count == 6
+
+
+class TestTriangleMeshRepairer:
+    """Tests for the NumPy repair pipeline."""
+
+    def test_soup_is_welded(self):
+        """Test an unwelded soup is welded into a closed cube."""
+        vertices, faces = cube_soup()
+        vertices += np.random.default_rng(0).uniform(-1e-5, 1e-5, vertices.shape)
+
+        repaired_vertices, repaired_faces, result = TriangleMeshRepairer().repair(vertices, faces)
+
+        assert len(repaired_vertices) == 8
+        assert len(repaired_faces) == 12
+        assert result.issues_remaining == 0
+        assert result.issues_fixed > 0
+        assert analyze_mesh(repaired_vertices.tolist(), repaired_faces.tolist()).is_printable
+
+    def test_normals_made_consistent_and_outward(self):
+        """Test flipped faces are turned to match and the whole cube faces out."""
+        vertices, faces = cube_soup()
+        faces = faces[:, ::-1].copy()
+        faces[[1, 4, 7]] = faces[[1, 4, 7], ::-1]
+
+        repaired_vertices, repaired_faces, result = TriangleMeshRepairer().repair(vertices, faces)
+
+        assert signed_volume(repaired_vertices, repaired_faces) == pytest.approx(1.0)
+        assert "Recalculated face normals" in result.operations_performed
+
+    def test_hole_filled(self):
+        """Test a missing face is filled with matching winding."""
+        vertices, faces = cube_soup()
+
+        repaired_vertices, repaired_faces, result = TriangleMeshRepairer().repair(vertices, faces[:-1])
+
+        assert len(repaired_faces) == 12
+        assert signed_volume(repaired_vertices, repaired_faces) == pytest.approx(1.0)
+        assert "Filled 1 holes" in result.operations_performed
+
+    def test_quad_hole_filled_with_fan(self):
+        """Test a missing quad is closed around a new centre vertex."""
+        repaired_vertices, repaired_faces, result = TriangleMeshRepairer().repair(
+            CUBE_VERTICES, CUBE_QUADS[:-1]
+        )
+
+        assert len(repaired_vertices) == 9
+        assert len(repaired_faces) == 14
+        assert signed_volume(repaired_vertices, repaired_faces) == pytest.approx(1.0)
+        assert result.issues_remaining == 0
+
+    def test_large_hole_left_open(self):
+        """Test loops longer than the limit are reported instead of filled."""
+        _, repaired_faces, result = TriangleMeshRepairer(max_hole_edges=3).repair(
+            CUBE_VERTICES, CUBE_QUADS[:-1]
+        )
+
+        assert len(repaired_faces) == 10
+        assert result.issues_remaining == 4
+        assert "Could not fill hole with 4 edges" in result.warnings
+
+    def test_duplicate_degenerate_and_loose_removed(self):
+        """Test repeated and collapsed faces and unused vertices are dropped."""
+        vertices, faces = cube_soup()
+        vertices = np.concatenate([vertices, [[5.0, 5.0, 5.0]]])
+        faces = np.concatenate([faces, faces[:1, ::-1], [[0, 0, 1]]])
+
+        repaired_vertices, repaired_faces, result = TriangleMeshRepairer().repair(vertices, faces)
+
+        assert len(repaired_vertices) == 8
+        assert len(repaired_faces) == 12
+        assert "Removed 1 duplicate faces" in result.operations_performed
+        assert "Removed 1 degenerate faces" in result.operations_performed
+        assert "Removed 1 loose vertices" in result.operations_performed
+
+    def test_collinear_face_removed(self):
+        """Test a zero-area face over three distinct vertices is dropped before orienting."""
+        vertices, faces = cube_soup()
+        vertices = np.concatenate([vertices, [[0.0, 0.0, 0.0], [0.5, 0.0, 0.0], [1.0, 0.0, 0.0]]])
+        faces = np.concatenate([faces, [[len(vertices) - 3, len(vertices) - 2, len(vertices) - 1]]])
+
+        repaired_vertices, repaired_faces, result = TriangleMeshRepairer().repair(vertices, faces)
+
+        assert len(repaired_vertices) == 8
+        assert len(repaired_faces) == 12
+        assert "Removed 1 degenerate faces" in result.operations_performed
+        assert signed_volume(repaired_vertices, repaired_faces) == pytest.approx(1.0)
+
+    def test_repair_mesh_data(self):
+        """Test MeshData in, MeshData out."""
+        vertices, faces = cube_soup()
+
+        repaired, result = repair_mesh_data(MeshData(vertices=vertices.astype(np.float32), faces=faces))
+
+        assert repaired.vertex_count == 8
+        assert repaired.signed_volume() == pytest.approx(1.0)
+        assert result.success
+
+    def test_benchmark(self):
+        """Test the benchmark repairs its damaged spheres."""
+        rows = benchmark_repair(sizes=(8,))
+
+        assert rows[0]["faces"] > 0
+        assert rows[0]["numpy_time"] > 0
+        assert rows[0]["blender_time"] is None
+
+    def test_benchmark_table(self):
+        """Test both timing columns are formatted to milliseconds."""
+        row = {"faces": 100, "repaired_faces": 96, "numpy_time": 0.01, "blender_time": 0.123456789,
+               "issues_remaining": 0}
+
+        table = format_repair_benchmark([row, dict(row, blender_time=None)])
+
+        lines = table.splitlines()
+        assert "     0.123 " in lines[1]
+        assert "0.123456789" not in table
+        assert len({len(line) for line in lines}) == 1
@@ -1,8 +1,20 @@
 """Tests for batch nesting module."""
 
+import time
+
+import numpy as np
 import pytest
 from pathlib import Path
 
+from src.nesting.footprint import (
+    PolygonBin,
+    buffer_polygon,
+    convex_footprint,
+    minkowski_sum,
+    polygon_area,
+    rotate_polygon,
+)
+from src.nesting.maxrects import MaxRectsBin
 from src.nesting.batch_nester import (
     BatchNester,
     NestingConfig,
@@ -103,6 +115,12 @@ class TestNestingConfig:
         assert config.plate_width == 180.0
         assert config.strategy == NestingStrategy.HEIGHT
 
+    def test_dict_roundtrip_keeps_scan_workers(self):
+        """Test the intake worker count survives serialization."""
+        config = NestingConfig.from_dict(NestingConfig(scan_workers=4).to_dict())
+
+        assert config.scan_workers == 4
+
     def test_for_printer(self):
         """Test printer-specific config."""
         config = NestingConfig.for_printer("bambu_x1c")
@@ -212,6 +230,14 @@ f 1 5 2
         assert len(result.placed_parts) > 0
         assert result.plate_utilization > 0
 
+    def test_nest_with_scan_workers(self, test_parts):
+        """Test parts scanned across worker processes nest the same."""
+        parallel = BatchNester(NestingConfig(scan_workers=2)).nest_parts(test_parts + ["/nonexistent/part.obj"])
+        serial = BatchNester().nest_parts(test_parts)
+
+        assert parallel.success is True
+        assert [p.to_dict() for p in parallel.placed_parts] == [p.to_dict() for p in serial.placed_parts]
+
     def test_nest_nonexistent_parts(self, nester):
         """Test nesting with non-existent files."""
         result = nester.nest_parts(["/nonexistent/part.obj"])
@@ -273,6 +299,308 @@ class TestPartPlacement:
         assert pos[0] >= 50 or pos[1] >= 50
 
 
+class TestMaxRectsBin:
+    """Tests for maximal-rectangles free space bookkeeping."""
+
+    def test_first_part_bottom_left(self):
+        """Test the first part goes in the corner."""
+        plate = MaxRectsBin(100, 100)
+
+        assert plate.find(30, 20) == (0.0, 0.0, False)
+
+    def test_free_rects_after_place(self):
+        """Test placing splits the plate into maximal pieces."""
+        plate = MaxRectsBin(100, 100)
+        plate.place(0, 0, 30, 20)
+
+        free = sorted(map(tuple, plate.free_rects.tolist()))
+
+        assert free == [(0.0, 20.0, 100.0, 80.0), (30.0, 0.0, 70.0, 100.0)]
+        assert plate.occupancy == pytest.approx(0.06)
+
+    def test_rotation_trial(self):
+        """Test a part is turned when only that orientation fits."""
+        plate = MaxRectsBin(100, 100)
+        plate.place(0, 0, 100, 60)
+
+        assert plate.find(40, 80) == (0.0, 60.0, True)
+        assert plate.find(40, 80, allow_rotation=False) is None
+
+    def test_exact_fit(self):
+        """Test parts fill the plate exactly with sub-millimetre sizes."""
+        plate = MaxRectsBin(10.5, 10.5)
+        for _ in range(4):
+            x, y, _ = plate.find(5.25, 5.25)
+            plate.place(x, y, 5.25, 5.25)
+
+        assert plate.occupancy == pytest.approx(1.0)
+        assert plate.find(0.1, 0.1) is None
+
+
+class TestMultiPlate:
+    """Tests for packing across several plates."""
+
+    @pytest.fixture
+    def nester(self):
+        """Nester with a 100mm plate, 2mm spacing and no margin."""
+        return BatchNester(NestingConfig(
+            plate_width=100.0,
+            plate_depth=100.0,
+            part_spacing=2.0,
+            edge_margin=0.0,
+        ))
+
+    def parts(self, count, width, depth):
+        """Part records as produced by nest_parts."""
+        return [
+            {"path": f"/p{i}", "name": f"p{i}", "width": width, "depth": depth, "height": 5}
+            for i in range(count)
+        ]
+
+    def test_spacing_only_between_parts(self, nester):
+        """Test four 49mm parts fill one plate with 2mm gaps."""
+        placed, unplaced = nester._place_parts(self.parts(4, 49, 49))
+
+        assert unplaced == []
+        assert {p.plate for p in placed} == {0}
+        assert sorted((p.x, p.y) for p in placed) == [(0, 0), (0, 51), (51, 0), (51, 51)]
+
+    def test_overflow_opens_plates(self, nester):
+        """Test parts that do not fit go to new plates."""
+        placed, unplaced = nester._place_parts(self.parts(9, 49, 49))
+
+        assert unplaced == []
+        assert [len([p for p in placed if p.plate == i]) for i in range(3)] == [4, 4, 1]
+
+    def test_oversized_part_unplaced(self, nester):
+        """Test a part larger than the plate is reported unplaced."""
+        placed, unplaced = nester._place_parts(self.parts(1, 120, 10))
+
+        assert placed == []
+        assert unplaced == ["/p0"]
+
+    def test_num_batches_counts_plates(self, nester, tmp_path):
+        """Test num_batches is the number of plates used."""
+        paths = []
+        for i in range(5):
+            path = tmp_path / f"part_{i}.obj"
+            path.write_text("v 0 0 0\nv 49 0 0\nv 49 49 0\nv 0 0 5\nf 1 2 3\nf 1 2 4\n")
+            paths.append(str(path))
+
+        result = nester.nest_parts(paths)
+
+        assert result.num_batches == 2
+        assert len(result.parts_on_plate(1)) == 1
+        assert "Plates: 2" in nester.export_layout(result)
+
+    def test_no_overlaps_and_fast(self):
+        """Test 500 mixed parts pack without overlaps in well under a second."""
+        nester = BatchNester(NestingConfig(part_spacing=2.0))
+        parts = [
+            {"path": f"/p{i}", "name": f"p{i}", "width": 5 + (i * 7) % 23,
+             "depth": 4 + (i * 11) % 19, "height": 5}
+            for i in range(500)
+        ]
+
+        start = time.perf_counter()
+        placed, unplaced = nester._place_parts(nester._sort_parts(parts))
+        elapsed = time.perf_counter() - start
+
+        assert unplaced == []
+        assert elapsed < 1.0
+        for plate in {p.plate for p in placed}:
+            boxes = [p for p in placed if p.plate == plate]
+            for i, a in enumerate(boxes):
+                assert a.x + a.width <= 246 + 1e-6 and a.y + a.depth <= 246 + 1e-6
+                for b in boxes[i + 1:]:
+                    assert (
+                        a.x + a.width + 2.0 <= b.x + 1e-6 or b.x + b.width + 2.0 <= a.x + 1e-6 or
+                        a.y + a.depth + 2.0 <= b.y + 1e-6 or b.y + b.depth + 2.0 <= a.y + 1e-6
+                    )
+
+
+def separated(a, b, gap=0.0):
+    """Whether two convex polygons are at least ``gap`` apart along some edge normal."""
+    for poly in (a, b):
+        edges = np.roll(poly, -1, axis=0) - poly
+        normals = np.stack([edges[:, 1], -edges[:, 0]], axis=1)
+        normals /= np.linalg.norm(normals, axis=1)[:, None]
+        pa, pb = a @ normals.T, b @ normals.T
+        if ((pa.min(axis=0) >= pb.max(axis=0) + gap - 1e-6) |
+                (pb.min(axis=0) >= pa.max(axis=0) + gap - 1e-6)).any():
+            return True
+    return False
+
+
+def write_triangle_part(path, leg, height=5.0):
+    """Write a right-triangle prism with legs along +X and +Y."""
+    path.write_text(
+        f"v 0 0 0\nv {leg} 0 0\nv 0 {leg} 0\n"
+        f"v 0 0 {height}\nv {leg} 0 {height}\nv 0 {leg} {height}\n"
+        "f 1 3 2\nf 4 5 6\nf 1 2 5\nf 1 5 4\nf 2 3 6\nf 2 6 5\nf 3 1 4\nf 3 4 6\n"
+    )
+    return str(path)
+
+
+class TestFootprintGeometry:
+    """Tests for convex footprints and no-fit polygons."""
+
+    def test_hull_drops_interior_points(self):
+        """Test the footprint of a square with interior points is the square."""
+        rng = np.random.default_rng(1)
+        points = np.concatenate([
+            [[0, 0], [10, 0], [10, 10], [0, 10]],
+            rng.uniform(1, 9, size=(1000, 2)),
+        ])
+        hull = convex_footprint(points)
+
+        assert len(hull) == 4
+        assert polygon_area(hull) == pytest.approx(100.0)
+
+    def test_large_hull_is_circumscribed(self):
+        """Test round footprints are capped in size but never shrink."""
+        angles = np.linspace(0, 2 * np.pi, 500, endpoint=False)
+        circle = 10 * np.stack([np.cos(angles), np.sin(angles)], axis=1)
+        hull = convex_footprint(circle, max_vertices=16)
+
+        assert len(hull) == 16
+        assert np.linalg.norm(hull, axis=1).min() >= 10 - 1e-9
+        assert polygon_area(hull) == pytest.approx(np.pi * 100, rel=0.03)
+
+    def test_minkowski_sum_of_squares(self):
+        """Test the no-fit polygon of two unit squares is a 2x2 square."""
+        square = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=float)
+        nfp = minkowski_sum(square, -square)
+
+        assert nfp.min(axis=0) == pytest.approx([-1, -1])
+        assert nfp.max(axis=0) == pytest.approx([1, 1])
+        assert polygon_area(nfp) == pytest.approx(4.0)
+
+    def test_buffer_keeps_axis_extent(self):
+        """Test buffering grows the bounding box by exactly the distance."""
+        square = np.array([[0, 0], [4, 0], [4, 4], [0, 4]], dtype=float)
+        grown = buffer_polygon(square, 1.0)
+
+        assert grown.min(axis=0) == pytest.approx([-1, -1])
+        assert grown.max(axis=0) == pytest.approx([5, 5])
+
+
+class TestPolygonBin:
+    """Tests for no-fit polygon placement."""
+
+    def test_triangles_pair_up(self):
+        """Test right triangles interlock into squares."""
+        plate = PolygonBin(100, 100)
+        triangle = np.array([[0, 0], [30, 0], [0, 30]], dtype=float)
+        shapes = [rotate_polygon(triangle, a) for a in (0, 90, 180, 270)]
+
+        while True:
+            position = plate.find(shapes)
+            if position is None:
+                break
+            x, y, index = position
+            plate.place(shapes[index], x, y)
+
+        assert plate.part_count == 18
+        assert plate.occupancy == pytest.approx(0.81)
+
+    def test_random_polygons_do_not_overlap(self):
+        """Test placed convex polygons stay on the plate and apart."""
+        rng = np.random.default_rng(7)
+        plate = PolygonBin(120, 120)
+        for _ in range(40):
+            shape = convex_footprint(rng.uniform(0, rng.uniform(5, 30), size=(12, 2)))
+            shapes = [rotate_polygon(shape, a) for a in range(0, 360, 45)]
+            position = plate.find(shapes)
+            if position:
+                plate.place(shapes[position[2]], position[0], position[1])
+
+        polygons = plate.polygons
+        assert len(polygons) > 10
+        for i, a in enumerate(polygons):
+            assert a.min() >= -1e-6 and a.max() <= 120 + 1e-6
+            for b in polygons[i + 1:]:
+                assert separated(a, b)
+
+
+class TestFootprintNesting:
+    """Tests for nesting parts by their convex footprints."""
+
+    @pytest.fixture
+    def config(self):
+        """Footprint config with a 100mm plate, 2mm spacing and no margin."""
+        return NestingConfig(
+            plate_width=100.0,
+            plate_depth=100.0,
+            part_spacing=2.0,
+            edge_margin=0.0,
+            use_footprints=True,
+        )
+
+    @pytest.fixture
+    def triangles(self, tmp_path):
+        """Twelve right-triangle parts."""
+        return [write_triangle_part(tmp_path / f"tri_{i}.obj", 40) for i in range(12)]
+
+    def test_fewer_plates_than_boxes(self, config, triangles):
+        """Test interlocking footprints need fewer plates than bounding boxes."""
+        boxes = BatchNester(NestingConfig(
+            plate_width=100.0, plate_depth=100.0, part_spacing=2.0, edge_margin=0.0,
+        )).nest_parts(triangles)
+        footprints = BatchNester(config).nest_parts(triangles)
+
+        assert boxes.num_batches == 3
+        assert footprints.num_batches == 2
+        assert len(footprints.placed_parts) == 12
+        assert {p.rotation for p in footprints.placed_parts} <= {0.0, 90.0, 180.0, 270.0}
+        assert footprints.placed_parts[0].footprint_area == pytest.approx(40 * 40 / 2)
+
+    def test_parts_keep_spacing(self, config, triangles):
+        """Test rebuilt footprints are on the plate and spacing apart."""
+        result = BatchNester(config).nest_parts(triangles)
+        triangle = np.array([[0, 0], [40, 0], [0, 40]], dtype=float)
+
+        for plate in range(result.num_batches):
+            outlines = []
+            for part in result.parts_on_plate(plate):
+                outline = rotate_polygon(triangle, part.rotation)
+                outline = outline - outline.min(axis=0) + (part.x, part.y)
+                assert outline.min() >= -1e-6 and outline.max() <= 100 + 1e-6
+                outlines.append(outline)
+
+            for i, a in enumerate(outlines):
+                for b in outlines[i + 1:]:
+                    assert separated(a, b, gap=2.0 - 1e-3)
+
+    def test_identical_part_sets_are_cached(self, config, triangles, tmp_path):
+        """Test a repeated part set reuses the layout under its own paths."""
+        nester = BatchNester(config)
+        first = nester.nest_parts(triangles)
+
+        copies = []
+        for i, path in enumerate(triangles):
+            copy = tmp_path / f"copy_{i}.obj"
+            copy.write_text(Path(path).read_text())
+            copies.append(str(copy))
+
+        nester._place_footprints = None  # Any placement would fail now
+        second = nester.nest_parts(copies)
+
+        assert second.success
+        assert sorted(p.file_path for p in second.placed_parts) == sorted(copies)
+        assert [(p.x, p.y, p.rotation) for p in second.placed_parts] == \
+            [(p.x, p.y, p.rotation) for p in first.placed_parts]
+
+    def test_changed_config_misses_cache(self, config, triangles):
+        """Test a different rotation step is nested again."""
+        BatchNester(config).nest_parts(triangles)
+
+        config.allow_rotation = False
+        result = BatchNester(config).nest_parts(triangles)
+
+        assert {p.rotation for p in result.placed_parts} == {0.0}
+
+
 class TestUtilization:
     """Tests for plate utilization calculation."""
 
@@ -0,0 +1,132 @@
+"""Tests for the print orientation search."""
+
+import math
+
+import numpy as np
+import pytest
+
+from src.blender.design_advisor import DesignAdvisor
+from src.blender.orientation import (
+    MIN_SEPARATION_DEG,
+    OrientationOptimizer,
+    fibonacci_sphere,
+    rotation_for_direction,
+    spherical_cap,
+)
+from src.mesh_io import get_mesh_cache
+from tests.mesh_helpers import t_shape, write_ascii_stl
+
+
+def rotate(direction, rotation_x, rotation_y):
+    """Apply rotation_x about X then rotation_y about Y to a vector."""
+    a, b = math.radians(rotation_x), math.radians(rotation_y)
+    rx = np.array([[1, 0, 0], [0, math.cos(a), -math.sin(a)], [0, math.sin(a), math.cos(a)]])
+    ry = np.array([[math.cos(b), 0, math.sin(b)], [0, 1, 0], [-math.sin(b), 0, math.cos(b)]])
+    return ry @ rx @ np.asarray(direction, dtype=np.float64)
+
+
+class TestSampling:
+    """Tests for direction sampling and Euler conversion."""
+
+    def test_fibonacci_sphere(self):
+        """Test lattice points are unit vectors spread over the sphere."""
+        points = fibonacci_sphere(500)
+
+        assert points.shape == (500, 3)
+        assert np.allclose(np.linalg.norm(points, axis=1), 1)
+        assert np.abs(points.mean(axis=0)).max() < 0.01
+
+    def test_spherical_cap(self):
+        """Test cap points stay within the cap radius."""
+        center = np.array([0.0, 0.6, 0.8])
+        points = spherical_cap(center, 0.2, 50)
+
+        assert np.allclose(np.linalg.norm(points, axis=1), 1)
+        assert np.arccos(np.clip(points @ center, -1, 1)).max() <= 0.2 + 1e-9
+
+    def test_rotation_for_direction(self):
+        """Test the Euler angles turn each direction to point up."""
+        for direction in fibonacci_sphere(40):
+            rotation_x, rotation_y = rotation_for_direction(direction)
+            assert rotate(direction, rotation_x, rotation_y) == pytest.approx([0, 0, 1], abs=1e-9)
+
+
+class TestOrientationOptimizer:
+    """Tests for batched orientation scoring and search."""
+
+    def test_evaluate_upright(self):
+        """Test the metrics of a T shape standing on its post."""
+        result = OrientationOptimizer().evaluate(t_shape(), [(0, 0, 1)])[0]
+
+        assert result.rotation_x == 0 and result.rotation_y == 0
+        assert result.contact_area == pytest.approx(100)
+        assert result.overhang_area == pytest.approx(200)
+        assert result.support_volume == pytest.approx(4000)
+        assert result.height == pytest.approx(25)
+
+    def test_evaluate_upside_down(self):
+        """Test a T shape on its slab needs no support."""
+        result = OrientationOptimizer().evaluate(t_shape(), [(0, 0, -1)])[0]
+
+        assert result.contact_area == pytest.approx(300)
+        assert result.overhang_area == pytest.approx(0)
+        assert result.support_volume == pytest.approx(0)
+
+    def test_optimize_lays_flat(self):
+        """Test the search lays the T on its side, needing no support."""
+        best = OrientationOptimizer(samples=500).optimize(t_shape())[0]
+
+        assert abs(best.direction[1]) == pytest.approx(1)
+        assert best.contact_area == pytest.approx(350)
+        assert best.support_volume == pytest.approx(0)
+        assert best.height == pytest.approx(10)
+
+    def test_top_k_distinct(self):
+        """Test suggestions are best first and well separated."""
+        results = OrientationOptimizer(samples=500).optimize(t_shape(), top_k=4)
+        directions = np.array([r.direction for r in results])
+
+        assert len(results) == 4
+        assert [r.score for r in results] == sorted(r.score for r in results)
+        cosines = directions @ directions.T - 2 * np.eye(len(results))
+        assert cosines.max() < math.cos(math.radians(MIN_SEPARATION_DEG))
+
+    def test_workers_match_in_process(self):
+        """Test scoring across processes gives the same orientations."""
+        mesh = t_shape()
+        single = OrientationOptimizer(samples=300).optimize(mesh)
+        parallel = OrientationOptimizer(samples=300, workers=2).optimize(mesh)
+
+        assert parallel == single
+
+
+class TestAdvisorOrientations:
+    """Tests for measured orientation suggestions in DesignAdvisor."""
+
+    def test_measured_suggestions(self, tmp_path):
+        """Test the advisor recommends the searched orientation with measured savings."""
+        path = tmp_path / "t_shape.stl"
+        write_ascii_stl(path, t_shape().triangles.tolist())
+        advice = DesignAdvisor().analyze(str(path))
+
+        best = advice.recommended_orientation
+        assert best is advice.orientation_suggestions[0]
+        assert best.support_reduction_percent == pytest.approx(100)
+        assert best.confidence > 0.5
+
+        current = [s for s in advice.orientation_suggestions if s.rotation_x == 0 and s.rotation_y == 0]
+        assert len(current) == 1
+        assert current[0].confidence == 0.5
+        assert "No rotation needed" in current[0].benefits
+
+    def test_mesh_from_feature_cache(self, tmp_path):
+        """Test repeated analyses of one file load its mesh through the feature cache."""
+        path = tmp_path / "t_shape.stl"
+        write_ascii_stl(path, t_shape().triangles.tolist())
+        cache = get_mesh_cache()
+
+        DesignAdvisor().analyze(str(path))
+        DesignAdvisor().analyze(str(path))
+
+        assert cache.misses == 1
+        assert cache.hits >= 1
@@ -0,0 +1,238 @@
+"""Tests for laser path ordering and optimization."""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from src.laser import path_optimizer
+from src.laser.cross_section import Path2D
+from src.laser.path_optimizer import PathOptimizer, rdp_keep
+from src.laser.path_ordering import (
+    EntryGrid,
+    benchmark_ordering,
+    nearest_neighbour_tour,
+    order_paths,
+    travel_distance,
+)
+
+
+def random_paths(count, size=100.0, seed=0):
+    """Mix of open strokes and small closed squares."""
+    rng = random.Random(seed)
+    paths, closed = [], []
+    for i in range(count):
+        x, y = rng.uniform(0, size), rng.uniform(0, size)
+        if i % 2:
+            paths.append([(x, y), (x + rng.uniform(-3, 3), y + rng.uniform(-3, 3))])
+            closed.append(False)
+        else:
+            paths.append([(x, y), (x + 1, y), (x + 1, y + 1), (x, y + 1)])
+            closed.append(True)
+    return paths, closed
+
+
+def recursive_rdp(points, tolerance):
+    """Reference recursive Ramer-Douglas-Peucker."""
+    if len(points) <= 2:
+        return points
+    (x1, y1), (x2, y2) = points[0], points[-1]
+    length = math.hypot(x2 - x1, y2 - y1)
+    best, best_idx = 0.0, 0
+    for i in range(1, len(points) - 1):
+        x0, y0 = points[i]
+        if length:
+            d = abs((y2 - y1) * x0 - (x2 - x1) * y0 + x2 * y1 - y2 * x1) / length
+        else:
+            d = math.hypot(x0 - x1, y0 - y1)
+        if d > best:
+            best, best_idx = d, i
+    if best > tolerance:
+        left = recursive_rdp(points[:best_idx + 1], tolerance)
+        return left[:-1] + recursive_rdp(points[best_idx:], tolerance)
+    return [points[0], points[-1]]
+
+
+def brute_force_tour(paths, closed, origin=(0.0, 0.0)):
+    """Reference greedy tour scanning every entry point."""
+    remaining = set(range(len(paths)))
+    x, y = origin
+    order, entries = [], []
+    while remaining:
+        best = None
+        for i in sorted(remaining):
+            candidates = range(len(paths[i])) if closed[i] else (0, len(paths[i]) - 1)
+            for v in candidates:
+                d = math.hypot(paths[i][v][0] - x, paths[i][v][1] - y)
+                if best is None or d < best[0]:
+                    best = (d, i, v)
+        _, i, v = best
+        remaining.remove(i)
+        order.append(i)
+        entries.append(v)
+        x, y = paths[i][v if closed[i] else len(paths[i]) - 1 - v]
+    return order, entries
+
+
+class TestEntryGrid:
+    """Tests for the entry point grid."""
+
+    def test_nearest_matches_brute_force(self):
+        """Test queries return the closest point of an unvisited path."""
+        rng = np.random.default_rng(3)
+        points = rng.uniform(0, 50, size=(500, 2))
+        owners = np.arange(500) // 2
+        grid = EntryGrid(points, owners)
+
+        for owner in range(0, 250, 3):
+            grid.visit(owner)
+        alive = owners % 3 != 0
+
+        for qx, qy in rng.uniform(-20, 70, size=(50, 2)):
+            found = grid.nearest(qx, qy)
+            dist = np.hypot(points[:, 0] - qx, points[:, 1] - qy)
+            assert alive[found]
+            assert dist[found] == pytest.approx(dist[alive].min())
+
+    def test_empty_after_all_visited(self):
+        """Test -1 is returned once every path is visited."""
+        grid = EntryGrid(np.array([[0.0, 0.0], [1.0, 1.0]]), np.array([0, 1]))
+        grid.visit(0)
+        grid.visit(1)
+
+        assert grid.remaining == 0
+        assert grid.nearest(0.0, 0.0) == -1
+
+
+class TestPathOrdering:
+    """Tests for tour construction and refinement."""
+
+    def test_seed_matches_greedy(self):
+        """Test the indexed seed equals the exhaustive nearest neighbour tour."""
+        paths, closed = random_paths(200)
+
+        assert nearest_neighbour_tour(paths, closed) == brute_force_tour(paths, closed)
+
+    def test_refinement_never_worse(self):
+        """Test 2-opt/Or-opt keeps every path once and shortens travel."""
+        paths, closed = random_paths(400, seed=5)
+        seed_order, seed_entries = nearest_neighbour_tour(paths, closed)
+        order, entries = order_paths(paths, closed, time_limit=1.0)
+
+        assert sorted(order) == list(range(400))
+        seeded = travel_distance(paths, closed, seed_order, seed_entries)
+        refined = travel_distance(paths, closed, order, entries)
+        assert refined < seeded
+
+    def test_two_opt_untangles_crossing(self):
+        """Test refinement reverses a run the greedy seed gets wrong."""
+        # Greedy goes right first and has to come all the way back
+        paths = [[(1.0, 0.0)], [(-1.5, 0.0)], [(3.0, 0.0)], [(5.0, 0.0)], [(-3.0, 0.0)]]
+        closed = [True] * 5
+        seed = nearest_neighbour_tour(paths, closed)
+        refined = order_paths(paths, closed, time_limit=0.5)
+
+        assert travel_distance(paths, closed, *refined) < travel_distance(paths, closed, *seed)
+
+    def test_empty_paths_skipped(self):
+        """Test paths without points are left out of the tour."""
+        order, _ = nearest_neighbour_tour([[], [(1.0, 1.0)]], [True, False])
+
+        assert order == [1]
+
+    def test_benchmark_rows(self):
+        """Test the benchmark reports travel and timings per size."""
+        rows = benchmark_ordering(sizes=(200,), time_limit=0.2)
+
+        assert rows[0]["paths"] == 200
+        assert rows[0]["refined_travel"] <= rows[0]["seed_travel"] + 1e-9
+        assert rows[0]["seed_travel"] < rows[0]["original_travel"]
+
+
+class TestPathOptimizer:
+    """Tests for PathOptimizer ordering."""
+
+    def test_closed_paths_start_at_entry(self):
+        """Test closed paths are rotated to the vertex nearest the laser."""
+        square = Path2D(points=[(10, 10), (12, 10), (12, 12), (10, 12)], is_closed=True)
+        near = Path2D(points=[(1, 1), (2, 1), (2, 2)], is_closed=True)
+        result = PathOptimizer(inner_first=False).optimize([square, near])
+
+        assert result.paths[0].points[0] == (1, 1)
+        assert result.paths[1].points[0] == (10, 10)
+
+    def test_open_paths_reversed(self):
+        """Test an open path is cut from its nearer end."""
+        line = Path2D(points=[(50, 0), (1, 0)], is_closed=False)
+        other = Path2D(points=[(60, 0), (70, 0)], is_closed=False)
+        result = PathOptimizer(inner_first=False).optimize([other, line])
+
+        assert result.paths[0].points == [(1, 0), (50, 0)]
+        assert result.stats.optimized_travel_distance < result.stats.original_travel_distance
+
+    def test_large_job_is_fast(self):
+        """Test ten thousand paths are ordered without stalling."""
+        paths, closed = random_paths(10_000, size=400.0)
+        job = [Path2D(points=p, is_closed=c) for p, c in zip(paths, closed)]
+
+        result = PathOptimizer(inner_first=False).optimize(job)
+
+        assert len(result.paths) == 10_000
+        assert result.stats.travel_reduction_percent > 90
+
+
+class TestSimplification:
+    """Tests for Ramer-Douglas-Peucker simplification."""
+
+    def test_matches_recursive(self):
+        """Test the iterative version keeps the same points."""
+        rng = random.Random(2)
+        for _ in range(20):
+            points = [(i * 0.5, rng.uniform(-1, 1)) for i in range(200)]
+            keep = rdp_keep(np.array(points), 0.3)
+
+            assert [points[i] for i in keep] == recursive_rdp(points, 0.3)
+
+    def test_long_contour(self):
+        """Test contours deeper than the recursion limit are simplified."""
+        # Shrinking zigzag: every split peels off one point, 5000 levels deep
+        i = np.arange(5000)
+        points = np.stack([i * 1.0, (-1.0) ** i * 0.9995 ** i], axis=1)
+
+        with pytest.raises(RecursionError):
+            recursive_rdp([tuple(p) for p in points.tolist()], 0.01)
+        assert len(rdp_keep(points, 0.01)) == 5000
+        assert len(rdp_keep(points, 0.5)) < 5000
+
+    def test_degenerate_chord(self):
+        """Test a polyline returning to its start keeps its far point."""
+        keep = rdp_keep(np.array([[0, 0], [1, 0], [5, 0], [1, 0.1], [0, 0]], dtype=float), 0.5)
+
+        assert keep.tolist() == [0, 2, 4]
+
+    def test_inputs_untouched_and_shared(self):
+        """Test optimize copies only the paths it changes."""
+        straight = Path2D(points=[(0, 0), (5, 0), (10, 0)], is_closed=False)
+        corner = Path2D(points=[(20, 0), (30, 0), (30, 10)], is_closed=False)
+        result = PathOptimizer(inner_first=False, simplify_tolerance=0.1).optimize([straight, corner])
+
+        assert straight.points == [(0, 0), (5, 0), (10, 0)]
+        assert result.stats.points_removed == 1
+        assert any(p is corner for p in result.paths)
+        assert not any(p is straight for p in result.paths)
+
+    def test_process_pool_matches_serial(self, monkeypatch):
+        """Test the process pool mode gives the same paths."""
+        rng = random.Random(4)
+        paths = [
+            Path2D(points=[(i, rng.uniform(0, 2)) for i in range(rng.randint(2, 300))], is_closed=False)
+            for _ in range(40)
+        ]
+        monkeypatch.setattr(path_optimizer, "PARALLEL_MIN_POINTS", 0)
+
+        serial = PathOptimizer(simplify_tolerance=0.5)._simplify_paths(paths, 0.5)
+        pooled = PathOptimizer(simplify_tolerance=0.5, workers=2)._simplify_paths(paths, 0.5)
+
+        assert pooled[1] == serial[1]
+        assert [p.points for p in pooled[0]] == [p.points for p in serial[0]]
@@ -0,0 +1,165 @@
+"""Tests for the local MQTT/FTPS printer simulator."""
+
+import time
+
+import pytest
+
+from src.printer import ftps_pool
+from src.printer.bambu_real import PrinterState
+from src.printer.ftps_pool import close_ftps_pools
+from src.printer.simulator import PRINT_SECONDS, PrinterSimulator, SimulatedPrinter, topic_matches
+
+
+def wait_for(condition, timeout=10.0):
+    """Poll until condition() is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def sim():
+    """Three running simulated printers, printing fast."""
+    with PrinterSimulator(3, report_rate=20, print_speedup=5000) as sim:
+        yield sim
+    close_ftps_pools()
+
+
+@pytest.fixture
+def client(sim):
+    """Real client connected to the first simulated printer."""
+    client = sim.client(sim.printers[0])
+    assert client.connect(timeout=5)
+    yield client
+    client.disconnect()
+
+
+class TestSimulatedPrinter:
+    """Tests for the printer model without networking."""
+
+    def test_topic_matches(self):
+        """Test MQTT topic filters with wildcards."""
+        assert topic_matches("device/+/report", "device/01S/report")
+        assert topic_matches("device/#", "device/01S/report")
+        assert not topic_matches("device/+/report", "device/01S/request")
+        assert not topic_matches("device/01S", "device/01S/report")
+
+    def test_deltas_carry_changes(self, tmp_path):
+        """Test reports carry only changed fields and pushall carries all of them."""
+        printer = SimulatedPrinter("SERIAL", "12345678", tmp_path)
+
+        delta = printer.tick(0.1)["print"]
+        full = printer.handle_command({"pushing": {"command": "pushall"}})[0]["print"]
+
+        assert delta["command"] == "push_status"
+        assert "gcode_state" not in delta and "nozzle_temper" in delta
+        assert full["gcode_state"] == "IDLE"
+        assert len(full["ams"]["ams"][0]["tray"]) == 4
+
+    def test_print_lifecycle(self, tmp_path):
+        """Test a print needs its file, then heats, runs and finishes."""
+        printer = SimulatedPrinter("SERIAL", "12345678", tmp_path, print_speedup=1)
+        command = {"print": {"command": "project_file", "url": "file:///cache/part.3mf", "sequence_id": "7"}}
+
+        reply = printer.handle_command(command)[0]["print"]
+        assert reply["result"] == "failed" and "not found" in reply["reason"]
+
+        (tmp_path / "cache" / "part.3mf").write_bytes(b"3mf")
+        reply = printer.handle_command(command)[0]["print"]
+        assert reply["result"] == "success" and reply["sequence_id"] == "7"
+        assert reply["gcode_state"] == "PREPARE"
+
+        printer.tick(300)
+        assert printer.state == "RUNNING"
+        printer.tick(PRINT_SECONDS / 2)
+        assert printer.report["mc_percent"] == 50
+        printer.tick(PRINT_SECONDS)
+        assert printer.state == "FINISH"
+
+    def test_commands(self, tmp_path):
+        """Test temperature gcode and stopping a print."""
+        printer = SimulatedPrinter("SERIAL", "12345678", tmp_path)
+        printer.handle_command({"print": {"command": "gcode_line", "param": "M140 S55\nM104 S200"}})
+        assert printer.report["bed_target_temper"] == 55
+        assert printer.report["nozzle_target_temper"] == 200
+
+        printer.report["gcode_state"] = "RUNNING"
+        printer.handle_command({"print": {"command": "stop"}})
+        assert printer.state == "FAILED"
+
+
+class TestPrinterSimulator:
+    """Tests driving the real client code against simulated printers."""
+
+    def test_status_reports(self, sim, client):
+        """Test the client receives the full report and then deltas."""
+        wait_for(lambda: client._pipeline.messages_received > 5)
+
+        assert client.status.state == PrinterState.IDLE
+        assert [slot.material for slot in client.status.ams.get_all_slots()] == ["PLA"] * 4
+        assert sim.printers[0].mqtt_connections == 1
+
+    def test_upload_and_print(self, sim, client, tmp_path):
+        """Test an uploaded file prints to completion."""
+        model = tmp_path / "part.3mf"
+        model.write_bytes(bytes(range(256)) * 4000)
+
+        upload = client.upload_file(str(model))
+        assert upload.success
+        assert upload.data["verified"] == "size"
+        assert (sim.printers[0].storage / "cache" / "part.3mf").read_bytes() == model.read_bytes()
+
+        assert client.start_print("part.3mf").success
+        wait_for(lambda: client.status.state == PrinterState.FINISHED)
+        assert client.status.progress == 100
+
+    def test_upload_resumes(self, sim, client, tmp_path, monkeypatch):
+        """Test a dropped upload resumes from what the printer received."""
+        monkeypatch.setattr(ftps_pool, "RETRY_DELAY", 0)
+        model = tmp_path / "part.3mf"
+        model.write_bytes(bytes(range(256)) * 8000)
+        sim.printers[0].drop_upload_after = 700_000
+
+        upload = client.upload_file(str(model))
+
+        assert upload.success
+        assert upload.data["attempts"] == 2
+        assert (sim.printers[0].storage / "cache" / "part.3mf").read_bytes() == model.read_bytes()
+
+    def test_wrong_access_code(self, sim):
+        """Test a client with the wrong access code is refused promptly."""
+        client = sim.client(sim.printers[0])
+        client.access_code = "00000000"
+
+        start = time.monotonic()
+        assert not client.connect(timeout=5)
+        client.disconnect()
+        assert time.monotonic() - start < 2
+
+    def test_reconnect(self, sim, client):
+        """Test the client reconnects and resubscribes after the link drops."""
+        wait_for(lambda: client._pipeline.messages_received > 0)
+
+        sim.drop_connections(sim.printers[0])
+        wait_for(lambda: not client.is_connected)
+        received = client._pipeline.messages_received
+        wait_for(lambda: client.is_connected and client._pipeline.messages_received > received)
+
+        assert sim.printers[0].mqtt_connections == 2
+
+    def test_many_printers(self):
+        """Test one process serves dozens of printers to their clients."""
+        with PrinterSimulator(24, report_rate=10) as sim:
+            clients = [sim.client(printer) for printer in sim.printers]
+            try:
+                assert all(client.connect(timeout=5) for client in clients)
+                wait_for(lambda: all(client._pipeline.messages_received >= 3 for client in clients))
+            finally:
+                for client in clients:
+                    client.disconnect()
+
+        stats = sim.stats()
+        assert stats["mqtt_connections"] == 24
+        assert stats["reports_sent"] >= 72
+        assert stats["reports_dropped"] == 0
@@ -0,0 +1,186 @@
+"""Tests for the headless silhouette projection."""
+
+import math
+
+import numpy as np
+import pytest
+
+from src.laser.projection import ProjectionTool
+from src.laser.silhouette import outline_loops, silhouette_edges, stitch_segments, view_projection
+from src.mesh_io import MeshData, merge_duplicate_vertices
+from tests.mesh_helpers import mesh_of, prism, signed_area
+
+
+def uv_sphere(radius, rings, segments):
+    """Closed UV sphere centred on the origin."""
+    theta = np.linspace(0, math.pi, rings + 1)[1:-1]
+    phi = np.linspace(0, 2 * math.pi, segments, endpoint=False)
+    t, p = np.meshgrid(theta, phi, indexing="ij")
+    vertices = np.stack([np.sin(t) * np.cos(p), np.sin(t) * np.sin(p), np.cos(t)], axis=-1).reshape(-1, 3)
+    vertices = np.vstack([vertices, [0, 0, 1], [0, 0, -1]]) * radius
+    top, bottom = len(vertices) - 2, len(vertices) - 1
+
+    i, j = np.meshgrid(np.arange(rings - 2), np.arange(segments), indexing="ij")
+    i, j = i.ravel(), j.ravel()
+    a, b = i * segments + j, i * segments + (j + 1) % segments
+    c, d = a + segments, b + segments
+    j = np.arange(segments)
+    last = (rings - 2) * segments
+    faces = np.concatenate([
+        np.stack([a, c, b], axis=1),
+        np.stack([b, c, d], axis=1),
+        np.stack([np.full(segments, top), j, (j + 1) % segments], axis=1),
+        np.stack([np.full(segments, bottom), last + (j + 1) % segments, last + j], axis=1),
+    ])
+    return MeshData(vertices=vertices, faces=faces)
+
+
+class TestSilhouette:
+    """Tests for silhouette edges and outline tracing."""
+
+    def test_box_edges(self):
+        """Test a box has its top and bottom rims as silhouette edges."""
+        mesh = merge_duplicate_vertices(mesh_of(((0, 0, 0, 10, 10, 10), False)))
+        edges, weights = silhouette_edges(mesh, view_projection('top'))
+
+        # Rims of the top square (front chain) and the bottom square (back chain)
+        assert len(edges) == 8
+        assert np.all(np.abs(weights).sum(axis=1) == 1)
+        assert np.abs(weights).sum(axis=0).tolist() == [4, 4]
+
+    @pytest.mark.parametrize("view", ["top", "front", "side"])
+    def test_overlapping_boxes_merge(self, view):
+        """Test overlapping parts merge into one outline."""
+        mesh = merge_duplicate_vertices(mesh_of(
+            ((0, 0, 0, 20, 20, 20), False),
+            ((10, 10, 10, 30, 30, 30), False),
+        ))
+        loops = outline_loops(mesh, view)
+
+        assert len(loops) == 1
+        assert signed_area(loops[0]) == pytest.approx(700)
+
+    def test_iso_box(self):
+        """Test the isometric outline of a cube."""
+        mesh = merge_duplicate_vertices(mesh_of(((0, 0, 0, 10, 10, 10), False)))
+        loops = outline_loops(mesh, 'iso')
+
+        # A hexagon; the view axes are scaled by sqrt(1.5)
+        assert len(loops) == 1
+        assert len(loops[0]) == 6
+        assert signed_area(loops[0]) == pytest.approx(1.5 * 100 * math.sqrt(3))
+
+    def test_frame_keeps_hole(self):
+        """Test a see-through opening comes back as a hole."""
+        mesh = merge_duplicate_vertices(mesh_of(
+            ((0, 0, 0, 30, 10, 5), False),
+            ((0, 20, 0, 30, 30, 5), False),
+            ((0, 10, 0, 10, 20, 5), False),
+            ((20, 10, 0, 30, 20, 5), False),
+        ))
+        areas = sorted(signed_area(loop) for loop in outline_loops(mesh, 'top'))
+
+        assert areas == pytest.approx([-100, 900])
+
+    def test_hidden_cavity(self):
+        """Test an enclosed cavity does not show in the outline."""
+        mesh = merge_duplicate_vertices(mesh_of(
+            ((0, 0, 0, 20, 20, 20), False),
+            ((5, 5, 5, 15, 15, 15), True),
+        ))
+        loops = outline_loops(mesh, 'top')
+
+        assert len(loops) == 1
+        assert signed_area(loops[0]) == pytest.approx(400)
+
+    def test_sphere_outline(self):
+        """Test a sphere projects to one round outline."""
+        loops = outline_loops(uv_sphere(10, 40, 80), 'top')
+
+        assert len(loops) == 1
+        assert signed_area(loops[0]) == pytest.approx(math.pi * 100, rel=0.01)
+
+    def test_unknown_view(self):
+        """Test an unknown view is rejected."""
+        mesh = merge_duplicate_vertices(mesh_of(((0, 0, 0, 10, 10, 10), False)))
+        with pytest.raises(ValueError):
+            outline_loops(mesh, 'bottom')
+
+
+class TestStitchSegments:
+    """Tests for chaining segments through the point hash."""
+
+    def test_directed_loop(self):
+        """Test shuffled directed segments close into one loop."""
+        square = np.array([(0, 0), (1, 0), (1, 1), (0, 1)], dtype=np.float64)
+        paths = stitch_segments(square[[2, 0, 3, 1]], square[[3, 1, 0, 2]], 1e-6)
+
+        assert len(paths) == 1
+        points, closed = paths[0]
+        assert closed
+        assert len(points) == 4
+        assert signed_area(points) == pytest.approx(1)
+
+    def test_undirected_open_path(self):
+        """Test undirected segments chain into one open path."""
+        start = np.array([(1, 0), (1, 0), (3, 0)], dtype=np.float64)
+        end = np.array([(0, 0), (2, 0), (2, 0)], dtype=np.float64)
+        paths = stitch_segments(start, end, 1e-6, directed=False)
+
+        assert len(paths) == 1
+        points, closed = paths[0]
+        assert not closed
+        assert sorted(points[:, 0].tolist()) == [0, 1, 2, 3]
+        assert {points[0, 0], points[-1, 0]} == {0, 3}
+
+    def test_near_points_share_node(self):
+        """Test end points within the resolution are joined."""
+        start = np.array([(0, 0), (1, 1e-7)], dtype=np.float64)
+        end = np.array([(1, 0), (0, 0)], dtype=np.float64)
+        paths = stitch_segments(start, end, 1e-4, directed=False)
+
+        assert len(paths) == 1
+
+
+class TestProjectionTool:
+    """Tests for ProjectionTool on MeshData."""
+
+    def test_project_convex_hull(self):
+        """Test project returns the convex hull of the shadow."""
+        mesh = prism([(0, 0), (20, 0), (20, 10), (10, 10), (10, 20), (0, 20)], 0, 5)
+        result = ProjectionTool().project(mesh, 'top')
+
+        assert len(result.paths) == 1
+        assert signed_area(result.paths[0].points) == pytest.approx(350)
+        assert result.bounding_box == pytest.approx((0, 0, 20, 20))
+
+    def test_project_silhouette_concave(self):
+        """Test project_silhouette keeps concave outlines."""
+        mesh = prism([(0, 0), (20, 0), (20, 10), (10, 10), (10, 20), (0, 20)], 0, 5)
+        result = ProjectionTool().project_silhouette(mesh, 'top')
+
+        assert len(result.paths) == 1
+        assert result.paths[0].is_outer
+        assert signed_area(result.paths[0].points) == pytest.approx(300)
+        assert result.width == pytest.approx(20)
+
+    def test_project_silhouette_hole(self):
+        """Test project_silhouette marks holes."""
+        mesh = mesh_of(
+            ((0, 0, 0, 30, 10, 5), False),
+            ((0, 20, 0, 30, 30, 5), False),
+            ((0, 10, 0, 10, 20, 5), False),
+            ((20, 10, 0, 30, 20, 5), False),
+        )
+        result = ProjectionTool().project_silhouette(mesh, 'top')
+
+        assert sorted(path.is_outer for path in result.paths) == [False, True]
+
+    def test_connect_edges_to_paths(self):
+        """Test loose edges are connected into a closed path."""
+        edges = [((0, 0), (1, 0)), ((1, 1), (1, 0)), ((1, 1), (0, 1)), ((0, 1), (0.00001, 0))]
+        paths = ProjectionTool()._connect_edges_to_paths(edges)
+
+        assert len(paths) == 1
+        assert paths[0].is_closed
+        assert len(paths[0].points) == 4
@@ -0,0 +1,181 @@
+"""Tests for the sweep-line Z slicer."""
+
+import numpy as np
+import pytest
+
+from src.mesh_io import MeshData
+from src.slicing.slicer import MeshSlicer, SliceLayer, slice_mesh
+
+
+def box_mesh(x0, y0, z0, x1, y1, z1, vertex_offset=0):
+    """Vertices and outward-wound faces of an axis-aligned box."""
+    vertices = np.array([
+        (x0, y0, z0), (x1, y0, z0), (x1, y1, z0), (x0, y1, z0),
+        (x0, y0, z1), (x1, y0, z1), (x1, y1, z1), (x0, y1, z1),
+    ], dtype=np.float32)
+    faces = np.array([
+        (0, 2, 1), (0, 3, 2),  # bottom
+        (4, 5, 6), (4, 6, 7),  # top
+        (0, 1, 5), (0, 5, 4),  # front
+        (1, 2, 6), (1, 6, 5),  # right
+        (2, 3, 7), (2, 7, 6),  # back
+        (3, 0, 4), (3, 4, 7),  # left
+    ], dtype=np.int64) + vertex_offset
+    return vertices, faces
+
+
+def mesh_of(*boxes):
+    """Combine boxes into one mesh."""
+    vertices, faces = [], []
+    for box in boxes:
+        v, f = box_mesh(*box, vertex_offset=8 * len(vertices))
+        vertices.append(v)
+        faces.append(f)
+    return MeshData(vertices=np.concatenate(vertices), faces=np.concatenate(faces))
+
+
+def shoelace(points):
+    """Signed polygon area."""
+    x, y = points[:, 0], points[:, 1]
+    return 0.5 * float(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y))
+
+
+class TestMeshSlicer:
+    """Tests for MeshSlicer."""
+
+    @pytest.fixture
+    def cube(self):
+        """A 10mm cube."""
+        return mesh_of((0, 0, 0, 10, 10, 10))
+
+    def test_square_contour(self, cube):
+        """Test a cube slices to one counter-clockwise square."""
+        layer = MeshSlicer(cube).slice_at([5.0])[0]
+
+        assert layer.contour_count == 1
+        assert layer.open_paths == 0
+        assert layer.area == pytest.approx(100.0)
+        assert layer.perimeter == pytest.approx(40.0)
+        assert shoelace(layer.contours[0]) == pytest.approx(100.0)
+
+    def test_plane_through_vertices(self):
+        """Test a plane through the equator of an octahedron closes."""
+        vertices = np.array([
+            (5, 0, 5), (0, 5, 5), (-5, 0, 5), (0, -5, 5), (0, 0, 0), (0, 0, 10),
+        ], dtype=np.float32)
+        faces = np.array([
+            (0, 1, 5), (1, 2, 5), (2, 3, 5), (3, 0, 5),
+            (1, 0, 4), (2, 1, 4), (3, 2, 4), (0, 3, 4),
+        ], dtype=np.int64)
+
+        layer = MeshSlicer(MeshData(vertices=vertices, faces=faces)).slice_at([5.0])[0]
+
+        assert layer.contour_count == 1
+        assert len(layer.contours[0]) == 4
+        assert layer.area == pytest.approx(50.0)
+
+    def test_planes_at_part_ends(self, cube):
+        """Test a plane at the top gets the outline and one at the bottom misses."""
+        bottom, top = MeshSlicer(cube).slice_at([0.0, 10.0])
+
+        assert bottom.is_empty
+        assert top.area == pytest.approx(100.0)
+
+    def test_separate_parts(self):
+        """Test each part gets its own contour."""
+        mesh = mesh_of((0, 0, 0, 10, 10, 10), (20, 0, 0, 25, 5, 4))
+
+        layers = MeshSlicer(mesh).slice_at([2.0, 6.0])
+
+        assert layers[0].contour_count == 2
+        assert layers[0].area == pytest.approx(125.0)
+        assert layers[1].contour_count == 1
+
+    def test_unsorted_heights(self, cube):
+        """Test heights are swept bottom to top."""
+        layers = MeshSlicer(cube).slice_at([8.0, 2.0, 20.0])
+
+        assert [layer.z for layer in layers] == [2.0, 8.0, 20.0]
+        assert layers[2].is_empty
+
+    def test_statistics_without_contours(self, cube):
+        """Test area and perimeter do not need contour linking."""
+        layer = MeshSlicer(cube).slice_at([5.0], with_contours=False)[0]
+
+        assert layer.contours == []
+        assert layer.area == pytest.approx(100.0)
+        assert layer.perimeter == pytest.approx(40.0)
+
+    def test_max_overhang(self):
+        """Test a ceiling is reported only in the layer that prints it."""
+        # Shelf sticking out of a pillar at z=5
+        mesh = mesh_of((0, 0, 0, 5, 5, 10), (5, 0, 5, 15, 5, 10))
+        layers = MeshSlicer(mesh).slice_at([2.0, 4.0, 6.0, 8.0])
+
+        assert [layer.max_overhang for layer in layers] == pytest.approx([0.0, 0.0, 90.0, 0.0])
+
+    def test_slice_uniform(self, cube):
+        """Test uniform slicing at layer mid-heights."""
+        layers = MeshSlicer(cube).slice_uniform(0.5, first_layer_height=1.0)
+
+        assert layers[0].z == pytest.approx(0.5)
+        assert layers[1].z == pytest.approx(1.25)
+        assert layers[-1].z == pytest.approx(9.75)
+        assert len(layers) == 19
+
+    def test_invalid_layer_height(self, cube):
+        """Test non-positive layer heights are rejected."""
+        with pytest.raises(ValueError):
+            MeshSlicer(cube).slice_uniform(0)
+
+    def test_z_profile(self):
+        """Test slope and overhang are profiled per band."""
+        # Shelf sticking out of a pillar at z=5
+        mesh = mesh_of((0, 0, 0, 5, 5, 10), (5, 0, 5, 15, 5, 10))
+
+        profile = MeshSlicer(mesh).z_profile(1.0)
+
+        assert len(profile.z) == 10
+        assert profile.max_slope.max() == 0.0  # Only vertical walls are sloped faces
+        assert profile.max_overhang[5] == pytest.approx(90.0)
+        assert profile.max_overhang[2] == 0.0
+        assert profile.band_of(5.5) == 5
+
+    def test_empty_mesh(self):
+        """Test an empty mesh slices to empty layers."""
+        mesh = MeshData(vertices=np.zeros((0, 3), dtype=np.float32), faces=np.zeros((0, 3), dtype=np.int64))
+
+        layers = MeshSlicer(mesh).slice_at([1.0])
+
+        assert layers[0].is_empty
+
+
+class TestSliceLayer:
+    """Tests for SliceLayer."""
+
+    def test_to_dict(self):
+        """Test serialization."""
+        layer = SliceLayer(z=1.0, contours=[np.zeros((3, 2))], area=2.0, perimeter=3.0)
+        d = layer.to_dict()
+
+        assert d["z"] == 1.0
+        assert d["contour_count"] == 1
+        assert d["area"] == 2.0
+
+
+class TestSliceMesh:
+    """Tests for the file convenience function."""
+
+    def test_slice_obj(self, tmp_path):
+        """Test slicing a mesh file."""
+        path = tmp_path / "cube.obj"
+        vertices, faces = box_mesh(0, 0, 0, 10, 10, 2)
+        path.write_text(
+            "".join(f"v {x} {y} {z}\n" for x, y, z in vertices) +
+            "".join(f"f {a + 1} {b + 1} {c + 1}\n" for a, b, c in faces)
+        )
+
+        layers = slice_mesh(path, layer_height=0.5)
+
+        assert len(layers) == 4
+        assert all(layer.area == pytest.approx(100.0) for layer in layers)
@@ -0,0 +1,258 @@
+"""Tests for the asyncio printer status pipeline."""
+
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.printer import bambu_real
+from src.printer.bambu_real import BambuRealPrinter, PrinterState
+from src.printer.status_pipeline import StatusPipeline
+
+
+def message(report):
+    """An MQTT message carrying a report."""
+    return SimpleNamespace(payload=json.dumps(report).encode())
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll until condition() is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def printer():
+    """Printer with its status pipeline running and no MQTT connection."""
+    printer = BambuRealPrinter("192.168.1.100", "12345678", "SERIAL", max_update_rate=1000)
+    printer._pipeline.start()
+    yield printer
+    printer._pipeline.stop()
+
+
+class FakeMQTTClient:
+    """paho client that accepts the connection from its network thread."""
+
+    def __init__(self, **kwargs):
+        self.subscriptions = []
+        self.published = []
+
+    def tls_set(self, **kwargs):
+        pass
+
+    def tls_insecure_set(self, value):
+        pass
+
+    def username_pw_set(self, user, password):
+        pass
+
+    def connect(self, host, port, keepalive=60):
+        pass
+
+    def loop_start(self):
+        threading.Timer(0.05, self.on_connect, (self, None, None, 0, None)).start()
+
+    def loop_stop(self):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def subscribe(self, topic):
+        self.subscriptions.append(topic)
+
+    def publish(self, topic, payload):
+        self.published.append((topic, json.loads(payload)))
+
+
+class TestParseStatus:
+    """Tests for merging partial reports into the cached status."""
+
+    def test_delta_merge(self):
+        """Test a delta changes only the fields it carries."""
+        printer = BambuRealPrinter("ip", "code", "SERIAL")
+
+        changed = printer._parse_status({"print": {"gcode_state": "RUNNING", "bed_temper": 60, "mc_percent": 5}})
+        assert changed == {"state", "bed_temp", "progress"}
+
+        changed = printer._parse_status({"print": {"bed_temper": 60, "mc_percent": 6, "spd_lvl": 3}})
+        assert changed == {"progress", "print_speed"}
+        assert printer.status.state == PrinterState.PRINTING
+        assert printer.status.bed_temp == 60.0
+        assert printer.status.print_speed == 125
+
+        assert printer._parse_status({"system": {"led_mode": "on"}, "print": {"bed_temper": "bad"}}) == {"light_state"}
+        assert printer.status.bed_temp == 60.0
+
+    def test_ams_partial_update(self):
+        """Test AMS slots are updated in place, and a bare tray id empties its slot."""
+        printer = BambuRealPrinter("ip", "code", "SERIAL")
+        printer._parse_status({"print": {"ams": {"tray_now": "1", "ams": [{"id": "0", "tray": [
+            {"id": "0", "tray_type": "PLA", "tray_color": "FF0000FF", "remain": 80},
+            {"id": "1", "tray_type": "PETG", "tray_color": "00FF00FF", "remain": 50},
+        ]}]}}})
+        slot = printer.status.ams.get_slot(0)
+
+        changed = printer._parse_status({"print": {"ams": {"ams": [{"id": "0", "tray": [
+            {"id": "0", "remain": 75},
+            {"id": "1"},
+        ]}]}}})
+
+        assert changed == {"ams"}
+        assert printer.status.ams.get_slot(0) is slot
+        assert (slot.material, slot.color, slot.remaining_percent) == ("PLA", "FF0000FF", 75.0)
+        assert not printer.status.ams.get_slot(1).is_loaded
+        assert printer.status.ams.current_slot == 1
+        assert printer._parse_status({"print": {"ams": {"ams": [{"id": "0", "tray": [{"id": "0", "remain": 75}]}]}}}) == set()
+
+
+class TestStatusPipeline:
+    """Tests for delivering status changes off the MQTT thread."""
+
+    def test_changed_fields_delivered(self, printer):
+        """Test subscribers receive only changed fields they asked for."""
+        everything, temps = [], []
+        printer.subscribe(lambda status, changed: everything.append(changed))
+        printer.subscribe(lambda status, changed: temps.append(changed), fields=["bed_temp", "nozzle_temp"])
+
+        printer._on_message(None, None, message({"print": {"bed_temper": 55, "mc_percent": 10}}))
+        wait_for(lambda: everything and temps)
+        printer._on_message(None, None, message({"print": {"mc_percent": 11}}))
+        wait_for(lambda: len(everything) == 2)
+
+        assert everything == [{"bed_temp": 55.0, "progress": 10}, {"progress": 11}]
+        assert temps == [{"bed_temp": 55.0}]
+
+    def test_unchanged_report_not_published(self, printer):
+        """Test a repeated report produces no update."""
+        received = []
+        printer.add_status_callback(received.append)
+
+        for _ in range(3):
+            printer._on_message(None, None, message({"print": {"nozzle_temper": 210}}))
+        wait_for(lambda: printer._pipeline.messages_received == 3 and printer._pipeline._queue.empty())
+        time.sleep(0.05)
+
+        assert [status.nozzle_temp for status in received] == [210.0]
+        assert printer._pipeline.updates_published == 1
+
+    def test_bursts_coalesced(self):
+        """Test a burst of reports reaches subscribers as at most max_rate updates."""
+        printer = BambuRealPrinter("ip", "code", "SERIAL", max_update_rate=4)
+        updates = []
+        printer.subscribe(lambda status, changed: updates.append(changed))
+        printer._pipeline.start()
+        try:
+            for i in range(50):
+                printer._on_message(None, None, message({"print": {"layer_num": i}}))
+            wait_for(lambda: updates and updates[-1] == {"layer_current": 49})
+        finally:
+            printer._pipeline.stop()
+
+        assert len(updates) <= 2
+        assert printer._pipeline.updates_published <= 2
+
+    def test_slow_callback_does_not_block(self, printer):
+        """Test a slow subscriber stalls neither the MQTT thread nor other subscribers."""
+        release = threading.Event()
+        fast = []
+        printer.add_status_callback(lambda status: release.wait(5))
+        printer.subscribe(lambda status, changed: fast.append(changed))
+
+        start = time.monotonic()
+        for i in range(1, 101):
+            printer._on_message(None, None, message({"print": {"mc_percent": i}}))
+        elapsed = time.monotonic() - start
+
+        wait_for(lambda: fast and fast[-1] == {"progress": 100})
+        release.set()
+        assert elapsed < 0.5
+
+    def test_callback_gets_snapshot(self, printer):
+        """Test a callback's status is not changed by reports parsed while it runs."""
+        release = threading.Event()
+        seen = []
+
+        def slow(status, changed):
+            before = [slot.material for slot in status.ams.get_all_slots()]
+            release.wait(5)
+            seen.append((before, [slot.material for slot in status.ams.get_all_slots()], changed["ams"] is status.ams))
+
+        printer.subscribe(slow, fields=["ams"])
+        tray = {"id": "0", "tray_type": "PLA", "tray_color": "FFFFFFFF"}
+        printer._on_message(None, None, message({"print": {"ams": {"ams": [{"id": "0", "tray": [tray]}]}}}))
+        wait_for(lambda: printer._pipeline.updates_published == 1)
+        time.sleep(0.05)
+
+        printer._on_message(None, None, message({"print": {"ams": {"ams": [{"id": "0", "tray": [dict(tray, tray_type="PETG")]}]}}}))
+        wait_for(lambda: printer.status.ams.get_all_slots()[0].material == "PETG")
+        release.set()
+        wait_for(lambda: len(seen) == 2)
+
+        assert seen[0] == (["PLA"], ["PLA"], True)
+        assert seen[1][:2] == (["PETG"], ["PETG"])
+
+    def test_overflow_drops_oldest(self):
+        """Test a full queue drops the oldest reports and asks once for a full report."""
+        resyncs = []
+        applied = []
+
+        async def run():
+            pipeline = StatusPipeline(lambda report: applied.append(report["n"]) or set(), lambda: None,
+                                      queue_size=4, on_overflow=lambda: resyncs.append(1))
+            pipeline.start(asyncio.get_running_loop())
+            for n in range(10):
+                pipeline.submit(json.dumps({"n": n}).encode())
+            await asyncio.sleep(0.01)
+            pipeline.stop()
+            return pipeline
+
+        pipeline = asyncio.run(run())
+
+        assert pipeline.messages_dropped == 6
+        assert applied == [6, 7, 8, 9]
+        assert resyncs == [1]
+
+    def test_parse_errors_counted(self, printer):
+        """Test malformed payloads are counted and skipped."""
+        printer._on_message(None, None, SimpleNamespace(payload=b"not json"))
+        printer._on_message(None, None, message({"print": {"mc_percent": 42}}))
+
+        wait_for(lambda: printer.status.progress == 42)
+        assert printer._pipeline.parse_errors == 1
+
+
+class TestConnect:
+    """Tests for waiting on the MQTT connection."""
+
+    def test_connect_waits_for_event(self, monkeypatch):
+        """Test connect returns once the broker accepts, then subscribes and requests status."""
+        monkeypatch.setattr(bambu_real.mqtt, "Client", FakeMQTTClient)
+        printer = BambuRealPrinter("ip", "code", "SERIAL")
+
+        start = time.monotonic()
+        assert printer.connect(timeout=5)
+        client = printer._mqtt_client
+        printer.disconnect()
+
+        assert time.monotonic() - start < 1
+        assert client.subscriptions == ["device/SERIAL/report"]
+        assert client.published[0][1]["pushing"]["command"] == "pushall"
+        assert not printer._pipeline.running
+
+    def test_failed_connect_leaves_pipeline_stopped(self, monkeypatch):
+        """Test a refused connection does not leave the status pipeline running."""
+        class RefusingClient(FakeMQTTClient):
+            def connect(self, host, port, keepalive=60):
+                raise ConnectionRefusedError("broker down")
+
+        monkeypatch.setattr(bambu_real.mqtt, "Client", RefusingClient)
+        printer = BambuRealPrinter("ip", "code", "SERIAL")
+
+        assert not printer.connect(timeout=1)
+        assert not printer._pipeline.running
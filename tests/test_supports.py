@@ -1,10 +1,12 @@
 """Tests for support generation and optimization."""
 
+import numpy as np
 import pytest
 from pathlib import Path
 
 from src.blender.support_generator import (
     SupportGenerator,
+    sample_grid_points,
     SupportSettings,
     SupportResult,
     SupportStructure,
@@ -18,9 +20,12 @@ from src.blender.support_optimizer import (
     OptimizationSettings,
     OptimizationResult,
     OptimizationGoal,
+    benchmark_merge,
     generate_optimized_supports,
     compare_support_strategies,
 )
+from src.mesh_io import MeshData, MeshFeatures
+from tests.mesh_helpers import mesh_of, t_shape, write_ascii_stl
 
 
 class TestSupportType:
@@ -444,3 +449,171 @@ endsolid complex""")
 
         # Tree supports should use less or equal material
         assert tree_result.total_material_grams <= normal_result.total_material_grams * 1.1  # Allow 10% tolerance
+
+
+class TestSupportColumns:
+    """Tests for grid-sampled support columns dropped onto the model or bed."""
+
+    @staticmethod
+    def write(tmp_path, mesh, name="model.stl"):
+        """Write a mesh as an ASCII STL and return its path."""
+        path = tmp_path / name
+        write_ascii_stl(path, mesh.triangles.tolist())
+        return str(path)
+
+    def test_sample_grid_points(self):
+        """Test grid nodes are sampled once on a sloped square split along its diagonal."""
+        square = np.array([
+            [(0, 0, 0), (10, 0, 10), (10, 10, 10)],
+            [(0, 0, 0), (10, 10, 10), (0, 10, 0)],
+        ], dtype=np.float64)
+        points, owner = sample_grid_points(square, 5.0)
+
+        assert len(points) == 4
+        assert sorted(map(tuple, points[:, :2].tolist())) == [(2.5, 2.5), (2.5, 7.5), (7.5, 2.5), (7.5, 7.5)]
+        assert points[:, 2] == pytest.approx(points[:, 0])
+        assert set(owner.tolist()) <= {0, 1}
+
+    def test_columns_reach_bed(self, tmp_path):
+        """Test the arms of a T get columns standing on the bed."""
+        columns = SupportGenerator().plan_columns(self.write(tmp_path, t_shape()))
+
+        assert len(columns) == 8
+        assert not columns.on_model.any()
+        assert columns.landing == pytest.approx(0)
+        assert columns.heights == pytest.approx(19.8)
+
+    def test_columns_land_on_model(self, tmp_path):
+        """Test columns under a bridge stop on the base below it."""
+        mesh = mesh_of(((0, 0, 0, 30, 10, 5), False), ((0, 0, 15, 30, 10, 20), False))
+        columns = SupportGenerator().plan_columns(self.write(tmp_path, mesh))
+
+        assert len(columns) == 12
+        assert columns.on_model.all()
+        assert columns.landing == pytest.approx(5)
+        assert columns.heights == pytest.approx(9.8)
+
+    def test_small_overhang_gets_a_column(self, tmp_path):
+        """Test an overhang between grid nodes still gets one column."""
+        mesh = mesh_of(((0, 0, 0, 2, 2, 2), False), ((0, 0, 10, 2, 2, 11), False))
+        columns = SupportGenerator().plan_columns(self.write(tmp_path, mesh))
+
+        assert len(columns) == 1
+        assert columns.areas[0] == pytest.approx(4)
+        assert columns.landing[0] == pytest.approx(2)
+
+    def test_small_sloped_overhang_uses_footprint(self):
+        """Test a missed region's column carries its projected area, as grid columns do."""
+        rise = 2 * np.tan(np.radians(30))
+        mesh = MeshData(
+            vertices=np.array([(0, 0, 10), (0, 2, 10 + rise), (2, 0, 10)], dtype=np.float64),
+            faces=np.array([[0, 1, 2]]),
+        )
+        features = MeshFeatures.from_mesh(mesh)
+
+        columns = SupportGenerator()._plan_columns(features)
+
+        assert features.surface_area == pytest.approx(2 / np.cos(np.radians(30)))
+        assert len(columns) == 1
+        assert columns.areas[0] == pytest.approx(2)
+
+    def test_volumes_from_column_heights(self, tmp_path):
+        """Test volumes and grams follow the real column heights."""
+        path = self.write(tmp_path, t_shape())
+        normal = SupportGenerator(SupportSettings(support_type=SupportType.NORMAL)).generate(path)
+        tree = SupportGenerator(SupportSettings(support_type=SupportType.TREE)).generate(path)
+
+        assert normal.support_count == 8
+        assert normal.total_support_volume == pytest.approx(8 * 25 * 19.8 * 0.15)
+        assert normal.total_material_grams == pytest.approx(normal.total_support_volume / 1000 * 1.24)
+        assert tree.total_support_volume == pytest.approx(8 * np.pi * 19.8)
+        assert tree.normal_support_volume == pytest.approx(normal.total_support_volume)
+        assert all(s.base_position[2] == 0 and s.height == pytest.approx(19.8) for s in tree.structures)
+
+
+def column(x, y, height, base_z=0.0):
+    """A tree column standing at (x, y, base_z)."""
+    return SupportStructure(
+        structure_id=f"{x},{y}",
+        support_type=SupportType.TREE,
+        points=[SupportPoint(position=(x, y, base_z + height), overhang_angle=60.0, area=25.0)],
+        base_position=(x, y, base_z),
+        height=height,
+        volume=np.pi * height,
+        rests_on_model=base_z > 0,
+    )
+
+
+class TestSupportMerging:
+    """Tests for spatially indexed support merging."""
+
+    def test_dense_cluster_becomes_one_tree(self):
+        """Test a tight group of columns merges into a priced tree."""
+        structures = [column(x, y, 20.0) for x in (-1, 0, 1) for y in (-1, 0, 1)]
+
+        merged, count = SupportOptimizer()._merge_nearby_supports(structures)
+
+        assert count == 8
+        assert len(merged) == 1
+        tree = merged[0]
+        fork = 20.0 - np.sqrt(2) / np.tan(np.radians(60))
+        assert tree.base_position == pytest.approx((0, 0, 0))
+        assert tree.trunk_positions[1][2] == pytest.approx(fork)
+        lengths = [np.hypot(np.hypot(x, y), 20.0 - fork) for x in (-1, 0, 1) for y in (-1, 0, 1)]
+        assert tree.volume == pytest.approx(4 * np.pi * fork + np.pi * sum(lengths))
+        assert tree.volume < sum(s.volume for s in structures)
+        assert len(tree.points) == 9 and len(tree.branches) == 9
+
+    def test_pair_not_worth_a_trunk(self):
+        """Test two close columns stay apart when a trunk would cost more."""
+        structures = [column(0, 0, 20.0), column(3, 0, 20.0)]
+
+        merged, count = SupportOptimizer()._merge_nearby_supports(structures)
+
+        assert count == 0
+        assert merged == structures
+
+    def test_distant_supports_untouched(self):
+        """Test supports farther apart than merge_distance are not clustered."""
+        structures = [column(x, y, 20.0) for x in (0, 1, 2) for y in (0, 1, 2)]
+        structures += [column(100 + x, y, 20.0) for x in (0, 1, 2) for y in (0, 1, 2)]
+
+        merged, count = SupportOptimizer()._merge_nearby_supports(structures)
+
+        assert count == 16
+        assert sorted(s.base_position[0] for s in merged) == pytest.approx([1, 101])
+
+    def test_ledge_and_bed_columns_kept_apart(self):
+        """Test a column on a model ledge never shares a trunk with columns on the bed."""
+        structures = [column(x, y, 20.0) for x in (-1, 0, 1) for y in (-1, 0, 1)]
+        ledge = column(1.5, 0, 17.0, base_z=3.0)
+        structures.append(ledge)
+
+        merged, count = SupportOptimizer()._merge_nearby_supports(structures)
+
+        assert count == 8
+        assert ledge in merged
+        tree = next(s for s in merged if s is not ledge)
+        assert not tree.rests_on_model
+        assert tree.base_position == pytest.approx((0, 0, 0))
+        assert len(tree.points) == 9
+
+    def test_chain_split_into_reachable_trees(self):
+        """Test a long row of columns forms several trees within the branch angle."""
+        structures = [column(x * 0.5, 0, 30.0) for x in range(100)]
+
+        merged, count = SupportOptimizer()._merge_nearby_supports(structures)
+
+        assert len(merged) > 1
+        assert count == 100 - len(merged)
+        assert sum(len(s.points) for s in merged) == 100
+        for tree in merged:
+            assert all(branch["angle"] <= 60 + 1e-6 for branch in tree.branches)
+
+    def test_benchmark(self):
+        """Test the benchmark reports merged counts and timings."""
+        rows = benchmark_merge(sizes=(500,))
+
+        assert rows[0]["supports"] == 500
+        assert 0 < rows[0]["remaining"] < 500
+        assert rows[0]["time"] > 0
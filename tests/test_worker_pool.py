@@ -0,0 +1,179 @@
+"""Tests for the warm Blender worker pool, using the stub worker."""
+
+import os
+import threading
+
+import pytest
+
+from src.blender.framing import read_message, write_message
+from src.blender.worker_pool import BlenderWorker, BlenderWorkerPool, stub_worker_command
+from src.mesh_io import scan_mesh
+
+
+def cube_job(path, size=10):
+    """Runner arguments creating a cube."""
+    return ["--action", "create_cube", "--output", str(path), "--size", str(size)]
+
+
+@pytest.fixture
+def pool():
+    """Two-worker pool of stub workers."""
+    pool = BlenderWorkerPool(stub_worker_command(), size=2, request_timeout=10.0)
+    yield pool
+    pool.close()
+
+
+class TestFraming:
+    """Tests for the length-prefixed message framing."""
+
+    def test_round_trip(self):
+        """Test messages come back in order across one pipe."""
+        read_fd, write_fd = os.pipe()
+        try:
+            write_message(write_fd, {"op": "ping", "id": 1})
+            write_message(write_fd, {"op": "run", "args": ["--action", "create_cube"], "id": 2})
+            assert read_message(read_fd, timeout=1)["id"] == 1
+            assert read_message(read_fd, timeout=1)["args"] == ["--action", "create_cube"]
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+    def test_end_of_stream(self):
+        """Test a closed pipe reads as None between messages."""
+        read_fd, write_fd = os.pipe()
+        os.close(write_fd)
+        try:
+            assert read_message(read_fd, timeout=1) is None
+        finally:
+            os.close(read_fd)
+
+    def test_truncated_message(self):
+        """Test a stream ending mid-message is an error."""
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b"\x00\x00\x00\x10{}")
+        os.close(write_fd)
+        try:
+            with pytest.raises(ConnectionError):
+                read_message(read_fd, timeout=1)
+        finally:
+            os.close(read_fd)
+
+    def test_timeout(self):
+        """Test waiting on a silent pipe times out."""
+        read_fd, write_fd = os.pipe()
+        try:
+            with pytest.raises(TimeoutError):
+                read_message(read_fd, timeout=0.05)
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+
+class TestBlenderWorker:
+    """Tests for a single stub worker process."""
+
+    def test_ping_and_close(self):
+        """Test a worker answers pings and exits when closed."""
+        worker = BlenderWorker(stub_worker_command())
+        assert worker.ping(timeout=10)
+        worker.close()
+        assert not worker.is_alive
+
+    def test_dead_worker_fails_ping(self):
+        """Test a killed worker fails its ping."""
+        worker = BlenderWorker(stub_worker_command())
+        worker.process.kill()
+        worker.process.wait()
+        assert not worker.ping(timeout=1)
+        worker.kill()
+
+
+class TestBlenderWorkerPool:
+    """Tests for BlenderWorkerPool with stub workers."""
+
+    def test_run_creates_model(self, pool, tmp_path):
+        """Test a job writes its model and returns the runner result."""
+        result = pool.run(cube_job(tmp_path / "cube.stl", size=12))
+
+        assert result["success"]
+        assert result["output_path"] == str(tmp_path / "cube.stl")
+        assert scan_mesh(tmp_path / "cube.stl").dimensions() == pytest.approx((12, 12, 12))
+
+    def test_workers_are_reused(self, pool, tmp_path):
+        """Test sequential jobs share one warm worker."""
+        for i in range(5):
+            assert pool.run(cube_job(tmp_path / f"{i}.stl"))["success"]
+
+        assert pool.workers_started == 1
+        assert pool.jobs_completed == 5
+
+    def test_recycle_after_jobs(self, tmp_path):
+        """Test a worker is replaced after its job allowance."""
+        with BlenderWorkerPool(stub_worker_command(), size=1, max_jobs_per_worker=2) as pool:
+            for i in range(5):
+                assert pool.run(cube_job(tmp_path / f"{i}.stl"))["success"]
+
+            assert pool.workers_started == 3
+            assert pool.workers_recycled == 2
+
+    def test_map_batch(self, pool, tmp_path):
+        """Test a batch runs in order across the workers."""
+        jobs = [cube_job(tmp_path / f"{i}.stl", size=i + 1) for i in range(6)]
+        results = pool.map(jobs)
+
+        assert [r["output_path"] for r in results] == [str(tmp_path / f"{i}.stl") for i in range(6)]
+        assert pool.workers_started <= 2
+
+    def test_concurrency_limit(self, pool, tmp_path):
+        """Test no more than size jobs run at once."""
+        threads = [
+            threading.Thread(target=pool.run, args=(cube_job(tmp_path / f"{i}.stl"),), kwargs={"delay": 0.2})
+            for i in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert pool.jobs_completed == 5
+        assert pool.workers_started == 2
+
+    def test_timeout_replaces_worker(self, tmp_path):
+        """Test a job past its timeout fails and the worker is replaced."""
+        with BlenderWorkerPool(stub_worker_command(), size=1, request_timeout=0.5) as pool:
+            result = pool.run(cube_job(tmp_path / "slow.stl"), delay=5)
+            assert not result["success"]
+            assert "timed out" in result["error"]
+
+            assert pool.run(cube_job(tmp_path / "fast.stl"))["success"]
+            assert pool.workers_started == 2
+
+    def test_invalid_arguments(self, pool):
+        """Test bad runner arguments fail without losing the worker."""
+        result = pool.run(["--action", "unknown"])
+
+        assert not result["success"]
+        assert pool.idle_count == 1
+
+    def test_health_check(self, pool):
+        """Test the health check drops workers that died while idle."""
+        pool.warm_up()
+        assert pool.idle_count == 2
+        pool._idle[0].process.kill()
+
+        assert pool.health_check() == {"healthy": 1, "removed": 1}
+        assert pool.idle_count == 1
+
+    def test_missing_worker_command(self):
+        """Test a worker that cannot start gives a failed result."""
+        with BlenderWorkerPool(["/nonexistent/blender"], size=1) as pool:
+            result = pool.run(["--action", "create_cube"])
+
+        assert not result["success"]
+        assert "Could not start" in result["error"]
+
+    def test_closed_pool(self, pool):
+        """Test a closed pool refuses jobs."""
+        pool.close()
+        with pytest.raises(RuntimeError):
+            pool.run(["--action", "create_cube"])